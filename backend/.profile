@@ -22,7 +22,9 @@ source tools/create_staffusers.sh
 setup_env
 gonogo "setup_env"
 
-if [[ "$CF_INSTANCE_INDEX" == 0 ]]; then
+# Only the first web instance prepares the database; the worker's instance 0
+# would otherwise tear down and stand up the API at the same time.
+if [[ "$CF_INSTANCE_INDEX" == 0 && "$CF_PROCESS_TYPE" == "web" ]]; then
 
     #####
     # API TEARDOWN
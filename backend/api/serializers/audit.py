@@ -3,14 +3,27 @@ from rest_framework import serializers
 from audit.models import SingleAuditChecklist, Audit
 
 
+class ProjectedModelSerializer(serializers.ModelSerializer):
+    """
+    A ModelSerializer that can be limited to some of its fields, as in
+    AuditSerializer(audit, fields=["report_id", "version"]).
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 # TODO: Update Post SOC Launch -> Delete
-class SingleAuditChecklistSerializer(serializers.ModelSerializer):
+class SingleAuditChecklistSerializer(ProjectedModelSerializer):
     class Meta:
         model = SingleAuditChecklist
         fields = "__all__"
 
 
-class AuditSerializer(serializers.ModelSerializer):
+class AuditSerializer(ProjectedModelSerializer):
     class Meta:
         model = Audit
         fields = "__all__"
@@ -1,7 +1,9 @@
+from io import StringIO
 import json
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from model_bakery import baker
@@ -9,6 +11,8 @@ from rest_framework.test import APIClient
 
 from api.test_uei import valid_uei_results
 from audit.models import Access, Audit, SingleAuditChecklist
+from audit.models.constants import STATUS
+from audit.test_audit_indexes import _audit_data
 from dissemination.models.general import General
 
 User = get_user_model()
@@ -682,6 +686,28 @@ class SingleAuditChecklistViewTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_get_fields(self):
+        """
+        With ?fields=, only those fields are returned, with the role emails.
+        """
+        sac = baker.make(SingleAuditChecklist, audit_type="single-audit")
+        baker.make(Access, user=self.user, sac=sac, role="editor", email="a@a.com")
+
+        response = self.client.get(
+            self.path(sac.report_id), {"fields": "report_id,audit_type"}
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "report_id": sac.report_id,
+                "audit_type": "single-audit",
+                "editors": ["a@a.com"],
+                "certifying_auditee_contact": None,
+                "certifying_auditor_contact": None,
+            },
+        )
+
     def test_get_bad_report_id(self):
         """
         If the user is logged in and the report ID doesn't match a SAC, they should get a 404.
@@ -691,6 +717,121 @@ class SingleAuditChecklistViewTests(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class AuditViewTests(TestCase):
+    """
+    Tests for /audit/edit/[report_id]
+    """
+
+    def setUp(self):
+        self.user = baker.make(User)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.audit = baker.make(
+            Audit,
+            audit={
+                "general_information": {"auditee_name": "Name"},
+                "federal_awards": {"federal_awards": []},
+            },
+        )
+        baker.make(
+            Access,
+            user=self.user,
+            audit=self.audit,
+            role="editor",
+            email="a@a.com",
+        )
+        baker.make(
+            Access,
+            audit=self.audit,
+            role="certifying_auditee_contact",
+            email="b@b.com",
+        )
+        self.path = reverse("audit", kwargs={"report_id": self.audit.report_id})
+
+    def test_get(self):
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["report_id"], self.audit.report_id)
+        self.assertEqual(data["audit"], self.audit.audit)
+        self.assertEqual(data["editors"], ["a@a.com"])
+        self.assertEqual(data["certifying_auditee_contact"], "b@b.com")
+        self.assertIsNone(data["certifying_auditor_contact"])
+
+    def test_get_projection(self):
+        response = self.client.get(
+            self.path, {"fields": "report_id,version", "sections": "federal_awards"}
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "report_id": self.audit.report_id,
+                "version": self.audit.version,
+                "audit": {"federal_awards": {"federal_awards": []}},
+                "editors": ["a@a.com"],
+                "certifying_auditee_contact": "b@b.com",
+                "certifying_auditor_contact": None,
+            },
+        )
+
+    def test_get_unknown_field(self):
+        response = self.client.get(self.path, {"fields": "report_id,nonsense"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_not_modified(self):
+        etag = self.client.get(self.path)["ETag"]
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        projected = self.client.get(self.path, {"sections": "federal_awards"})
+        self.assertNotEqual(projected["ETag"], etag)
+
+        self.audit.update_section("notes_to_sefa", {"accounting_policies": "Text"})
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        baker.make(Access, audit=self.audit, role="editor", email="c@c.com")
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["editors"], ["a@a.com", "c@c.com"])
+
+    @patch("audit.models.utils.compute_cog_over", return_value=("10", None))
+    def test_get_after_reindex(self, _mock_cog_over):
+        Audit.objects.filter(pk=self.audit.pk).update(
+            submission_status=STATUS.DISSEMINATED, audit=_audit_data()
+        )
+        etag = self.client.get(self.path)["ETag"]
+
+        call_command("reindex_audits", stdout=StringIO())
+
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["audit"]["cognizant_agency"], "10")
+
+    def test_get_no_audit_access(self):
+        audit = baker.make(Audit)
+        response = self.client.get(
+            reverse("audit", kwargs={"report_id": audit.report_id})
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_bad_report_id(self):
+        response = self.client.get(
+            reverse("audit", kwargs={"report_id": "nonsensical_id"})
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
 class SacFederalAwardsViewTests(TestCase):
     """
     Tests for /sac/edit/[report_id]/federal_awards
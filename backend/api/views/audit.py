@@ -1,7 +1,16 @@
+import hashlib
+import json
 import logging
 
-from django.http import Http404, JsonResponse
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import OuterRef, Subquery
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import JSONObject
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
@@ -19,11 +28,29 @@ logger = logging.getLogger(__name__)
 UserModel = get_user_model()
 
 
+def role_emails_subquery(**filters):
+    """
+    The role and email of each Access matching filters, which refer to the
+    outer query with OuterRef, as a JSON list, so that they are read with the
+    audit or SAC they belong to.
+    """
+    return Subquery(
+        Access.objects.filter(**filters)
+        .order_by()
+        .values(*filters)
+        .annotate(
+            accesses=JSONBAgg(JSONObject(role="role", email="email"), order_by="id")
+        )
+        .values("accesses")
+    )
+
+
 # TODO: Update Post SOC Launch
-def get_role_emails_for_sac(sac_id, audit_id=None) -> dict:
+def get_role_emails(accesses) -> dict:
     """
-    Given a SAC id, returns a dictionary containing the various email addresses
-    from Access objects associated with that SAC, grouped by role.
+    Given the role and email of each Access of a SAC or audit, as read by
+    role_emails_subquery(), returns a dictionary containing the email
+    addresses grouped by role.
 
     {
         "editors": ["a@a.com", "b@b.com", "victor@frankenstein.com"]
@@ -31,25 +58,54 @@ def get_role_emails_for_sac(sac_id, audit_id=None) -> dict:
         "certfying_auditee_contact": ["e@e.com"],
     }
     """
-    accesses = (
-        Access.objects.filter(sac=sac_id)
-        if not audit_id
-        else Audit.objects.filter(audit=sac_id)
-    )
+    accesses = accesses or []
 
     # Turn lists into single items or None for the certifier roles:
     only_one = lambda x: x[0] if x else None
     return {
-        "editors": [a.email for a in accesses if a.role == "editor"],
+        "editors": [a["email"] for a in accesses if a["role"] == "editor"],
         "certifying_auditee_contact": only_one(
-            [a.email for a in accesses if a.role == "certifying_auditee_contact"]
+            [a["email"] for a in accesses if a["role"] == "certifying_auditee_contact"]
         ),
         "certifying_auditor_contact": only_one(
-            [a.email for a in accesses if a.role == "certifying_auditor_contact"]
+            [a["email"] for a in accesses if a["role"] == "certifying_auditor_contact"]
         ),
     }
 
 
+def _query_list(request, name):
+    """The comma-separated values of a query parameter, or None if not given."""
+    values = [v for v in request.query_params.get(name, "").split(",") if v]
+    return values or None
+
+
+def requested_fields(request, serializer_class):
+    """
+    The fields of serializer_class asked for with ?fields=a,b, or None for
+    all of them.
+    """
+    fields = _query_list(request, "fields")
+    if fields is not None:
+        unknown = set(fields) - set(serializer_class().fields)
+        if unknown:
+            raise ValidationError(
+                {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}"]}
+            )
+    return fields
+
+
+def audit_etag(audit, fields, sections):
+    """
+    The ETag of an audit as returned by AuditView: its report_id and version,
+    with a digest of the projection asked for and of its Accesses, which can
+    change without a new version.
+    """
+    digest = hashlib.sha256(
+        json.dumps([fields, sections, audit.accesses]).encode()
+    ).hexdigest()
+    return quote_etag(f"{audit.report_id}-{audit.version}-{digest[:16]}")
+
+
 class AuditView(APIView):
     permission_classes = [IsAuthenticated, AuditPermission]
     invalid_metadata_keys = [
@@ -69,17 +125,54 @@ class AuditView(APIView):
         """
         Get the audit by report_id and return it in JSON format.
         Return 404 if it doesn't exist.
+
+        ?fields=a,b returns only those fields, and ?sections=a,b only those
+        keys of the audit JSON. Unchanged audits return 304 for their ETag.
         """
+        fields = requested_fields(request, AuditSerializer)
+        sections = _query_list(request, "sections")
         try:
-            audit = Audit.objects.get(report_id=report_id)
+            audit = (
+                Audit.objects.only("id", "report_id", "version")
+                .annotate(accesses=role_emails_subquery(audit=OuterRef("pk")))
+                .get(report_id=report_id)
+            )
         except Audit.DoesNotExist as e:
             raise Http404() from e
         self.check_object_permissions(request, audit)
 
-        base_data = dict(AuditSerializer(audit).data.items())
-        full_data = base_data | get_role_emails_for_sac(None, audit.id)
+        etag = audit_etag(audit, fields, sections)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data = self._serialize(audit, fields, sections)
+            response = JsonResponse(data | get_role_emails(audit.accesses))
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
-        return JsonResponse(full_data)
+    def _serialize(self, audit, fields, sections):
+        """
+        The audit's fields, read again with only the fields and the sections
+        of the audit JSON asked for.
+        """
+        fields = list(fields or AuditSerializer().fields)
+        audit_fields = Audit.objects.filter(pk=audit.pk).only(*fields)
+        if sections is not None:
+            if "audit" not in fields:
+                fields.append("audit")
+            audit_fields = audit_fields.defer("audit").annotate(
+                **{
+                    f"section_{i}": KeyTransform(name, "audit")
+                    for i, name in enumerate(sections)
+                }
+            )
+        projected = audit_fields.get()
+        if sections is not None:
+            projected.audit = {
+                name: getattr(projected, f"section_{i}")
+                for i, name in enumerate(sections)
+            }
+        return dict(AuditSerializer(projected, fields=fields).data.items())
 
 
 class SingleAuditChecklistView(APIView):
@@ -105,15 +198,25 @@ class SingleAuditChecklistView(APIView):
         """
         Get the SAC by report_id and return it in JSON format.
         Return 404 if it doesn't exist.
+
+        ?fields=a,b returns only those fields.
         """
+        fields = requested_fields(request, SingleAuditChecklistSerializer)
+        sacs = SingleAuditChecklist.objects.annotate(
+            accesses=role_emails_subquery(sac=OuterRef("pk"))
+        )
+        if fields is not None:
+            sacs = sacs.only(*fields)
         try:
-            sac = SingleAuditChecklist.objects.get(report_id=report_id)
+            sac = sacs.get(report_id=report_id)
         except SingleAuditChecklist.DoesNotExist as e:
             raise Http404() from e
         self.check_object_permissions(request, sac)
 
-        base_data = dict(SingleAuditChecklistSerializer(sac).data.items())
-        full_data = base_data | get_role_emails_for_sac(sac.id)
+        base_data = dict(
+            SingleAuditChecklistSerializer(sac, fields=fields).data.items()
+        )
+        full_data = base_data | get_role_emails(sac.accesses)
 
         return JsonResponse(full_data)
 
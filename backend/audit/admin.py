@@ -419,6 +419,7 @@ class AuditHistoryAdmin(admin.ModelAdmin):
         "event_display",
         "updated_by__email",
         "version",
+        "audit_state",
     )
     list_filter = [
         "report_id",
@@ -426,6 +427,7 @@ class AuditHistoryAdmin(admin.ModelAdmin):
         "event",
         "updated_by__email",
         "version",
+        "audit_state",
     ]
     search_fields = ("report_id", "updated_by__email")
     ordering = ("-updated_at",)
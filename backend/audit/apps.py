@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AuditConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "audit"
+
+    def ready(self):
+        from audit import schema_registry
+
+        schema_registry.warm_up()
+
+        # Register the job handlers.
+        from audit import jobs, upload_pipeline  # noqa: F401
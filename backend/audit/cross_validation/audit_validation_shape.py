@@ -1,5 +1,6 @@
 import logging
 
+from audit.cross_validation.lookups import ShapedAudit
 from audit.cross_validation.naming import NC, SECTION_NAMES
 
 at_root_sections = (NC.AUDIT_INFORMATION, NC.GENERAL_INFORMATION, NC.TRIBAL_DATA_CONSENT)  # type: ignore
@@ -10,7 +11,8 @@ logger = logging.getLogger(__name__)
 def audit_validation_shape(audit):
     """
     Takes an instance of Audit and converts it to the shape
-    expected by the validation functions.
+    expected by the validation functions, as a ShapedAudit, so that the
+    functions share the lookups in cross_validation.lookups.
 
     This function exists so that as either the Audit or the
     validation shape changes we only have to make adjustments in one place.
@@ -54,17 +56,19 @@ def audit_validation_shape(audit):
     """
     from audit.models import Access, AuditValidationWaiver
 
-    shape = {
-        "sf_sac_sections": {k: get_shaped_section(audit, k) for k in SECTION_NAMES},
-        "sf_sac_meta": {
-            "submitted_by": audit.created_by,  # For SACs submitted by was created_by (and at this point the audit isn't even submitted
-            "date_created": audit.created_at,
-            "submission_status": audit.submission_status,
-            "report_id": audit.report_id,
-            "audit_type": audit.audit_type,
-            "data_source": audit.data_source,
-        },
-    }
+    shape = ShapedAudit(
+        {
+            "sf_sac_sections": {k: get_shaped_section(audit, k) for k in SECTION_NAMES},
+            "sf_sac_meta": {
+                "submitted_by": audit.created_by,  # For SACs submitted by was created_by (and at this point the audit isn't even submitted
+                "date_created": audit.created_at,
+                "submission_status": audit.submission_status,
+                "report_id": audit.report_id,
+                "audit_type": audit.audit_type,
+                "data_source": audit.data_source,
+            },
+        }
+    )
 
     # Querying the AuditValidationWaiver table for waivers
     waivers = AuditValidationWaiver.objects.filter(report_id=audit.report_id)
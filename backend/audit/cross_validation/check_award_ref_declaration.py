@@ -1,3 +1,4 @@
+from . import lookups
 from .errors import (
     err_award_ref_not_declared,
 )
@@ -9,34 +10,14 @@ def check_award_ref_declaration(sac_dict, *_args, **_kwargs):
     are present within the Federal Awards workbook.
     """
 
-    all_sections = sac_dict.get("sf_sac_sections", {})
-    federal_awards_section = all_sections.get("federal_awards") or {}
-    federal_awards = federal_awards_section.get("federal_awards", [])
-    findings_uniform_guidance_section = (
-        all_sections.get("findings_uniform_guidance") or {}
-    )
-    findings_uniform_guidance = findings_uniform_guidance_section.get(
-        "findings_uniform_guidance_entries", []
-    )
+    federal_awards = lookups.federal_awards(sac_dict)
+    findings_uniform_guidance = lookups.findings_uniform_guidance(sac_dict)
 
-    declared_award_refs = set()
-    reported_award_refs = set()
+    declared_award_refs = set(lookups.award_references(sac_dict))
+    reported_award_refs = set(lookups.finding_award_references(sac_dict))
     errors = []
-    declared_award_ref_max_length = 0
-    reported_award_ref_max_length = 0
-    for award in federal_awards:
-        award_ref = award.get("award_reference")
-        if award_ref:
-            declared_award_refs.add(award_ref)
-            if len(award_ref) > declared_award_ref_max_length:
-                declared_award_ref_max_length = len(award_ref)
-
-    for finding in findings_uniform_guidance:
-        award_ref = finding["program"]["award_reference"]
-        if award_ref:
-            reported_award_refs.add(award_ref)
-            if len(award_ref) > reported_award_ref_max_length:
-                reported_award_ref_max_length = len(award_ref)
+    declared_award_ref_max_length = max(map(len, declared_award_refs), default=0)
+    reported_award_ref_max_length = max(map(len, reported_award_refs), default=0)
 
     updated_declared_refs, updated_reported_refs = _normalize_award_ref_lengths(
         declared_award_ref_max_length,
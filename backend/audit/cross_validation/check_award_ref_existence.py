@@ -1,6 +1,7 @@
 from audit.fixtures.excel import (
     FEDERAL_AWARDS_TEMPLATE_DEFINITION,
 )
+from . import lookups
 from .errors import (
     err_missing_award_reference,
 )
@@ -20,9 +21,7 @@ def check_award_ref_existence(sac_dict, *_args, **_kwargs):
     Check that all awards have a reference code.
     """
     first_row = FEDERAL_AWARDS_TEMPLATE["title_row"]
-    all_sections = sac_dict.get("sf_sac_sections", {})
-    federal_awards_section = all_sections.get("federal_awards") or {}
-    federal_awards = federal_awards_section.get("federal_awards", [])
+    federal_awards = lookups.federal_awards(sac_dict)
     missing_refs = []
     errors = []
     for index, award in enumerate(federal_awards):
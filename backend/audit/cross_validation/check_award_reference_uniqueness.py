@@ -1,3 +1,4 @@
+from . import lookups
 from .errors import (
     err_duplicate_award_reference,
 )
@@ -9,19 +10,9 @@ def check_award_reference_uniqueness(sac_dict, *_args, **_kwargs):
     Check that all award references in the Federal Award workbook are distinct.
     """
 
-    all_sections = sac_dict.get("sf_sac_sections", {})
-    federal_awards_section = all_sections.get("federal_awards") or {}
-    federal_awards = federal_awards_section.get("federal_awards", [])
-    award_refs = []
     errors = []
 
-    for award in federal_awards:
-        award_reference = award.get("award_reference")
-
-        if award_reference:
-            award_refs.append(award_reference)
-
-    duplicated_award_refs = _find_duplicates(award_refs)
+    duplicated_award_refs = _find_duplicates(lookups.award_references(sac_dict))
 
     for dup_award_ref in duplicated_award_refs:
         errors.append({"error": err_duplicate_award_reference(dup_award_ref)})
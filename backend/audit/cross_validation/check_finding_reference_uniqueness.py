@@ -1,5 +1,6 @@
 from django.conf import settings
 from census_historical_migration.invalid_record import InvalidRecord
+from . import lookups
 from .errors import (
     err_duplicate_finding_reference,
 )
@@ -11,15 +12,9 @@ def check_finding_reference_uniqueness(sac_dict, *_args, **_kwargs):
     Check the uniqueness of REFERENCE numbers for each AWARD in findings.
     """
 
-    all_sections = sac_dict.get("sf_sac_sections", {})
     data_source = sac_dict.get("sf_sac_meta", {}).get("data_source", "")
     waiver_types = sac_dict.get("waiver_types", [])
-    findings_uniform_guidance_section = (
-        all_sections.get("findings_uniform_guidance") or {}
-    )
-    findings_uniform_guidance = findings_uniform_guidance_section.get(
-        "findings_uniform_guidance_entries", []
-    )
+    findings_uniform_guidance = lookups.findings_uniform_guidance(sac_dict)
 
     ref_numbers = defaultdict(set)
     duplicate_ref_number = defaultdict(set)
@@ -1,6 +1,7 @@
 from django.conf import settings
 
 from census_historical_migration.invalid_record import InvalidRecord
+from . import lookups
 from .errors import (
     err_findings_count_inconsistent,
 )
@@ -13,15 +14,8 @@ def check_findings_count_consistency(sac_dict, *_args, **_kwargs):
     the number of findings referenced in Federal Awards Audit Findings.
     """
 
-    all_sections = sac_dict.get("sf_sac_sections", {})
-    federal_awards_section = all_sections.get("federal_awards") or {}
-    federal_awards = federal_awards_section.get("federal_awards", [])
-    findings_uniform_guidance_section = (
-        all_sections.get("findings_uniform_guidance") or {}
-    )
-    findings_uniform_guidance = findings_uniform_guidance_section.get(
-        "findings_uniform_guidance_entries", []
-    )
+    federal_awards = lookups.federal_awards(sac_dict)
+    findings_uniform_guidance = lookups.findings_uniform_guidance(sac_dict)
     data_source = sac_dict.get("sf_sac_meta", {}).get("data_source", "")
     expected_award_refs_count = {}
     found_award_refs_count = defaultdict(int)
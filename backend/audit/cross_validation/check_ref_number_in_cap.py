@@ -1,5 +1,6 @@
 from django.conf import settings
 from census_historical_migration.invalid_record import InvalidRecord
+from . import lookups
 from .errors import (
     err_missing_or_extra_references,
 )
@@ -20,18 +21,11 @@ def check_ref_number_in_cap(sac_dict, *_args, **_kwargs):
 
     all_sections = sac_dict.get("sf_sac_sections", {})
     data_source = sac_dict.get("sf_sac_meta", {}).get("data_source", "")
-    findings_uniform_guidance_section = (
-        all_sections.get("findings_uniform_guidance") or {}
-    )
-    findings_uniform_guidance = findings_uniform_guidance_section.get(
-        "findings_uniform_guidance_entries", []
-    )
     corrective_action_plan_section = all_sections.get("corrective_action_plan") or {}
     corrective_action_plan = corrective_action_plan_section.get(
         "corrective_action_plan_entries", []
     )
 
-    declared_references = set()
     in_use_references = set()
     errors = []
 
@@ -42,11 +36,7 @@ def check_ref_number_in_cap(sac_dict, *_args, **_kwargs):
         # Skip this validation if it is a historical audit report with non-matching reference numbers
         return errors
 
-    for finding in findings_uniform_guidance:
-        ref_number = finding["findings"]["reference_number"]
-        if ref_number:
-            declared_references.add(ref_number)
-
+    declared_references = lookups.finding_reference_numbers(sac_dict)
     for cap in corrective_action_plan:
         ref_number = cap["reference_number"]
         if ref_number:
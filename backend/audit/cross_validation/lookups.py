@@ -0,0 +1,109 @@
+"""
+Values that more than one validation function derives from the shaped audit.
+
+audit_validation_shape() returns a ShapedAudit, which keeps each of these once
+it has been worked out, so that the functions run by Audit.validate() share
+them. For any other dictionary, such as the shapes built in the tests, they
+are worked out on every call.
+
+The values are shared, so callers must not change them.
+"""
+
+import functools
+
+
+class ShapedAudit(dict):
+    """The validation shape of an audit, and the lookups derived from it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = {}
+
+
+def memoized(func):
+    @functools.wraps(func)
+    def wrapper(sac_dict):
+        lookups = getattr(sac_dict, "lookups", None)
+        if lookups is None:
+            return func(sac_dict)
+        if func.__name__ not in lookups:
+            lookups[func.__name__] = func(sac_dict)
+        return lookups[func.__name__]
+
+    return wrapper
+
+
+@memoized
+def federal_awards(sac_dict):
+    """The awards in the Federal Awards workbook."""
+    all_sections = sac_dict.get("sf_sac_sections", {})
+    federal_awards_section = all_sections.get("federal_awards") or {}
+    return federal_awards_section.get("federal_awards", [])
+
+
+@memoized
+def findings_uniform_guidance(sac_dict):
+    """The entries in the Federal Awards Audit Findings workbook."""
+    all_sections = sac_dict.get("sf_sac_sections", {})
+    findings_uniform_guidance_section = (
+        all_sections.get("findings_uniform_guidance") or {}
+    )
+    return findings_uniform_guidance_section.get(
+        "findings_uniform_guidance_entries", []
+    )
+
+
+@memoized
+def award_references(sac_dict):
+    """The award references in the Federal Awards workbook, in order."""
+    return tuple(
+        award["award_reference"]
+        for award in federal_awards(sac_dict)
+        if award.get("award_reference")
+    )
+
+
+@memoized
+def finding_award_references(sac_dict):
+    """
+    The award references in the Federal Awards Audit Findings workbook, in
+    order.
+    """
+    return tuple(
+        finding["program"]["award_reference"]
+        for finding in findings_uniform_guidance(sac_dict)
+        if finding["program"]["award_reference"]
+    )
+
+
+@memoized
+def finding_reference_numbers(sac_dict):
+    """
+    The set of reference numbers in the Federal Awards Audit Findings
+    workbook.
+    """
+    return frozenset(
+        finding["findings"]["reference_number"]
+        for finding in findings_uniform_guidance(sac_dict)
+        if finding["findings"]["reference_number"]
+    )
+
+
+@memoized
+def auditee_ueis(sac_dict):
+    """The auditee_uei of each section that has one."""
+    sections = filter(None, sac_dict["sf_sac_sections"].values())
+    return tuple(filter(None, (s.get("auditee_uei", None) for s in sections)))
+
+
+@memoized
+def number_of_findings(sac_dict):
+    """The number of findings the Federal Awards workbook reports, in total."""
+
+    def get_num_findings(award):
+        if program := award.get("program"):
+            if findings := program.get("number_of_audit_findings", 0):
+                return int(findings)
+        return 0
+
+    return sum(get_num_findings(award) for award in federal_awards(sac_dict))
@@ -0,0 +1,39 @@
+import logging
+import time
+
+import newrelic.agent
+
+from audit.cross_validation import functions
+
+logger = logging.getLogger(__name__)
+
+
+def run_cross_validation(shaped_audit, sar=None, validation_functions=None):
+    """
+    Runs each validation function (by default, cross_validation.functions) on
+    one shaped audit, so that they share the lookups it keeps (see
+    cross_validation.lookups).
+
+    Returns (results, timings): the error and warning dicts from every
+    function, in the order of the functions, and the seconds each function
+    took, by function name. Each timing is also recorded in New Relic.
+    """
+    results = []
+    timings = {}
+    for func in validation_functions or functions:
+        start_time = time.perf_counter()
+        results.extend(func(shaped_audit, sar=sar))
+        timings[func.__name__] = time.perf_counter() - start_time
+
+    for name, run_time in timings.items():
+        newrelic.agent.record_custom_metric(f"Custom/cross_validation/{name}", run_time)
+    logger.info(
+        f"Cross-validation executed in {sum(timings.values()):.4f} secs; slowest: "
+        + ", ".join(
+            f"{name} {run_time:.4f}"
+            for name, run_time in sorted(
+                timings.items(), key=lambda item: item[1], reverse=True
+            )[:3]
+        )
+    )
+    return results, timings
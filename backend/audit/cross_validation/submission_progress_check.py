@@ -2,6 +2,7 @@ from copy import deepcopy
 
 from django.core.exceptions import ValidationError
 
+from audit.cross_validation import lookups
 from audit.cross_validation.naming import NC, find_section_by_name
 from audit.models.constants import RESUBMISSION_ACTION
 from audit.models.submission_event import SubmissionEvent
@@ -79,12 +80,6 @@ def progress_check(sac, sections, key):
     return a dictionary containing that key with its progress as the value.
     """
 
-    def get_num_findings(award):
-        if program := award.get("program"):
-            if findings := program.get("number_of_audit_findings", 0):
-                return int(findings)
-        return 0
-
     progress = {
         "display": None,
         "completed": None,
@@ -92,13 +87,10 @@ def progress_check(sac, sections, key):
         "completed_date": None,
         "section_name": key,
     }
-    awards = {}
-    if sections[NC.FEDERAL_AWARDS]:
-        awards = sections.get(NC.FEDERAL_AWARDS, {}).get(NC.FEDERAL_AWARDS, [])
     general_info = sections.get(NC.GENERAL_INFORMATION, {}) or {}
     resubmission_meta = sac["sf_sac_meta"].get(NC.RESUBMISSION_META, {}) or {}
 
-    num_findings = sum(get_num_findings(award) for award in awards)
+    num_findings = lookups.number_of_findings(sac)
     conditions = {
         NC.GENERAL_INFORMATION: True,
         NC.AUDIT_INFORMATION: True,
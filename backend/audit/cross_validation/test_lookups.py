@@ -0,0 +1,136 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from model_bakery import baker
+
+from audit.models import Audit
+
+from . import lookups
+from .lookups import ShapedAudit
+from .runner import run_cross_validation
+
+
+def _make_sections():
+    return {
+        "sf_sac_sections": {
+            "general_information": {"auditee_uei": "AAA123456BBB"},
+            "federal_awards": {
+                "auditee_uei": "AAA123456BBB",
+                "federal_awards": [
+                    {
+                        "award_reference": "AWARD-0001",
+                        "program": {"number_of_audit_findings": 2},
+                    },
+                    {"program": {"number_of_audit_findings": 0}},
+                    {
+                        "award_reference": "AWARD-0003",
+                        "program": {"number_of_audit_findings": "1"},
+                    },
+                ],
+            },
+            "findings_uniform_guidance": {
+                "auditee_uei": "AAA123456BBB",
+                "findings_uniform_guidance_entries": [
+                    {
+                        "program": {"award_reference": "AWARD-0001"},
+                        "findings": {"reference_number": "2023-001"},
+                    },
+                    {
+                        "program": {"award_reference": "AWARD-0001"},
+                        "findings": {"reference_number": "2023-002"},
+                    },
+                    {
+                        "program": {"award_reference": "AWARD-0003"},
+                        "findings": {"reference_number": "2023-002"},
+                    },
+                ],
+            },
+            "notes_to_sefa": None,
+        },
+    }
+
+
+class LookupsTests(SimpleTestCase):
+    def test_lookups(self):
+        sac_dict = _make_sections()
+
+        self.assertEqual(
+            lookups.award_references(sac_dict), ("AWARD-0001", "AWARD-0003")
+        )
+        self.assertEqual(
+            lookups.finding_award_references(sac_dict),
+            ("AWARD-0001", "AWARD-0001", "AWARD-0003"),
+        )
+        self.assertEqual(
+            lookups.finding_reference_numbers(sac_dict), {"2023-001", "2023-002"}
+        )
+        self.assertEqual(lookups.auditee_ueis(sac_dict), ("AAA123456BBB",) * 3)
+        self.assertEqual(lookups.number_of_findings(sac_dict), 3)
+
+    def test_missing_sections(self):
+        sac_dict = {"sf_sac_sections": {"federal_awards": None}}
+
+        self.assertEqual(lookups.award_references(sac_dict), ())
+        self.assertEqual(lookups.finding_reference_numbers(sac_dict), frozenset())
+        self.assertEqual(lookups.number_of_findings(sac_dict), 0)
+
+    def test_shaped_audit_keeps_lookups(self):
+        """
+        A ShapedAudit works each lookup out once; a plain dict, every time
+        """
+        sac_dict = _make_sections()
+        shaped_audit = ShapedAudit(_make_sections())
+
+        self.assertEqual(shaped_audit, sac_dict)
+        self.assertIs(
+            lookups.award_references(shaped_audit),
+            lookups.award_references(shaped_audit),
+        )
+        self.assertIsNot(
+            lookups.award_references(sac_dict), lookups.award_references(sac_dict)
+        )
+
+
+class RunCrossValidationTests(SimpleTestCase):
+    def test_results_in_order_with_timings(self):
+        def first(sac_dict, sar=None):
+            return [{"error": "first"}]
+
+        def second(sac_dict, sar=None):
+            return [{"warning": "second"}, {"error": sar}]
+
+        results, timings = run_cross_validation(
+            ShapedAudit(), sar="sar", validation_functions=[first, second]
+        )
+
+        self.assertEqual(
+            results,
+            [{"error": "first"}, {"warning": "second"}, {"error": "sar"}],
+        )
+        self.assertEqual(list(timings), ["first", "second"])
+
+
+def _award_refs_declared(sac_dict, sar=None):
+    return [{"warning": lookups.award_references(sac_dict)}]
+
+
+@patch("audit.cross_validation.runner.functions", [_award_refs_declared])
+class AuditValidateTests(TestCase):
+    @patch("audit.models.audit.audit_validation_shape")
+    def test_audit_shaped_once(self, mock_shape):
+        mock_shape.side_effect = lambda audit: ShapedAudit(_make_sections())
+        audit = baker.make(Audit, version=0)
+
+        _, warnings = audit.validate()
+
+        mock_shape.assert_called_once_with(audit)
+        self.assertEqual(
+            warnings, {"warnings": [{"warning": ("AWARD-0001", "AWARD-0003")}]}
+        )
+
+    def test_cross_validation_timings(self):
+        audit = baker.make(Audit, version=0)
+
+        cross_result = audit._validate_cross()
+
+        self.assertEqual(list(cross_result["timings"]), ["_award_refs_declared"])
@@ -1,10 +1,8 @@
 from copy import deepcopy
-import json
-from django.conf import settings
-from jsonschema import FormatChecker, validate
 from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
 from django.core.exceptions import ValidationError
 from audit.cross_validation.naming import NC
+from audit.schema_registry import validate_section
 from audit.validators import validate_general_information_schema_rules
 from audit.utils import Util
 
@@ -66,8 +64,6 @@ def validate_general_information(sac_dict, *_args, **_kwargs):
     """
     all_sections = sac_dict["sf_sac_sections"]
     general_information = deepcopy(all_sections[NC.GENERAL_INFORMATION])
-    schema_path = settings.SECTION_SCHEMA_DIR / "GeneralInformationRequired.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
     # Removing extra fields from the general information (if any) to avoid
     # blocking submission of reports that were created prior to 'Util.remove_extra_fields' code change.
     # Patch can be removed in few months from 04/23/2024.
@@ -77,7 +73,9 @@ def validate_general_information(sac_dict, *_args, **_kwargs):
         return errors
     try:
         validate_general_information_schema_rules(patched_general_information)
-        validate(patched_general_information, schema, format_checker=FormatChecker())
+        validate_section(
+            "GeneralInformationRequired.schema.json", patched_general_information
+        )
     except JSONSchemaValidationError as err:
         return [{"error": f"General Information: {str(err)}"}]
     except ValidationError as err:
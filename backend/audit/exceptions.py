@@ -26,3 +26,26 @@ class AdministrativeOverrideError(Exception):
     """
 
     pass
+
+
+class DisseminationError(Exception):
+    """
+    Exception covering submissions that fail to disseminate, so that the
+    transitions made before dissemination are rolled back with it.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"Dissemination failed: {errors}")
+
+
+class StaleAuditError(Exception):
+    """
+    Exception covering updates to an audit that has been changed since it was
+    read, so that the update is not made over the other change.
+    """
+
+    def __init__(self, report_id, version):
+        self.report_id = report_id
+        self.version = version
+        super().__init__(f"{report_id} is no longer at version {version}")
@@ -1,11 +1,14 @@
 import logging
+from collections import defaultdict
+
 import pytz
 
 from django.forms import model_to_dict
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 
 from audit.intakelib.transforms.xform_resize_award_references import _format_reference
 from audit.models.constants import RESUBMISSION_STATUS, RESUBMISSION_ACTION
+from audit.models.utils import copy_rows
 from audit.utils import Util
 from dissemination.models import (
     AdditionalEin,
@@ -21,15 +24,79 @@ from dissemination.models import (
     SecondaryAuditor,
     Unified,
 )
+from dissemination.analytics.rollups import refresh_rollups, rollup_groups
+from dissemination.searchlib.search_cache import invalidate_search_cache
 
 logger = logging.getLogger(__name__)
 
 
+# Every table keyed by report_id that dissemination writes, General first.
+DISSEMINATION_MODELS = (
+    General,
+    FederalAward,
+    Finding,
+    FindingText,
+    CapText,
+    Note,
+    Passthrough,
+    AdditionalUei,
+    AdditionalEin,
+    SecondaryAuditor,
+    Resubmission,
+    Unified,
+)
+
+
 def omit(remove, d) -> dict:
     """omit(["a"], {"a":1, "b": 2}) => {"b": 2}"""
     return {k: d[k] for k in d if k not in remove}
 
 
+def delete_dissemination_objects(cursor, report_ids):
+    """
+    Delete the rows of every dissemination table for the report_ids, in one
+    statement. The foreign keys to General are deferred, so the order of the
+    deletes does not matter.
+    """
+    qn = connection.ops.quote_name
+    deletes = ", ".join(
+        f"d{i} AS (DELETE FROM {qn(model._meta.db_table)} WHERE "
+        f"{qn(model._meta.get_field('report_id').column)} = ANY(%s))"
+        for i, model in enumerate(DISSEMINATION_MODELS)
+    )
+    cursor.execute(
+        f"WITH {deletes} SELECT 1", [list(report_ids)] * len(DISSEMINATION_MODELS)
+    )
+
+
+def copy_dissemination_objects(loaded_objects, replace_report_ids=()):
+    """
+    Load dissemination objects, as IntakeToDissemination.load_all() returns
+    them, with one COPY per table, in one transaction. loaded_objects may hold
+    the objects of any number of reports.
+
+    The existing rows of replace_report_ids are deleted first, in the same
+    transaction, so readers see either the old rows or the new ones. Rows for
+    any other report that is already disseminated raise an IntegrityError,
+    and nothing is changed. The analytics rollups of the reports' years and
+    states are refreshed in the same transaction.
+    """
+    objects_by_model = defaultdict(list)
+    for object_list in loaded_objects.values():
+        for obj in object_list:
+            objects_by_model[type(obj)].append(obj)
+
+    report_ids = [general.report_id for general in objects_by_model[General]]
+    with transaction.atomic(), connection.cursor() as cursor:
+        rollup_groups_changed = rollup_groups(replace_report_ids)
+        if replace_report_ids:
+            delete_dissemination_objects(cursor, replace_report_ids)
+        for model in DISSEMINATION_MODELS:
+            if objects_by_model[model]:
+                copy_rows(cursor, model, objects_by_model[model])
+        refresh_rollups(rollup_groups_changed | rollup_groups(report_ids))
+
+
 class IntakeToDissemination(object):
     DISSEMINATION = "dissemination"
     PRE_CERTIFICATION_REVIEW = "pre_certification_review"
@@ -75,16 +142,24 @@ class IntakeToDissemination(object):
     def get_dissemination_objects(self):
         return self.loaded_objects
 
-    def save_dissemination_objects(self):
-        for key, object_list in self.loaded_objects.items():
-            try:
-                if object_list:
-                    model_class = type(object_list[0])
-                    model_class.objects.bulk_create(object_list)
-            except IntegrityError as e:
-                error = f"An error occurred during bulk creation for {key}: {e}"
-                logger.warning(error)
-                self.errors.append(error)
+    def save_dissemination_objects(self, replace=False):
+        """
+        Save the loaded objects with copy_dissemination_objects(). With
+        replace, the report's existing dissemination rows are deleted in the
+        same transaction; without it, saving a report that is already
+        disseminated records an error and saves nothing.
+        """
+        try:
+            copy_dissemination_objects(
+                self.loaded_objects, [self.report_id] if replace else ()
+            )
+        except IntegrityError as e:
+            error = f"An error occurred during bulk creation for {self.report_id}: {e}"
+            logger.warning(error)
+            self.errors.append(error)
+
+        # New dissemination rows change search results.
+        invalidate_search_cache()
 
     def load_finding_texts(self):
         findings_text = self.single_audit_checklist.findings_text
@@ -583,30 +658,19 @@ class IntakeToDissemination(object):
         gen = self.loaded_objects["Generals"][0]
         unifieds = []
 
-        for fed in self.loaded_objects["FederalAwards"]:
-            fins = [
-                fin
-                for fin in self.loaded_objects["Findings"]
-                if fin.award_reference == fed.award_reference
-            ]
-            pts = [
-                pt
-                for pt in self.loaded_objects["Passthroughs"]
-                if pt.award_reference == fed.award_reference
-            ]
+        # One row per award, finding, and passthrough of the award, or with
+        # None in place of the findings or passthroughs if it has none.
+        fins_by_award = defaultdict(list)
+        for fin in self.loaded_objects["Findings"]:
+            fins_by_award[fin.award_reference].append(fin)
+        pts_by_award = defaultdict(list)
+        for pt in self.loaded_objects["Passthroughs"]:
+            pts_by_award[pt.award_reference].append(pt)
 
-            if not fins and not pts:
-                unifieds.append(self._load_unified_helper(gen, fed, None, None))
-            elif fins and not pts:
-                for fin in fins:
-                    unifieds.append(self._load_unified_helper(gen, fed, fin, None))
-            elif pts and not fins:
-                for pt in pts:
-                    unifieds.append(self._load_unified_helper(gen, fed, None, pt))
-            else:
-                for fin in fins:
-                    for pt in pts:
-                        unifieds.append(self._load_unified_helper(gen, fed, fin, pt))
+        for fed in self.loaded_objects["FederalAwards"]:
+            for fin in fins_by_award.get(fed.award_reference) or [None]:
+                for pt in pts_by_award.get(fed.award_reference) or [None]:
+                    unifieds.append(self._load_unified_helper(gen, fed, fin, pt))
 
         self.loaded_objects["Unifieds"] = unifieds
 
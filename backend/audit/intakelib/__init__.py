@@ -1,5 +1,5 @@
 # flake8: noqa: F401
-from .intermediate_representation import extract_workbook_as_ir
+from .intermediate_representation import extract_workbook_as_ir, read_workbook
 
 from .mapping_additional_ueis import (
     extract_additional_ueis,
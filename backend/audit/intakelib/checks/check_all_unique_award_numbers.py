@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 def all_unique_award_numbers(ir):
     award_references = get_range_values_by_name(ir, "award_reference")
     errors = []
-    found = []
+    found = set()
     for index, award_ref in enumerate(award_references):
         if award_ref in found:
             errors.append(
@@ -30,5 +30,5 @@ def all_unique_award_numbers(ir):
                 )
             )
         if award_ref not in found:
-            found.append(award_ref)
+            found.add(award_ref)
     return errors
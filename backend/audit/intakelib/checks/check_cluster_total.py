@@ -5,7 +5,7 @@ from audit.intakelib.intermediate_representation import (
     get_range_values_by_name,
     get_range_by_name,
 )
-from audit.intakelib.common import get_message, build_cell_error_tuple
+from audit.intakelib.common import get_message, build_cell_error_tuple, sumifs
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,8 @@ def cluster_total_is_correct(ir):
     amounts_expended = get_range_values_by_name(ir, "amount_expended")
 
     errors = []
+    # Each cluster's total is needed once per award in the cluster.
+    sums = {}
 
     # Validating each cluster_total
     for idx, name in enumerate(cluster_names):
@@ -38,6 +40,7 @@ def cluster_total_is_correct(ir):
             state_cluster_names=state_cluster_names,
             cluster_names=cluster_names,
             amounts_expended=amounts_expended,
+            sums=sums,
         )
         if expected_value != cluster_totals[idx]:
             errors.append(
@@ -56,6 +59,7 @@ def cluster_total_is_correct(ir):
 
 def expected_cluster_total(**kwargs):
     # idx, name, uniform_other_cluster_names, uniform_state_cluster_names, state_cluster_names, cluster_names, amounts_expended
+    # and optionally sums, a dict shared between calls over the same awards.
     # Get the values from the kwargs
     idx = kwargs.get("idx")
     name = kwargs.get("name")
@@ -64,15 +68,16 @@ def expected_cluster_total(**kwargs):
     state_cluster_names = kwargs.get("state_cluster_names")
     cluster_names = kwargs.get("cluster_names")
     amounts_expended = kwargs.get("amounts_expended")
+    sums = kwargs.get("sums", {})
 
     # Based on the formula's conditions
     if name == settings.OTHER_CLUSTER:
-        expected_value = sum(
-            [
-                amount
-                for k, amount in zip(uniform_other_cluster_names, amounts_expended)
-                if k == uniform_other_cluster_names[idx]
-            ]
+        expected_value = sumifs(
+            sums,
+            "uniform_other_cluster_name",
+            uniform_other_cluster_names,
+            uniform_other_cluster_names[idx],
+            amounts_expended,
         )
     elif (
         name is None
@@ -84,16 +89,16 @@ def expected_cluster_total(**kwargs):
     ):
         expected_value = 0
     elif name == settings.STATE_CLUSTER:
-        expected_value = sum(
-            [
-                amount
-                for k, amount in zip(uniform_state_cluster_names, amounts_expended)
-                if k == uniform_state_cluster_names[idx]
-            ]
+        expected_value = sumifs(
+            sums,
+            "uniform_state_cluster_name",
+            uniform_state_cluster_names,
+            uniform_state_cluster_names[idx],
+            amounts_expended,
         )
     elif name:
-        expected_value = sum(
-            [amount for k, amount in zip(cluster_names, amounts_expended) if k == name]
+        expected_value = sumifs(
+            sums, "cluster_name", cluster_names, name, amounts_expended
         )
     else:
         expected_value = 0
@@ -3,7 +3,7 @@ from audit.intakelib.intermediate_representation import (
     get_range_values_by_name,
     get_range_by_name,
 )
-from audit.intakelib.common import get_message, build_cell_error_tuple
+from audit.intakelib.common import get_message, build_cell_error_tuple, sumifs
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +17,13 @@ def federal_program_total_is_correct(ir):
     amount_expended = get_range_values_by_name(ir, "amount_expended")
 
     errors = []
+    # Each program's total is needed once per award in the program.
+    sums = {}
 
     # Validating each federal_program_total
     for idx, key in enumerate(cfda_key):
         # Compute the sum for current cfda_key
-        computed_sum = sum(
-            [amount for k, amount in zip(cfda_key, amount_expended) if k == key]
-        )
+        computed_sum = sumifs(sums, "cfda_key", cfda_key, key, amount_expended)
         if computed_sum != federal_program_total[idx]:
             errors.append(
                 build_cell_error_tuple(
@@ -3,6 +3,9 @@ import logging
 
 # from .check_finding_uniqueness import check_finding_uniqueness
 from census_historical_migration.invalid_record import InvalidRecord
+from audit.intakelib.intermediate_representation import (
+    as_intermediate_representation,
+)
 
 from .check_finding_award_references_pattern import award_references_pattern
 from .check_cluster_names import check_cluster_names
@@ -176,6 +179,7 @@ def run_all_checks(
     If this is not a data migration, then we want to make sure no one put in a GSA_MIGRATION keyword.
     """
     errors = []
+    ir = as_intermediate_representation(ir)
 
     errors += run_section_check(ir, section_name)
     list_of_checks = filter_checks_for_data_migration(list_of_checks, is_data_migration)
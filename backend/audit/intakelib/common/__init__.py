@@ -12,4 +12,5 @@ from .util import (
     safe_int_conversion,
     list_contains_non_null_values,
     build_range_error_tuple,
+    sumifs,
 )
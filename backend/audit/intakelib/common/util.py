@@ -3,6 +3,7 @@ from .error_messages import messages
 import logging
 from audit.intakelib.intermediate_representation import (
     get_range_by_name,
+    get_sheet_name_by_range_name,
     replace_range_by_name,
 )
 from django.core.exceptions import ValidationError
@@ -31,12 +32,7 @@ def get_range_start_row(range):
 
 
 def get_sheet_name_from_range_name(ir, range_name):
-    for sheet in ir:
-        sheet_name = sheet["name"]
-        for range in sheet["ranges"]:
-            if range["name"] == range_name:
-                return sheet_name
-    return "Uknown sheet"
+    return get_sheet_name_by_range_name(ir, range_name) or "Uknown sheet"
 
 
 # [(col1, row1, field1, link1, help-text1), (col2, row2, ...), ...]
@@ -174,6 +170,18 @@ def safe_int_conversion(ir, range_name, other_values_allowed=None):
     return new_ir
 
 
+def sumifs(sums, column, keys, key, amounts):
+    """
+    SUMIFS(amounts, keys, key), remembered in sums under (column, key) so
+    that each key is summed once.
+    """
+    if (column, key) not in sums:
+        sums[(column, key)] = sum(
+            [amount for k, amount in zip(keys, amounts) if k == key]
+        )
+    return sums[(column, key)]
+
+
 # check if the given string can be converted to an int
 def is_int(s):
     try:
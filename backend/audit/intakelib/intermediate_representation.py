@@ -5,9 +5,50 @@ from .mapping_util import _open_workbook, _get_entries_by_path
 from .exceptions import ExcelExtractionError
 from .constants import SECTION_NAME
 from django.core.exceptions import ValidationError
+from openpyxl.utils import column_index_from_string
 
 logger = logging.getLogger(__name__)
 
+# Where read_workbook() keeps what it read on an uploaded file.
+READ_WORKBOOK_ATTRIBUTE = "_intake_read_workbook"
+
+
+class IntermediateRepresentation(list):
+    """
+    The IR: a list of sheets, as described in the README, with indexes of the
+    sheets and ranges by name.
+
+    An IR is never changed in place. replace_range_by_name() and the other
+    functions below return a new IR, which shares every sheet and range that
+    did not change with the IR it came from, so a transform costs the size of
+    the ranges it rewrites rather than a copy of the whole workbook.
+
+    Named ranges are unique within a workbook; where a plain list has
+    duplicates, the first one wins, as with the linear lookups.
+    """
+
+    def __init__(self, sheets=()):
+        super().__init__(sheets)
+        self.sheets_by_name = {}
+        self.ranges_by_name = {}
+        for sheet in self:
+            self.sheets_by_name.setdefault(sheet.get("name"), sheet)
+            for range in sheet.get("ranges", []):
+                self.ranges_by_name.setdefault(range.get("name"), (sheet, range))
+
+    def with_sheet(self, old_sheet, new_sheet):
+        """A new IR, with new_sheet in the place of old_sheet."""
+        return IntermediateRepresentation(
+            new_sheet if sheet is old_sheet else sheet for sheet in self
+        )
+
+
+def as_intermediate_representation(ir):
+    """Index an IR given as a plain list, e.g. one loaded from JSON."""
+    if isinstance(ir, IntermediateRepresentation):
+        return ir
+    return IntermediateRepresentation(ir)
+
 
 def _extract_generic_single_value(ir, name):
     """Extract a single value from the workbook with the defined name"""
@@ -75,18 +116,107 @@ def abs_ref_to_cell(ref, ndx):
         return None
 
 
-# cell obj, cell obj, worksheet name
-# FIXME. Not at all clear.
-# May want either unit tests and definitely documentation.
-# Unit tests are tricky, they need a workbook.
-def load_workbook_range(start_cell, end_cell, ws):
-    values = []
-    sc = f"${start_cell['column']}${start_cell['row']}"
-    ec = f"${end_cell['column']}${end_cell['row']}"
-    range_string = f"{sc}:{ec}"
-    for cell in ws[range_string]:
-        values.append(cell[0].value)
-    return values
+def read_workbook(file):
+    """
+    Open a workbook once, read-only, and read every defined name.
+
+    Returns (defined_names, values_by_name, data_lengths). defined_names is a
+    list of (name, attr_text, destination) in the workbook's order, where
+    destination is the (title, coord) of the name's first destination, or
+    None. values_by_name holds the values of every name whose destination is
+    a cell or range, read from the first column of the range, with one pass
+    over the rows of each worksheet. data_lengths is as for read_columns().
+
+    The result is kept on the file, so that validate_excel_file_integrity()
+    and the extractor share one parse of an upload.
+    """
+    read = getattr(file, READ_WORKBOOK_ATTRIBUTE, None)
+    if read is not None:
+        return read
+
+    workbook = _open_workbook(file)
+    try:
+        read = _read_defined_names(workbook)
+    finally:
+        # Close the archive held open by a read-only workbook we opened.
+        if workbook is not file:
+            workbook.close()
+
+    try:
+        setattr(file, READ_WORKBOOK_ATTRIBUTE, read)
+    except AttributeError:
+        # A path, which will be read again if extracted again.
+        pass
+    return read
+
+
+def _read_defined_names(workbook):
+    defined_names = []
+    columns_by_title = {}
+    for name in workbook.defined_names:
+        dn = workbook.defined_names[name]
+        destination = None
+        if "#ref" not in dn.attr_text.lower():
+            destination = next(dn.destinations, None)
+        defined_names.append((dn.name, dn.attr_text, destination))
+
+        if destination and is_cell_or_range_coord(destination[1]):
+            title, coord = destination
+            start_cell = abs_ref_to_cell(coord, 0)
+            end_cell = abs_ref_to_cell(coord, 1) or start_cell
+            columns_by_title.setdefault(title, {})[dn.name] = (
+                column_index_from_string(start_cell["column"]),
+                int(start_cell["row"]),
+                int(end_cell["row"]),
+            )
+
+    values_by_name = {}
+    data_lengths = {}
+    for title, columns in columns_by_title.items():
+        values, lengths = read_columns(workbook[title], columns)
+        values_by_name.update(values)
+        data_lengths.update(lengths)
+    return defined_names, values_by_name, data_lengths
+
+
+def read_columns(worksheet, columns):
+    """
+    Read ranges of a worksheet in one pass over its rows. columns maps each
+    range name to its (column index, first row, last row).
+
+    Returns (values_by_name, data_lengths): the values of each range, and the
+    number of them up to the last that does not appear empty, for
+    remove_null_rows().
+    """
+    min_row = min(first for _, first, _ in columns.values())
+    max_row = max(last for _, _, last in columns.values())
+    min_col = min(column for column, _, _ in columns.values())
+    max_col = max(column for column, _, _ in columns.values())
+    values_by_name = {name: [] for name in columns}
+    data_lengths = dict.fromkeys(columns, 0)
+
+    rows = worksheet.iter_rows(
+        min_row=min_row,
+        max_row=max_row,
+        min_col=min_col,
+        max_col=max_col,
+        values_only=True,
+    )
+    for row_number, row in enumerate(rows, min_row):
+        for name, (column, first, last) in columns.items():
+            if first <= row_number <= last:
+                ndx = column - min_col
+                value = row[ndx] if ndx < len(row) else None
+                values_by_name[name].append(value)
+                if value is not None and not appears_empty(value):
+                    data_lengths[name] = row_number - first + 1
+
+    # A read-only worksheet stops at its last row with data, and every cell
+    # after that is empty.
+    for name, (_, first, last) in columns.items():
+        values = values_by_name[name]
+        values.extend([None] * (last - first + 1 - len(values)))
+    return values_by_name, data_lengths
 
 
 def most_common(lst):
@@ -98,17 +228,14 @@ def appears_empty(v):
 
 
 def replace_range_by_name(ir, name, new_values):
-    new_ir = []
-    for sheet in ir:
-        new_ranges = []
-        for range in sheet["ranges"]:
-            if range["name"] == name:
-                logger.debug(f"Replacing range {name}")
-                range["values"] = new_values
-            new_ranges.append(range)
-        sheet["ranges"] = new_ranges
-        new_ir.append(sheet)
-    return new_ir
+    ir = as_intermediate_representation(ir)
+    if name not in ir.ranges_by_name:
+        return ir
+    logger.debug(f"Replacing range {name}")
+    sheet, old_range = ir.ranges_by_name[name]
+    new_range = {**old_range, "values": new_values}
+    new_ranges = [new_range if r is old_range else r for r in sheet["ranges"]]
+    return ir.with_sheet(sheet, {**sheet, "ranges": new_ranges})
 
 
 # FIXME: add comments
@@ -144,19 +271,67 @@ def _remove_null_rows(sheet, cutpoint):
             c["row"] = str(cutpoint + int(r["start_cell"]["row"]) - 1)
 
 
-# FIXME: add comments
-def remove_null_rows(sheet):
-    ok_rows = ranges_to_rows(sheet["ranges"])
-    return _remove_null_rows(sheet, len(ok_rows))
+def _data_length(values, end, start):
+    """
+    One past the last value in values[start:end] that does not appear empty,
+    or start if they all do.
+    """
+    for ndx in range(end - 1, start - 1, -1):
+        v = values[ndx]
+        if v is not None and not appears_empty(v):
+            return ndx + 1
+    return start
+
+
+def remove_null_rows(sheet, data_lengths=None):
+    """
+    Cut every range of the sheet after the last row in which any range has a
+    value that does not appear empty. As with ranges_to_rows(), only the rows
+    that every range has are kept.
+
+    data_lengths, from read_columns(), saves looking for the last value of
+    each range again; otherwise each range is scanned up from the bottom, and
+    only down to the cut found so far.
+    """
+    data_lengths = data_lengths or {}
+    ranges = sheet["ranges"]
+    row_count = min((len(r["values"]) for r in ranges), default=0)
+    cutpoint = 0
+    for r in ranges:
+        data_length = data_lengths.get(r.get("name"))
+        if data_length is not None and data_length <= row_count:
+            cutpoint = max(cutpoint, data_length)
+        else:
+            cutpoint = _data_length(r["values"], row_count, cutpoint)
+    return _remove_null_rows(sheet, cutpoint)
+
+
+def copy_sheet(sheet):
+    """
+    A copy of a sheet that can be changed in place, e.g. by remove_null_rows(),
+    without changing the IR it came from.
+    """
+    ranges = []
+    for range in sheet["ranges"]:
+        new_range = dict(range)
+        if range.get("end_cell"):
+            new_range["end_cell"] = dict(range["end_cell"])
+        ranges.append(new_range)
+    return {**sheet, "ranges": ranges}
 
 
 def get_sheet_by_name(sheets, name):
+    if isinstance(sheets, IntermediateRepresentation):
+        return sheets.sheets_by_name.get(name)
     for sheet in sheets:
         if sheet["name"] == name:
             return sheet
 
 
 def get_range_by_name(sheets, name):
+    if isinstance(sheets, IntermediateRepresentation):
+        sheet_and_range = sheets.ranges_by_name.get(name)
+        return sheet_and_range[1] if sheet_and_range else None
     for sheet in sheets:
         for range in sheet["ranges"]:
             if range["name"] == name:
@@ -164,19 +339,39 @@ def get_range_by_name(sheets, name):
     return None
 
 
+def get_sheet_name_by_range_name(sheets, name):
+    if isinstance(sheets, IntermediateRepresentation):
+        sheet_and_range = sheets.ranges_by_name.get(name)
+        return sheet_and_range[0]["name"] if sheet_and_range else None
+    for sheet in sheets:
+        for range in sheet["ranges"]:
+            if range["name"] == name:
+                return sheet["name"]
+    return None
+
+
 def insert_new_range(ir, sheet_name, range_name, column, row, values):
-    for sheet in ir:
-        if sheet["name"] == sheet_name:
-            range = {}
-            range["name"] = range_name
-            range["values"] = values
-            range["start_cell"] = {"column": column, "row": str(row)}
-            range["end_cell"] = {
-                "column": column,
-                "row": str(int(row) + len(values) - 1),
-            }
-            sheet["ranges"].append(range)
-    return ir
+    ir = as_intermediate_representation(ir)
+    sheet = ir.sheets_by_name.get(sheet_name)
+    if sheet is None:
+        return ir
+    range = {}
+    range["name"] = range_name
+    range["values"] = values
+    range["start_cell"] = {"column": column, "row": str(row)}
+    range["end_cell"] = {
+        "column": column,
+        "row": str(int(row) + len(values) - 1),
+    }
+    return ir.with_sheet(sheet, {**sheet, "ranges": sheet["ranges"] + [range]})
+
+
+def rename_sheet_by_name(ir, name, new_name):
+    ir = as_intermediate_representation(ir)
+    sheet = ir.sheets_by_name.get(name)
+    if sheet is None:
+        return ir
+    return ir.with_sheet(sheet, {**sheet, "name": new_name})
 
 
 def raise_modified_workbook(msg):
@@ -206,18 +401,13 @@ def get_range_values_by_name(sheets, name):
 
 
 def remove_range_by_name(ir, name):
-    new_ir = []
-    for sheet in ir:
-        new_ranges = []
-        for range in sheet["ranges"]:
-            if range["name"] == name:
-                logger.debug(f"Removing range {name}")
-                pass
-            else:
-                new_ranges.append(range)
-        sheet["ranges"] = new_ranges
-        new_ir.append(sheet)
-    return new_ir
+    ir = as_intermediate_representation(ir)
+    if name not in ir.ranges_by_name:
+        return ir
+    logger.debug(f"Removing range {name}")
+    sheet, old_range = ir.ranges_by_name[name]
+    new_ranges = [r for r in sheet["ranges"] if r is not old_range]
+    return ir.with_sheet(sheet, {**sheet, "ranges": new_ranges})
 
 
 def is_good_range_coord(s):
@@ -240,12 +430,12 @@ def is_cell_or_range_coord(s):
     return is_good_range_coord(s) or is_good_cell_coord(s)
 
 
-def process_destination(dn, title, coord, sheets_by_name, workbook):
+def process_destination(name, title, coord, sheets_by_name, values_by_name):
     """Process a destination for a defined name."""
     # Make sure this looks like a range string
     if is_cell_or_range_coord(coord):
         range = {}
-        range["name"] = dn.name
+        range["name"] = name
         # If it is a range, grab both parts
         if is_good_range_coord(coord):
             range["start_cell"] = abs_ref_to_cell(coord, 0)
@@ -256,10 +446,8 @@ def process_destination(dn, title, coord, sheets_by_name, workbook):
             range["start_cell"] = abs_ref_to_cell(coord, 0)
             range["end_cell"] = range["start_cell"]
 
-        # Grab the values for this range using the start/end values
-        range["values"] = load_workbook_range(
-            range["start_cell"], range["end_cell"], workbook[title]
-        )
+        # The values read for this range by read_workbook()
+        range["values"] = list(values_by_name[name])
 
         # Now, either append to a given sheet, or start a new sheet.
         if title in sheets_by_name:
@@ -269,22 +457,22 @@ def process_destination(dn, title, coord, sheets_by_name, workbook):
 
 
 def extract_workbook_as_ir(file):
-    workbook = _open_workbook(file)
+    defined_names, values_by_name, data_lengths = read_workbook(file)
     sheets_by_name = {}
 
-    for named_range_name in workbook.defined_names:
-        dn = workbook.defined_names[named_range_name]
+    for named_range_name, attr_text, destination in defined_names:
         # If the user mangles the workbook enough, we get #REF errors
-        if "#ref" in dn.attr_text.lower():
+        if "#ref" in attr_text.lower():
             logger.error(f"Workbook has #REF errors for {named_range_name}.")
             raise_modified_workbook(WORKBOOK_MODIFIED_ERROR)
+        elif destination is not None:
+            title, coord = destination
+            process_destination(
+                named_range_name, title, coord, sheets_by_name, values_by_name
+            )
         else:
-            try:
-                title, coord = next(dn.destinations)
-                process_destination(dn, title, coord, sheets_by_name, workbook)
-            except StopIteration:
-                logger.debug(f"No destinations found for {named_range_name}.")
-                # raise_modified_workbook(WORKBOOK_MODIFIED_ERROR)
+            logger.debug(f"No destinations found for {named_range_name}.")
+            # raise_modified_workbook(WORKBOOK_MODIFIED_ERROR)
 
     # Build the IR, which is a list of sheets.
     sheets = []
@@ -296,6 +484,6 @@ def extract_workbook_as_ir(file):
 
     # Remove all the Nones at the bottom of the sheets, since we have 10000 rows of formulas.
     for sheet in sheets:
-        remove_null_rows(sheet)
+        remove_null_rows(sheet, data_lengths)
 
-    return sheets
+    return IntermediateRepresentation(sheets)
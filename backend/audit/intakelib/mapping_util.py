@@ -62,7 +62,7 @@ def _open_workbook(file):
         return file
     else:
         wb = None
-        wb = load_workbook(filename=file, data_only=True)
+        wb = load_workbook(filename=file, read_only=True, data_only=True)
         return wb
 
 
@@ -1,5 +1,8 @@
 import logging
-from copy import deepcopy
+
+from audit.intakelib.intermediate_representation import (
+    as_intermediate_representation,
+)
 
 from .xform_clean_version_value import remove_equals_and_quotes
 
@@ -55,7 +58,9 @@ logger = logging.getLogger(__name__)
 
 
 def run_all_transforms(ir, list_of_xforms):
-    new_ir = deepcopy(ir)
+    # Transforms return a new IR rather than changing the one they are given,
+    # so there is no need to copy the IR first.
+    new_ir = as_intermediate_representation(ir)
     for fun in list_of_xforms:
         new_ir = fun(new_ir)
     return new_ir
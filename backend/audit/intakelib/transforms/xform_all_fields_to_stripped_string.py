@@ -1,5 +1,4 @@
 import logging
-from copy import deepcopy
 from audit.intakelib.intermediate_representation import (
     replace_range_by_name,
 )
@@ -10,7 +9,7 @@ logger = logging.getLogger(__name__)
 # DESCRIPTION
 # Strip all text fields of leading and trailing whitespace
 def convert_to_stripped_string(ir):
-    new_ir = deepcopy(ir)
+    new_ir = ir
     for sheet in ir:
         # To ensure backwards compatibility with NotesToSefa workbook 1.0.0 and 1.0.1, we check for both "AdditionalNotes" and "Form"
         if sheet["name"] in {"AdditionalNotes", "Form", "Coversheet"}:
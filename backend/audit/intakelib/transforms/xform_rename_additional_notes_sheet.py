@@ -1,5 +1,7 @@
 import logging
-from copy import deepcopy
+from audit.intakelib.intermediate_representation import (
+    rename_sheet_by_name,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -7,10 +9,4 @@ logger = logging.getLogger(__name__)
 # This transform is needed for backwards compatibility with NotesToSefa workbook 1.0.0 and 1.0.1
 # Once we deprecate those versions, we can remove this transform
 def rename_additional_notes_sheet_to_form_sheet(ir):
-    new_ir = deepcopy(ir)
-
-    for sheet in new_ir:
-        if sheet["name"] == "AdditionalNotes":
-            sheet["name"] = "Form"
-
-    return new_ir
+    return rename_sheet_by_name(ir, "AdditionalNotes", "Form")
@@ -1,5 +1,7 @@
 import logging
 from audit.intakelib.intermediate_representation import (
+    IntermediateRepresentation,
+    copy_sheet,
     remove_range_by_name,
     remove_null_rows,
 )
@@ -11,7 +13,8 @@ def trim_null_from_content_fields_in_notes_to_sefa(ir):
     # First, get rid of the sequence number column.
     without_seq_ir = remove_range_by_name(ir, "seq_number")
     # Now, remove extra nulls from content columns
-    for sheet in without_seq_ir:
+    sheets = [copy_sheet(sheet) for sheet in without_seq_ir]
+    for sheet in sheets:
         remove_null_rows(sheet)
 
-    return without_seq_ir
+    return IntermediateRepresentation(sheets)
@@ -0,0 +1,225 @@
+# A durable job queue on the application database.
+#
+# Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+# workers, on any number of instances, can poll the same table without two of
+# them claiming the same job. Claiming a job, doing its work and recording the
+# outcome are one transaction: if a worker dies part way through, the work is
+# rolled back, the row lock is released, and another worker picks the job up.
+# A job's work is in a savepoint, so that a failure rolls back the work but
+# still records the attempt.
+
+from datetime import timedelta
+import logging
+import os
+import socket
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+import newrelic.agent
+
+from audit.exceptions import DisseminationError
+from audit.models import Audit, Job, SingleAuditChecklist, User
+from audit.models.constants import STATUS, RESUBMISSION_STATUS
+from audit.models.utils import generate_audit_indexes
+from audit.models.viewflow import sac_transition
+from dissemination.remove_workbook_artifacts import remove_workbook_artifacts
+
+logger = logging.getLogger(__name__)
+
+# A failed job is tried again after this long, doubled for each attempt.
+RETRY_BACKOFF_SECS = 30
+
+HANDLERS = {}
+FAILURE_HANDLERS = {}
+
+
+def job_handler(action):
+    """Register the function that does the work of an action."""
+
+    def inner(func):
+        HANDLERS[action] = func
+        return func
+
+    return inner
+
+
+def job_failure_handler(action):
+    """
+    Register the function that cleans up after a job of an action that has
+    failed its last attempt.
+    """
+
+    def inner(func):
+        FAILURE_HANDLERS[action] = func
+        return func
+
+    return inner
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(report_id, action, payload=None, key=None):
+    """
+    Queue an action for a report, once per key, which defaults to the report
+    and action. If it is already queued or done, the existing Job is
+    returned. If it failed, or its handler skipped it (returning {"skipped":
+    ...}), it is queued again.
+    """
+    job, created = Job.objects.get_or_create(
+        idempotency_key=key or Job.key(report_id, action),
+        defaults={
+            "report_id": report_id,
+            "action": action,
+            "payload": payload or {},
+        },
+    )
+    requeue = Q(status=Job.Status.FAILED) | Q(
+        status=Job.Status.SUCCEEDED, result__has_key="skipped"
+    )
+    if not created and Job.objects.filter(requeue, pk=job.pk).update(
+        status=Job.Status.QUEUED,
+        attempts=0,
+        run_after=timezone.now(),
+        payload=payload or job.payload,
+        result=None,
+    ):
+        job.refresh_from_db()
+    return job
+
+
+def run_next_job(worker=None, job_id=None):
+    """
+    Claim and run the next queued job that is due, or only the job with
+    job_id. Returns the job, or None if there was nothing to claim: no job was
+    queued, or the others were locked by other workers.
+    """
+    worker = worker or default_worker_name()
+    with transaction.atomic():
+        queued = Job.objects.select_for_update(skip_locked=True).filter(
+            status=Job.Status.QUEUED
+        )
+        if job_id is None:
+            queued = queued.filter(run_after__lte=timezone.now())
+        else:
+            queued = queued.filter(pk=job_id)
+        job = queued.order_by("run_after", "id").first()
+        if job is None:
+            return None
+        _run(job, worker)
+    _record_metrics(job)
+    return job
+
+
+def _run(job, worker):
+    job.worker = worker
+    job.started_at = timezone.now()
+    job.attempts += 1
+    try:
+        with transaction.atomic():
+            job.result = HANDLERS[job.action](job)
+        job.status = Job.Status.SUCCEEDED
+        job.last_error = None
+    except Exception as err:
+        logger.error(f"Job {job} failed on attempt {job.attempts}", exc_info=err)
+        job.last_error = f"{type(err).__name__}: {err}"
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            _clean_up_failure(job)
+        else:
+            backoff = RETRY_BACKOFF_SECS * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=backoff)
+    job.finished_at = timezone.now()
+    job.save()
+
+
+def _clean_up_failure(job):
+    handler = FAILURE_HANDLERS.get(job.action)
+    if handler is None:
+        return
+    try:
+        with transaction.atomic():
+            handler(job)
+    except Exception as err:
+        logger.error(f"Cleaning up after job {job} failed", exc_info=err)
+
+
+def _record_metrics(job):
+    # The wait is from when the job was queued, or last due, to its start.
+    wait = (job.started_at - max(job.created_at, job.run_after)).total_seconds()
+    duration = (job.finished_at - job.started_at).total_seconds()
+    logger.info(
+        f"Job {job} ran on {job.worker} in {duration:.2f}s after waiting "
+        f"{max(wait, 0):.2f}s"
+    )
+    newrelic.agent.record_custom_metric(f"Custom/jobs/{job.action}/wait", max(wait, 0))
+    newrelic.agent.record_custom_metric(f"Custom/jobs/{job.action}/duration", duration)
+    newrelic.agent.record_custom_metric(f"Custom/jobs/{job.action}/{job.status}", 1)
+
+
+@job_handler(Job.Action.DISSEMINATE)
+def disseminate_submission(job):
+    """
+    Submit and disseminate a certified submission, and deprecate the report it
+    resubmits, if any. Submissions that are no longer waiting to be submitted
+    are skipped, so that the job is queued again when they are.
+    """
+    sac = SingleAuditChecklist.objects.select_for_update().get(report_id=job.report_id)
+    if sac.submission_status != STATUS.AUDITEE_CERTIFIED:
+        logger.warning(
+            f"Not disseminating {sac.report_id}, as it is {sac.submission_status}"
+        )
+        return {"skipped": sac.submission_status}
+
+    # sac_transition only needs the request for its user.
+    request = SimpleNamespace(
+        user=User.objects.filter(pk=job.payload.get("user_id")).first()
+    )
+    audit = Audit.objects.find_audit_or_none(report_id=sac.report_id)
+    previous_report_id = (sac.resubmission_meta or {}).get("previous_report_id")
+
+    sac_transition(request, sac, audit=audit, transition_to=STATUS.SUBMITTED)
+    disseminated = sac.disseminate()
+    # `disseminated` is None if there were no errors.
+    if disseminated is not None:
+        raise DisseminationError(disseminated["errors"])
+
+    # If this is a resubmission, deprecate the old version.
+    if previous_report_id:
+        _deprecate_previous_report(request, sac, previous_report_id)
+
+    if audit:
+        audit_indexes = generate_audit_indexes(audit)
+        audit.audit.update(audit_indexes)
+
+    sac_transition(request, sac, audit=audit, transition_to=STATUS.DISSEMINATED)
+
+    # Remove workbook artifacts once the dissemination is committed.
+    transaction.on_commit(lambda: remove_workbook_artifacts(sac))
+    return None
+
+
+def _deprecate_previous_report(request, sac, previous_report_id):
+    old_sac = SingleAuditChecklist.objects.get(report_id=previous_report_id)
+    old_resubmission_meta = getattr(old_sac, "resubmission_meta", {}) or {}
+    old_sac.resubmission_meta = {
+        **old_resubmission_meta,
+        "version": old_resubmission_meta.get("version", 1),
+        "resubmission_status": RESUBMISSION_STATUS.DEPRECATED,
+        "next_report_id": sac.report_id,
+        "next_row_id": sac.id,
+    }
+    old_audit = Audit.objects.find_audit_or_none(report_id=old_sac.report_id)
+
+    sac_transition(
+        request,
+        old_sac,
+        audit=old_audit,
+        transition_to=STATUS.RESUBMITTED,
+    )
+
+    old_sac.save()
+    old_sac.redisseminate()
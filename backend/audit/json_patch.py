@@ -0,0 +1,104 @@
+"""
+JSON Patch (RFC 6902) documents between two versions of a JSON document, as
+stored by History for the versions of an audit between snapshots.
+
+Only the add, remove and replace operations are made and applied. Lists are
+compared position by position: appended and removed items are added and
+removed at the end, and a list whose items have mostly changed is replaced.
+"""
+
+
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def pointer(*keys):
+    """The JSON Pointer to the value at the given keys, e.g. /a/0."""
+    return "".join(f"/{_escape(key)}" for key in keys)
+
+
+def make_patch(old, new):
+    """The operations that turn old into new."""
+    ops = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _diff(old, new, path, ops):
+    if old is new:
+        return
+    # Compared by type as well, as True == 1 and 1 == 1.0 in Python.
+    if type(old) is not type(new):
+        ops.append({"op": "replace", "path": path, "value": new})
+    elif isinstance(new, dict):
+        _diff_dicts(old, new, path, ops)
+    elif isinstance(new, list):
+        _diff_lists(old, new, path, ops)
+    elif old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_dicts(old, new, path, ops):
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+    for key, value in new.items():
+        if key in old:
+            _diff(old[key], value, f"{path}/{_escape(key)}", ops)
+        else:
+            ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+
+
+def _diff_lists(old, new, path, ops):
+    list_ops = []
+    common = min(len(old), len(new))
+    for i in range(common):
+        _diff(old[i], new[i], f"{path}/{i}", list_ops)
+    for i in range(common, len(new)):
+        list_ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+    # From the end, so that the indexes stay put.
+    for i in reversed(range(common, len(old))):
+        list_ops.append({"op": "remove", "path": f"{path}/{i}"})
+
+    if len(list_ops) > len(new):
+        ops.append({"op": "replace", "path": path, "value": new})
+    else:
+        ops.extend(list_ops)
+
+
+def apply_patch(doc, patch):
+    """
+    Apply the operations to doc, which is changed in place, and return the
+    result, which is a new value only if the whole document was replaced.
+    """
+    for op in patch:
+        if op["op"] not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported JSON Patch operation: {op['op']}")
+        if op["path"] == "":
+            if op["op"] == "remove":
+                raise ValueError("Cannot remove the whole document.")
+            doc = op["value"]
+            continue
+
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = doc
+        for token in parents:
+            target = target[int(token) if isinstance(target, list) else token]
+
+        if isinstance(target, list):
+            index = len(target) if last == "-" else int(last)
+            if op["op"] == "add":
+                target.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = op["value"]
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return doc
@@ -0,0 +1,69 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from audit.models import SingleAuditReportFile
+from audit.viewlib.compare_two_submissions import get_digests
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Record the SHA-256 and length of the single audit report PDFs uploaded
+    before these were recorded at upload. Each PDF is hashed as it downloads,
+    --workers at a time. Reports that cannot be downloaded are logged and
+    left for the next run.
+
+    Usage:
+    manage.py backfill_report_digests
+    manage.py backfill_report_digests --report_ids 2023-06-GSAFAC-0000000001
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--report_ids",
+            type=str,
+            nargs="+",
+            metavar="report_id",
+            help="Backfill only the reports of these submissions.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Number of PDFs downloaded at a time.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of reports read at a time.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = SingleAuditReportFile.objects.filter(sha256__isnull=True)
+        if options["report_ids"]:
+            queryset = queryset.filter(sac__report_id__in=options["report_ids"])
+
+        stats = {"reports": 0, "recorded": 0}
+        batch = []
+        for sar in queryset.order_by("id").iterator(chunk_size=options["batch_size"]):
+            batch.append(sar)
+            if len(batch) >= options["batch_size"]:
+                _backfill(batch, options["workers"], stats)
+                batch = []
+        _backfill(batch, options["workers"], stats)
+
+        logger.info(f"Backfilled report digests: {stats}")
+        self.stdout.write(
+            f"{stats['reports']} reports read, {stats['recorded']} digests recorded."
+        )
+
+
+def _backfill(batch, workers, stats):
+    if not batch:
+        return
+    digests = get_digests(batch, workers=workers)
+    stats["reports"] += len(batch)
+    stats["recorded"] += sum(1 for digest in digests if digest)
@@ -0,0 +1,199 @@
+import copy
+import json
+import math
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from audit.models import History
+from audit.models.constants import EventType
+
+User = get_user_model()
+
+FIXTURE_DIR = settings.BASE_DIR / "audit" / "fixtures" / "json"
+FEDERAL_AWARDS_FIXTURE_PATH = (
+    FIXTURE_DIR / "federal-awards--test0001test--simple-pass.json"
+)
+GENERAL_INFORMATION_FIXTURE_PATH = (
+    FIXTURE_DIR / "general-information--test0001test--simple-pass.json"
+)
+REPORT_IDS = {
+    "full": "2023-06-BNCHMK-0000000001",
+    "delta": "2023-06-BNCHMK-0000000002",
+}
+
+
+def synthetic_states(award_count, version_count):
+    """
+    The audit JSON after each of version_count changes, as a submission goes
+    through its sections: most change a few fields, and every tenth uploads
+    the federal awards workbook again with one more award.
+    """
+    general_information = json.loads(
+        GENERAL_INFORMATION_FIXTURE_PATH.read_text(encoding="utf-8")
+    )
+    section = json.loads(FEDERAL_AWARDS_FIXTURE_PATH.read_text(encoding="utf-8"))
+    award = section["FederalAwards"]["federal_awards"][0]
+
+    def awards(count):
+        result = []
+        for i in range(1, count + 1):
+            new_award = copy.deepcopy(award)
+            new_award["award_reference"] = f"AWARD-{i:04d}"
+            result.append(new_award)
+        return result
+
+    state = {
+        "general_information": general_information,
+        "federal_awards": {
+            "federal_awards": awards(award_count),
+            "total_amount_expended": 0,
+        },
+    }
+    states = [copy.deepcopy(state)]
+    for version in range(1, version_count):
+        if version % 10 == 0:
+            state["federal_awards"]["federal_awards"] = awards(
+                award_count + version // 10
+            )
+        else:
+            state["general_information"]["auditee_contact_name"] = f"Name {version}"
+            state["federal_awards"]["total_amount_expended"] = version * 1000
+        states.append(copy.deepcopy(state))
+    return states
+
+
+def stored_bytes(report_id):
+    """The bytes, as stored (compressed, if large), of a report's History."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT coalesce(sum(coalesce(pg_column_size(event_data), 0)
+                + coalesce(pg_column_size(patch), 0)), 0)
+            FROM audit_history WHERE report_id = %s
+            """,
+            [report_id],
+        )
+        return cursor.fetchone()[0]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def timed(func):
+    t0 = time.perf_counter()
+    func()
+    return (time.perf_counter() - t0) * 1000
+
+
+class Command(BaseCommand):
+    help = """
+    Records a synthetic audit's History both as full copies of the audit JSON
+    (as before) and as snapshots with JSON Patch deltas, then reports the
+    bytes stored, the time to record each state, and the time to read back a
+    version: a row for the full copies, History.objects.as_of() for the
+    deltas. Everything is rolled back afterwards.
+
+    Usage:
+    manage.py benchmark_audit_history
+    manage.py benchmark_audit_history --awards 500 --versions 100
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--awards",
+            type=int,
+            default=200,
+            help="Number of awards in the federal awards section.",
+        )
+        parser.add_argument(
+            "--versions",
+            type=int,
+            default=50,
+            help="Number of states recorded.",
+        )
+        parser.add_argument(
+            "--reads",
+            type=int,
+            default=50,
+            help="Number of versions read back, at random.",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["awards"], options["versions"], options["reads"]) < 1:
+            raise CommandError("--awards, --versions and --reads must be at least 1.")
+
+        states = synthetic_states(options["awards"], options["versions"])
+        versions = [
+            random.randrange(len(states)) for _ in range(options["reads"])  # nosec
+        ]
+        self.stdout.write(
+            f"{len(states)} versions of an audit with {options['awards']}+ awards, "
+            f"a snapshot every {settings.AUDIT_HISTORY_SNAPSHOT_INTERVAL}."
+        )
+        header = (
+            f"{'mode':<6} {'stored KB':>10} {'write p50':>10} {'write p95':>10} "
+            f"{'read p50':>9} {'read p95':>9}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        with transaction.atomic():
+            user = User.objects.create(username="benchmark_audit_history")
+            for mode, report_id in REPORT_IDS.items():
+                writes, reads = self._run(mode, report_id, user, states, versions)
+                self.stdout.write(
+                    f"{mode:<6} {stored_bytes(report_id) / 1024:>10.1f} "
+                    f"{percentile(writes, 50):>10.2f} {percentile(writes, 95):>10.2f} "
+                    f"{percentile(reads, 50):>9.2f} {percentile(reads, 95):>9.2f}"
+                )
+            transaction.set_rollback(True)
+        self.stdout.write("Times are in ms.")
+
+    def _run(self, mode, report_id, user, states, versions):
+        writes, reads = [], []
+        for version, state in enumerate(states):
+            fields = {
+                "event": EventType.FEDERAL_AWARDS_UPDATED,
+                "report_id": report_id,
+                "version": version,
+                "updated_by": user,
+            }
+            if mode == "full":
+                writes.append(
+                    timed(
+                        lambda: History.objects.create(
+                            audit_state=History.State.SNAPSHOT,
+                            event_data=state,
+                            **fields,
+                        )
+                    )
+                )
+            else:
+                writes.append(
+                    timed(
+                        lambda: History.objects.create_audit_state(
+                            audit_data=state, **fields
+                        )
+                    )
+                )
+
+        for version in versions:
+            if mode == "full":
+                read = History.objects.filter(
+                    report_id=report_id, version=version
+                ).values_list("event_data", flat=True)
+                reads.append(timed(lambda: read.first()))
+            else:
+                reads.append(timed(lambda: History.objects.as_of(report_id, version)))
+            if History.objects.as_of(report_id, version) != states[version]:
+                raise CommandError(f"Version {version} was not read back as written.")
+        return writes, reads
@@ -0,0 +1,148 @@
+import copy
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from jsonschema import Draft7Validator, FormatChecker, validate
+from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
+
+from audit import schema_registry
+from audit.validators import validate_federal_award_json
+
+FIXTURE_DIR = settings.BASE_DIR / "audit" / "fixtures" / "json"
+FIXTURE_PATH = FIXTURE_DIR / "federal-awards--test0001test--simple-pass.json"
+GENERAL_INFORMATION_FIXTURE_PATH = (
+    FIXTURE_DIR / "general-information--test0001test--simple-pass.json"
+)
+
+
+def large_federal_awards(award_count):
+    """
+    The simple-pass federal awards fixture, with its award repeated
+    award_count times under distinct award references.
+    """
+    section = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    award = section["FederalAwards"]["federal_awards"][0]
+    awards = []
+    for i in range(1, award_count + 1):
+        new_award = copy.deepcopy(award)
+        new_award["award_reference"] = f"AWARD-{i:04d}"
+        awards.append(new_award)
+    section["FederalAwards"]["federal_awards"] = awards
+    return section
+
+
+def uncached_federal_award_errors(value):
+    """
+    What validate_federal_award_json did before the schema registry: read,
+    parse, and compile the schema on every call.
+    """
+    schema_path = settings.SECTION_SCHEMA_DIR / "FederalAwards.schema.json"
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    validator = Draft7Validator(schema)
+    return list(validator.iter_errors(value))
+
+
+def uncached_general_information_validate(value):
+    """
+    What the general information cross-validation did before the schema
+    registry: jsonschema.validate(), which also checks the schema itself.
+    """
+    schema_path = settings.SECTION_SCHEMA_DIR / "GeneralInformationRequired.schema.json"
+    schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    try:
+        validate(value, schema, format_checker=FormatChecker())
+    except JSONSchemaValidationError:
+        pass
+
+
+def cached_general_information_validate(value):
+    try:
+        schema_registry.validate_section(
+            "GeneralInformationRequired.schema.json", value
+        )
+    except JSONSchemaValidationError:
+        pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = """
+    Times validating a large federal awards section, and a general information
+    section, against their JSON Schemas. Each is validated compiling the
+    schema on every call (as before the schema registry) and with the cached
+    validator, and p50/p95 are reported per mode.
+
+    Usage:
+    manage.py benchmark_section_validation
+    manage.py benchmark_section_validation --awards 5000 --iterations 5
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--awards",
+            type=int,
+            default=2000,
+            help="Number of awards in the federal awards section.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Number of times to validate in each mode.",
+        )
+
+    def handle(self, *args, **options):
+        if options["awards"] < 1 or options["iterations"] < 1:
+            raise CommandError("--awards and --iterations must be at least 1.")
+
+        section = large_federal_awards(options["awards"])
+        general_information = json.loads(
+            GENERAL_INFORMATION_FIXTURE_PATH.read_text(encoding="utf-8")
+        )
+        modes = [
+            (
+                "federal_awards",
+                "uncached",
+                lambda: uncached_federal_award_errors(section),
+            ),
+            ("federal_awards", "cached", lambda: validate_federal_award_json(section)),
+            (
+                "general_info",
+                "uncached",
+                lambda: uncached_general_information_validate(general_information),
+            ),
+            (
+                "general_info",
+                "cached",
+                lambda: cached_general_information_validate(general_information),
+            ),
+        ]
+        # Start the cached mode cold, so its first call includes compiling.
+        schema_registry.clear()
+
+        self.stdout.write(f"federal_awards has {options['awards']} awards.")
+        header = (
+            f"{'section':<15} {'mode':<10} {'first ms':>9} {'p50 ms':>9} {'p95 ms':>9}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for section_name, mode, run in modes:
+            timings = []
+            for _ in range(options["iterations"]):
+                t0 = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - t0) * 1000)
+            self.stdout.write(
+                f"{section_name:<15} {mode:<10} {timings[0]:>9.1f} "
+                f"{percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}"
+            )
@@ -0,0 +1,124 @@
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from audit.fixtures.excel import FORM_SECTIONS
+from audit.intakelib.checks import (
+    run_all_federal_awards_checks,
+    run_all_general_checks,
+)
+from audit.intakelib.transforms import run_all_federal_awards_transforms
+
+FIXTURE_PATH = (
+    settings.BASE_DIR
+    / "audit"
+    / "fixtures"
+    / "workbooks"
+    / "should_pass"
+    / "100010-22"
+    / "federal-awards-100010.json"
+)
+
+# Workbooks from 1.1.0 on may hold up to MAX_ROWS awards.
+WORKBOOK_VERSION = "1.1.0"
+
+# Totals of amounts, which grow with the number of copies of the awards.
+SCALED_TOTALS = {"federal_program_total", "cluster_total", "total_amount_expended"}
+
+
+def large_federal_awards_ir(row_count):
+    """
+    The IR of a passing federal awards workbook, with its awards copied as
+    many whole times as fit in row_count rows. Award references are
+    renumbered, and totals scaled, so that the workbook still passes every
+    check.
+    """
+    ir = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    form = next(sheet for sheet in ir if sheet["name"] == "Form")
+    copies = max(1, row_count // len(form["ranges"][0]["values"]))
+    for sheet in ir:
+        for named_range in sheet["ranges"]:
+            if named_range["name"] in SCALED_TOTALS:
+                named_range["values"] = [
+                    v * copies if v else v for v in named_range["values"]
+                ]
+            elif named_range["name"] == "version":
+                named_range["values"] = [WORKBOOK_VERSION]
+
+    for named_range in form["ranges"]:
+        values = named_range["values"] * copies
+        if named_range["name"] == "award_reference":
+            values = [f"AWARD-{i:05d}" for i in range(1, len(values) + 1)]
+        named_range["values"] = values
+        start_row = int(named_range["start_cell"]["row"])
+        named_range["end_cell"]["row"] = str(start_row + len(values) - 1)
+    return ir
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = """
+    Times the intake pipeline (general checks, transforms, and federal awards
+    checks) on the IR of a federal awards workbook with up to MAX_ROWS awards,
+    and reports p50/p95 per stage.
+
+    Usage:
+    manage.py benchmark_workbook_intake
+    manage.py benchmark_workbook_intake --rows 5000 --iterations 5
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=settings.MAX_ROWS,
+            help="Number of award rows in the workbook.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Number of times to run the pipeline.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["iterations"] < 1:
+            raise CommandError("--rows and --iterations must be at least 1.")
+
+        ir = large_federal_awards_ir(options["rows"])
+        award_count = len(ir[0]["ranges"][0]["values"])
+        timings = {"general_checks": [], "transforms": [], "award_checks": []}
+        for _ in range(options["iterations"]):
+            t0 = time.perf_counter()
+            run_all_general_checks(ir, FORM_SECTIONS.FEDERAL_AWARDS)
+            t1 = time.perf_counter()
+            new_ir = run_all_federal_awards_transforms(ir)
+            t2 = time.perf_counter()
+            try:
+                run_all_federal_awards_checks(new_ir)
+            except ValidationError as err:
+                raise CommandError(f"The workbook failed its checks: {err}")
+            t3 = time.perf_counter()
+            timings["general_checks"].append((t1 - t0) * 1000)
+            timings["transforms"].append((t2 - t1) * 1000)
+            timings["award_checks"].append((t3 - t2) * 1000)
+
+        self.stdout.write(f"federal_awards has {award_count} awards.")
+        header = f"{'stage':<15} {'p50 ms':>9} {'p95 ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for stage, stage_timings in timings.items():
+            self.stdout.write(
+                f"{stage:<15} {percentile(stage_timings, 50):>9.1f} "
+                f"{percentile(stage_timings, 95):>9.1f}"
+            )
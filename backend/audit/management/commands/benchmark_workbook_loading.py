@@ -0,0 +1,110 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from openpyxl import load_workbook
+
+from audit.intakelib.intermediate_representation import (
+    abs_ref_to_cell,
+    extract_workbook_as_ir,
+    is_cell_or_range_coord,
+    read_workbook,
+)
+
+DEFAULT_PATHS = [
+    settings.BASE_DIR / "audit" / "fixtures",
+    settings.BASE_DIR / "cypress" / "fixtures" / "test_workbooks",
+    settings.BASE_DIR / "schemas" / "output" / "excel" / "xlsx",
+]
+
+
+def workbook_paths(paths):
+    """The .xlsx files at each path, or under it if it is a directory."""
+    found = []
+    for path in map(Path, paths):
+        found += sorted(path.rglob("*.xlsx")) if path.is_dir() else [path]
+    return found
+
+
+def legacy_load(path):
+    """
+    What an upload cost before read_workbook(): a full load for the integrity
+    check, then a second full load with data_only=True, sliced range by range.
+    """
+    load_workbook(filename=path)
+    workbook = load_workbook(filename=path, data_only=True)
+    for name in workbook.defined_names:
+        dn = workbook.defined_names[name]
+        if "#ref" in dn.attr_text.lower():
+            continue
+        destination = next(dn.destinations, None)
+        if destination and is_cell_or_range_coord(destination[1]):
+            title, coord = destination
+            start_cell = abs_ref_to_cell(coord, 0)
+            end_cell = abs_ref_to_cell(coord, 1) or start_cell
+            cells = workbook[title][
+                f"${start_cell['column']}${start_cell['row']}:"
+                f"${end_cell['column']}${end_cell['row']}"
+            ]
+            [cell[0].value for cell in cells]
+
+
+def read_only_load(path):
+    """
+    An upload now: one read-only pass, shared by the integrity check and the
+    extractor.
+    """
+    with open(path, "rb") as file:
+        read_workbook(file)
+        try:
+            extract_workbook_as_ir(file)
+        except Exception:
+            # e.g. a workbook with #REF errors; it has still been read.
+            pass
+
+
+class Command(BaseCommand):
+    help = """
+    Loads each test workbook as an upload did before (a full load for the
+    integrity check, then a second full load sliced range by range) and with
+    the read-only, single-pass loader, and reports the elapsed time and the
+    peak Python memory allocated for each. Memory is measured with tracemalloc
+    in a second, untimed load.
+
+    Usage:
+    manage.py benchmark_workbook_loading
+    manage.py benchmark_workbook_loading --paths schemas/output/excel/xlsx
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=DEFAULT_PATHS,
+            help="Workbooks, or directories of workbooks, to load.",
+        )
+
+    def handle(self, *args, **options):
+        paths = workbook_paths(options["paths"])
+        if not paths:
+            raise CommandError("No .xlsx workbooks found.")
+
+        header = f"{'workbook':<48} {'mode':<10} {'ms':>8} {'peak MB':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for path in paths:
+            for mode, load in [("legacy", legacy_load), ("read_only", read_only_load)]:
+                # Timed without tracemalloc, which slows allocation down.
+                t0 = time.perf_counter()
+                load(path)
+                elapsed = time.perf_counter() - t0
+                tracemalloc.start()
+                load(path)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"{path.name[:48]:<48} {mode:<10} "
+                    f"{elapsed * 1000:>8.0f} {peak / 2**20:>8.1f}"
+                )
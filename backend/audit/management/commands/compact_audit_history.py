@@ -0,0 +1,138 @@
+import copy
+import json
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from audit.json_patch import apply_patch, make_patch
+from audit.models import History
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ["audit_state", "event_data", "patch"]
+
+
+class Command(BaseCommand):
+    """
+    Compact the History rows that record the states of audits, which were each
+    a full copy of the audit JSON: every AUDIT_HISTORY_SNAPSHOT_INTERVAL-th
+    state is kept as a snapshot, and the rest are rewritten as JSON Patches
+    from the state before, as they are now recorded. Rows already in that
+    form are left alone, so the command can be run again safely.
+
+    With --expand, every state is rewritten as a full snapshot instead, as
+    needed before migrating audit back past 0039_history_audit_state.
+
+    The space freed is only returned to the database by VACUUM.
+
+    Usage:
+    manage.py compact_audit_history
+    manage.py compact_audit_history --report_ids 2023-06-GSAFAC-0000000001
+    manage.py compact_audit_history --expand
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--report_ids",
+            type=str,
+            nargs="+",
+            metavar="report_id",
+            help="Compact only the history of these audits.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of audits compacted per transaction.",
+        )
+        parser.add_argument(
+            "--expand",
+            action="store_true",
+            help="Rewrite every state as a full snapshot.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        interval = 1 if options["expand"] else settings.AUDIT_HISTORY_SNAPSHOT_INTERVAL
+
+        states = History.objects.filter(audit_state__isnull=False)
+        if options["report_ids"]:
+            states = states.filter(report_id__in=options["report_ids"])
+        report_ids = states.values_list("report_id", flat=True).distinct()
+
+        stats = {"audits": 0, "states": 0, "rewritten": 0, "before": 0, "after": 0}
+        last_report_id = ""
+        while batch := list(
+            report_ids.filter(report_id__gt=last_report_id).order_by("report_id")[
+                : options["batch_size"]
+            ]
+        ):
+            _compact(states.filter(report_id__in=batch), interval, stats)
+            stats["audits"] += len(batch)
+            last_report_id = batch[-1]
+
+        logger.info(f"Compacted audit history: {stats}")
+        self.stdout.write(
+            f"{stats['audits']} audits, {stats['states']} states read, "
+            f"{stats['rewritten']} rewritten. Stored JSON went from "
+            f"{stats['before']:,} to {stats['after']:,} bytes."
+        )
+
+
+def _compact(states, interval, stats):
+    with transaction.atomic():
+        rows = list(
+            states.select_for_update()
+            .order_by("report_id", "version", "id")
+            .only("id", "report_id", *FIELDS)
+        )
+        rewritten = []
+        chain, previous, previous_report_id = 0, None, None
+        for row in rows:
+            if row.report_id != previous_report_id:
+                chain, previous, previous_report_id = 0, None, row.report_id
+            state = _state(row, previous)
+            stats["before"] += _stored_size(row)
+            if _rewrite(row, chain, state, previous, interval):
+                rewritten.append(row)
+            stats["after"] += _stored_size(row)
+            chain, previous = chain + 1, state
+
+        History.objects.bulk_update(rewritten, FIELDS, batch_size=500)
+        stats["states"] += len(rows)
+        stats["rewritten"] += len(rewritten)
+
+
+def _state(row, previous):
+    """The audit JSON that the row records, given the state before it."""
+    if row.audit_state == History.State.SNAPSHOT:
+        return row.event_data
+    return apply_patch(copy.deepcopy(previous), row.patch)
+
+
+def _rewrite(row, chain, state, previous, interval):
+    """
+    Make the row the chain-th state of its audit, as a snapshot or a delta.
+    Returns whether it changed.
+    """
+    if chain % interval == 0:
+        if row.audit_state == History.State.SNAPSHOT:
+            return False
+        row.audit_state, row.event_data, row.patch = History.State.SNAPSHOT, state, None
+        return True
+    if row.audit_state == History.State.DELTA:
+        return False
+    row.audit_state = History.State.DELTA
+    row.event_data, row.patch = None, make_patch(previous, state)
+    return True
+
+
+def _stored_size(row):
+    return sum(
+        len(json.dumps(value))
+        for value in (row.event_data, row.patch)
+        if value is not None
+    )
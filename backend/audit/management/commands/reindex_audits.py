@@ -0,0 +1,115 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import F, Value
+
+from audit.models import Audit
+from audit.models.constants import STATUS
+from audit.models.utils import JsonbMerge, generate_audit_indexes
+
+logger = logging.getLogger(__name__)
+
+INDEXED_KEYS = [
+    "audit_year",
+    "cognizant_agency",
+    "oversight_agency",
+    "fy_end_month",
+    "is_public",
+    "search_indexes",
+    "index_hashes",
+]
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the search indexes of disseminated Audits. Only the index fragments
+    whose audit sections have changed since they were built are rebuilt, and
+    cog/over is only worked out again when its inputs have changed, unless
+    --full is given. Audits whose indexes are unchanged are not written.
+
+    The indexes are derived data, so this records no History, but it does bump
+    the Audit's version, which clients rely on (as the audit API's ETag) to
+    tell that the audit JSON changed. Only the indexed keys are written, and
+    only if the Audit is still at the version it was read at; Audits changed
+    meanwhile are left for the next run.
+
+    Usage:
+    manage.py reindex_audits
+    manage.py reindex_audits --report_ids 2023-06-GSAFAC-0000000001 --full
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--report_ids",
+            type=str,
+            nargs="+",
+            metavar="report_id",
+            help="Reindex only these audits.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild every fragment and cog/over, ignoring the stored hashes.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of audits read and written at a time.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Audit.objects.filter(submission_status=STATUS.DISSEMINATED)
+        if options["report_ids"]:
+            queryset = queryset.filter(report_id__in=options["report_ids"])
+
+        stats = {"audits": 0, "written": 0, "changed": 0, "rebuilt": {}}
+        batch = []
+        for audit in queryset.order_by("id").iterator(chunk_size=options["batch_size"]):
+            stats["audits"] += 1
+            if _reindex(audit, options["full"], stats["rebuilt"]):
+                batch.append(audit)
+            if len(batch) >= options["batch_size"]:
+                _write(batch, stats)
+                batch = []
+        _write(batch, stats)
+
+        logger.info(f"Reindexed audits: {stats}")
+        self.stdout.write(
+            f"{stats['audits']} audits read, {stats['written']} written, "
+            f"{stats['changed']} changed while reindexing. Rebuilt: "
+            + ", ".join(f"{name} {n}" for name, n in sorted(stats["rebuilt"].items()))
+        )
+
+
+def _reindex(audit, full, rebuilt):
+    """
+    Update the audit's indexes in place, counting each fragment rebuilt.
+    Returns whether any indexed value changed.
+    """
+    previous = {key: audit.audit.get(key) for key in INDEXED_KEYS}
+    indexes = generate_audit_indexes(audit, previous=None if full else audit.audit)
+
+    previous_hashes = previous["index_hashes"] or {}
+    for name, digest in indexes["index_hashes"].items():
+        if full or previous_hashes.get(name) != digest:
+            rebuilt[name] = rebuilt.get(name, 0) + 1
+
+    audit.audit.update(indexes)
+    return any(previous[key] != indexes[key] for key in INDEXED_KEYS)
+
+
+def _write(audits, stats):
+    """
+    Set the indexed keys of each audit that is still at the version it was
+    read at, counting those written and those changed since.
+    """
+    with transaction.atomic():
+        for audit in audits:
+            indexes = {key: audit.audit[key] for key in INDEXED_KEYS}
+            written = Audit.objects.filter(pk=audit.pk, version=audit.version).update(
+                audit=JsonbMerge(F("audit"), Value(indexes, models.JSONField())),
+                version=F("version") + 1,
+            )
+            stats["written" if written else "changed"] += 1
@@ -0,0 +1,123 @@
+import logging
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from audit.jobs import default_worker_name, run_next_job
+from audit.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Run queued jobs, such as disseminating submissions, until stopped. Any
+    number of these can run at once, on any number of instances; each job is
+    run by one of them. Each runs --concurrency jobs at once (by default,
+    JOBS_WORKER_CONCURRENCY), each on its own thread and database connection.
+    When there are no jobs due, a thread waits JOBS_POLL_INTERVAL_SECS before
+    looking again. On SIGTERM or SIGINT, the jobs in hand are finished before
+    exiting.
+
+    Usage:
+    manage.py run_jobs
+    manage.py run_jobs --burst
+    manage.py run_jobs --concurrency 8
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no jobs due, instead of waiting for more.",
+        )
+        parser.add_argument(
+            "--worker",
+            type=str,
+            default=None,
+            help="The name recorded on the jobs this runs. Defaults to host:pid.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Number of jobs run at once. Defaults to JOBS_WORKER_CONCURRENCY.",
+        )
+
+    def handle(self, *args, **options):
+        worker = options["worker"] or default_worker_name()
+        concurrency = options["concurrency"] or settings.JOBS_WORKER_CONCURRENCY
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        self.stopping = False
+        self.errors = []
+        self.lock = threading.Lock()
+        # Signal handlers can only be set from the main thread.
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, self._stop)
+
+        stats = {status: 0 for status, _ in Job.STATUS_CHOICES}
+        start = time.monotonic()
+        if concurrency == 1:
+            self._work(worker, options["burst"], stats)
+        else:
+            threads = [
+                threading.Thread(
+                    target=self._work_in_thread,
+                    args=(f"{worker}/{i}", options["burst"], stats),
+                    name=f"run_jobs-{i}",
+                )
+                for i in range(concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                # With a timeout, so that signals are handled meanwhile.
+                while thread.is_alive():
+                    thread.join(timeout=1)
+
+        elapsed = time.monotonic() - start
+        ran = sum(stats.values())
+        logger.info(f"Worker {worker} ran {ran} jobs in {elapsed:.2f}s: {stats}")
+        self.stdout.write(
+            f"{worker}: {ran} jobs in {elapsed:.2f}s "
+            f"({ran / elapsed if elapsed else 0:.2f} jobs/s); "
+            + ", ".join(f"{status} {n}" for status, n in stats.items())
+        )
+        if self.errors:
+            raise CommandError(f"A job thread stopped: {self.errors[0]}")
+
+    def _work(self, worker, burst, stats):
+        while not self.stopping:
+            close_old_connections()
+            job = run_next_job(worker=worker)
+            if job is not None:
+                with self.lock:
+                    stats[job.status] += 1
+            elif burst:
+                break
+            else:
+                time.sleep(settings.JOBS_POLL_INTERVAL_SECS)
+
+    def _work_in_thread(self, worker, burst, stats):
+        """
+        _work(), stopping every thread if this one fails, so that the process
+        exits and is restarted rather than running on with fewer threads.
+        """
+        try:
+            self._work(worker, burst, stats)
+        except Exception as err:
+            logger.error(f"Job thread {worker} failed", exc_info=err)
+            self.errors.append(err)
+            self.stopping = True
+        finally:
+            connections.close_all()
+
+    def _stop(self, signum, _frame):
+        logger.info(f"Received signal {signum}; stopping after the current jobs")
+        self.stopping = True
@@ -0,0 +1,68 @@
+import audit.models.utils
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0034_remove_singleauditreportfile_keep_previous_report"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # This custom function is needed for the search_names_text generated
+        # column. array_to_string is only STABLE, so it has to be wrapped in an
+        # IMMUTABLE function to be usable in a generated column.
+        migrations.RunSQL(
+            sql="""
+                    CREATE OR REPLACE FUNCTION json_array_to_text (data jsonb)
+                        RETURNS text
+                        AS $CODE$
+                    BEGIN
+                        RETURN array_to_string(ARRAY (
+                            SELECT
+                                jsonb_array_elements_text(data)), ' ');
+                    END
+                    $CODE$
+                    LANGUAGE plpgsql
+                    IMMUTABLE;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS json_array_to_text (jsonb);",
+        ),
+        migrations.AddField(
+            model_name="audit",
+            name="search_names_text",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=audit.models.utils.JsonArrayToText(
+                    "audit__search_indexes__search_names"
+                ),
+                output_field=models.TextField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="audit",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("search_names_text"),
+                    name="gin_trgm_ops",
+                ),
+                name="audit_search_names_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="audit",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["agency_prefixes"], name="audit_agency_prefixes_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="audit",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["agency_extensions"], name="audit_agency_extensions_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-18 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0035_audit_search_names_text_and_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="singleauditreportfile",
+            name="sha256",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="singleauditreportfile",
+            name="size",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.16 on 2026-10-18 23:01
+
+import audit.models.upload
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0037_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="job",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("disseminate", "Disseminate"),
+                    ("validate_upload", "Validate upload"),
+                ],
+                max_length=40,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="idempotency_key",
+            field=models.CharField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="report_id",
+            field=models.CharField(),
+        ),
+        migrations.CreateModel(
+            name="Upload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("form_section", models.CharField(max_length=255)),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True, upload_to=audit.models.upload.upload_path
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("validating", "Validating"),
+                            ("accepted", "Accepted"),
+                            ("rejected", "Rejected"),
+                            ("error", "Error"),
+                        ],
+                        default="validating",
+                        max_length=20,
+                    ),
+                ),
+                ("stages", models.JSONField(blank=True, default=dict)),
+                ("result", models.JSONField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "sac",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="audit.singleauditchecklist",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.16 on 2026-10-18 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0038_upload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="history",
+            name="audit_state",
+            field=models.CharField(
+                blank=True,
+                choices=[("snapshot", "Snapshot"), ("delta", "Delta")],
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="history",
+            name="patch",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="history",
+            name="event_data",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        # Until they are compacted, the rows that record an audit's state are
+        # the snapshots that Audit.save() wrote, of its whole audit JSON.
+        migrations.RunSQL(
+            sql="""
+                UPDATE audit_history
+                SET audit_state = 'snapshot'
+                WHERE event_data ? 'general_information';
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="history",
+            index=models.Index(
+                condition=models.Q(("audit_state__isnull", False)),
+                fields=["report_id", "version", "id"],
+                name="history_audit_state_idx",
+            ),
+        ),
+    ]
@@ -20,7 +20,9 @@ from .models import (
 )
 from .audit import Audit
 from .history import History
+from .job import Job
 from .submission_event import SubmissionEvent
+from .upload import Upload, upload_path
 from .waivers import AuditValidationWaiver, SacValidationWaiver, UeiValidationWaiver
 from ..exceptions import LateChangeError
 
@@ -32,6 +34,7 @@ _models = [
     DeletedAccess,
     History,
     ExcelFile,
+    Job,
     GeneralInformationMixin,
     SubmissionEvent,
     LateChangeError,
@@ -40,6 +43,7 @@ _models = [
     SingleAuditReportFile,
     SacValidationWaiver,
     UeiValidationWaiver,
+    Upload,
     User,
 ]
 _functions = [
@@ -48,6 +52,7 @@ _functions = [
     generate_sac_report_id,
     remove_email_from_submission_access,
     single_audit_report_path,
+    upload_path,
 ]
 _constants = [
     ACCESS_ROLES,
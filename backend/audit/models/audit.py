@@ -1,10 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Field, GeneratedField, Transform
+from django.db.models import F, Field, GeneratedField, Transform, Value
 from django.db.models.fields.json import KeyTextTransform
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, Upper
+from django.utils import timezone
 
 from audit.cross_validation.naming import SECTION_NAMES
 from audit.cross_validation.audit_validation_shape import audit_validation_shape
@@ -21,12 +24,15 @@ from audit.models.mixins import CreatedMixin, UpdatedMixin
 from audit.models.utils import (
     get_next_sequence_id,
     generate_sac_report_id,
+    JsonArrayToText,
     JsonArrayToTextArray,
+    JsonbMerge,
     validate_audit_consistency,
 )
 
-from itertools import chain
-from audit.cross_validation import functions as cross_validation_functions
+from audit.cross_validation.runner import run_cross_validation
+from audit.exceptions import StaleAuditError
+from audit.json_patch import pointer
 from audit.utils import FORM_SECTION_HANDLERS
 import logging
 
@@ -71,11 +77,11 @@ class AuditManager(models.Manager):
             }
 
             result = super().create(**updated)
-            History.objects.create(
+            History.objects.create_audit_state(
                 event=event_type,
                 report_id=report_id,
                 version=version,
-                event_data=result.audit,
+                audit_data=result.audit,
                 updated_by=user,
             )
             return result
@@ -268,6 +274,14 @@ class Audit(CreatedMixin, UpdatedMixin):
         db_persist=True,
     )
 
+    # Flattened copy of `search_names`, covered by a trigram index so that the
+    # name search can use substring matching without scanning the whole table.
+    search_names_text = GeneratedField(
+        expression=JsonArrayToText("audit__search_indexes__search_names"),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
+
     agency_extensions = GeneratedField(
         expression=JsonArrayToTextArray("audit__search_indexes__agency_extensions"),
         output_field=ArrayField(models.CharField()),
@@ -319,6 +333,17 @@ class Audit(CreatedMixin, UpdatedMixin):
         # Admin View
         verbose_name = "Audit"
         verbose_name_plural = "Audits"
+        indexes = [
+            # Name search uses `search_names_text__icontains`, which Django
+            # renders as `UPPER(...) LIKE UPPER(...)`.
+            GinIndex(
+                OpClass(Upper("search_names_text"), name="gin_trgm_ops"),
+                name="audit_search_names_trgm_idx",
+            ),
+            # ALN search uses array overlap/containment (`&&`/`@>`).
+            GinIndex(fields=["agency_prefixes"], name="audit_agency_prefixes_idx"),
+            GinIndex(fields=["agency_extensions"], name="audit_agency_extensions_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         """
@@ -351,22 +376,92 @@ class Audit(CreatedMixin, UpdatedMixin):
                     )
 
             if event_type and event_user:
-                History.objects.create(
+                History.objects.create_audit_state(
                     event=event_type,
                     report_id=report_id,
                     version=self.version,
-                    event_data=self.audit,
+                    audit_data=self.audit,
                     updated_by=self.updated_by,
                 )
             return super().save()
 
+    def update_section(
+        self, name, data, event_user=None, event_type=None, retry_stale=False
+    ):
+        """Set one top-level section of the audit JSON; see update_sections()."""
+        self.update_sections(
+            {name: data},
+            event_user=event_user,
+            event_type=event_type,
+            retry_stale=retry_stale,
+        )
+
+    def update_sections(
+        self, sections, event_user=None, event_type=None, retry_stale=False
+    ):
+        """
+        Set top-level sections of the audit JSON, as save() does after
+        audit.update(sections), but with one UPDATE that sends only those
+        sections, and only if the audit is still at the version it was read
+        at. Otherwise, StaleAuditError is raised, unless retry_stale: then the
+        version is read again and the sections set once more, as they replace
+        whatever the other change left in them. The rest of the audit JSON
+        need not have been read (see defer()). The audit is only checked
+        against its SAC with SOT_COMPARE_MODE.
+        """
+        try:
+            self._update_sections(sections, event_user, event_type)
+        except StaleAuditError:
+            if not retry_stale:
+                raise
+            self.refresh_from_db(fields=["version"])
+            self._update_sections(sections, event_user, event_type)
+
+    def _update_sections(self, sections, event_user, event_type):
+        if not self.updated_by_id:
+            self.updated_by = event_user
+
+        with transaction.atomic():
+            updated = Audit.objects.filter(pk=self.pk, version=self.version).update(
+                audit=JsonbMerge(F("audit"), Value(sections, models.JSONField())),
+                version=F("version") + 1,
+                updated_by_id=self.updated_by_id,
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                raise StaleAuditError(self.report_id, self.version)
+            self.version += 1
+            # If deferred, the audit JSON is read as updated when it is used.
+            if "audit" not in self.get_deferred_fields():
+                self.audit.update(sections)
+
+            if settings.SOT_COMPARE_MODE:
+                is_consistent, discrepancies = validate_audit_consistency(self)
+                if not is_consistent:
+                    logger.warning(
+                        f"Inconsistencies found between models for {self.report_id}: {discrepancies}"
+                    )
+
+            if event_type and event_user:
+                # Setting a section is the same change whatever was there.
+                History.objects.create_audit_state(
+                    event=event_type,
+                    report_id=self.report_id,
+                    version=self.version,
+                    patch=[
+                        {"op": "add", "path": pointer(name), "value": data}
+                        for name, data in sections.items()
+                    ],
+                    updated_by=self.updated_by,
+                )
+
     def validate(self):
         """
         Full validation, intended for use when the user indicates that the
         submission is finished.
         """
         shaped_audit = audit_validation_shape(self)
-        cross_result = self._validate_cross()
+        cross_result = self._validate_cross(shaped_audit)
         individual_result = self._validate_individually()
 
         # Combining the results from cross and individual validations is non-trivial.
@@ -420,7 +515,7 @@ class Audit(CreatedMixin, UpdatedMixin):
 
         return result
 
-    def _validate_cross(self):
+    def _validate_cross(self, shaped_audit=None):
         """
         This method should NOT be run as part of full_clean(), because we want
         to be able to save in-progress submissions.
@@ -428,8 +523,12 @@ class Audit(CreatedMixin, UpdatedMixin):
         A stub method to represent the cross-sheet, “full” validation that we
         do once all the individual sections are complete and valid in
         themselves.
+
+        The result's "timings" holds the seconds each validation function
+        took, by name.
         """
-        shaped_audit = audit_validation_shape(self)
+        if shaped_audit is None:
+            shaped_audit = audit_validation_shape(self)
         try:
             sar = SingleAuditReportFile.objects.filter(audit_id=self.id).latest(
                 "date_created"
@@ -437,15 +536,11 @@ class Audit(CreatedMixin, UpdatedMixin):
         except SingleAuditReportFile.DoesNotExist:
             sar = None
 
-        results = list(
-            chain.from_iterable(
-                [func(shaped_audit, sar=sar) for func in cross_validation_functions]
-            )
-        )
+        results, timings = run_cross_validation(shaped_audit, sar=sar)
 
         errors = [r for r in results if "error" in r]
         warnings = [r for r in results if "warning" in r]
-        result = {}
+        result = {"timings": timings}
         if errors:
             result["errors"] = errors
             result["data"] = shaped_audit
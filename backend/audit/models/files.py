@@ -1,3 +1,4 @@
+from hashlib import sha256
 import logging
 
 from django.db import models
@@ -104,6 +105,24 @@ class SingleAuditReportFile(models.Model):
     component_page_numbers = models.JSONField(
         blank=True, null=True, validators=[validate_component_page_numbers]
     )
+    # Recorded at upload, so that reports can be compared without downloading
+    # them. Null for reports uploaded before these were recorded, until
+    # backfilled by the backfill_report_digests command.
+    sha256 = models.CharField(max_length=64, blank=True, null=True)
+    size = models.BigIntegerField(blank=True, null=True)
+
+    def record_digest(self):
+        """
+        Hash a newly uploaded file, a chunk at a time, before it is stored.
+        """
+        digest = sha256()
+        size = 0
+        for chunk in self.file.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        self.file.seek(0)
+        self.sha256 = digest.hexdigest()
+        self.size = size
 
     def save(self, *args, **kwargs):
         report_id = self.sac.report_id
@@ -160,4 +179,7 @@ class SingleAuditReportFile(models.Model):
                     },
                 )
 
+        if self.file and not self.file._committed:
+            self.record_digest()
+
         super().save()
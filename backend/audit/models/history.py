@@ -1,24 +1,170 @@
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models, transaction
 
+from audit.json_patch import apply_patch, make_patch
 from audit.models.constants import EVENT_TYPES
 
 User = get_user_model()
 
 
+class HistoryManager(models.Manager):
+    """
+    Custom Manager for History. The states of an audit are recorded as a full
+    snapshot every AUDIT_HISTORY_SNAPSHOT_INTERVAL states, and as a JSON Patch
+    from the previous state in between.
+    """
+
+    def create_audit_state(
+        self, *, event, report_id, version, updated_by, audit_data=None, patch=None
+    ):
+        """
+        Record a new state of an audit, given as the whole audit JSON or as a
+        patch that makes it from any earlier state: as a patch from its last
+        recorded state, if that is an earlier version, unless it is time for a
+        snapshot. Snapshots of states given as a patch are read from the audit.
+
+        The states of an audit are recorded one at a time, so that no two
+        patches are made from the same state.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext(%s))", [report_id]
+                )
+            return self._create_audit_state(
+                event=event,
+                report_id=report_id,
+                version=version,
+                updated_by=updated_by,
+                audit_data=audit_data,
+                patch=patch,
+            )
+
+    def _create_audit_state(
+        self, *, event, report_id, version, updated_by, audit_data, patch
+    ):
+        last_version = self._last_version_for_delta(report_id, version)
+        if last_version is not None:
+            if patch is None:
+                patch = make_patch(self.as_of(report_id, last_version), audit_data)
+            return self.create(
+                event=event,
+                report_id=report_id,
+                version=version,
+                audit_state=History.State.DELTA,
+                patch=patch,
+                updated_by=updated_by,
+            )
+        if audit_data is None:
+            audit_data = (
+                apps.get_model("audit.Audit")
+                .objects.filter(report_id=report_id)
+                .values_list("audit", flat=True)
+                .get()
+            )
+        return self.create(
+            event=event,
+            report_id=report_id,
+            version=version,
+            audit_state=History.State.SNAPSHOT,
+            event_data=audit_data,
+            updated_by=updated_by,
+        )
+
+    def _last_version_for_delta(self, report_id, version):
+        """
+        The version of the audit's last recorded state, if the state at version
+        can be a delta from it: that is, if it is an earlier version, and there
+        are fewer than AUDIT_HISTORY_SNAPSHOT_INTERVAL states since the last
+        snapshot. Otherwise, as when two saves of the audit were made from the
+        same version, it is a snapshot. (Versions saved without recording
+        History leave gaps, which deltas, made from the recorded state, allow.)
+        """
+        interval = settings.AUDIT_HISTORY_SNAPSHOT_INTERVAL
+        recent = list(
+            self.filter(report_id=report_id, audit_state__isnull=False)
+            .order_by("-version", "-id")
+            .values_list("version", "audit_state")[:interval]
+        )
+        if recent and recent[0][0] < version:
+            if any(
+                audit_state == History.State.SNAPSHOT
+                for _, audit_state in recent[: interval - 1]
+            ):
+                return recent[0][0]
+        return None
+
+    def as_of(self, report_id, version):
+        """
+        The audit JSON as it was recorded at the given version, or None if no
+        state of it was recorded by then.
+        """
+        states = self.filter(
+            report_id=report_id, audit_state__isnull=False, version__lte=version
+        )
+        snapshot = (
+            states.filter(audit_state=History.State.SNAPSHOT)
+            .order_by("-version", "-id")
+            .values_list("version", "id", "event_data")
+            .first()
+        )
+        if snapshot is None:
+            return None
+        snapshot_version, snapshot_id, audit_data = snapshot
+
+        deltas = (
+            states.filter(audit_state=History.State.DELTA)
+            .filter(
+                models.Q(version__gt=snapshot_version)
+                | models.Q(version=snapshot_version, id__gt=snapshot_id)
+            )
+            .order_by("version", "id")
+            .values_list("patch", flat=True)
+        )
+        for patch in deltas:
+            audit_data = apply_patch(audit_data, patch)
+        return audit_data
+
+
 class History(models.Model):
     """
-    Represents a history of the audit. Contains the audit json object at the time
-    of the event.
+    Represents a history of the audit. Rows for changes to the audit record
+    its state, as a snapshot of the audit json object in event_data or as a
+    patch from the state before; see HistoryManager. Other rows record the
+    details of an event in event_data.
     """
 
+    class State:
+        SNAPSHOT = "snapshot"
+        DELTA = "delta"
+
+    STATE_CHOICES = (
+        (State.SNAPSHOT, "Snapshot"),
+        (State.DELTA, "Delta"),
+    )
+
     event = models.CharField(choices=EVENT_TYPES)
     report_id = models.CharField()
     version = models.IntegerField()
-    event_data = models.JSONField()
+    event_data = models.JSONField(blank=True, null=True)
+    # Null unless the row records a state of the audit.
+    audit_state = models.CharField(choices=STATE_CHOICES, blank=True, null=True)
+    # For deltas, the JSON Patch from the audit's previous state.
+    patch = models.JSONField(blank=True, null=True)
     updated_at = models.DateTimeField(auto_now_add=True)
     updated_by = models.ForeignKey(User, on_delete=models.PROTECT)
 
+    objects = HistoryManager()
+
     class Meta:
         verbose_name = "Audit History"
         verbose_name_plural = "Audit History"
+        indexes = [
+            models.Index(
+                fields=["report_id", "version", "id"],
+                name="history_audit_state_idx",
+                condition=models.Q(audit_state__isnull=False),
+            ),
+        ]
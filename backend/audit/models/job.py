@@ -0,0 +1,65 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work, such as disseminating a submission, run by
+    the run_jobs workers. There is one Job per idempotency key, which is the
+    report and action unless given: enqueueing the same action for the same
+    report again returns the existing Job, so the work is done once however
+    many times it is asked for.
+    """
+
+    class Action:
+        DISSEMINATE = "disseminate"
+        VALIDATE_UPLOAD = "validate_upload"
+
+    class Status:
+        QUEUED = "queued"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    ACTION_CHOICES = (
+        (Action.DISSEMINATE, "Disseminate"),
+        (Action.VALIDATE_UPLOAD, "Validate upload"),
+    )
+    STATUS_CHOICES = (
+        (Status.QUEUED, "Queued"),
+        (Status.SUCCEEDED, "Succeeded"),
+        (Status.FAILED, "Failed"),
+    )
+
+    action = models.CharField(max_length=40, choices=ACTION_CHOICES)
+    report_id = models.CharField()
+    # report_id:action, by default
+    idempotency_key = models.CharField(unique=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=Status.QUEUED
+    )
+    payload = models.JSONField(blank=True, default=dict)
+    result = models.JSONField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, null=True)
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["run_after", "id"],
+                name="job_queued_idx",
+                condition=models.Q(status="queued"),
+            ),
+        ]
+
+    @staticmethod
+    def key(report_id, action):
+        return f"{report_id}:{action}"
+
+    def __str__(self):
+        return f"{self.idempotency_key} ({self.status})"
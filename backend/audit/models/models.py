@@ -46,19 +46,6 @@ from .submission_event import SubmissionEvent
 from .utils import camel_to_snake
 from ..exceptions import LateChangeError, AdministrativeOverrideError
 
-from dissemination.models import (
-    AdditionalEin,
-    AdditionalUei,
-    CapText,
-    FederalAward,
-    Finding,
-    FindingText,
-    General,
-    Note,
-    Passthrough,
-    SecondaryAuditor,
-    Resubmission,
-)
 from django.utils.timezone import now
 
 User = get_user_model()
@@ -242,17 +229,18 @@ class SingleAuditChecklist(models.Model, GeneralInformationMixin):  # type: igno
         # Save the model.
         return super().save()
 
-    def disseminate(self):
+    def disseminate(self, replace=False):
         """
         Cognizant/Oversight agency assignment followed by dissemination
-        ETL.
+        ETL. With replace, the report's existing dissemination rows are
+        replaced.
         """
         try:
             if not self.cognizant_agency and not self.oversight_agency:
                 self.assign_cog_over()
             intake_to_dissem = IntakeToDissemination(self)
             intake_to_dissem.load_all()
-            intake_to_dissem.save_dissemination_objects()
+            intake_to_dissem.save_dissemination_objects(replace=replace)
             if intake_to_dissem.errors:
                 return {"errors": intake_to_dissem.errors}
         except TransactionManagementError as err:
@@ -268,19 +256,6 @@ class SingleAuditChecklist(models.Model, GeneralInformationMixin):  # type: igno
         return None
 
     def redisseminate(self):
-        named_models = {
-            "AdditionalEins": AdditionalEin,
-            "AdditionalUeis": AdditionalUei,
-            "CorrectiveActionPlan": CapText,
-            "FederalAwards": FederalAward,
-            "FindingsText": FindingText,
-            "FindingsUniformGuidance": Finding,
-            "NotesToSefa": Note,
-            "SecondaryAuditors": SecondaryAuditor,
-            "General": General,
-            "Passthrough": Passthrough,
-            "Resubmission": Resubmission,
-        }
         # BEGIN ATOMIC BLOCK
         with transaction.atomic():
             # This needs to be in the DISSEMINATED state in order
@@ -292,12 +267,9 @@ class SingleAuditChecklist(models.Model, GeneralInformationMixin):  # type: igno
                 logger.error("Trying to resubmit an audit that is not disseminated.")
                 raise AdministrativeOverrideError
             try:
-                # Delete this record from the dissemination tables
-                for model in named_models.values():
-                    rows = model.objects.filter(report_id=self.report_id)
-                    rows.delete()
-                # Disseminate this record once more
-                self.disseminate()
+                # Disseminate this record once more, replacing its rows in
+                # the dissemination tables
+                self.disseminate(replace=True)
             except TransactionManagementError as err:
                 logger.error(f"transaction management error in redissemination: {err}")
                 raise err
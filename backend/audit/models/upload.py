@@ -0,0 +1,51 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+def upload_path(instance, _filename):
+    """
+    Uploads are kept under their own id until they have been validated.
+    """
+    return f"uploads/{instance.id}.xlsx"
+
+
+class Upload(models.Model):
+    """
+    A workbook upload that is being, or has been, validated in the background
+    by a validate_upload job. The browser polls UploadStatusView for its status.
+    Once validated, the workbook is copied to its ExcelFile's key and the
+    upload's own copy is deleted.
+    """
+
+    class Status:
+        VALIDATING = "validating"
+        ACCEPTED = "accepted"
+        REJECTED = "rejected"
+        ERROR = "error"
+
+    STATUS_CHOICES = (
+        (Status.VALIDATING, "Validating"),
+        (Status.ACCEPTED, "Accepted"),
+        (Status.REJECTED, "Rejected"),
+        (Status.ERROR, "Error"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sac = models.ForeignKey("audit.SingleAuditChecklist", on_delete=models.CASCADE)
+    user = models.ForeignKey(User, blank=True, null=True, on_delete=models.SET_NULL)
+    form_section = models.CharField(max_length=255)
+    file = models.FileField(upload_to=upload_path, blank=True)
+    filename = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=Status.VALIDATING
+    )
+    # The outcome of each stage of validation, by name.
+    stages = models.JSONField(blank=True, default=dict)
+    # For rejected uploads, the errors, as ExcelFileHandlerView returns them.
+    result = models.JSONField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -3,10 +3,15 @@ The intent of this file is to group together audit related helpers.
 """
 
 import copy
+import hashlib
+import io
+import json
 import logging
 from datetime import timedelta
+from typing import Callable, NamedTuple
 
 import pytz
+from psycopg2.extras import Json
 from django.utils import timezone as django_timezone
 from django.contrib.postgres.fields import ArrayField
 from django.db import models, connection
@@ -56,6 +61,99 @@ class JsonArrayToTextArray(Func):
     output_field = ArrayField(models.CharField())
 
 
+class JsonArrayToText(Func):
+    """
+    Flattens a JSON array of strings into a single space-separated string, so
+    that it can be covered by a trigram index.
+    """
+
+    function = "json_array_to_text"
+    output_field = models.TextField()
+
+
+class JsonbMerge(Func):
+    """
+    A JSON object with the top-level keys of another one set on it, replacing
+    any that are there, as dict.update() does.
+    """
+
+    template = "(%(expressions)s)"
+    arg_joiner = " || "
+    output_field = models.JSONField()
+
+
+# Characters escaped in COPY's text format; see copy_rows().
+COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _array_literal(values):
+    """A list as a PostgreSQL array literal, e.g. ["a", None] => {"a",NULL}."""
+    elements = (
+        (
+            "NULL"
+            if v is None
+            else '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        )
+        for v in values
+    )
+    return "{" + ",".join(elements) + "}"
+
+
+def _copy_text(value):
+    """A value, as prepared for the database, in COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    elif isinstance(value, (list, tuple)):
+        value = _array_literal(value)
+    return str(value).translate(COPY_TEXT_ESCAPES)
+
+
+def copy_rows(cursor, model, objects, keep_fields=()):
+    """
+    Load unsaved model instances into the model's table with one COPY, as
+    bulk_create() would save them: every concrete field but the primary key,
+    which the table's sequence fills in, and any generated fields. The fields
+    named in keep_fields are written as they are on the objects, rather than
+    as pre_save() would set them (e.g. to keep an auto_now_add timestamp).
+    """
+    fields = [
+        f
+        for f in model._meta.concrete_fields
+        if not isinstance(f, models.AutoField) and not f.generated
+    ]
+    buffer = io.StringIO()
+    for obj in objects:
+        buffer.write(
+            "\t".join(
+                _copy_text(
+                    f.get_db_prep_save(
+                        (
+                            getattr(obj, f.attname)
+                            if f.name in keep_fields
+                            else f.pre_save(obj, True)
+                        ),
+                        connection,
+                    )
+                )
+                for f in fields
+            )
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+
+    qn = connection.ops.quote_name
+    columns = ", ".join(qn(f.column) for f in fields)
+    # copy_expert() is psycopg2's own, so its errors need wrapping as Django's.
+    with connection.wrap_database_errors:
+        cursor.copy_expert(
+            f"COPY {qn(model._meta.db_table)} ({columns}) FROM STDIN", buffer
+        )
+
+
 def one_month_from_today():
     return django_timezone.now() + timedelta(days=30)
 
@@ -83,7 +181,19 @@ def convert_utc_to_american_samoa_zone(date):
     return formatted_date
 
 
-def generate_audit_indexes(audit):
+def generate_audit_indexes(audit, previous=None):
+    """
+    The top-level and search_indexes values derived from the audit JSON, and
+    "index_hashes": a hash of the inputs of each search index fragment, and of
+    the cognizant/oversight agency.
+
+    If previous is given (the audit JSON as last indexed), the fragments and
+    cog/over whose inputs hash as they did then are copied from it rather
+    than worked out again. Cog/over queries the historical baselines, so it
+    is only recomputed when the federal awards, EIN, UEI, audit year or
+    status change. An audit indexed before the hashes were kept keeps its
+    cog/over, which may have been reassigned since.
+    """
     general_information = audit.audit.get("general_information", {})
 
     fiscal_period_end = general_information.get("auditee_fiscal_period_end", None)
@@ -92,22 +202,52 @@ def generate_audit_indexes(audit):
     else:
         audit_year, fy_end_month, _ = "1900-01-01".split("-")
 
-    cognizant_agency, oversight_agency = compute_cog_over(
-        audit.audit.get("federal_awards"),
-        audit.submission_status,
-        audit.auditee_ein,
-        audit.auditee_uei,
-        int(audit_year),
+    previous = previous or {}
+    previous_hashes = previous.get("index_hashes", {})
+    previous_indexes = previous.get("search_indexes", {})
+    index_hashes = {}
+    search_indexes = {}
+    for fragment in SEARCH_INDEX_FRAGMENTS:
+        index_hashes[fragment.name] = _hash_index_inputs(
+            fragment.version,
+            [audit.audit.get(section) for section in fragment.sections],
+        )
+        if index_hashes[fragment.name] == previous_hashes.get(fragment.name) and all(
+            key in previous_indexes for key in fragment.keys
+        ):
+            search_indexes.update({key: previous_indexes[key] for key in fragment.keys})
+        else:
+            search_indexes.update(fragment.build(audit.audit))
+
+    index_hashes["cog_over"] = _hash_index_inputs(
+        COG_OVER_VERSION,
+        [
+            audit.audit.get("federal_awards"),
+            audit.submission_status,
+            audit.auditee_ein,
+            audit.auditee_uei,
+            audit_year,
+        ],
     )
+    if index_hashes["cog_over"] == previous_hashes.get("cog_over") or (
+        "cog_over" not in previous_hashes and "cognizant_agency" in previous
+    ):
+        cognizant_agency = previous.get("cognizant_agency")
+        oversight_agency = previous.get("oversight_agency")
+    else:
+        cognizant_agency, oversight_agency = compute_cog_over(
+            audit.audit.get("federal_awards"),
+            audit.submission_status,
+            audit.auditee_ein,
+            audit.auditee_uei,
+            int(audit_year),
+        )
 
     is_public = general_information.get(
         "user_provided_organization_type", ""
     ) != "tribal" or audit.audit.get("tribal_data_consent", {}).get(
         "is_tribal_information_authorized_to_be_public", True
     )
-    awards_indexes = _index_awards(audit.audit)
-    findings_indexes = _index_findings(audit.audit)
-    general_indexes = _index_general(audit.audit)
 
     return {
         "audit_year": audit_year,
@@ -115,10 +255,18 @@ def generate_audit_indexes(audit):
         "oversight_agency": oversight_agency,
         "fy_end_month": fy_end_month,
         "is_public": is_public,
-        "search_indexes": {**findings_indexes, **awards_indexes, **general_indexes},
+        "search_indexes": search_indexes,
+        "index_hashes": index_hashes,
     }
 
 
+def _hash_index_inputs(version, inputs):
+    """A digest of an index fragment's version and the values it is built from."""
+    return hashlib.sha256(
+        json.dumps([version, inputs], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
 def _index_findings(audit_data):
     findings = 0
     compliance_requirements = set()
@@ -228,6 +376,61 @@ def _index_general(audit_data):
     }
 
 
+class IndexFragment(NamedTuple):
+    """
+    Part of search_indexes: the audit sections it is built from, the keys it
+    sets, and the function that builds it. Bump the version when the function
+    changes what it returns, so that stored fragments are rebuilt.
+    """
+
+    name: str
+    sections: tuple
+    keys: tuple
+    build: Callable
+    version: int = 1
+
+
+SEARCH_INDEX_FRAGMENTS = [
+    IndexFragment(
+        name="findings",
+        sections=("findings_uniform_guidance",),
+        keys=(
+            "findings_summary",
+            "compliance_requirements",
+            "unique_audit_findings_count",
+        ),
+        build=_index_findings,
+    ),
+    IndexFragment(
+        name="awards",
+        sections=("federal_awards",),
+        keys=(
+            "program_names",
+            "has_direct_funding",
+            "has_indirect_funding",
+            "is_major_program",
+            "passthrough_names",
+            "agency_extensions",
+            "agency_prefixes",
+        ),
+        build=_index_awards,
+    ),
+    IndexFragment(
+        name="general",
+        sections=(
+            "general_information",
+            "auditee_certification",
+            "auditor_certification",
+        ),
+        keys=("search_names",),
+        build=_index_general,
+    ),
+]
+
+# Bump when compute_cog_over() changes, so that cog/over is worked out again.
+COG_OVER_VERSION = 1
+
+
 json_fields_to_check = [
     "general_information",
     "federal_awards",
@@ -0,0 +1,105 @@
+"""
+Compiled JSON Schema validators for the section schemas.
+
+Each schema file is read and parsed once per process, and each validator is
+constructed (and, where jsonschema.validate would, meta-validated) once. The
+section schemas are self-contained, with no external $refs, so there is
+nothing else to resolve ahead of time.
+
+AuditConfig.ready() calls warm_up() so that the first submission handled by a
+worker doesn't pay for compiling every schema.
+"""
+
+import functools
+import json
+import logging
+import time
+
+from django.conf import settings
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+logger = logging.getLogger(__name__)
+
+# (schema filename, validator class, format checking) for every validator
+# built by audit.validators. A validator class of None means the class named
+# by the schema's own $schema, as jsonschema.validate() picks it.
+SECTION_VALIDATORS = [
+    ("AdditionalEINs.schema.json", Draft7Validator, False),
+    ("AdditionalUEIs.schema.json", Draft7Validator, False),
+    ("AuditFindingsText.schema.json", Draft7Validator, False),
+    ("AuditInformation.schema.json", None, True),
+    ("AuditeeCertification.schema.json", None, True),
+    ("AuditorCertification.schema.json", None, True),
+    ("CorrectiveActionPlan.schema.json", Draft7Validator, False),
+    ("FederalAwards.schema.json", Draft7Validator, False),
+    ("FederalAwardsAuditFindings.schema.json", Draft7Validator, False),
+    ("GeneralInformationRequired.schema.json", Draft7Validator, True),
+    ("GeneralInformationRequired.schema.json", None, True),
+    ("NotesToSefa.schema.json", Draft7Validator, False),
+    ("SecondaryAuditors.schema.json", Draft7Validator, False),
+    ("TribalAccess.schema.json", None, True),
+]
+
+
+@functools.cache
+def section_schema(filename):
+    """
+    The parsed schema from SECTION_SCHEMA_DIR. Shared between callers, so it
+    must not be modified.
+    """
+    schema_path = settings.SECTION_SCHEMA_DIR / filename
+    return json.loads(schema_path.read_text(encoding="utf-8"))
+
+
+def section_validator(filename, validator_class=Draft7Validator, format_checker=False):
+    """
+    The compiled validator for a section schema. With validator_class=None,
+    the class comes from the schema's $schema and the schema itself is
+    checked first, matching jsonschema.validate().
+    """
+    # Normalize the arguments, so that every spelling of a call shares one entry.
+    return _compiled_validator(filename, validator_class, bool(format_checker))
+
+
+@functools.cache
+def _compiled_validator(filename, validator_class, format_checker):
+    schema = section_schema(filename)
+    if validator_class is None:
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+    return validator_class(
+        schema, format_checker=FormatChecker() if format_checker else None
+    )
+
+
+def validate_section(filename, instance):
+    """
+    Cached equivalent of
+    jsonschema.validate(instance, schema, format_checker=FormatChecker()).
+    Raises the best matching jsonschema ValidationError, if any.
+    """
+    error = best_match(section_validator(filename, None, True).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def warm_up():
+    """
+    Compile every section validator.
+    """
+    t0 = time.perf_counter()
+    for filename, validator_class, format_checker in SECTION_VALIDATORS:
+        section_validator(filename, validator_class, format_checker)
+    logger.debug(
+        f"Compiled {len(SECTION_VALIDATORS)} section validators in {time.perf_counter() - t0:.4f} secs"
+    )
+
+
+def clear():
+    """
+    Drop every cached schema and validator, e.g. after the schemas change.
+    """
+    _compiled_validator.cache_clear()
+    section_schema.cache_clear()
@@ -0,0 +1,128 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from audit.models import Audit
+from audit.models.constants import STATUS
+from audit.management.commands.reindex_audits import _write
+from audit.models.utils import generate_audit_indexes
+
+
+def _audit_data():
+    return {
+        "general_information": {
+            "ein": "123456789",
+            "auditee_uei": "AAA123456BBB",
+            "auditee_name": "Test Auditee",
+            "auditee_fiscal_period_end": "2023-06-30",
+        },
+        "federal_awards": {
+            "awards": [
+                {
+                    "program": {
+                        "program_name": "Program",
+                        "federal_agency_prefix": "10",
+                        "three_digit_extension": "123",
+                        "amount_expended": 100,
+                        "is_major": "Y",
+                    },
+                    "direct_or_indirect_award": {"is_direct": "Y"},
+                }
+            ],
+            "total_amount_expended": 100,
+        },
+        "findings_uniform_guidance": [
+            {
+                "program": {"compliance_requirement": "A"},
+                "findings": {"reference_number": "2023-001"},
+                "modified_opinion": "Y",
+            }
+        ],
+    }
+
+
+@patch("audit.models.utils.compute_cog_over", return_value=("10", None))
+class GenerateAuditIndexesTests(TestCase):
+    def setUp(self):
+        self.audit = baker.make(
+            Audit,
+            version=0,
+            submission_status=STATUS.DISSEMINATED,
+            audit=_audit_data(),
+        )
+
+    def test_unchanged_audit_reuses_indexes(self, mock_cog_over):
+        indexes = generate_audit_indexes(self.audit)
+        self.audit.audit.update(indexes)
+
+        reindexed = generate_audit_indexes(self.audit, previous=self.audit.audit)
+
+        self.assertEqual(reindexed, indexes)
+        self.assertIs(
+            reindexed["search_indexes"]["program_names"],
+            indexes["search_indexes"]["program_names"],
+        )
+        mock_cog_over.assert_called_once()
+
+    def test_changed_section_rebuilds_its_fragment(self, mock_cog_over):
+        self.audit.audit.update(generate_audit_indexes(self.audit))
+        self.audit.audit["general_information"]["auditee_name"] = "Renamed Auditee"
+
+        reindexed = generate_audit_indexes(self.audit, previous=self.audit.audit)
+
+        self.assertIn("Renamed Auditee", reindexed["search_indexes"]["search_names"])
+        self.assertEqual(reindexed["search_indexes"]["findings_summary"], 1)
+        # The awards and UEI/EIN are unchanged, so cog/over is not worked out again.
+        mock_cog_over.assert_called_once()
+
+    def test_changed_awards_recompute_cog_over(self, mock_cog_over):
+        self.audit.audit.update(generate_audit_indexes(self.audit))
+        self.audit.audit["federal_awards"]["total_amount_expended"] = 200
+
+        generate_audit_indexes(self.audit, previous=self.audit.audit)
+
+        self.assertEqual(mock_cog_over.call_count, 2)
+
+    def test_audit_indexed_without_hashes_keeps_cog_over(self, mock_cog_over):
+        indexes = generate_audit_indexes(self.audit)
+        del indexes["index_hashes"]
+        self.audit.audit.update(indexes, cognizant_agency="84")
+
+        reindexed = generate_audit_indexes(self.audit, previous=self.audit.audit)
+
+        self.assertEqual(reindexed["cognizant_agency"], "84")
+        mock_cog_over.assert_called_once()
+
+    def test_reindex_audits(self, mock_cog_over):
+        self.audit.audit.update(generate_audit_indexes(self.audit))
+        self.audit.audit["general_information"]["auditee_name"] = "Renamed Auditee"
+        Audit.objects.filter(id=self.audit.id).update(audit=self.audit.audit)
+
+        out = StringIO()
+        call_command("reindex_audits", stdout=out)
+
+        self.assertEqual(
+            out.getvalue().strip(),
+            "1 audits read, 1 written, 0 changed while reindexing. Rebuilt: general 1",
+        )
+        audit = Audit.objects.get(id=self.audit.id)
+        self.assertEqual(audit.version, self.audit.version + 1)
+        self.assertIn("Renamed Auditee", audit.search_names)
+        mock_cog_over.assert_called_once()
+
+    def test_reindex_audits_keeps_later_changes(self, mock_cog_over):
+        """An audit changed after it was read for reindexing is not overwritten"""
+        audit = Audit.objects.get(id=self.audit.id)
+        audit.audit.update(generate_audit_indexes(audit))
+        Audit.objects.filter(id=audit.id).update(
+            audit={**self.audit.audit, "notes": "Edited"}, version=audit.version + 1
+        )
+
+        stats = {"written": 0, "changed": 0}
+        _write([audit], stats)
+
+        self.assertEqual(stats, {"written": 0, "changed": 1})
+        self.assertEqual(Audit.objects.get(id=audit.id).audit["notes"], "Edited")
@@ -1,13 +1,16 @@
 """Test management commands."""
 
+from io import StringIO
 import logging
 
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from unittest.mock import patch
+from model_bakery import baker
 
-from audit.models import SingleAuditChecklist
+from audit.models import History, SingleAuditChecklist, SingleAuditReportFile
+from audit.models.constants import EventType
 
 
 class MockHttpResponse:
@@ -46,3 +49,78 @@ class TestLoadFixturesCommand(TestCase):
 
         # restore the logging override
         logging.disable(logging.ERROR)
+
+
+class TestBackfillReportDigestsCommand(TestCase):
+    @patch("audit.viewlib.compare_two_submissions.get_s3_client")
+    @patch("audit.viewlib.compare_two_submissions.stream_digest")
+    def test_backfill_report_digests(self, mock_stream_digest, _mock_get_s3_client):
+        """backfill_report_digests records the digests of legacy reports only."""
+        sacs = [
+            baker.make(SingleAuditChecklist, report_id=f"2023-06-TSTDAT-000000000{i}")
+            for i in range(3)
+        ]
+        legacy = baker.make(SingleAuditReportFile, sac=sacs[0])
+        missing = baker.make(SingleAuditReportFile, sac=sacs[1])
+        baker.make(SingleAuditReportFile, sac=sacs[2], sha256="b" * 64, size=20)
+        mock_stream_digest.side_effect = lambda client, bucket, key: (
+            ("a" * 64, 10) if key == f"singleauditreport/{legacy.filename}" else None
+        )
+        out = StringIO()
+
+        call_command("backfill_report_digests", stdout=out)
+
+        self.assertEqual(mock_stream_digest.call_count, 2)
+        self.assertIn("2 reports read, 1 digests recorded.", out.getvalue())
+        legacy.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual((legacy.sha256, legacy.size), ("a" * 64, 10))
+        self.assertIsNone(missing.sha256)
+
+
+@override_settings(AUDIT_HISTORY_SNAPSHOT_INTERVAL=2)
+class TestCompactAuditHistoryCommand(TestCase):
+    def test_compact_audit_history(self):
+        """compact_audit_history keeps every state, compacted, and can undo it."""
+        user = baker.make(get_user_model())
+        report_id = "2023-06-TSTDAT-0000000001"
+        states = [
+            {"general_information": {"auditee_name": "Auditee"}, "notes": [1] * i}
+            for i in range(5)
+        ]
+        # Each state in full, as they were recorded before.
+        for version, state in enumerate(states):
+            baker.make(
+                History,
+                report_id=report_id,
+                version=version,
+                event=EventType.NOTES_TO_SEFA_UPDATED,
+                audit_state=History.State.SNAPSHOT,
+                event_data=state,
+                updated_by=user,
+            )
+        baker.make(History, report_id=report_id, version=4, event_data={"a": 1})
+
+        def compact(*args):
+            out = StringIO()
+            call_command("compact_audit_history", *args, stdout=out)
+            return out.getvalue()
+
+        self.assertIn("1 audits, 5 states read, 2 rewritten.", compact())
+        self.assertEqual(
+            list(
+                History.objects.filter(audit_state__isnull=False)
+                .order_by("version")
+                .values_list("audit_state", flat=True)
+            ),
+            ["snapshot", "delta", "snapshot", "delta", "snapshot"],
+        )
+        for version, state in enumerate(states):
+            self.assertEqual(History.objects.as_of(report_id, version), state)
+
+        self.assertIn("0 rewritten.", compact())
+
+        self.assertIn("2 rewritten.", compact("--expand"))
+        self.assertFalse(History.objects.filter(audit_state="delta").exists())
+        for version, state in enumerate(states):
+            self.assertEqual(History.objects.as_of(report_id, version), state)
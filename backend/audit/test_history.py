@@ -0,0 +1,226 @@
+import copy
+import threading
+import time
+
+from django.db import connection, transaction
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from model_bakery import baker
+
+from audit.json_patch import apply_patch, make_patch
+from audit.models import Audit, History, User
+from audit.models.constants import EventType
+
+REPORT_ID = "2023-06-TSTDAT-0000000001"
+
+
+def _states(count):
+    """count versions of a small audit, each changing it a little more."""
+    states = []
+    for i in range(count):
+        states.append(
+            {
+                "general_information": {"auditee_name": f"Auditee {i % 2}"},
+                "federal_awards": {
+                    "federal_awards": [
+                        {"award_reference": f"AWARD-{n:04d}", "amount": n * i}
+                        for n in range(1, i + 2)
+                    ],
+                },
+                **({"notes_to_sefa": {"accounting_policies": "Text"}} if i % 3 else {}),
+            }
+        )
+    return states
+
+
+class JsonPatchTests(SimpleTestCase):
+    CASES = [
+        ({"a": 1}, {"a": 2}),
+        ({"a": 1, "b": 2}, {"b": 2, "c": 3}),
+        ({"a": {"b": [1, 2, 3]}}, {"a": {"b": [1, 2]}}),
+        ({"a": [1]}, {"a": [1, 2, {"c": None}]}),
+        ({"a": [1, 2, 3, 4]}, {"a": [5, 6, 7, 8]}),
+        ({"a": 1}, {"a": True}),
+        ({"a": 1}, {"a": 1.0}),
+        ({"a/b": {"c~d": 1}}, {"a/b": {"c~d": 2}}),
+        ({"a": None}, {"a": {"b": 1}}),
+        ({"a": 1}, [1, 2]),
+        ({}, {}),
+    ]
+
+    def test_round_trip(self):
+        for old, new in self.CASES:
+            with self.subTest(old=old, new=new):
+                patch = make_patch(old, new)
+                result = apply_patch(copy.deepcopy(old), patch)
+                self.assertEqual(result, new)
+                self.assertEqual(type(result), type(new))
+                if isinstance(new, dict) and "a" in new:
+                    self.assertIs(type(result["a"]), type(new["a"]))
+
+    def test_unchanged(self):
+        self.assertEqual(make_patch({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}), [])
+
+    def test_changes_only(self):
+        old = {"a": {"b": 1, "c": list(range(100))}}
+        new = {"a": {"b": 2, "c": list(range(100))}}
+
+        self.assertEqual(
+            make_patch(old, new), [{"op": "replace", "path": "/a/b", "value": 2}]
+        )
+
+    def test_unsupported_operation(self):
+        with self.assertRaises(ValueError):
+            apply_patch({"a": 1}, [{"op": "move", "from": "/a", "path": "/b"}])
+
+
+@override_settings(AUDIT_HISTORY_SNAPSHOT_INTERVAL=3)
+class HistoryTests(TestCase):
+    def setUp(self):
+        self.user = baker.make(User)
+
+    def _record(self, states):
+        for version, state in enumerate(states):
+            History.objects.create_audit_state(
+                event=EventType.FEDERAL_AWARDS_UPDATED,
+                report_id=REPORT_ID,
+                version=version,
+                audit_data=state,
+                updated_by=self.user,
+            )
+            # Event rows, which are not states of the audit, are passed over.
+            baker.make(
+                History,
+                report_id=REPORT_ID,
+                version=version,
+                event=EventType.ACCESS_GRANTED,
+                event_data={"email": "a@a.com"},
+            )
+
+    def test_snapshots_and_deltas(self):
+        states = _states(7)
+        self._record(states)
+
+        recorded = History.objects.filter(
+            report_id=REPORT_ID, audit_state__isnull=False
+        ).order_by("version")
+        S, D = History.State.SNAPSHOT, History.State.DELTA
+        self.assertEqual([h.audit_state for h in recorded], [S, D, D, S, D, D, S])
+        for history in recorded:
+            if history.audit_state == D:
+                self.assertIsNone(history.event_data)
+                self.assertTrue(history.patch)
+
+        for version, state in enumerate(states):
+            self.assertEqual(History.objects.as_of(REPORT_ID, version), state)
+
+    def test_as_of_before_any_state(self):
+        self.assertIsNone(History.objects.as_of(REPORT_ID, 5))
+
+        self._record(_states(2))
+
+        self.assertIsNone(History.objects.as_of(REPORT_ID, -1))
+        self.assertIsNone(History.objects.as_of("2023-06-TSTDAT-0000000002", 1))
+
+    def test_two_states_from_the_same_version(self):
+        """
+        A second state at a version already recorded, as when two saves are
+        made from the same version, is a snapshot, not a second delta
+        """
+        base = {"a": 1, "x": 1}
+        self._record([{"a": 0}, base])
+        for state in [{"a": 2}, {"a": 3}]:
+            History.objects.create_audit_state(
+                event=EventType.FEDERAL_AWARDS_UPDATED,
+                report_id=REPORT_ID,
+                version=2,
+                audit_data=state,
+                updated_by=self.user,
+            )
+
+        states = History.objects.filter(
+            report_id=REPORT_ID, version=2, audit_state__isnull=False
+        ).order_by("id")
+        S, D = History.State.SNAPSHOT, History.State.DELTA
+        self.assertEqual([h.audit_state for h in states], [D, S])
+        self.assertEqual(History.objects.as_of(REPORT_ID, 2), {"a": 3})
+
+    def test_state_after_unrecorded_versions(self):
+        self._record(_states(2))
+        state = _states(3)[2]
+
+        history = History.objects.create_audit_state(
+            event=EventType.FEDERAL_AWARDS_UPDATED,
+            report_id=REPORT_ID,
+            version=5,
+            audit_data=state,
+            updated_by=self.user,
+        )
+
+        self.assertEqual(history.audit_state, History.State.DELTA)
+        self.assertEqual(History.objects.as_of(REPORT_ID, 5), state)
+        self.assertEqual(History.objects.as_of(REPORT_ID, 4), _states(2)[1])
+
+    def test_audit_save(self):
+        audit = baker.make(Audit, report_id=REPORT_ID, version=0, audit={})
+        states = _states(4)
+        for state in states:
+            audit.audit = state
+            audit.save(
+                event_user=self.user, event_type=EventType.FEDERAL_AWARDS_UPDATED
+            )
+
+        self.assertEqual(History.objects.filter(audit_state="delta").count(), 2)
+        self.assertEqual(History.objects.as_of(REPORT_ID, audit.version), states[-1])
+        self.assertEqual(History.objects.as_of(REPORT_ID, audit.version - 2), states[1])
+
+
+@override_settings(AUDIT_HISTORY_SNAPSHOT_INTERVAL=3)
+class ConcurrentHistoryTests(TransactionTestCase):
+    """
+    Two saves of an audit from the same version, on their own connections.
+    """
+
+    def test_concurrent_states_are_recorded_in_turn(self):
+        user = baker.make(User)
+        for version, state in enumerate([{"a": 0}, {"a": 1, "x": 1}]):
+            History.objects.create_audit_state(
+                event=EventType.FEDERAL_AWARDS_UPDATED,
+                report_id=REPORT_ID,
+                version=version,
+                audit_data=state,
+                updated_by=user,
+            )
+        first_recorded = threading.Event()
+
+        def save(state, hold):
+            try:
+                with transaction.atomic():
+                    History.objects.create_audit_state(
+                        event=EventType.FEDERAL_AWARDS_UPDATED,
+                        report_id=REPORT_ID,
+                        version=2,
+                        audit_data=state,
+                        updated_by=user,
+                    )
+                    if hold:
+                        first_recorded.set()
+                        # Long enough for the other save to try meanwhile.
+                        time.sleep(0.3)
+            finally:
+                connection.close()
+
+        first = threading.Thread(target=save, args=({"a": 2}, True))
+        first.start()
+        first_recorded.wait(timeout=10)
+        second = threading.Thread(target=save, args=({"a": 3}, False))
+        second.start()
+        first.join()
+        second.join()
+
+        # Both made from {"a": 1, "x": 1}, two deltas would each remove "x".
+        self.assertEqual(History.objects.as_of(REPORT_ID, 2), {"a": 3})
@@ -8,7 +8,11 @@ from faker import Faker
 
 from audit.models import SingleAuditChecklist, User
 from audit.models.constants import STATUS, RESUBMISSION_ACTION
-from audit.intake_to_dissemination import IntakeToDissemination
+from audit.intake_to_dissemination import (
+    DISSEMINATION_MODELS,
+    IntakeToDissemination,
+    omit,
+)
 from audit.test_views import AUDIT_JSON_FIXTURES, _load_json
 from audit.utils import Util
 from dissemination.models import (
@@ -652,6 +656,64 @@ class IntakeToDisseminationTests(TestCase):
         self.assertNotEqual(general.entity_type, "tribal")
         self.assertEqual(general.is_public, True)
 
+    def _saved_rows(self):
+        return {
+            model.__name__: sorted(
+                (
+                    omit(["id"], row)
+                    for row in model.objects.filter(report_id=self.report_id).values()
+                ),
+                key=repr,
+            )
+            for model in DISSEMINATION_MODELS
+        }
+
+    def _load_all(self):
+        sac = self._create_sac(
+            reference_number=2, cognizant_agency="xx", oversight_agency=""
+        )
+        self._run_state_transition(sac)
+        self.sac = sac
+        self.report_id = sac.report_id
+        self.intake_to_dissemination = IntakeToDissemination(sac)
+        return self.intake_to_dissemination.load_all()
+
+    def test_save_matches_bulk_create(self):
+        """
+        COPY saves every table just as bulk_create() did, including text that
+        COPY has to escape
+        """
+        loaded_objects = self._load_all()
+        loaded_objects["FindingTexts"][0].finding_text = "a\tb\nc\\N\r\\d"
+
+        self.intake_to_dissemination.save_dissemination_objects()
+        copied = self._saved_rows()
+        General.objects.filter(report_id=self.report_id).delete()
+        for object_list in loaded_objects.values():
+            if object_list:
+                type(object_list[0]).objects.bulk_create(object_list)
+
+        self.assertEqual(copied, self._saved_rows())
+        self.assertEqual(
+            FindingText.objects.get(report_id=self.report_id).finding_text,
+            "a\tb\nc\\N\r\\d",
+        )
+        self.assertTrue(all(copied.values()))
+
+    def test_save_with_replace(self):
+        """
+        With replace, saving a disseminated report again replaces its rows
+        """
+        self._load_all()
+        self.intake_to_dissemination.save_dissemination_objects()
+        before = self._saved_rows()
+
+        self.intake_to_dissemination.load_all()
+        self.intake_to_dissemination.save_dissemination_objects(replace=True)
+
+        self.assertEqual(self.intake_to_dissemination.errors, [])
+        self.assertEqual(before, self._saved_rows())
+
     def test_load_and_return_objects(self):
         len_general = len(General.objects.all())
         len_captext = len(CapText.objects.all())
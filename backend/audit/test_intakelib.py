@@ -1,13 +1,35 @@
 import unittest
 from django.test import SimpleTestCase
 from copy import deepcopy
+from io import StringIO
+from django.core.management import call_command
 from audit.intakelib.intermediate_representation import (
+    IntermediateRepresentation,
     extract_workbook_as_ir,
+    get_range_by_name,
+    get_sheet_by_name,
+    get_sheet_name_by_range_name,
+    insert_new_range,
     ranges_to_rows,
+    read_columns,
+    read_workbook,
     remove_null_rows,
+    remove_range_by_name,
+    rename_sheet_by_name,
+    replace_range_by_name,
+)
+from audit.intakelib.transforms.runners import (
+    run_all_transforms,
+    notes_to_sefa_transforms,
 )
 from unittest.mock import MagicMock, patch
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from io import BytesIO
+from openpyxl import Workbook
+from openpyxl.workbook.defined_name import DefinedName
+from audit.intakelib.mapping_util import _open_workbook
+from audit.validators import validate_excel_file_integrity
 
 
 class IRTests(SimpleTestCase):
@@ -87,6 +109,175 @@ class IRTests(SimpleTestCase):
         remove_null_rows(cp)
         self.assertEqual(cp, IRTests.r2)
 
+    def test_remove_null_rows_matches_ranges_to_rows(self):
+        """
+        The cut is where ranges_to_rows() stops, with or without the data
+        lengths read_columns() found, however long the ranges are.
+        """
+        cases = [
+            [[1, 2, None, None], ["a", 0, " ", None]],
+            [[None, None], [0, ""]],
+            [[1, None, None, 4], ["a", "b"]],
+            [["a", None, None], [None, None, "c", None, "e"]],
+            [],
+        ]
+        for values in cases:
+            sheet = {
+                "ranges": [
+                    {
+                        "name": f"r{i}",
+                        "start_cell": {"column": "A", "row": "2"},
+                        "end_cell": {"column": "A", "row": str(len(v) + 1)},
+                        "values": v,
+                    }
+                    for i, v in enumerate(values)
+                ]
+            }
+            expected = len(ranges_to_rows(sheet["ranges"]))
+            data_lengths = {
+                r["name"]: len(ranges_to_rows([r])) for r in sheet["ranges"]
+            }
+            for lengths in [None, data_lengths]:
+                with self.subTest(values=values, lengths=lengths):
+                    cp = deepcopy(sheet)
+                    remove_null_rows(cp, lengths)
+                    for r in cp["ranges"]:
+                        self.assertEqual(len(r["values"]), expected)
+                        self.assertEqual(r["end_cell"]["row"], str(expected + 1))
+
+
+class IndexedIRTests(SimpleTestCase):
+    sheets = [
+        {
+            "name": "Form",
+            "ranges": [
+                {
+                    "name": "award_reference",
+                    "start_cell": {"column": "A", "row": "2"},
+                    "end_cell": {"column": "A", "row": "3"},
+                    "values": ["AWARD-0001", "AWARD-0002"],
+                },
+                {
+                    "name": "amount_expended",
+                    "start_cell": {"column": "F", "row": "2"},
+                    "end_cell": {"column": "F", "row": "3"},
+                    "values": ["10", "20"],
+                },
+            ],
+        },
+        {
+            "name": "Coversheet",
+            "ranges": [
+                {
+                    "name": "version",
+                    "start_cell": {"column": "B", "row": "2"},
+                    "end_cell": {"column": "B", "row": "2"},
+                    "values": ["1.1.0"],
+                },
+            ],
+        },
+    ]
+
+    def setUp(self):
+        self.ir = IntermediateRepresentation(deepcopy(IndexedIRTests.sheets))
+
+    def test_lookups_match_plain_list(self):
+        plain = IndexedIRTests.sheets
+        for name in ["award_reference", "version", "no_such_range"]:
+            self.assertEqual(
+                get_range_by_name(self.ir, name), get_range_by_name(plain, name)
+            )
+            self.assertEqual(
+                get_sheet_name_by_range_name(self.ir, name),
+                get_sheet_name_by_range_name(plain, name),
+            )
+        self.assertEqual(
+            get_sheet_by_name(self.ir, "Coversheet"),
+            get_sheet_by_name(plain, "Coversheet"),
+        )
+        self.assertEqual(self.ir, plain)
+
+    def test_replace_is_copy_on_write(self):
+        new_ir = replace_range_by_name(self.ir, "amount_expended", [10, 20])
+
+        self.assertEqual(
+            get_range_by_name(new_ir, "amount_expended")["values"], [10, 20]
+        )
+        # The original IR is unchanged ...
+        self.assertEqual(self.ir, IndexedIRTests.sheets)
+        # ... and shares everything that did not change.
+        self.assertIs(new_ir[1], self.ir[1])
+        self.assertIs(
+            get_range_by_name(new_ir, "award_reference"),
+            get_range_by_name(self.ir, "award_reference"),
+        )
+
+    def test_remove_insert_and_rename(self):
+        new_ir = remove_range_by_name(self.ir, "amount_expended")
+        new_ir = insert_new_range(new_ir, "Form", "seq_number", "D", 2, [1, 2])
+        new_ir = rename_sheet_by_name(new_ir, "Form", "AdditionalNotes")
+
+        self.assertIsNone(get_range_by_name(new_ir, "amount_expended"))
+        self.assertEqual(
+            get_range_by_name(new_ir, "seq_number")["end_cell"],
+            {"column": "D", "row": "3"},
+        )
+        self.assertEqual(
+            get_sheet_name_by_range_name(new_ir, "seq_number"), "AdditionalNotes"
+        )
+        self.assertIsNone(get_sheet_by_name(new_ir, "Form"))
+        self.assertEqual(self.ir, IndexedIRTests.sheets)
+
+    def test_plain_list_is_not_modified(self):
+        plain = deepcopy(IndexedIRTests.sheets)
+
+        new_ir = replace_range_by_name(plain, "version", ["1.1.1"])
+
+        self.assertIsInstance(new_ir, IntermediateRepresentation)
+        self.assertEqual(get_range_by_name(new_ir, "version")["values"], ["1.1.1"])
+        self.assertEqual(plain, IndexedIRTests.sheets)
+
+    def test_transforms_leave_their_input_unchanged(self):
+        sheets = deepcopy(IndexedIRTests.sheets)
+        sheets[0]["name"] = "AdditionalNotes"
+        sheets[0]["ranges"].append(
+            {
+                "name": "contains_chart_or_table",
+                "start_cell": {"column": "C", "row": "2"},
+                "end_cell": {"column": "C", "row": "4"},
+                "values": [" N ", "N", None],
+            }
+        )
+        ir = IntermediateRepresentation(sheets)
+        before = deepcopy(sheets)
+
+        new_ir = run_all_transforms(ir, notes_to_sefa_transforms)
+
+        self.assertEqual(ir, before)
+        self.assertEqual(
+            get_range_by_name(new_ir, "contains_chart_or_table")["values"],
+            ["N", "N"],
+        )
+        self.assertEqual(get_sheet_name_by_range_name(new_ir, "seq_number"), "Form")
+
+
+class BenchmarkWorkbookIntakeCommandTests(SimpleTestCase):
+    def test_reports_each_stage(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_workbook_intake",
+            "--rows",
+            "24",
+            "--iterations",
+            "2",
+            stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "federal_awards has 24 awards.")
+        self.assertEqual(len(lines), 3 + 3)
+
 
 class TestExtractWorkbookAsIr(SimpleTestCase):
     def setUp(self):
@@ -156,3 +347,80 @@ class TestExtractWorkbookAsIr(SimpleTestCase):
         mock_open_workbook.return_value = self.mock_workbook
         with self.assertRaises(ValidationError):
             extract_workbook_as_ir("dummy_file_with_malformed_attr_text")
+
+
+class ReadWorkbookTests(SimpleTestCase):
+    def _upload(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Form"
+        for row, (reference, amount) in enumerate(
+            [("AWARD-0001", 10), (None, None), ("AWARD-0003", 30)], 2
+        ):
+            sheet[f"A{row}"] = reference
+            sheet[f"B{row}"] = amount
+        workbook.defined_names["award_reference"] = DefinedName(
+            "award_reference", attr_text="Form!$A$2:$A$10"
+        )
+        workbook.defined_names["amount_expended"] = DefinedName(
+            "amount_expended", attr_text="Form!$B$2:$B$10"
+        )
+        content = BytesIO()
+        workbook.save(content)
+        return SimpleUploadedFile("federal-awards.xlsx", content.getvalue())
+
+    def test_columns_read_in_one_pass(self):
+        _, values_by_name, data_lengths = read_workbook(self._upload())
+
+        # Empty rows inside a range, and after the last row with data, are None.
+        self.assertEqual(
+            values_by_name["award_reference"],
+            ["AWARD-0001", None, "AWARD-0003"] + [None] * 6,
+        )
+        self.assertEqual(values_by_name["amount_expended"][:3], [10, None, 30])
+        self.assertEqual(data_lengths, {"award_reference": 3, "amount_expended": 3})
+
+    def test_integrity_check_and_extraction_share_one_read(self):
+        upload = self._upload()
+
+        with patch(
+            "audit.intakelib.intermediate_representation._open_workbook",
+            wraps=_open_workbook,
+        ) as mock_open_workbook:
+            validate_excel_file_integrity(upload)
+            ir = extract_workbook_as_ir(upload)
+
+        mock_open_workbook.assert_called_once()
+        self.assertEqual(
+            get_range_by_name(ir, "award_reference")["end_cell"],
+            {"column": "A", "row": "4"},
+        )
+
+    def test_read_columns_pads_short_rows(self):
+        worksheet = MagicMock()
+        worksheet.iter_rows.return_value = [("a",), ("b", 2)]
+
+        values_by_name, data_lengths = read_columns(
+            worksheet, {"first": (1, 5, 7), "second": (2, 5, 6)}
+        )
+
+        self.assertEqual(
+            values_by_name, {"first": ["a", "b", None], "second": [None, 2]}
+        )
+        self.assertEqual(data_lengths, {"first": 2, "second": 2})
+
+
+class BenchmarkWorkbookLoadingCommandTests(SimpleTestCase):
+    def test_reports_each_mode(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_workbook_loading",
+            "--paths",
+            "audit/fixtures/workbooks/should_fail/notes-to-sefa",
+            stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 2)
+        self.assertIn("read_only", lines[-1])
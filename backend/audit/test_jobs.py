@@ -0,0 +1,237 @@
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from audit.jobs import HANDLERS, enqueue, run_next_job
+from audit.models import Job, SingleAuditChecklist
+from audit.models.constants import STATUS
+
+DISSEMINATE = Job.Action.DISSEMINATE
+
+
+def _failing_handler(job):
+    raise ValueError("nope")
+
+
+class JobQueueTests(TestCase):
+    def test_enqueue_once(self):
+        job = enqueue("2023-06-TSTDAT-0000000001", DISSEMINATE, {"user_id": 1})
+        again = enqueue("2023-06-TSTDAT-0000000001", DISSEMINATE, {"user_id": 2})
+
+        self.assertEqual(job, again)
+        self.assertEqual(again.payload, {"user_id": 1})
+        self.assertEqual(job.idempotency_key, "2023-06-TSTDAT-0000000001:disseminate")
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_failed_job_is_queued_again(self):
+        job = baker.make(
+            Job,
+            report_id="2023-06-TSTDAT-0000000001",
+            action=DISSEMINATE,
+            idempotency_key="2023-06-TSTDAT-0000000001:disseminate",
+            status=Job.Status.FAILED,
+            attempts=3,
+        )
+
+        job = enqueue("2023-06-TSTDAT-0000000001", DISSEMINATE)
+
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 0)
+
+    def test_nothing_to_run(self):
+        self.assertIsNone(run_next_job())
+
+    def test_jobs_run_when_due(self):
+        later = enqueue("2023-06-TSTDAT-0000000001", DISSEMINATE)
+        Job.objects.filter(pk=later.pk).update(
+            run_after=timezone.now() + timedelta(minutes=5)
+        )
+        with patch.dict(HANDLERS, {DISSEMINATE: lambda job: {"ran": job.report_id}}):
+            self.assertIsNone(run_next_job())
+
+            now = enqueue("2023-06-TSTDAT-0000000002", DISSEMINATE)
+            job = run_next_job(worker="test")
+
+        self.assertEqual(job, now)
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"ran": "2023-06-TSTDAT-0000000002"})
+        self.assertEqual(job.worker, "test")
+        self.assertEqual(job.attempts, 1)
+
+    @patch.dict(HANDLERS, {DISSEMINATE: _failing_handler})
+    def test_failures_are_retried(self):
+        job = enqueue("2023-06-TSTDAT-0000000001", DISSEMINATE)
+
+        run_next_job(job_id=job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.last_error, "ValueError: nope")
+        self.assertGreater(job.run_after, timezone.now())
+        # Not due yet.
+        self.assertIsNone(run_next_job())
+
+        for _ in range(job.max_attempts - 1):
+            run_next_job(job_id=job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, job.max_attempts)
+
+    @patch("audit.jobs.remove_workbook_artifacts")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate")
+    def test_failed_dissemination_is_rolled_back(self, mock_disseminate, _mock_remove):
+        sac = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-TSTDAT-0000000001",
+            submission_status=STATUS.AUDITEE_CERTIFIED,
+        )
+        mock_disseminate.return_value = {"errors": ["bad"]}
+
+        job = run_next_job(job_id=enqueue(sac.report_id, DISSEMINATE).id)
+
+        self.assertIn("DisseminationError", job.last_error)
+        sac.refresh_from_db()
+        self.assertEqual(sac.submission_status, STATUS.AUDITEE_CERTIFIED)
+
+    @patch("audit.jobs.remove_workbook_artifacts")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate", return_value=None)
+    def test_skipped_dissemination_is_queued_again(self, _mock_disseminate, _mock):
+        """Unlocked before its job ran, then submitted again, it is disseminated"""
+        sac = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-TSTDAT-0000000001",
+            submission_status=STATUS.AUDITEE_CERTIFIED,
+        )
+        job = enqueue(sac.report_id, DISSEMINATE)
+        SingleAuditChecklist.objects.filter(pk=sac.pk).update(
+            submission_status=STATUS.IN_PROGRESS
+        )
+
+        job = run_next_job(job_id=job.id)
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"skipped": STATUS.IN_PROGRESS})
+
+        SingleAuditChecklist.objects.filter(pk=sac.pk).update(
+            submission_status=STATUS.AUDITEE_CERTIFIED
+        )
+        again = enqueue(sac.report_id, DISSEMINATE)
+        self.assertEqual(again, job)
+        self.assertEqual(again.status, Job.Status.QUEUED)
+        self.assertIsNone(again.result)
+
+        job = run_next_job(job_id=again.id)
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertIsNone(job.result)
+        sac.refresh_from_db()
+        self.assertEqual(sac.submission_status, STATUS.DISSEMINATED)
+        self.assertEqual(enqueue(sac.report_id, DISSEMINATE).status, job.status)
+
+
+class JobWorkerTests(TransactionTestCase):
+    """
+    Workers on their own database connections, as on separate instances.
+    """
+
+    @patch("audit.jobs.remove_workbook_artifacts")
+    def test_two_workers_disseminate_once(self, _mock_remove):
+        report_ids = [f"2023-06-TSTDAT-000000000{i}" for i in range(6)]
+        for report_id in report_ids:
+            baker.make(
+                SingleAuditChecklist,
+                report_id=report_id,
+                submission_status=STATUS.AUDITEE_CERTIFIED,
+            )
+        disseminated = Counter()
+        lock = threading.Lock()
+
+        def disseminate(sac, replace=False):
+            with lock:
+                disseminated[sac.report_id] += 1
+            # Long enough for the other worker to look for jobs meanwhile.
+            time.sleep(0.05)
+            return None
+
+        def in_thread(func, *args, **kwargs):
+            try:
+                func(*args, **kwargs)
+            finally:
+                connection.close()
+
+        # Every report is submitted three times, from two "instances".
+        clicks = [
+            threading.Thread(target=in_thread, args=(enqueue, r, DISSEMINATE))
+            for r in report_ids * 3
+        ]
+        for click in clicks:
+            click.start()
+        for click in clicks:
+            click.join()
+
+        outputs = [StringIO(), StringIO()]
+        workers = [
+            threading.Thread(
+                target=in_thread,
+                args=(call_command, "run_jobs", "--burst"),
+                kwargs={"worker": f"worker-{i}", "stdout": outputs[i]},
+            )
+            for i in range(2)
+        ]
+        with patch.object(SingleAuditChecklist, "disseminate", disseminate):
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        self.assertEqual(disseminated, Counter({r: 1 for r in report_ids}))
+        self.assertEqual(
+            Job.objects.filter(status=Job.Status.SUCCEEDED).count(), len(report_ids)
+        )
+        self.assertEqual(
+            set(Job.objects.values_list("worker", flat=True)),
+            {"worker-0", "worker-1"},
+        )
+        for sac in SingleAuditChecklist.objects.all():
+            self.assertEqual(sac.submission_status, STATUS.DISSEMINATED)
+        self.assertIn("succeeded", outputs[0].getvalue())
+
+    @patch("audit.jobs.remove_workbook_artifacts")
+    def test_concurrent_worker_disseminates_once(self, _mock_remove):
+        report_ids = [f"2023-06-TSTDAT-000000000{i}" for i in range(6)]
+        for report_id in report_ids:
+            baker.make(
+                SingleAuditChecklist,
+                report_id=report_id,
+                submission_status=STATUS.AUDITEE_CERTIFIED,
+            )
+            enqueue(report_id, DISSEMINATE)
+        disseminated = Counter()
+        lock = threading.Lock()
+
+        def disseminate(sac, replace=False):
+            with lock:
+                disseminated[sac.report_id] += 1
+            time.sleep(0.05)
+            return None
+
+        out = StringIO()
+        with patch.object(SingleAuditChecklist, "disseminate", disseminate):
+            call_command(
+                "run_jobs", "--burst", "--concurrency", "3", worker="w", stdout=out
+            )
+
+        self.assertEqual(disseminated, Counter({r: 1 for r in report_ids}))
+        self.assertEqual(
+            Job.objects.filter(status=Job.Status.SUCCEEDED).count(), len(report_ids)
+        )
+        self.assertLessEqual(
+            set(Job.objects.values_list("worker", flat=True)), {"w/0", "w/1", "w/2"}
+        )
+        self.assertIn("w: 6 jobs", out.getvalue())
@@ -1,17 +1,19 @@
 from datetime import datetime, timezone
+from hashlib import sha256
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.utils import IntegrityError
 from django.db import models
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from viewflow.fsm import TransitionNotAllowed
 from model_bakery import baker
 
-from .exceptions import LateChangeError
+from .exceptions import LateChangeError, StaleAuditError
 from .models import (
     Access,
     ExcelFile,
+    History,
     SingleAuditChecklist,
     SingleAuditReportFile,
     SubmissionEvent,
@@ -19,7 +21,7 @@ from .models import (
     generate_sac_report_id,
 )
 from audit.models import Audit
-from audit.models.constants import SAC_SEQUENCE_ID
+from audit.models.constants import SAC_SEQUENCE_ID, EventType
 from audit.models.utils import get_next_sequence_id
 from .models.constants import STATUS
 from .models.viewflow import sac_transition, SingleAuditChecklistFlow
@@ -309,6 +311,22 @@ class SingleAuditReportFileTests(TestCase):
 
         self.assertEqual(f"{report_id}.pdf", sar_file.filename)
 
+    def test_digest_recorded(self):
+        """
+        The SHA-256 and length of an uploaded file should be recorded
+        """
+        file = SimpleUploadedFile("this is a file.pdf", b"this is a file")
+
+        sar_file = baker.make(
+            SingleAuditReportFile,
+            file=file,
+            sac=baker.make(SingleAuditChecklist, report_id="2023-06-TSTDAT-0000000001"),
+        )
+        sar_file.refresh_from_db()
+
+        self.assertEqual(sar_file.sha256, sha256(b"this is a file").hexdigest())
+        self.assertEqual(sar_file.size, 14)
+
     def test_no_late_upload(self):
         """
         If the associated SAC isn't in progress, we should get an error.
@@ -325,3 +343,90 @@ class SingleAuditReportFileTests(TestCase):
             sac = baker.make(SingleAuditChecklist, submission_status=status_from)
             with self.assertRaises(LateChangeError):
                 baker.make(SingleAuditReportFile, sac=sac, file=file)
+
+
+class AuditUpdateSectionsTests(TestCase):
+    def setUp(self):
+        self.user = baker.make(User)
+        self.audit = baker.make(
+            Audit,
+            audit={"general_information": {"auditee_name": "Name"}, "notes": "A"},
+        )
+        self.version = self.audit.version
+
+    def test_update_section(self):
+        self.audit.update_section(
+            "federal_awards",
+            {"federal_awards": []},
+            event_user=self.user,
+            event_type=EventType.FEDERAL_AWARDS_UPDATED,
+        )
+
+        expected = {
+            "general_information": {"auditee_name": "Name"},
+            "notes": "A",
+            "federal_awards": {"federal_awards": []},
+        }
+        self.assertEqual(self.audit.version, self.version + 1)
+        self.assertEqual(self.audit.audit, expected)
+        audit = Audit.objects.get(pk=self.audit.pk)
+        self.assertEqual(audit.version, self.version + 1)
+        self.assertEqual(audit.audit, expected)
+        self.assertEqual(
+            History.objects.as_of(audit.report_id, audit.version), expected
+        )
+
+    @override_settings(AUDIT_HISTORY_SNAPSHOT_INTERVAL=3)
+    def test_update_sections_deferred(self):
+        audit = Audit.objects.only("id", "report_id", "version", "updated_by").get(
+            pk=self.audit.pk
+        )
+        for i in range(4):
+            audit.update_sections(
+                {"notes": str(i), "federal_awards": {"total_amount_expended": i}},
+                event_user=self.user,
+                event_type=EventType.FEDERAL_AWARDS_UPDATED,
+            )
+
+        expected = {
+            "general_information": {"auditee_name": "Name"},
+            "notes": "3",
+            "federal_awards": {"total_amount_expended": 3},
+        }
+        self.assertEqual(audit.version, self.version + 4)
+        self.assertEqual(audit.audit, expected)
+        self.assertEqual(
+            History.objects.as_of(audit.report_id, audit.version), expected
+        )
+        earlier = History.objects.as_of(audit.report_id, self.version + 2)
+        self.assertEqual(earlier["notes"], "1")
+
+    def test_stale_version(self):
+        Audit.objects.filter(pk=self.audit.pk).update(version=self.version + 1)
+
+        with self.assertRaises(StaleAuditError):
+            self.audit.update_section("notes", "B", event_user=self.user)
+
+        audit = Audit.objects.get(pk=self.audit.pk)
+        self.assertEqual(audit.audit["notes"], "A")
+        self.assertEqual(self.audit.version, self.version)
+
+    def test_stale_version_retried(self):
+        Audit.objects.filter(pk=self.audit.pk).update(
+            audit=self.audit.audit | {"other": 1},
+            version=self.version + 1,
+        )
+
+        self.audit.update_section(
+            "notes",
+            "B",
+            event_user=self.user,
+            event_type=EventType.FEDERAL_AWARDS_UPDATED,
+            retry_stale=True,
+        )
+
+        audit = Audit.objects.get(pk=self.audit.pk)
+        self.assertEqual(audit.version, self.version + 2)
+        self.assertEqual(audit.audit["notes"], "B")
+        self.assertEqual(audit.audit["other"], 1)
+        self.assertEqual(self.audit.version, self.version + 2)
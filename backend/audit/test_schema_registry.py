@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from jsonschema import Draft7Validator, FormatChecker, validate
+from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
+
+from audit import schema_registry
+
+
+class SchemaRegistryTests(SimpleTestCase):
+    def setUp(self):
+        schema_registry.clear()
+
+    def test_validators_are_compiled_once(self):
+        """
+        Equivalent calls share one compiled validator
+        """
+        first = schema_registry.section_validator("FederalAwards.schema.json")
+        second = schema_registry.section_validator(
+            "FederalAwards.schema.json", Draft7Validator, False
+        )
+
+        self.assertIs(first, second)
+        self.assertIsNone(first.format_checker)
+
+    def test_validator_class_from_schema(self):
+        """
+        With no validator class, the schema's own $schema picks the class
+        """
+        validator = schema_registry.section_validator(
+            "AuditInformation.schema.json", None, True
+        )
+
+        self.assertNotEqual(type(validator), Draft7Validator)
+        self.assertIsNotNone(validator.format_checker)
+
+    def test_validate_section_matches_jsonschema_validate(self):
+        """
+        validate_section raises the same error as jsonschema.validate
+        """
+        filename = "AuditorCertification.schema.json"
+        schema = json.loads(
+            (settings.SECTION_SCHEMA_DIR / filename).read_text(encoding="utf-8")
+        )
+        value = {"auditor_certification": {"is_OMB_limited": "not a bool"}}
+
+        with self.assertRaises(JSONSchemaValidationError) as expected:
+            validate(value, schema, format_checker=FormatChecker())
+        with self.assertRaises(JSONSchemaValidationError) as actual:
+            schema_registry.validate_section(filename, value)
+
+        self.assertEqual(actual.exception.message, expected.exception.message)
+
+    def test_warm_up_compiles_every_section_validator(self):
+        schema_registry.warm_up()
+
+        self.assertEqual(
+            schema_registry._compiled_validator.cache_info().currsize,
+            len(schema_registry.SECTION_VALIDATORS),
+        )
+
+
+class BenchmarkSectionValidationCommandTests(SimpleTestCase):
+    def test_reports_each_section_and_mode(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_section_validation",
+            "--awards",
+            "2",
+            "--iterations",
+            "2",
+            stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3 + 4)
+        self.assertIn("cached", lines[-1])
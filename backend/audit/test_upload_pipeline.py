@@ -0,0 +1,250 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tempfile import NamedTemporaryFile
+import threading
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from model_bakery import baker
+from openpyxl import load_workbook
+
+from audit.fixtures.excel import (
+    ADDITIONAL_UEIS_ENTRY_FIXTURES,
+    ADDITIONAL_UEIS_TEMPLATE,
+    FORM_SECTIONS,
+)
+from audit.jobs import run_next_job
+from audit.models import (
+    Access,
+    Audit,
+    ExcelFile,
+    Job,
+    SingleAuditChecklist,
+    Upload,
+    User,
+)
+from audit.models.constants import STATUS
+from audit.test_views import _add_entry, _set_by_name
+from audit.upload_pipeline import save_audit_data
+from audit.validators import validate_while_scanning
+
+GOOD_UEI = "AAA123456BBB"
+
+
+class AVStandIn:
+    """
+    A local stand-in for the clamav-rest service, which answers every scan
+    with the given status code.
+    """
+
+    def __init__(self, status_code):
+        stand_in = self
+        self.status_code = status_code
+        self.scanned = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                stand_in.scanned.append(self.rfile.read(length))
+                self.send_response(stand_in.status_code)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/scan"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.settings = override_settings(AV_SCAN_URL=self.url)
+        self.settings.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.settings.disable()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ValidateWhileScanningTests(SimpleTestCase):
+    def test_clean_file(self):
+        file = ContentFile(b"workbook bytes", name="workbook.xlsx")
+
+        with AVStandIn(200) as av:
+            result = validate_while_scanning(file, lambda f: f.read())
+
+        self.assertEqual(result, b"workbook bytes")
+        self.assertEqual(len(av.scanned), 1)
+        self.assertIn(b"workbook bytes", av.scanned[0])
+
+    def test_infected_file(self):
+        file = ContentFile(b"workbook bytes", name="workbook.xlsx")
+
+        with AVStandIn(406), self.assertRaisesMessage(
+            ValidationError, "did not pass our security inspection"
+        ):
+            validate_while_scanning(file, lambda f: f.read())
+
+    def test_scan_error_is_raised_first(self):
+        file = ContentFile(b"workbook bytes", name="workbook.xlsx")
+
+        def validate(f):
+            raise ValueError("not a workbook")
+
+        with AVStandIn(406), self.assertRaises(ValidationError):
+            validate_while_scanning(file, validate)
+
+
+@override_settings(JOBS_RUN_INLINE=False)
+class UploadPipelineTests(TestCase):
+    def setUp(self):
+        self.user = baker.make(User)
+        self.sac = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-TSTDAT-0000000001",
+            submission_status=STATUS.IN_PROGRESS,
+            general_information={"auditee_uei": GOOD_UEI},
+        )
+        baker.make(Access, user=self.user, sac=self.sac)
+        self.client.force_login(self.user)
+        self.url = reverse(
+            f"audit:{FORM_SECTIONS.ADDITIONAL_UEIS}",
+            kwargs={
+                "report_id": self.sac.report_id,
+                "form_section": FORM_SECTIONS.ADDITIONAL_UEIS,
+            },
+        )
+
+    def _post_workbook(self):
+        entries = json.loads(ADDITIONAL_UEIS_ENTRY_FIXTURES.read_text(encoding="utf-8"))
+        workbook = load_workbook(ADDITIONAL_UEIS_TEMPLATE, data_only=True)
+        _set_by_name(workbook, "auditee_uei", GOOD_UEI)
+        _set_by_name(workbook, "section_name", FORM_SECTIONS.ADDITIONAL_UEIS)
+        _add_entry(workbook, 0, entries[0])
+        with NamedTemporaryFile(suffix=".xlsx") as tmp:
+            workbook.save(tmp.name)
+            with open(tmp.name, "rb") as excel_file:
+                return self.client.post(self.url, data={"FILES": excel_file})
+
+    def _status(self, response):
+        return self.client.get(response.json()["status_url"]).json()
+
+    def test_upload_is_validated_by_a_job(self):
+        with AVStandIn(200) as av:
+            response = self._post_workbook()
+
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(self._status(response)["status"], "validating")
+            self.assertFalse(av.scanned)
+            self.assertFalse(ExcelFile.objects.exists())
+
+            job = run_next_job()
+
+        self.assertEqual(job.action, Job.Action.VALIDATE_UPLOAD)
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(len(av.scanned), 1)
+        status = self._status(response)
+        self.assertEqual(status["status"], Upload.Status.ACCEPTED)
+        self.assertEqual(
+            status["stages"],
+            {"av_scan": "passed", "workbook": "passed", "schema": "passed"},
+        )
+        self.assertTrue(
+            ExcelFile.objects.filter(
+                sac=self.sac, form_section=FORM_SECTIONS.ADDITIONAL_UEIS
+            ).exists()
+        )
+        self.sac.refresh_from_db()
+        self.assertIn("AdditionalUEIs", self.sac.additional_ueis)
+
+    def test_infected_upload_is_rejected(self):
+        with AVStandIn(406):
+            response = self._post_workbook()
+            run_next_job()
+
+        status = self._status(response)
+        self.assertEqual(status["status"], Upload.Status.REJECTED)
+        self.assertEqual(status["result"]["type"], "error_row")
+        # As the file field's errors, the way full_clean() reported them.
+        field, messages = status["result"]["errors"][0]
+        self.assertEqual(field, "file")
+        self.assertIn("security inspection", messages[0])
+        self.assertFalse(ExcelFile.objects.exists())
+        self.sac.refresh_from_db()
+        self.assertIsNone(self.sac.additional_ueis)
+
+    def test_failed_job_is_an_error(self):
+        with AVStandIn(200):
+            response = self._post_workbook()
+        Job.objects.update(status=Job.Status.FAILED)
+
+        self.assertEqual(self._status(response)["status"], Upload.Status.ERROR)
+
+    def test_last_failed_attempt_discards_the_upload(self):
+        with AVStandIn(200):
+            response = self._post_workbook()
+        Job.objects.update(max_attempts=1)
+        upload = Upload.objects.get()
+        staged = upload.file.name
+        self.assertTrue(upload.file.storage.exists(staged))
+
+        with patch(
+            "audit.upload_pipeline.validate_upload", side_effect=RuntimeError
+        ), self.captureOnCommitCallbacks(execute=True):
+            job = run_next_job()
+
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(self._status(response)["status"], Upload.Status.ERROR)
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, Upload.Status.ERROR)
+        self.assertFalse(upload.file.storage.exists(staged))
+
+    def test_audit_changed_while_saving(self):
+        audit = baker.make(Audit, report_id=self.sac.report_id, audit={"notes": "A"})
+        update_sections = Audit._update_sections
+        calls = []
+
+        def changed_first(audit, *args):
+            # Another save lands between reading the audit and updating it.
+            if not calls:
+                Audit.objects.filter(pk=audit.pk).update(
+                    audit={"notes": "B"}, version=audit.version + 1
+                )
+            calls.append(audit.version)
+            return update_sections(audit, *args)
+
+        data = {
+            "AdditionalUEIs": {
+                "additional_ueis_entries": [{"additional_uei": GOOD_UEI}]
+            }
+        }
+        with patch.object(
+            Audit, "_update_sections", autospec=True, side_effect=changed_first
+        ):
+            save_audit_data(self.sac, FORM_SECTIONS.ADDITIONAL_UEIS, data, self.user)
+
+        self.assertEqual(calls, [audit.version, audit.version + 1])
+        audit.refresh_from_db()
+        self.assertEqual(audit.audit, {"notes": "B", "additional_ueis": [GOOD_UEI]})
+        self.sac.refresh_from_db()
+        self.assertEqual(self.sac.additional_ueis, data)
+
+    def test_status_of_another_report(self):
+        with AVStandIn(200):
+            response = self._post_workbook()
+        other = baker.make(SingleAuditChecklist, report_id="2023-06-TSTDAT-0000000002")
+        baker.make(Access, user=self.user, sac=other)
+        upload = Upload.objects.get()
+
+        response = self.client.get(
+            reverse(
+                "audit:UploadStatus",
+                kwargs={"report_id": other.report_id, "upload_id": upload.id},
+            )
+        )
+
+        self.assertEqual(response.status_code, 404)
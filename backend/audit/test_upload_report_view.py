@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from model_bakery import baker
+
+from .exceptions import StaleAuditError
+from .models import Access, Audit, SingleAuditChecklist, SingleAuditReportFile, User
+from .models.constants import STATUS
+
+PAGE_NUMBERS = {
+    "financial_statements": 1,
+    "financial_statements_opinion": 2,
+    "schedule_expenditures": 3,
+    "schedule_expenditures_opinion": 4,
+    "uniform_guidance_control": 5,
+    "uniform_guidance_compliance": 6,
+    "GAS_control": 7,
+    "GAS_compliance": 8,
+    "schedule_findings": 9,
+}
+
+
+class UploadReportViewTests(TestCase):
+    """
+    POST tests for the single audit report upload page, with the report file
+    itself accepted as is.
+    """
+
+    def setUp(self):
+        self.user = baker.make(User)
+        self.sac = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-TSTDAT-0000000001",
+            submission_status=STATUS.IN_PROGRESS,
+        )
+        baker.make(Access, user=self.user, sac=self.sac)
+        self.audit = baker.make(
+            Audit, report_id=self.sac.report_id, audit={"notes": "A"}
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("audit:UploadReport", args=[self.sac.report_id])
+
+        for method in ["full_clean", "save"]:
+            patcher = patch.object(SingleAuditReportFile, method)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _post(self):
+        report = SimpleUploadedFile("report.pdf", b"%PDF", "application/pdf")
+        return self.client.post(self.url, PAGE_NUMBERS | {"upload_report": report})
+
+    def test_audit_changed_while_uploading(self):
+        update_sections = Audit._update_sections
+        calls = []
+
+        def changed_first(audit, *args):
+            # Another save lands between reading the audit and updating it.
+            if not calls:
+                Audit.objects.filter(pk=audit.pk).update(
+                    audit={"notes": "B"}, version=audit.version + 1
+                )
+            calls.append(audit.version)
+            return update_sections(audit, *args)
+
+        with patch.object(
+            Audit, "_update_sections", autospec=True, side_effect=changed_first
+        ):
+            response = self._post()
+
+        self.assertRedirects(
+            response,
+            reverse("audit:SubmissionProgress", args=[self.sac.report_id]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(len(calls), 2)
+        self.audit.refresh_from_db()
+        self.assertEqual(self.audit.audit["notes"], "B")
+        self.assertEqual(self.audit.audit["file_information"]["filename"], "report.pdf")
+
+    def test_audit_changed_again_while_uploading(self):
+        with patch.object(
+            Audit,
+            "_update_sections",
+            side_effect=StaleAuditError(self.sac.report_id, self.audit.version),
+        ):
+            response = self._post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "This audit was changed")
+        self.audit.refresh_from_db()
+        self.assertNotIn("file_information", self.audit.audit)
@@ -1,6 +1,12 @@
+from hashlib import sha256
+from unittest.mock import patch
+
+from django.conf import settings
 from django.test import TestCase
 from audit.viewlib.compare_two_submissions import (
     compare_report_ids,
+    compare_single_audit_reports,
+    stream_digest,
     in_first_not_second,
     in_second_not_first,
     in_both,
@@ -11,9 +17,10 @@ from audit.viewlib.compare_two_submissions import (
     are_two_sacs_identical,
     _get_keysets,
 )
-from audit.models import SingleAuditChecklist
+from audit.models import SingleAuditChecklist, SingleAuditReportFile
 from model_bakery import baker
 from copy import deepcopy
+from dissemination.file_downloads import get_s3_client
 
 
 def setup_mock_db():
@@ -513,3 +520,65 @@ class CompareSubmissionTests(TestCase):
     #         [],
     #         summary.get("findings_uniform_guidance", {}).get("in_r2", None),
     #     )
+
+
+class CompareSingleAuditReportsTests(TestCase):
+    def setUp(self):
+        self.sac1, self.sac2, _ = setup_mock_db()
+
+    @patch("audit.viewlib.compare_two_submissions.get_s3_client")
+    def test_recorded_digests(self, mock_get_s3_client):
+        """Reports with recorded digests are compared without downloading them"""
+        baker.make(SingleAuditReportFile, sac=self.sac1, sha256="a" * 64, size=10)
+        baker.make(SingleAuditReportFile, sac=self.sac2, sha256="a" * 64, size=10)
+        self.assertEqual(
+            compare_single_audit_reports(self.sac1, self.sac2), {"status": "same"}
+        )
+
+        baker.make(SingleAuditReportFile, sac=self.sac2, sha256="b" * 64, size=12)
+        result = compare_single_audit_reports(self.sac1, self.sac2)
+        self.assertEqual(result["status"], "changed")
+        self.assertEqual(
+            result["in_both"][1],
+            {"from": "10 bytes", "to": "12 bytes", "key": "file length"},
+        )
+        mock_get_s3_client.assert_not_called()
+
+    @patch("audit.viewlib.compare_two_submissions.get_s3_client")
+    @patch("audit.viewlib.compare_two_submissions.stream_digest")
+    def test_legacy_reports_are_hashed_and_recorded(
+        self, mock_stream_digest, _mock_get_s3_client
+    ):
+        sar1 = baker.make(SingleAuditReportFile, sac=self.sac1)
+        baker.make(SingleAuditReportFile, sac=self.sac2, sha256="a" * 64, size=10)
+        mock_stream_digest.return_value = ("a" * 64, 10)
+
+        self.assertEqual(
+            compare_single_audit_reports(self.sac1, self.sac2), {"status": "same"}
+        )
+        mock_stream_digest.assert_called_once()
+        sar1.refresh_from_db()
+        self.assertEqual((sar1.sha256, sar1.size), ("a" * 64, 10))
+
+    @patch("audit.viewlib.compare_two_submissions.get_s3_client")
+    @patch("audit.viewlib.compare_two_submissions.stream_digest")
+    def test_missing_legacy_report(self, mock_stream_digest, _mock_get_s3_client):
+        baker.make(SingleAuditReportFile, sac=self.sac1)
+        baker.make(SingleAuditReportFile, sac=self.sac2, sha256="a" * 64, size=10)
+        mock_stream_digest.return_value = None
+
+        result = compare_single_audit_reports(self.sac1, self.sac2)
+        self.assertEqual(result["status"], "error")
+        self.assertIn(self.sac1.report_id, result["message"])
+
+    def test_stream_digest(self):
+        client = get_s3_client()
+        bucket = settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
+        body = b"%PDF-1.4 " * 300000
+        client.put_object(Bucket=bucket, Key="test/stream-digest.pdf", Body=body)
+
+        self.assertEqual(
+            stream_digest(client, bucket, "test/stream-digest.pdf"),
+            (sha256(body).hexdigest(), len(body)),
+        )
+        self.assertIsNone(stream_digest(client, bucket, "test/no-such-report.pdf"))
@@ -2,7 +2,7 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from audit.cross_validation.naming import SECTION_NAMES as SN
 from audit.fixtures.excel import (
@@ -37,6 +37,7 @@ from audit.models import (
     generate_sac_report_id,
     Audit,
     ExcelFile,
+    Job,
 )
 from audit.models.utils import get_next_sequence_id
 from audit.models.constants import STATUS, SAC_SEQUENCE_ID
@@ -46,7 +47,13 @@ from dissemination.models import FederalAward, General
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, RequestFactory, TestCase, TransactionTestCase
+from django.test import (
+    Client,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
 from django.urls import reverse
 from faker import Faker
 from model_bakery import baker
@@ -388,9 +395,9 @@ class SubmissionViewTests(TestCase):
 
     @patch("audit.models.SingleAuditChecklist.validate_full")
     @patch("audit.models.Audit.validate")
-    @patch("audit.views.submissions.sac_transition")
-    @patch("audit.views.submissions.remove_workbook_artifacts")
-    @patch("audit.views.submissions.SingleAuditChecklist.disseminate")
+    @patch("audit.jobs.sac_transition")
+    @patch("audit.jobs.remove_workbook_artifacts")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate")
     def test_post_successful(
         self,
         mock_disseminate,
@@ -403,13 +410,14 @@ class SubmissionViewTests(TestCase):
         mock_validate_sac.return_value = ({}, {})
         mock_validate_audit.return_value = ({}, {})
         mock_disseminate.return_value = None
-        response = self.client.post(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url)
 
         mock_validate_sac.assert_called_once()
         mock_validate_audit.assert_called_once()
         mock_disseminate.assert_called_once()
         mock_transition.assert_called_with(
-            response.wsgi_request,
+            ANY,
             self.sac,
             audit=self.audit,
             transition_to=STATUS.DISSEMINATED,
@@ -428,8 +436,8 @@ class SubmissionViewTests(TestCase):
 
     @patch("audit.views.submissions.SingleAuditChecklist.validate_full")
     @patch("audit.models.Audit.validate")
-    @patch("audit.views.submissions.sac_transition")
-    @patch("audit.views.submissions.SingleAuditChecklist.disseminate")
+    @patch("audit.jobs.sac_transition")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate")
     def test_post_validation_errors(
         self, mock_disseminate, mock_transition, mock_validate_audit, mock_validate_sac
     ):
@@ -450,30 +458,49 @@ class SubmissionViewTests(TestCase):
         mock_disseminate.assert_not_called()
         mock_transition.assert_not_called()
 
-    @patch("audit.views.submissions.General.objects.get")
-    @patch("audit.views.submissions.SingleAuditChecklist.validate_full")
+    @patch("audit.models.SingleAuditChecklist.validate_full")
     @patch("audit.models.Audit.validate")
-    def test_post_transaction_error(
-        self, mock_validate_audit, mock_validate_sac, mock_general_get
+    @patch("audit.jobs.sac_transition")
+    @patch("audit.jobs.remove_workbook_artifacts")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate")
+    def test_post_twice(
+        self,
+        mock_disseminate,
+        _mock_remove,
+        _mock_transition,
+        mock_validate_audit,
+        mock_validate_sac,
     ):
-        """Test that a transaction error during a submission is handled properly"""
-        self.sac.submission_status = STATUS.AUDITEE_CERTIFIED
-        self.sac.save()
+        """Test that submitting twice queues and runs one dissemination"""
+        mock_validate_sac.return_value = ({}, {})
+        mock_validate_audit.return_value = ({}, {})
+        mock_disseminate.return_value = None
 
-        awardsfile = "federal-awards--test0001test--simple-pass.json"
-        self.audit.audit.update(
-            **_load_json_audit_data(awardsfile, FORM_SECTIONS.FEDERAL_AWARDS)
-        )
-        self.audit.submission_status = STATUS.AUDITEE_CERTIFIED
-        self.audit.save()
+        self.client.post(self.url)
+        response = self.client.post(self.url)
 
-        mock_validate_audit.return_value = ({}, {})
+        mock_disseminate.assert_called_once()
+        job = Job.objects.get(report_id=self.sac.report_id)
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.payload, {"user_id": self.user.id})
+        self.assertRedirects(response, reverse("audit:MySubmissions"))
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    @patch("audit.models.SingleAuditChecklist.validate_full")
+    @patch("audit.models.Audit.validate")
+    @patch("audit.jobs.SingleAuditChecklist.disseminate")
+    def test_post_queues_dissemination(
+        self, mock_disseminate, mock_validate_audit, mock_validate_sac
+    ):
+        """Test that, with workers, the submission is left for them"""
         mock_validate_sac.return_value = ({}, {})
-        mock_general_get.return_value = True
+        mock_validate_audit.return_value = ({}, {})
 
         response = self.client.post(self.url)
 
-        self.assertEqual(response.status_code, 302)
+        mock_disseminate.assert_not_called()
+        job = Job.objects.get(report_id=self.sac.report_id)
+        self.assertEqual(job.status, Job.Status.QUEUED)
         self.assertRedirects(response, reverse("audit:MySubmissions"))
 
     def test_post_permission_denied_if_no_sac(self):
@@ -0,0 +1,235 @@
+# Validating workbook uploads in the background.
+#
+# ExcelFileHandlerView stores each upload once, as an Upload, and queues a
+# validate_upload job for it. The job AV scans the workbook on one thread
+# while it reads, extracts and validates it on another, from the same bytes.
+# An accepted workbook is copied to its ExcelFile's key and the submission is
+# updated, as when this was all done in the request; the browser polls
+# UploadStatusView until then.
+
+import logging
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.http import JsonResponse
+from django.shortcuts import redirect
+
+from audit.context import set_sac_to_context
+from audit.fixtures.excel import FORM_SECTIONS, UNKNOWN_WORKBOOK
+from audit.intakelib.exceptions import ExcelExtractionError
+from audit.jobs import job_failure_handler, job_handler
+from audit.models import Audit, ExcelFile, Job, LateChangeError, Upload
+from audit.models.constants import STATUS, EventType
+from audit.models.files import excel_file_path
+from audit.utils import FORM_SECTION_HANDLERS
+from audit.validators import (
+    validate_excel_file_integrity,
+    validate_file_infection,
+    validate_while_scanning,
+)
+from dissemination.file_downloads import copy_file
+
+logger = logging.getLogger(__name__)
+
+LATE_CHANGE_MESSAGE = "Access denied. Further changes to audits that have been marked ready for certification are not permitted."
+
+EVENT_TYPES = {
+    FORM_SECTIONS.ADDITIONAL_EINS: EventType.ADDITIONAL_EINS_UPDATED,
+    FORM_SECTIONS.ADDITIONAL_UEIS: EventType.ADDITIONAL_UEIS_UPDATED,
+    FORM_SECTIONS.CORRECTIVE_ACTION_PLAN: EventType.CORRECTIVE_ACTION_PLAN_UPDATED,
+    FORM_SECTIONS.FEDERAL_AWARDS: EventType.FEDERAL_AWARDS_UPDATED,
+    FORM_SECTIONS.FINDINGS_TEXT: EventType.FEDERAL_AWARDS_AUDIT_FINDINGS_TEXT_UPDATED,
+    FORM_SECTIONS.FINDINGS_UNIFORM_GUIDANCE: EventType.FINDINGS_UNIFORM_GUIDANCE_UPDATED,
+    FORM_SECTIONS.NOTES_TO_SEFA: EventType.NOTES_TO_SEFA_UPDATED,
+    FORM_SECTIONS.SECONDARY_AUDITORS: EventType.SECONDARY_AUDITORS_UPDATED,
+}
+
+
+def as_file_errors(validator):
+    """
+    The validator, with its ValidationErrors reported against the file field,
+    as full_clean() reported them when the view ran the file's validators.
+    """
+
+    def wrapped(file, *args):
+        try:
+            return validator(file, *args)
+        except ValidationError as err:
+            raise ValidationError({"file": err.error_list}) from err
+
+    return wrapped
+
+
+def extract_and_validate_data(form_section, file, auditee_uei):
+    handler_info = FORM_SECTION_HANDLERS.get(form_section)
+    if handler_info is None:
+        logger.warning("No form section found with name %s", form_section)
+        raise BadRequest()
+    audit_data = handler_info["extractor"](file, auditee_uei=auditee_uei)
+    validator = handler_info.get("validator")
+    if validator is not None and callable(validator):
+        validator(audit_data)
+    return audit_data
+
+
+def save_audit_data(sac, form_section, audit_data, user=None):
+    handler_info = FORM_SECTION_HANDLERS.get(form_section)
+    if handler_info is not None:
+        setattr(sac, handler_info["field_name"], audit_data)
+        sac.save()
+
+        # SOT TODO: Update Post SOC Launch
+        # SOT TODO Audit Rework
+        audit = (
+            Audit.objects.only("id", "report_id", "version", "updated_by")
+            .filter(report_id=sac.report_id)
+            .first()
+        )
+        if audit:
+            audit_update = FORM_SECTION_HANDLERS.get(form_section)["audit_object"](
+                audit_data
+            )
+            audit.update_sections(
+                audit_update,
+                event_user=user,
+                event_type=EVENT_TYPES[form_section],
+                retry_stale=True,
+            )
+
+
+def error_result(form_section, err):
+    """
+    The errors returned to the browser for a rejected upload, or None if err
+    is not a validation failure.
+    """
+    if isinstance(err, ValidationError):
+        # The good error, where bad rows/columns are sent back in the request.
+        # These come back as tuples:
+        # [(col1, row1, field1, link1, help-text1), (col2, row2, ...), ...]
+        logger.warning("%s Excel upload failed validation: %s", form_section, err)
+        return {"errors": list(err), "type": "error_row"}
+    if isinstance(err, ExcelExtractionError):
+        if err.error_key == UNKNOWN_WORKBOOK:
+            return {"errors": str(err), "type": UNKNOWN_WORKBOOK}
+        return {"errors": list(err), "type": "error_row"}
+    if isinstance(err, KeyError):
+        logger.warning("Field error. Field: %s", err)
+        return {"errors": str(err), "type": "error_field"}
+    if isinstance(err, LateChangeError):
+        logger.warning("Attempted late change.")
+        return {"errors": LATE_CHANGE_MESSAGE, "type": "no_late_changes"}
+    return None
+
+
+def upload_response(upload):
+    """
+    The response to a validated upload, as ExcelFileHandlerView returned it
+    when it validated uploads itself.
+    """
+    if upload.status == Upload.Status.ACCEPTED:
+        return redirect("/")
+    if upload.status == Upload.Status.REJECTED:
+        return JsonResponse(upload.result, status=400)
+    return JsonResponse(
+        {"errors": "The upload could not be validated.", "type": "error"},
+        status=500,
+    )
+
+
+def validate_upload(upload):
+    """
+    Validate an upload, and if it is valid, save it as its section's
+    ExcelFile and update the submission. Validation failures reject the
+    upload; other errors are raised.
+    """
+    sac = upload.sac
+    with upload.file.open("rb") as stored:
+        file = ContentFile(stored.read(), name=upload.filename)
+
+    auditee_uei = (sac.general_information or {}).get("auditee_uei")
+
+    def validate(file):
+        as_file_errors(validate_excel_file_integrity)(file)
+        upload.stages["workbook"] = "passed"
+        audit_data = extract_and_validate_data(upload.form_section, file, auditee_uei)
+        upload.stages["schema"] = "passed"
+        return audit_data
+
+    try:
+        # A rejected upload leaves nothing it saved behind.
+        with transaction.atomic(), set_sac_to_context(sac):
+            audit_data = validate_while_scanning(
+                file, validate, scan=as_file_errors(validate_file_infection)
+            )
+            upload.stages["av_scan"] = "passed"
+            _save_excel_file(upload, sac, audit_data)
+        upload.status = Upload.Status.ACCEPTED
+    except Exception as err:
+        result = error_result(upload.form_section, err)
+        if result is None:
+            raise
+        upload.status = Upload.Status.REJECTED
+        upload.result = result
+    upload.save()
+    # The upload's own copy is not needed once it has been validated.
+    _delete_staged_file(upload)
+
+
+def _delete_staged_file(upload):
+    staged = upload.file.name
+    transaction.on_commit(lambda: upload.file.storage.delete(staged))
+
+
+def _save_excel_file(upload, sac, audit_data):
+    excel_file = ExcelFile(
+        sac=sac,
+        audit=Audit.objects.find_audit_or_none(report_id=sac.report_id),
+        form_section=upload.form_section,
+        filename="temp",
+        user=upload.user,
+    )
+    # Late changes are refused before the workbook is copied.
+    if sac.submission_status != STATUS.IN_PROGRESS:
+        raise LateChangeError("Attempted Excel file upload")
+    dest_key = excel_file_path(excel_file, upload.filename)
+    copy_file(upload.file.name, dest_key)
+    excel_file.file = dest_key
+    excel_file.save(event_user=upload.user, event_type=EVENT_TYPES[upload.form_section])
+    save_audit_data(sac, upload.form_section, audit_data, upload.user)
+
+
+@job_handler(Job.Action.VALIDATE_UPLOAD)
+def validate_upload_job(job):
+    upload = Upload.objects.select_related("sac").get(pk=job.payload["upload_id"])
+    if upload.status == Upload.Status.VALIDATING:
+        validate_upload(upload)
+    return {"upload_status": upload.status}
+
+
+@job_failure_handler(Job.Action.VALIDATE_UPLOAD)
+def discard_upload(job):
+    """
+    An upload whose job has failed for good is an error, and its own copy of
+    the workbook is deleted.
+    """
+    upload = Upload.objects.get(pk=job.payload["upload_id"])
+    if upload.status == Upload.Status.VALIDATING:
+        upload.status = Upload.Status.ERROR
+        upload.save()
+        _delete_staged_file(upload)
+
+
+def upload_status(upload):
+    """
+    What UploadStatusView returns: the upload's status, its stages, and
+    for rejected uploads, the errors.
+    """
+    status = upload.status
+    if status == Upload.Status.VALIDATING:
+        job = Job.objects.filter(
+            idempotency_key=Job.key(upload.id, Job.Action.VALIDATE_UPLOAD)
+        ).first()
+        if job and job.status == Job.Status.FAILED:
+            status = Upload.Status.ERROR
+    return {"status": status, "stages": upload.stages, "result": upload.result}
@@ -145,6 +145,11 @@ urlpatterns = [
         views.CompareSubmissionsView.as_view(),
         name="CompareSubmissions",
     ),
+    path(
+        "upload-status/<str:report_id>/<uuid:upload_id>",
+        views.UploadStatusView.as_view(),
+        name="UploadStatus",
+    ),
 ]
 
 for form_section in FORM_SECTIONS:
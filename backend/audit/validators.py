@@ -1,8 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 import os
 import json
 import logging
 
-from jsonschema import Draft7Validator, FormatChecker, validate
+from jsonschema import Draft7Validator
 from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
 
 from django.core.exceptions import ValidationError
@@ -10,10 +12,10 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 import requests
-from openpyxl import load_workbook
 from pypdf import PdfReader
 
 from audit.intakelib import (
+    read_workbook,
     additional_ueis_named_ranges,
     additional_eins_named_ranges,
     corrective_action_plan_named_ranges,
@@ -33,6 +35,7 @@ from audit.fixtures.excel import (
     SECONDARY_AUDITORS_TEMPLATE_DEFINITION,
     NOTES_TO_SEFA_TEMPLATE_DEFINITION,
 )
+from audit.schema_registry import section_schema, section_validator, validate_section
 from support.decorators import newrelic_timing_metric
 
 logger = logging.getLogger(__name__)
@@ -131,104 +134,92 @@ def validate_uei_nine_digit_sequences(value):
     return value
 
 
+@newrelic_timing_metric("validate_findings_uniform_guidance_json")
 def validate_findings_uniform_guidance_json(value):
     """
     Apply JSON Schema for findings uniform guidance and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "FederalAwardsAuditFindings.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("FederalAwardsAuditFindings.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_findings_uniform_guidance_json_error(errors))
 
 
+@newrelic_timing_metric("validate_additional_ueis_json")
 def validate_additional_ueis_json(value):
     """
     Apply JSON Schema for additional UEIs and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AdditionalUEIs.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("AdditionalUEIs.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_additional_ueis_json_error(errors))
 
 
+@newrelic_timing_metric("validate_additional_eins_json")
 def validate_additional_eins_json(value):
     """
     Apply JSON Schema for additional EINs and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AdditionalEINs.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("AdditionalEINs.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_additional_eins_json_error(errors))
 
 
+@newrelic_timing_metric("validate_notes_to_sefa_json")
 def validate_notes_to_sefa_json(value):
     """
     Apply JSON Schema for notes to SEFA and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "NotesToSefa.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("NotesToSefa.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_notes_to_sefa_json_error(errors))
 
 
+@newrelic_timing_metric("validate_findings_text_json")
 def validate_findings_text_json(value):
     """
     Apply JSON Schema for findings text and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AuditFindingsText.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("AuditFindingsText.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_findings_text_json_error(errors))
 
 
+@newrelic_timing_metric("validate_corrective_action_plan_json")
 def validate_corrective_action_plan_json(value):
     """
     Apply JSON Schema for corrective action plan and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "CorrectiveActionPlan.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("CorrectiveActionPlan.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_corrective_action_json_error(errors))
 
 
+@newrelic_timing_metric("validate_federal_award_json")
 def validate_federal_award_json(value):
     """
     Apply JSON Schema for federal awards and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "FederalAwards.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("FederalAwards.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_federal_awards_json_error(errors))
 
 
+@newrelic_timing_metric("validate_general_information_schema")
 def validate_general_information_schema(general_information):
     """
     Apply JSON Schema for general information and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "GeneralInformationRequired.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-    validator = Draft7Validator(schema, format_checker=FormatChecker())
+    schema = section_schema("GeneralInformationRequired.schema.json")
+    validator = section_validator(
+        "GeneralInformationRequired.schema.json", Draft7Validator, True
+    )
     try:
         for key, val in general_information.items():
             if key in schema["properties"] and val not in [None, "", [], {}]:
@@ -384,15 +375,13 @@ def validate_audit_information_json(value, is_data_migration=True):
     return value
 
 
+@newrelic_timing_metric("validate_audit_information_schema")
 def validate_audit_information_schema(value):
     """
     Apply JSON Schema for audit information and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AuditInformation.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
     try:
-        validate(value, schema, format_checker=FormatChecker())
+        validate_section("AuditInformation.schema.json", value)
     except JSONSchemaValidationError as err:
         raise ValidationError(
             _(err.message),
@@ -400,28 +389,24 @@ def validate_audit_information_schema(value):
     return value
 
 
+@newrelic_timing_metric("validate_secondary_auditors_json")
 def validate_secondary_auditors_json(value):
     """
     Apply JSON Schema for secondary auditors and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "SecondaryAuditors.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
-    validator = Draft7Validator(schema)
+    validator = section_validator("SecondaryAuditors.schema.json")
     errors = list(validator.iter_errors(value))
     if len(errors) > 0:
         raise ValidationError(message=_secondary_auditors_json_error(errors))
 
 
+@newrelic_timing_metric("validate_auditor_certification_json")
 def validate_auditor_certification_json(value):
     """
     Apply JSON Schema for auditor certification and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AuditorCertification.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
     try:
-        validate(value, schema, format_checker=FormatChecker())
+        validate_section("AuditorCertification.schema.json", value)
     except JSONSchemaValidationError as err:
         raise ValidationError(
             _(err.message),
@@ -429,15 +414,13 @@ def validate_auditor_certification_json(value):
     return value
 
 
+@newrelic_timing_metric("validate_auditee_certification_json")
 def validate_auditee_certification_json(value):
     """
     Apply JSON Schema for auditee certification and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "AuditeeCertification.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
     try:
-        validate(value, schema, format_checker=FormatChecker())
+        validate_section("AuditeeCertification.schema.json", value)
     except JSONSchemaValidationError as err:
         raise ValidationError(
             _(err.message),
@@ -445,15 +428,13 @@ def validate_auditee_certification_json(value):
     return value
 
 
+@newrelic_timing_metric("validate_tribal_data_consent_json")
 def validate_tribal_data_consent_json(value):
     """
     Apply JSON Schema for tribal data consent and report errors.
     """
-    schema_path = settings.SECTION_SCHEMA_DIR / "TribalAccess.schema.json"
-    schema = json.loads(schema_path.read_text(encoding="utf-8"))
-
     try:
-        validate(value, schema, format_checker=FormatChecker())
+        validate_section("TribalAccess.schema.json", value)
     except JSONSchemaValidationError as err:
         raise ValidationError(
             _(err.message),
@@ -551,11 +532,36 @@ def validate_file_infection(file):
     logger.info(f"Scanning of file {file} complete.")
 
 
+def validate_while_scanning(file, validate, scan=None):
+    """
+    AV scan a copy of the file's bytes on another thread while validate(file)
+    runs on this one, and return what validate returns. If the scan fails,
+    its error is raised rather than validate's.
+    """
+    scan = scan or validate_file_infection
+    file.seek(0)
+    scan_copy = BytesIO(file.read())
+    scan_copy.name = os.path.basename(getattr(file, "name", None) or "upload")
+    file.seek(0)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        scanned = executor.submit(scan, scan_copy)
+        try:
+            result = validate(file)
+        finally:
+            # Raises the scan's ValidationError, if any, in place of validate's.
+            scanned.result()
+    return result
+
+
 def validate_excel_file_integrity(file):
-    """Files must be readable by openpyxl"""
+    """
+    Files must be readable by openpyxl. The workbook is read as it will be
+    extracted, and what was read is kept on the file for the extractor.
+    """
     try:
         logger.info(f"Attempting to load workbook from {file.name}")
-        load_workbook(filename=file)
+        read_workbook(file)
         logger.info(f"Successfully loaded workbook from {file.name}")
     except Exception:
         raise ValidationError("We were unable to process the file you uploaded.")
@@ -565,8 +571,7 @@ def validate_excel_file(file):
     validate_file_extension(file, ALLOWED_EXCEL_FILE_EXTENSIONS)
     validate_file_content_type(file, ALLOWED_EXCEL_CONTENT_TYPES)
     validate_file_size(file, MAX_EXCEL_FILE_SIZE_MB)
-    validate_file_infection(file)
-    validate_excel_file_integrity(file)
+    validate_while_scanning(file, validate_excel_file_integrity)
 
 
 def _get_error_details(xlsx_definition_template, named_ranges_row_indices):
@@ -711,8 +716,7 @@ def validate_single_audit_report_file(file):
     validate_file_extension(file, ALLOWED_SINGLE_AUDIT_REPORT_EXTENSIONS)
     validate_file_content_type(file, ALLOWED_SINGLE_AUDIT_REPORT_CONTENT_TYPES)
     validate_file_size(file, MAX_SINGLE_AUDIT_REPORT_FILE_SIZE_MB)
-    validate_file_infection(file)
-    validate_pdf_file_integrity(file)
+    validate_while_scanning(file, validate_pdf_file_integrity)
 
 
 def _additional_ueis_json_error(errors):
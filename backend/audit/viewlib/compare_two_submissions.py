@@ -1,15 +1,20 @@
 from audit.models import SingleAuditChecklist, SingleAuditReportFile
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 import logging
-import boto3
-from io import BytesIO
 from botocore.exceptions import ClientError
 from django.conf import settings
 from hashlib import sha256
 from typing import Callable, Any, Union
 
+from dissemination.file_downloads import get_s3_client
+
 logger = logging.getLogger(__name__)
 
+# Legacy reports, without recorded digests, are hashed as they download, this
+# much at a time.
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
 #########################################
 # The first set of functions compare dictionary-based
 # fields from the SAC. This would be general_info and
@@ -297,79 +302,98 @@ def compare_lists_of_objects(
     return res
 
 
-def get_s3_object(client, bucket_name, key):
-    file = BytesIO()
+def stream_digest(client, bucket_name, key):
+    """
+    The SHA-256 and length of an S3 object, hashed a chunk at a time as it
+    downloads. None if it cannot be downloaded.
+    """
     try:
-        client.download_fileobj(Bucket=bucket_name, Key=key, Fileobj=file)
+        body = client.get_object(Bucket=bucket_name, Key=key)["Body"]
     except ClientError:
         logger.error("Could not download {}".format(key))
         return None
-    return file
+    digest = sha256()
+    size = 0
+    for chunk in body.iter_chunks(chunk_size=DIGEST_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def report_key(sar: SingleAuditReportFile):
+    return f"singleauditreport/{sar.filename}"
+
+
+def record_digest(sar: SingleAuditReportFile, digest):
+    """
+    Record the digest of a report uploaded before digests were recorded. This
+    is an update, not a save, as saving a submitted report is a late change.
+    """
+    sar.sha256, sar.size = digest
+    SingleAuditReportFile.objects.filter(pk=sar.pk).update(
+        sha256=sar.sha256, size=sar.size
+    )
+
+
+def get_digests(sars: list[SingleAuditReportFile], workers=None):
+    """
+    The (sha256, size) of each report: recorded at upload, or else hashed
+    from S3, up to `workers` at a time, and recorded for next time. None for
+    the reports that cannot be downloaded.
+    """
+    digests = [(sar.sha256, sar.size) if sar.sha256 else None for sar in sars]
+    missing = [sar for sar in sars if not sar.sha256]
+    if missing:
+        client = get_s3_client()
+        bucket_name = settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
+        # The threads only download; the digests are recorded on this
+        # thread's database connection.
+        with ThreadPoolExecutor(max_workers=workers or len(missing)) as executor:
+            hashed = executor.map(
+                lambda sar: stream_digest(client, bucket_name, report_key(sar)),
+                missing,
+            )
+            hashed = dict(zip([sar.pk for sar in missing], hashed))
+        for i, sar in enumerate(sars):
+            if sar.pk in hashed and hashed[sar.pk]:
+                record_digest(sar, hashed[sar.pk])
+                digests[i] = hashed[sar.pk]
+    return digests
+
+
+def latest_report(sac: SingleAuditChecklist):
+    sars = SingleAuditReportFile.objects.filter(sac=sac)
+    # seems there can be multiple copies !
+    # return the lastest version, else revert to the first version!
+    try:
+        return sars.latest("date_created")
+    except SingleAuditReportFile.DoesNotExist:
+        return None
 
 
-def compare_single_audit_reports(  # noqa: C901
+def compare_single_audit_reports(
     sac1: SingleAuditChecklist, sac2: SingleAuditChecklist
 ):
-    sar1 = SingleAuditReportFile.objects.filter(sac=sac1)
-    sar2 = SingleAuditReportFile.objects.filter(sac=sac2)
+    sar1 = latest_report(sac1)
+    sar2 = latest_report(sac2)
 
-    # seems there can be multiple copies !
     # Make sure they both exist/have PDFs associated with them.
-    if len(sar1) == 0:
+    if sar1 is None:
         return {
             "status": "error",
             "message": f"No single audit report found for {sac1.report_id}",
         }
-    if len(sar2) == 0:
+    if sar2 is None:
         return {
             "status": "error",
             "message": f"No single audit report found for {sac2.report_id}",
         }
 
-    # return the lastest version, else revert to the first version!
-    try:
-        sar1 = sar1.latest("date_created")
-    except SingleAuditReportFile.DoesNotExist:
-        logger.error(
-            f"could not retrieve latest single audit report for {sar1.filename}"
-        )
-        sar1 = sar1.first()
-
-    try:
-        sar2 = sar2.latest("date_created")
-    except SingleAuditReportFile.DoesNotExist:
-        logger.error(
-            f"could not retrieve latest single audit report for {sar2.filename}"
-        )
-        sar2 = sar2.first()
-
-    client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-    )
-
-    # logger.info(f"FETCHING PDF: {sar1.filename}")
-    pdf1 = get_s3_object(
-        client,
-        settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
-        f"singleauditreport/{sar1.filename}",
-    )
+    digest1, digest2 = get_digests([sar1, sar2])
 
-    # logger.info(f"FETCHING PDF: {sar2.filename}")
-    pdf2 = get_s3_object(
-        client,
-        settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
-        f"singleauditreport/{sar2.filename}",
-    )
-
-    if pdf1 and pdf2:
-        pdf1_bytes = pdf1.getvalue()
-        pdf2_bytes = pdf2.getvalue()
-        sha1 = sha256(pdf1_bytes).hexdigest()
-        sha2 = sha256(pdf2_bytes).hexdigest()
-        # logger.info(f"SHA1: {sha1}:{len(pdf1_bytes)} SHA2: {sha2}:{len(pdf2_bytes)}")
+    if digest1 and digest2:
+        sha1, length1 = digest1
+        sha2, length2 = digest2
         if sha1 == sha2:
             return {"status": "same"}
         else:
@@ -384,33 +408,28 @@ def compare_single_audit_reports(  # noqa: C901
                         "key": "preview",
                     },
                     {
-                        "from": f"{len(pdf1_bytes)} bytes",
-                        "to": f"{len(pdf2_bytes)} bytes",
+                        "from": f"{length1} bytes",
+                        "to": f"{length2} bytes",
                         "key": "file length",
                     },
                 ],
             }
-    elif not pdf1 and not pdf2:
+    elif not digest1 and not digest2:
         return {
             "status": "error",
             "message": f"Could not retrieve report for {sac1.report_id} or {sac2.report_id}. Possibly contact the FAC helpdesk.",
         }
-    elif not pdf1:
+    elif not digest1:
         return {
             "status": "error",
             "message": f"Could not retrieve report for {sac1.report_id}. Possibly contact the FAC helpdesk.",
         }
-    elif not pdf2:
+    else:
         return {
             "status": "error",
             "message": f"Could not retrieve report for {sac2.report_id}. Possibly contact the FAC helpdesk.",
         }
 
-    return {
-        "status": "error",
-        "message": "Uknown error comparing PDF objects. Please contact the FAC helpdesk.",
-    }
-
 
 def report_id_to_sac(rid):
     if isinstance(rid, str):
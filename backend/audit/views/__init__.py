@@ -9,7 +9,7 @@ from .auditor_certification import (
 )
 from .certification import CertificationView, ReadyForCertificationView
 from .cross_validation import CrossValidationView
-from .excel_file_handler import ExcelFileHandlerView
+from .excel_file_handler import ExcelFileHandlerView, UploadStatusView
 from .home import Home
 from .home import Maintenance
 from .manage_submission import ManageSubmissionView
@@ -73,5 +73,6 @@ views_list = [
     TribalDataConsent,
     UnlockAfterCertificationView,
     UploadReportView,
+    UploadStatusView,
     CompareSubmissionsView,
 ]
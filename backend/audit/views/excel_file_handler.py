@@ -1,29 +1,42 @@
 import logging
 
+from django.conf import settings
 from django.views import generic
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import redirect
 from django.core.exceptions import BadRequest, PermissionDenied, ValidationError
+from django.urls import reverse
 from django.utils.datastructures import MultiValueDictKeyError
 from django.utils.decorators import method_decorator
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 
-from audit.fixtures.excel import FORM_SECTIONS, UNKNOWN_WORKBOOK
+from audit.jobs import enqueue, run_next_job
 from audit.mixins import (
     SingleAuditChecklistAccessRequiredMixin,
 )
 from audit.models import (
-    ExcelFile,
+    Job,
     LateChangeError,
     SingleAuditChecklist,
-    Audit,
+    Upload,
 )
 
-from audit.intakelib.exceptions import ExcelExtractionError
-from audit.models.constants import EventType
+from audit.models.constants import STATUS
+from audit.upload_pipeline import (
+    as_file_errors,
+    error_result,
+    upload_response,
+    upload_status,
+)
 from audit.utils import FORM_SECTION_HANDLERS
-
-from audit.context import set_sac_to_context
+from audit.validators import (
+    ALLOWED_EXCEL_CONTENT_TYPES,
+    ALLOWED_EXCEL_FILE_EXTENSIONS,
+    MAX_EXCEL_FILE_SIZE_MB,
+    validate_file_content_type,
+    validate_file_extension,
+    validate_file_size,
+)
 from dissemination.file_downloads import get_download_url, get_filename
 
 logging.basicConfig(
@@ -33,59 +46,25 @@ logger = logging.getLogger(__name__)
 
 
 class ExcelFileHandlerView(SingleAuditChecklistAccessRequiredMixin, generic.View):
-    def _create_excel_file(self, file, sac_id, form_section):
-        excel_file = ExcelFile(
-            **{
-                "file": file,
-                "filename": "temp",
-                "sac_id": sac_id,
-                "form_section": form_section,
-            }
+    def _create_upload(self, file, sac, form_section, user):
+        upload = Upload(
+            sac=sac,
+            user=user,
+            form_section=form_section,
+            file=file,
+            filename=file.name,
+        )
+        # The cheap checks are made here, as the file's validators made them;
+        # the AV scan and the workbook's are made by the validate_upload job.
+        as_file_errors(validate_file_extension)(
+            upload.file, ALLOWED_EXCEL_FILE_EXTENSIONS
+        )
+        as_file_errors(validate_file_content_type)(
+            upload.file, ALLOWED_EXCEL_CONTENT_TYPES
         )
-        excel_file.full_clean()
-        return excel_file
-
-    def _event_type(self, form_section):
-        return {
-            FORM_SECTIONS.ADDITIONAL_EINS: EventType.ADDITIONAL_EINS_UPDATED,
-            FORM_SECTIONS.ADDITIONAL_UEIS: EventType.ADDITIONAL_UEIS_UPDATED,
-            FORM_SECTIONS.CORRECTIVE_ACTION_PLAN: EventType.CORRECTIVE_ACTION_PLAN_UPDATED,
-            FORM_SECTIONS.FEDERAL_AWARDS: EventType.FEDERAL_AWARDS_UPDATED,
-            FORM_SECTIONS.FINDINGS_TEXT: EventType.FEDERAL_AWARDS_AUDIT_FINDINGS_TEXT_UPDATED,
-            FORM_SECTIONS.FINDINGS_UNIFORM_GUIDANCE: EventType.FINDINGS_UNIFORM_GUIDANCE_UPDATED,
-            FORM_SECTIONS.NOTES_TO_SEFA: EventType.NOTES_TO_SEFA_UPDATED,
-            FORM_SECTIONS.SECONDARY_AUDITORS: EventType.SECONDARY_AUDITORS_UPDATED,
-        }[form_section]
-
-    def _extract_and_validate_data(self, form_section, excel_file, auditee_uei):
-        handler_info = FORM_SECTION_HANDLERS.get(form_section)
-        if handler_info is None:
-            logger.warning("No form section found with name %s", form_section)
-            raise BadRequest()
-        audit_data = handler_info["extractor"](excel_file.file, auditee_uei=auditee_uei)
-        validator = handler_info.get("validator")
-        if validator is not None and callable(validator):
-            validator(audit_data)
-        return audit_data
-
-    def _save_audit_data(self, sac, form_section, audit_data, user=None):
-        handler_info = FORM_SECTION_HANDLERS.get(form_section)
-        if handler_info is not None:
-            setattr(sac, handler_info["field_name"], audit_data)
-            sac.save()
-
-            # SOT TODO: Update Post SOC Launch
-            # SOT TODO Audit Rework
-            audit = Audit.objects.find_audit_or_none(report_id=sac.report_id)
-            if audit:
-                audit_update = FORM_SECTION_HANDLERS.get(form_section)["audit_object"](
-                    audit_data
-                )
-                audit.audit.update(audit_update)
-                audit.save(
-                    event_user=user,
-                    event_type=self._event_type(form_section),
-                )
+        as_file_errors(validate_file_size)(upload.file, MAX_EXCEL_FILE_SIZE_MB)
+        upload.save()
+        return upload
 
     @method_decorator(csrf_exempt)
     def dispatch(self, *args, **kwargs):
@@ -109,8 +88,9 @@ class ExcelFileHandlerView(SingleAuditChecklistAccessRequiredMixin, generic.View
 
     def post(self, request, *_args, **kwargs):
         """
-        Handle Excel file upload:
-        validate Excel, validate data, verify SAC exists, redirect.
+        Handle Excel file upload: store it, and queue it to be validated and
+        saved. Returns 202, with the URL of the upload's status, or with
+        JOBS_RUN_INLINE, validates it and redirects.
         """
         try:
             report_id = kwargs["report_id"]
@@ -122,52 +102,58 @@ class ExcelFileHandlerView(SingleAuditChecklistAccessRequiredMixin, generic.View
 
             file = request.FILES["FILES"]
 
-            excel_file = self._create_excel_file(file, sac.id, form_section)
-
-            auditee_uei = None
-            if (
-                sac.general_information is not None
-                and "auditee_uei" in sac.general_information
-            ):
-                auditee_uei = sac.general_information["auditee_uei"]
-            with set_sac_to_context(sac):
-                audit_data = self._extract_and_validate_data(
-                    form_section, excel_file, auditee_uei
-                )
-                excel_file.save(
-                    event_user=request.user, event_type=self._event_type(form_section)
-                )
-                self._save_audit_data(sac, form_section, audit_data, request.user)
-
-                return redirect("/")
+            if form_section not in FORM_SECTION_HANDLERS:
+                logger.warning("No form section found with name %s", form_section)
+                raise BadRequest()
+            if sac.submission_status != STATUS.IN_PROGRESS:
+                raise LateChangeError("Attempted Excel file upload")
+
+            upload = self._create_upload(file, sac, form_section, request.user)
+            job = enqueue(
+                report_id,
+                Job.Action.VALIDATE_UPLOAD,
+                {"upload_id": str(upload.id)},
+                key=Job.key(upload.id, Job.Action.VALIDATE_UPLOAD),
+            )
+            if settings.JOBS_RUN_INLINE:
+                run_next_job(job_id=job.id)
+                upload.refresh_from_db()
+                return upload_response(upload)
+
+            return JsonResponse(
+                {
+                    "id": str(upload.id),
+                    "status": upload.status,
+                    "status_url": reverse(
+                        "audit:UploadStatus",
+                        kwargs={"report_id": report_id, "upload_id": upload.id},
+                    ),
+                },
+                status=202,
+            )
 
         except SingleAuditChecklist.DoesNotExist as err:
             logger.warning("no SingleAuditChecklist found with report ID %s", report_id)
             raise PermissionDenied() from err
-        except ValidationError as err:
-            # The good error, where bad rows/columns are sent back in the request.
-            # These come back as tuples:
-            # [(col1, row1, field1, link1, help-text1), (col2, row2, ...), ...]
-            logger.warning("%s Excel upload failed validation: %s", form_section, err)
-            return JsonResponse({"errors": list(err), "type": "error_row"}, status=400)
         except MultiValueDictKeyError as err:
             logger.warning("No file found in request")
             raise BadRequest() from err
-        except KeyError as err:
-            logger.warning("Field error. Field: %s", err)
-            return JsonResponse({"errors": str(err), "type": "error_field"}, status=400)
-        except ExcelExtractionError as err:
-            if err.error_key == UNKNOWN_WORKBOOK:
-                return JsonResponse(
-                    {"errors": str(err), "type": UNKNOWN_WORKBOOK}, status=400
-                )
-            raise JsonResponse({"errors": list(err), "type": "error_row"}, status=400)
-        except LateChangeError:
-            logger.warning("Attempted late change.")
-            return JsonResponse(
-                {
-                    "errors": "Access denied. Further changes to audits that have been marked ready for certification are not permitted.",
-                    "type": "no_late_changes",
-                },
-                status=400,
+        except (ValidationError, LateChangeError) as err:
+            return JsonResponse(error_result(form_section, err), status=400)
+
+
+class UploadStatusView(SingleAuditChecklistAccessRequiredMixin, generic.View):
+    """
+    The status of a workbook upload, for the browser to poll until it has
+    been validated. Rejected uploads include the errors, as
+    ExcelFileHandlerView returns them.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            upload = Upload.objects.get(
+                id=kwargs["upload_id"], sac__report_id=kwargs["report_id"]
             )
+        except Upload.DoesNotExist as err:
+            raise Http404() from err
+        return JsonResponse(upload_status(upload))
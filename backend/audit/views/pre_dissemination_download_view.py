@@ -3,7 +3,7 @@ from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import View
 
 from audit.intake_to_dissemination import IntakeToDissemination
-from dissemination.file_downloads import get_download_url, get_filename
+from dissemination.file_downloads import get_download_url, get_file, get_filename
 from dissemination.report_generation.audit_summary_reports import (
     generate_audit_summary_report,
 )
@@ -22,8 +22,8 @@ class PredisseminationXlsxDownloadView(SingleAuditChecklistAccessRequiredMixin,
 
 class PredisseminationPdfDownloadView(SingleAuditChecklistAccessRequiredMixin, View):
     def get(self, request, report_id):
-        filename = get_filename(report_id, "report")
-        return redirect(get_download_url(filename))
+        filename, known_to_exist = get_file(report_id, "report")
+        return redirect(get_download_url(filename, known_to_exist=known_to_exist))
 
 
 class PredisseminationSummaryReportDownloadView(
@@ -1,30 +1,26 @@
 import logging
 
 from config.settings import DOLLAR_THRESHOLDS
+from django.conf import settings
 from django.views import generic
 from django.shortcuts import render, redirect
-from django.db import transaction
 from django.db.models import F, Q
-from django.db.transaction import TransactionManagementError
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
 from audit.mixins import (
     CertifyingAuditeeRequiredMixin,
 )
+from audit.jobs import enqueue, run_next_job
 from audit.models import (
     SingleAuditChecklist,
     Audit,
     Access,
+    Job,
 )
-from audit.models.constants import STATUS, RESUBMISSION_STATUS
-from audit.models.utils import generate_audit_indexes
-from audit.models.viewflow import sac_transition
+from audit.models.constants import STATUS
 from audit.decorators import verify_status
 
-from dissemination.remove_workbook_artifacts import remove_workbook_artifacts
-from dissemination.models import General
-
 logging.basicConfig(
     format="%(asctime)s %(levelname)-8s %(module)s:%(lineno)d %(message)s"
 )
@@ -148,16 +144,17 @@ class SubmissionView(CertifyingAuditeeRequiredMixin, generic.View):
             raise PermissionDenied("You do not have access to this audit.")
 
     @verify_status(STATUS.AUDITEE_CERTIFIED)
-    def post(self, request, *args, **kwargs):  # noqa: C901
+    def post(self, request, *args, **kwargs):
         # RACE HAZARD WARNING
         # It is possible for a user to enter the submission multiple times,
         # from multiple FAC instances. This race hazard is documented in
         # backend/audit/views/README-fac-views-race-hazard-postmortem.md
+        # The submission is validated here, and then submitted and disseminated
+        # by a job. There is only ever one job per report, however many times
+        # it is queued, and only one worker can run it.
         report_id = kwargs["report_id"]
         try:
             sac = SingleAuditChecklist.objects.get(report_id=report_id)
-            resubmission_meta = sac.resubmission_meta or {}
-            previous_report_id = resubmission_meta.get("previous_report_id")
             errors, warnings = sac.validate_full()
 
             # TODO: Update Post SOC Launch
@@ -175,98 +172,16 @@ class SubmissionView(CertifyingAuditeeRequiredMixin, generic.View):
                     context,
                 )
 
-            # TODO: Update Post SOC Launch Atomic stuff should be able to go away.
-            # Only change this value if things work...
-            disseminated = "DID NOT DISSEMINATE"
-
-            # BEGIN ATOMIC BLOCK
-            with transaction.atomic():
-                sac_transition(
-                    request, sac, audit=audit, transition_to=STATUS.SUBMITTED
-                )
-                disseminated = sac.disseminate()
-
-                # If this is a resubmission, deprecate the old version.
-                if previous_report_id:
-                    old_sac = SingleAuditChecklist.objects.get(
-                        report_id=previous_report_id
-                    )
-                    old_resubmission_meta = (
-                        getattr(old_sac, "resubmission_meta", {}) or {}
-                    )
-                    old_sac.resubmission_meta = {
-                        **old_resubmission_meta,
-                        "version": old_resubmission_meta.get("version", 1),
-                        "resubmission_status": RESUBMISSION_STATUS.DEPRECATED,
-                        "next_report_id": sac.report_id,
-                        "next_row_id": sac.id,
-                    }
-                    old_audit = Audit.objects.find_audit_or_none(
-                        report_id=old_sac.report_id
-                    )
-
-                    sac_transition(
-                        request,
-                        old_sac,
-                        audit=old_audit,
-                        transition_to=STATUS.RESUBMITTED,
-                    )
-
-                    old_sac.save()
-                    old_sac.redisseminate()
-
-                if audit:
-                    audit_indexes = generate_audit_indexes(audit)
-                    audit.audit.update(audit_indexes)
-
-                # `disseminated` is None if there were no errors.
-                if disseminated is None:
-                    sac_transition(
-                        request, sac, audit=audit, transition_to=STATUS.DISSEMINATED
-                    )
-            # END ATOMIC BLOCK
-
-            # IF THE DISSEMINATION SUCCEEDED
-            # `disseminated` is None if there were no errors.
-            if disseminated is None:
-                # Remove workbook artifacts after the report has been disseminated.
-                # We do this outside of the atomic block. No race between
-                # two instances of the FAC should be able to get to this point.
-                # If we do, something will fail.
-                remove_workbook_artifacts(sac)
-
-            # IF THE DISSEMINATION FAILED
-            # If disseminated has a value, it is an error
-            # object returned from `sac.disseminate()`
-            if disseminated is not None:
-                logger.info(
-                    "{} is a `not None` value report_id[{}] for `disseminated`".format(
-                        report_id, disseminated
-                    )
-                )
+            job = enqueue(
+                report_id, Job.Action.DISSEMINATE, {"user_id": request.user.id}
+            )
+            if settings.JOBS_RUN_INLINE:
+                run_next_job(job_id=job.id)
 
             return redirect(reverse("audit:MySubmissions"))
 
         except SingleAuditChecklist.DoesNotExist:
             raise PermissionDenied("You do not have access to this audit.")
-        except TransactionManagementError:
-            # ORIGINAL COMMENT
-            # This is most likely the result of a race condition, where the user hits
-            # the submit button multiple times and the requests get round-robined to
-            # different instances, and the second attempt tries to insert an existing
-            # report_id into the dissemination.General table.
-            # Our assumption is that the first request succeeded (otherwise there
-            # wouldn't be an entry with that report_id to cause the error), and that we
-            # should log this but not report it to the user.
-            # See https://github.com/GSA-TTS/FAC/issues/3347
-            # UPDATED 2024-09-13
-            # We have not been able to trigger this error in the most recent race
-            # debugging. However, that does not mean it is impossible.
-            # Therefore, leaving this exception handler in place.
-            logger.info("IntegrityError on disseminating report_id: %s", report_id)
-            if General.objects.get(report_id=sac.report_id):
-                return redirect(reverse("audit:MySubmissions"))
-            raise
 
 
 def _friendly_status(status):
@@ -8,6 +8,7 @@ from django.views import generic
 from django.urls import reverse
 
 from audit.forms import UploadReportForm
+from audit.exceptions import StaleAuditError
 from audit.mixins import (
     SingleAuditChecklistAccessRequiredMixin,
 )
@@ -236,6 +237,13 @@ class UploadReportView(SingleAuditChecklistAccessRequiredMixin, generic.View):
             for issue in err.error_dict.get("file"):
                 form.add_error("upload_report", issue)
             return render(request, "audit/upload-report.html", context | {"form": form})
+        except StaleAuditError:
+            form.add_error(
+                "upload_report",
+                "This audit was changed while the report was uploading. "
+                "Please upload it again.",
+            )
+            return render(request, "audit/upload-report.html", context | {"form": form})
 
         return redirect(reverse("audit:SubmissionProgress", args=[report_id]))
 
@@ -314,6 +322,8 @@ def copy_previous_report_data(
         sac=current_sac,
         audit=current_audit,
         component_page_numbers=previous_sar.component_page_numbers,
+        sha256=previous_sar.sha256,
+        size=previous_sar.size,
     )
     new_sar.save(
         event_user=user,
@@ -331,17 +341,19 @@ def save_audit(
     user: User,
 ) -> None:
     # TODO: Update Post SOC Launch : Delete and move done for linting complexity
-    audit = Audit.objects.find_audit_or_none(report_id=report_id)
+    audit = (
+        Audit.objects.only("id", "report_id", "version", "updated_by")
+        .filter(report_id=report_id)
+        .first()
+    )
     if audit:
-        audit.audit.update(
+        audit.update_section(
+            "file_information",
             {
-                "file_information": {
-                    "filename": sar_file.filename,
-                    "pages": sar_file.component_page_numbers,
-                }
-            }
-        )
-        audit.save(
+                "filename": sar_file.filename,
+                "pages": sar_file.component_page_numbers,
+            },
             event_user=user,
             event_type=EventType.AUDIT_REPORT_PDF_UPDATED,
+            retry_stale=True,
         )
@@ -16,21 +16,14 @@ from .models import (
     ReportMigrationStatus,
     MigrationErrorDetail,
 )
-from audit.intake_to_dissemination import IntakeToDissemination
+from audit.intake_to_dissemination import (
+    IntakeToDissemination,
+    delete_dissemination_objects,
+)
 from audit.models.constants import STATUS
 from audit.models.viewflow import SingleAuditChecklistFlow
 from dissemination.models import (
-    AdditionalEin,
-    AdditionalUei,
-    CapText,
-    FederalAward,
-    Finding,
-    FindingText,
-    General,
     InvalidAuditRecord,
-    Note,
-    Passthrough,
-    SecondaryAuditor,
     MigrationInspectionRecord,
 )
 from census_historical_migration.migration_result import MigrationResult
@@ -39,6 +32,7 @@ from .invalid_record import InvalidRecord
 from .report_type_flag import AceFlag
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.utils import timezone as django_timezone
 
 import argparse
@@ -92,24 +86,13 @@ def step_through_certifications(sac, audit_header):
 
 def disseminate(sac):
     logger.info("Invoking movement of data from Intake to Dissemination")
-    for model in [
-        AdditionalEin,
-        AdditionalUei,
-        CapText,
-        FederalAward,
-        Finding,
-        FindingText,
-        General,
-        Note,
-        Passthrough,
-        SecondaryAuditor,
-    ]:
-        model.objects.filter(report_id=sac.report_id).delete()
-
     if sac.general_information:
         etl = IntakeToDissemination(sac)
         etl.load_all()
-        etl.save_dissemination_objects()
+        etl.save_dissemination_objects(replace=True)
+    else:
+        with connection.cursor() as cursor:
+            delete_dissemination_objects(cursor, [sac.report_id])
 
 
 def run_end_to_end(user, audit_header):
@@ -1,5 +1,4 @@
 import logging
-import boto3
 import pandas as pd
 import numpy as np
 
@@ -11,18 +10,15 @@ from django.conf import settings
 from django.apps import apps
 from collections import defaultdict
 
+from dissemination.file_downloads import get_s3_client
+
 logger = logging.getLogger(__name__)
 
 census_to_gsafac_models = list(
     apps.get_app_config("census_historical_migration").get_models()
 )
 census_to_gsafac_model_names = [m._meta.model_name for m in census_to_gsafac_models]
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-)
+s3_client = get_s3_client()
 census_to_gsafac_bucket_name = settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
 DELIMITER = ","
 
@@ -1,6 +1,5 @@
-import boto3
 from audit.exceptions import SessionExpiredException, SessionWarningException
-from dissemination.file_downloads import file_exists
+from dissemination.file_downloads import file_exists, get_s3_client
 from django.conf import settings
 from django.shortcuts import redirect, render
 
@@ -13,7 +12,8 @@ def is_maintenance_on():
     Get current status of maintenance mode.
     """
 
-    return file_exists(S3_FILENAME, show_warning=False)
+    # Not cached, so that every worker sees the change at once.
+    return file_exists(S3_FILENAME, show_warning=False, use_cache=False)
 
 
 def change_maintenance(enabled):
@@ -21,12 +21,7 @@ def change_maintenance(enabled):
     Update status of maintenance mode.
     """
 
-    s3_client = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-    )
+    s3_client = get_s3_client()
 
     # turn on.
     if enabled:
@@ -38,7 +33,7 @@ def change_maintenance(enabled):
 
     # turn off.
     else:
-        if file_exists(S3_FILENAME, show_warning=False):
+        if is_maintenance_on():
             s3_client.delete_object(
                 Bucket=settings.AWS_PRIVATE_STORAGE_BUCKET_NAME, Key=S3_FILENAME
             )
@@ -569,6 +569,60 @@ CENSUS_DATA_SOURCE = "CENSUS"
 SUMMARY_REPORT_DOWNLOAD_LIMIT = 1000
 FINDINGS_SUMMARY_REPORT_DOWNLOAD_LIMIT = 4000
 
+# The default cache is local to each process. The "shared" cache, a database
+# table made by `manage.py createcachetable`, is seen by every web and run_jobs
+# process; it holds what one process changes for all of them, such as the
+# search cache generation.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    },
+}
+
+# Search result counts are cached per normalized query. Optionally, very broad
+# searches can show the planner's row estimate instead of an exact count.
+# Caching is off during test runs so that tests don't see each other's counts.
+SEARCH_COUNT_CACHE_TTL_SECS = 0 if TEST_RUN else 10 * 60
+SEARCH_USE_ESTIMATED_COUNTS = env.bool("SEARCH_USE_ESTIMATED_COUNTS", False)
+SEARCH_ESTIMATED_COUNT_THRESHOLD = 50000
+
+# The ordered report_ids of a search are cached per normalized query and
+# invalidated on dissemination. Searches matching more rows than this are paged
+# from the database instead.
+SEARCH_RESULT_CACHE_TTL_SECS = 0 if TEST_RUN else 10 * 60
+SEARCH_RESULT_CACHE_MAX_IDS = 100000
+
+# Each process shares its S3 clients between requests. The gevent workers serve
+# many requests at once, so each client pools up to this many connections.
+# Whether a file is in S3 is kept in the shared cache for a while after it is
+# checked; files that are missing are checked again sooner, as they may be
+# about to be uploaded.
+S3_MAX_POOL_CONNECTIONS = 50
+S3_EXISTS_CACHE_TTL_SECS = 0 if TEST_RUN else 10 * 60
+S3_MISSING_CACHE_TTL_SECS = 0 if TEST_RUN else 30
+
+# Submissions are disseminated, and workbook uploads validated, by the run_jobs
+# workers. With JOBS_RUN_INLINE, the request that queues a job also runs it, as
+# when there are no workers.
+JOBS_RUN_INLINE = env.bool("JOBS_RUN_INLINE", TEST_RUN)
+JOBS_POLL_INTERVAL_SECS = 2
+# Jobs each run_jobs process runs at once, each on a thread with its own
+# database connection. Jobs mostly wait on the AV scanner, S3 and the database,
+# and a workbook whose scan is being retried holds its thread for minutes, so
+# a few threads keep the queue moving; more instances add capacity beyond that.
+JOBS_WORKER_CONCURRENCY = env.int("JOBS_WORKER_CONCURRENCY", 1 if TEST_RUN else 4)
+
+# Audit History records every nth state of an audit in full, and the states
+# in between as JSON Patches from the state before.
+AUDIT_HISTORY_SNAPSHOT_INTERVAL = 10
+
+# While both are kept, Audits can be checked against their SACs as they are
+# updated. Audit.save() always checks; Audit.update_sections() only does with
+# SOT_COMPARE_MODE.
+SOT_COMPARE_MODE = env.bool("SOT_COMPARE_MODE", False)
+
 DEFAULT_MAX_ROWS = (
     10000  # A version of this constant also exists in schemas.scrpits.render.py
 )
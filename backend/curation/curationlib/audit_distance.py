@@ -13,9 +13,19 @@ records and cluster them for linking based on the similarity between
 those records.
 """
 
+from typing import NamedTuple
+
 from Levenshtein import distance
 from config.settings import GSA_MIGRATION
 
+# The weight of each field in audit_distance and features_distance.
+AUDIT_YEAR_SCALE = 11
+AUDITEE_UEI_SCALE = 8
+EIN_SCALE = 3
+AUDITEE_EMAIL_SCALE = 1
+AUDITEE_NAME_SCALE = 3
+AUDITEE_STATE_SCALE = 8
+
 
 def edit_dist(a, b) -> int:
     return distance(a, b)
@@ -36,13 +46,13 @@ def get_audit_year(r):
 
 # ay_dist :: record, record, scaling factor -> integer
 # calculates the scaled distance between the audit year in two records
-def ay_dist(r1, r2, scale=11):
+def ay_dist(r1, r2, scale=AUDIT_YEAR_SCALE):
     return abs(get_audit_year(r2) - get_audit_year(r1)) * scale
 
 
 # uei_dist :: record, record, scaling factor -> integer
 # calculates the scaled distance between two UEIs in two records
-def uei_dist(r1, r2, scale=8):
+def uei_dist(r1, r2, scale=AUDITEE_UEI_SCALE):
     return (
         edit_dist(
             prep_string(r1.general_information["auditee_uei"]),
@@ -53,7 +63,7 @@ def uei_dist(r1, r2, scale=8):
 
 
 # ein_dist :: record, record, scaling factor -> integer
-def ein_dist(r1, r2, scale=3):
+def ein_dist(r1, r2, scale=EIN_SCALE):
     return (
         edit_dist(
             prep_string(r1.general_information["ein"]),
@@ -64,7 +74,7 @@ def ein_dist(r1, r2, scale=3):
 
 
 # auditee_email_dist :: record, record, scaling factor -> integer
-def auditee_email_dist(r1, r2, scale=1):
+def auditee_email_dist(r1, r2, scale=AUDITEE_EMAIL_SCALE):
     return (
         edit_dist(
             prep_string(r1.general_information["auditee_email"]),
@@ -75,7 +85,7 @@ def auditee_email_dist(r1, r2, scale=1):
 
 
 # auditee_name_dist :: record, record, scaling factor -> integer
-def auditee_name_dist(r1, r2, scale=3):
+def auditee_name_dist(r1, r2, scale=AUDITEE_NAME_SCALE):
     return (
         edit_dist(
             prep_string(r1.general_information["auditee_name"]),
@@ -86,7 +96,7 @@ def auditee_name_dist(r1, r2, scale=3):
 
 
 # auditee_state_dist :: record, record, scaling factor -> integer
-def auditee_state_dist(r1, r2, scale=8):
+def auditee_state_dist(r1, r2, scale=AUDITEE_STATE_SCALE):
     s1 = r1.general_information["auditee_state"]
     s2 = r2.general_information["auditee_state"]
     return scale if s1 != s2 else 0
@@ -118,6 +128,51 @@ def set_distance(r1, s):
     return dist
 
 
+class AuditFeatures(NamedTuple):
+    """The fields audit_distance compares, prepared for comparison."""
+
+    audit_year: int
+    auditee_uei: str
+    ein: str
+    auditee_email: str
+    auditee_name: str
+    auditee_state: str
+
+
+# audit_features :: record -> AuditFeatures
+# Prepares the fields of a record once, for any number of comparisons
+def audit_features(r):
+    gen_info = r.general_information
+    return AuditFeatures(
+        audit_year=get_audit_year(r),
+        auditee_uei=prep_string(gen_info["auditee_uei"]),
+        ein=prep_string(gen_info["ein"]),
+        auditee_email=prep_string(gen_info["auditee_email"]),
+        auditee_name=prep_string(gen_info["auditee_name"]),
+        auditee_state=gen_info["auditee_state"],
+    )
+
+
+# features_distance :: AuditFeatures, AuditFeatures -> integer
+# audit_distance, between two records' prepared fields
+def features_distance(f1, f2):
+    return (
+        abs(f2.audit_year - f1.audit_year) * AUDIT_YEAR_SCALE
+        + edit_dist(f1.auditee_uei, f2.auditee_uei) * AUDITEE_UEI_SCALE
+        + edit_dist(f1.ein, f2.ein) * EIN_SCALE
+        + edit_dist(f1.auditee_email, f2.auditee_email) * AUDITEE_EMAIL_SCALE
+        + edit_dist(f1.auditee_name, f2.auditee_name) * AUDITEE_NAME_SCALE
+        + (AUDITEE_STATE_SCALE if f1.auditee_state != f2.auditee_state else 0)
+    )
+
+
+# blocking_key :: AuditFeatures -> tuple
+# Every field but the email. Two records that differ in any of them are
+# at least as far apart as the smallest of those fields' scales.
+def blocking_key(f):
+    return (f.audit_year, f.auditee_state, f.auditee_uei, f.ein, f.auditee_name)
+
+
 def audit_equivalence_key(r):
     """
     Returns a normalized tuple of fields used to determine whether two records
@@ -1,9 +1,12 @@
+from collections import Counter, defaultdict
 import logging
 
 from curation.curationlib.audit_distance import (
     audit_equivalence_key,
+    audit_features,
+    blocking_key,
+    features_distance,
     get_audit_year,
-    set_distance,
 )
 from curation.curationlib.util import (
     order_reports_key,
@@ -16,8 +19,31 @@ from curation.curationlib.fetch_sacs import (
 logger = logging.getLogger(__name__)
 
 
-class MinDist:
-    pass
+# Submissions less than this far from a chain join it.
+DISTANCE_THRESHOLD = 3
+
+
+class DistanceChain:
+    """
+    A chain being built by distance: its submissions, and how many of them
+    have each set of prepared fields, so that the distance from a submission
+    to the chain is summed over the distinct ones rather than every member.
+    """
+
+    def __init__(self):
+        self.sacs = []
+        self.features = Counter()
+
+    def add(self, sac, features):
+        sac.order = len(self.sacs)
+        self.sacs.append(sac)
+        self.features[features] += 1
+
+    def distance(self, features):
+        return sum(
+            count * features_distance(features, member)
+            for member, count in self.features.items()
+        )
 
 
 def get_and_generate_submission_chains_by_equivalence(AY=None, noisy=False):
@@ -154,40 +180,37 @@ def generate_submission_chains_by_distance(sacs, noisy=False):
     For each submission, compute its distance to the existing chains.
     If it is below the threshold, insert it into an existing chain.
     Otherwise, insert into a new chain.
+
+    Only the chains in the submission's block, those sharing every field but
+    the email, are compared: a submission that differs from a chain member in
+    any other field is at least DISTANCE_THRESHOLD from that chain.
     """
     chains = []
-    THRESHOLD = 3
+    blocks = defaultdict(list)
 
     for rndx, r in enumerate(sacs):
         if noisy:
             print(
                 f"Processing {rndx} of {len(sacs)}: {r.report_id} chains: {len(chains)}"
             )
-        # Start infinitely far apart
-        md = MinDist()
-        md.distance = float("inf")
-        md.chain_index = -1
-
-        for ndx, chain in enumerate(chains):
-            d = set_distance(r, chain)
-
-            if d < md.distance:
-                md.distance = d
-                md.chain_index = ndx
+        features = audit_features(r)
+        block = blocks[blocking_key(features)]
 
-        r.distance = md.distance
-
-        if md.distance < THRESHOLD:
-            r.order = len(chains[md.chain_index])
-            chains[md.chain_index].append(r)
-        else:
-            new_chain = list()
-            r.order = 0
-            new_chain.append(r)
-            chains.append(new_chain)
+        # Start infinitely far apart
+        nearest, r.distance = None, float("inf")
+        for chain in block:
+            d = chain.distance(features)
+            if d < r.distance:
+                nearest, r.distance = chain, d
+
+        if r.distance >= DISTANCE_THRESHOLD:
+            nearest = DistanceChain()
+            block.append(nearest)
+            chains.append(nearest)
+        nearest.add(r, features)
 
     # Discard chains with one lonely SAC.
-    chains = [chain for chain in chains if len(chain) > 1]
+    chains = [chain.sacs for chain in chains if len(chain.sacs) > 1]
 
     sorted_chains = sorted(chains, key=lambda chain: get_audit_year(chain[0]))
     sorted_chains = [sorted(chain, key=order_reports_key) for chain in sorted_chains]
@@ -0,0 +1,135 @@
+import random
+import string
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+
+from curation.curationlib.audit_distance import set_distance
+from curation.curationlib.generate_resubmission_chains import (
+    DISTANCE_THRESHOLD,
+    generate_submission_chains_by_distance,
+)
+
+STATES = ["AL", "CA", "IL", "MA", "ME", "NY", "PA", "RI", "TX", "VT"]
+
+
+def _random_string(rng, alphabet, length):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def synthetic_sacs(count, audit_year=2022, resubmission_rate=0.2, seed=0):
+    """
+    count SAC-like records for one audit year. Most auditees submit once;
+    resubmission_rate of them submit again, sometimes with a typo in the
+    email, and sometimes with another UEI, EIN or state.
+    """
+    rng = random.Random(seed)
+    sacs = []
+    while len(sacs) < count:
+        general_information = {
+            "ein": _random_string(rng, string.digits, 9),
+            "auditee_uei": _random_string(rng, string.ascii_uppercase, 12),
+            "auditee_name": f"{_random_string(rng, string.ascii_uppercase, 8)} TOWNSHIP",
+            "auditee_email": f"{_random_string(rng, string.ascii_lowercase, 8)}@example.gov",
+            "auditee_state": rng.choice(STATES),
+            "auditee_fiscal_period_end": f"{audit_year}-12-31",
+        }
+        submissions = [general_information]
+        if rng.random() < resubmission_rate:
+            resubmission = dict(general_information)
+            change = rng.choice(["none", "email", "email", "ein", "state"])
+            if change == "email":
+                resubmission["auditee_email"] = "x" + resubmission["auditee_email"][1:]
+            elif change == "ein":
+                resubmission["ein"] = _random_string(rng, string.digits, 9)
+            elif change == "state":
+                resubmission["auditee_state"] = rng.choice(STATES)
+            submissions.append(resubmission)
+        for general_information in submissions:
+            day = len(sacs) % 28 + 1
+            sacs.append(
+                SimpleNamespace(
+                    report_id=f"{audit_year}-12-GSAFAC-{len(sacs) + 1:010d}",
+                    general_information=general_information,
+                    transition_name=["submitted"],
+                    transition_date=[f"{audit_year + 1}-01-{day:02d}T00:00:00Z"],
+                )
+            )
+    return sacs[:count]
+
+
+def legacy_chains_by_distance(sacs):
+    """
+    generate_submission_chains_by_distance as it was before blocking:
+    every submission is compared to every member of every chain.
+    """
+    chains = []
+    for r in sacs:
+        distances = [set_distance(r, chain) for chain in chains]
+        best = min(distances, default=float("inf"))
+        if best < DISTANCE_THRESHOLD:
+            chains[distances.index(best)].append(r)
+        else:
+            chains.append([r])
+    return [chain for chain in chains if len(chain) > 1]
+
+
+def _report_ids(chains):
+    return sorted(sorted(sac.report_id for sac in chain) for chain in chains)
+
+
+class Command(BaseCommand):
+    help = """
+    Times generate_submission_chains_by_distance on a synthetic audit year of
+    SAC-like records. Use --legacy-sample to also time the comparison of every
+    submission against every chain on the first N records, and check that
+    both find the same chains.
+
+    Usage:
+    manage.py benchmark_resubmission_chains --count 50000
+    manage.py benchmark_resubmission_chains --count 50000 --legacy-sample 3000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=50000,
+            help="Number of synthetic submissions.",
+        )
+        parser.add_argument(
+            "--legacy-sample",
+            type=int,
+            default=0,
+            help="Number of submissions to also chain without blocking.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["count"] < 1:
+            raise CommandError("--count must be at least 1.")
+        sacs = synthetic_sacs(options["count"], seed=options["seed"])
+
+        start = time.perf_counter()
+        chains = generate_submission_chains_by_distance(sacs)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"blocked: {len(sacs)} submissions, {len(chains)} chains "
+            f"in {elapsed:.2f}s"
+        )
+
+        sample_size = min(options["legacy_sample"], len(sacs))
+        if sample_size:
+            sample = sacs[:sample_size]
+            start = time.perf_counter()
+            blocked = generate_submission_chains_by_distance(sample)
+            blocked_elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            legacy = legacy_chains_by_distance(sample)
+            legacy_elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"sample of {sample_size}: blocked {blocked_elapsed:.2f}s, "
+                f"unblocked {legacy_elapsed:.2f}s, "
+                f"same chains: {_report_ids(blocked) == _report_ids(legacy)}"
+            )
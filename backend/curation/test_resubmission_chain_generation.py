@@ -6,11 +6,18 @@ from django.test import TestCase
 
 from audit.models import SingleAuditChecklist
 from config.settings import GSA_MIGRATION
+from curation.curationlib import audit_distance
 from curation.curationlib.generate_resubmission_chains import (
+    DISTANCE_THRESHOLD,
+    generate_submission_chains_by_distance,
     get_and_generate_submission_chains_by_equivalence,
     get_and_generate_submission_chains_by_distance,
     get_and_generate_submission_chain_by_report_ids,
 )
+from curation.management.commands.benchmark_resubmission_chains import (
+    legacy_chains_by_distance,
+    synthetic_sacs,
+)
 
 sac: Dict[str, Any] = {
     "report_id": "2022-42-MAGIC-0000000001",
@@ -171,6 +178,46 @@ class DistanceChainingTests(TestCase):
         for chain in sorted_chains:
             self.assertEqual(len(chain), 2)
 
+    def test_blocking_finds_the_same_chains(self):
+        # Comparing only the chains in a submission's block chains the same
+        # submissions as comparing every chain.
+        sacs = synthetic_sacs(500, resubmission_rate=0.5)
+
+        chains = generate_submission_chains_by_distance(sacs)
+
+        def report_ids(chains):
+            return sorted(sorted(r.report_id for r in chain) for chain in chains)
+
+        self.assertGreater(len(chains), 50)
+        self.assertEqual(
+            report_ids(chains), report_ids(legacy_chains_by_distance(sacs))
+        )
+
+    def test_features_distance_matches_audit_distance(self):
+        sacs = synthetic_sacs(40, resubmission_rate=0.5)
+        features = [audit_distance.audit_features(r) for r in sacs]
+
+        for i in range(len(sacs)):
+            for j in range(len(sacs)):
+                self.assertEqual(
+                    audit_distance.features_distance(features[i], features[j]),
+                    audit_distance.audit_distance(sacs[i], sacs[j]),
+                )
+
+    def test_blocked_fields_are_at_least_the_threshold_apart(self):
+        # Blocking relies on a difference in any field but the email being
+        # enough to keep two submissions out of the same chain.
+        self.assertGreaterEqual(
+            min(
+                audit_distance.AUDIT_YEAR_SCALE,
+                audit_distance.AUDITEE_UEI_SCALE,
+                audit_distance.EIN_SCALE,
+                audit_distance.AUDITEE_NAME_SCALE,
+                audit_distance.AUDITEE_STATE_SCALE,
+            ),
+            DISTANCE_THRESHOLD,
+        )
+
 
 class EquivalenceChainingTests(TestCase):
     def test_no_chains_single_record(self):
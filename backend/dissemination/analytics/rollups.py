@@ -0,0 +1,333 @@
+# Pre-aggregated analytics for disseminated records, and the analytics read
+# from them.
+#
+# The rollup tables hold totals by (year, state, entity type), and by (year,
+# state, entity type, agency, program). Dissemination refreshes the
+# (year, state) groups of the records it writes, in the same transaction;
+# `manage.py refresh_analytics_rollups` rebuilds them all.
+
+from collections import defaultdict
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from dissemination.models import (
+    AnalyticsProgramRollup,
+    AnalyticsRollup,
+    FederalAward,
+    Finding,
+    General,
+)
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock keys. A full rebuild holds the first exclusively; a refresh
+# holds it shared, and the second, per (year, state) group, exclusively.
+ROLLUP_LOCK = 8_462_001
+ROLLUP_GROUP_LOCK = 8_462_002
+
+_GROUPS_SQL = """
+    general.is_public
+    AND (EXTRACT(YEAR FROM general.fac_accepted_date)::int, general.auditee_state)
+        IN (SELECT * FROM unnest(%(years)s::int[], %(states)s::text[]))
+"""
+
+
+def _rollup_sql(where):
+    return f"""
+        WITH records AS (
+            SELECT
+                general.report_id,
+                EXTRACT(YEAR FROM general.fac_accepted_date)::int AS year,
+                general.auditee_state,
+                general.entity_type,
+                general.is_low_risk_auditee
+            FROM {General._meta.db_table} general
+            WHERE {where}
+        ), findings AS (
+            SELECT report_id, count(*) AS findings
+            FROM {Finding._meta.db_table}
+            WHERE report_id IN (SELECT report_id FROM records)
+            GROUP BY report_id
+        ), awards AS (
+            SELECT report_id, sum(amount_expended) AS award_volume
+            FROM {FederalAward._meta.db_table}
+            WHERE report_id IN (SELECT report_id FROM records)
+            GROUP BY report_id
+        )
+        INSERT INTO {AnalyticsRollup._meta.db_table} (
+            year, auditee_state, entity_type, submissions, low_risk_submissions,
+            not_low_risk_submissions, submissions_with_findings, findings,
+            award_volume
+        )
+        SELECT
+            records.year,
+            records.auditee_state,
+            records.entity_type,
+            count(*),
+            count(*) FILTER (WHERE records.is_low_risk_auditee = 'Yes'),
+            count(*) FILTER (WHERE records.is_low_risk_auditee = 'No'),
+            count(findings.report_id),
+            coalesce(sum(findings.findings), 0),
+            coalesce(sum(awards.award_volume), 0)
+        FROM records
+        LEFT JOIN findings USING (report_id)
+        LEFT JOIN awards USING (report_id)
+        GROUP BY records.year, records.auditee_state, records.entity_type
+    """
+
+
+def _program_rollup_sql(where):
+    return f"""
+        WITH records AS (
+            SELECT
+                general.report_id,
+                EXTRACT(YEAR FROM general.fac_accepted_date)::int AS year,
+                general.auditee_state,
+                general.entity_type
+            FROM {General._meta.db_table} general
+            WHERE {where}
+        ), repeat_findings AS (
+            SELECT report_id, award_reference, count(*) AS repeat_findings
+            FROM {Finding._meta.db_table}
+            WHERE is_repeat_finding = 'Y'
+                AND report_id IN (SELECT report_id FROM records)
+            GROUP BY report_id, award_reference
+        )
+        INSERT INTO {AnalyticsProgramRollup._meta.db_table} (
+            year, auditee_state, entity_type, federal_agency_prefix,
+            federal_program_name, award_volume, repeat_findings
+        )
+        SELECT
+            records.year,
+            records.auditee_state,
+            records.entity_type,
+            award.federal_agency_prefix,
+            award.federal_program_name,
+            coalesce(sum(award.amount_expended), 0),
+            coalesce(sum(repeat_findings.repeat_findings), 0)
+        FROM records
+        JOIN {FederalAward._meta.db_table} award USING (report_id)
+        LEFT JOIN repeat_findings
+            ON repeat_findings.report_id = award.report_id
+            AND repeat_findings.award_reference = award.award_reference
+        GROUP BY 1, 2, 3, 4, 5
+    """
+
+
+def rollup_groups(report_ids):
+    """The (year, state) groups of the General records with these report_ids."""
+    return {
+        (accepted.year, state)
+        for accepted, state in General.objects.filter(
+            report_id__in=report_ids
+        ).values_list("fac_accepted_date", "auditee_state")
+        if accepted
+    }
+
+
+def refresh_rollups(groups):
+    """
+    Recompute the rollups of the given (year, state) groups from the
+    disseminated records. Call it in the transaction that changed them, after
+    the change; each group is locked until it commits, so that concurrent
+    refreshes of a group see each other's records.
+    """
+    groups = sorted(groups)
+    if not groups:
+        return
+    params = {
+        "years": [year for year, _ in groups],
+        "states": [state for _, state in groups],
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [ROLLUP_LOCK])
+        for year, state in groups:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                [ROLLUP_GROUP_LOCK, f"{year}:{state}"],
+            )
+        for model in [AnalyticsRollup, AnalyticsProgramRollup]:
+            cursor.execute(
+                f"DELETE FROM {model._meta.db_table} "
+                "WHERE (year, auditee_state) "
+                "IN (SELECT * FROM unnest(%(years)s::int[], %(states)s::text[]))",
+                params,
+            )
+        cursor.execute(_rollup_sql(_GROUPS_SQL), params)
+        cursor.execute(_program_rollup_sql(_GROUPS_SQL), params)
+
+
+def rebuild_rollups():
+    """Recompute every rollup from the disseminated records."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [ROLLUP_LOCK])
+        for model in [AnalyticsRollup, AnalyticsProgramRollup]:
+            cursor.execute(f"DELETE FROM {model._meta.db_table}")
+        cursor.execute(_rollup_sql("general.is_public"))
+        cursor.execute(_program_rollup_sql("general.is_public"))
+    logger.info(
+        f"Rebuilt {AnalyticsRollup.objects.count()} analytics rollups and "
+        f"{AnalyticsProgramRollup.objects.count()} program rollups."
+    )
+
+
+def _percent(count, total):
+    return (count / total) * 100 if total > 0 else 0
+
+
+class RollupTrendAnalytics:
+    """
+    DisseminationTrendAnalytics, answered from the rollups with one grouped
+    query for all the years.
+    """
+
+    def __init__(self, years):
+        self.years = years
+        totals = (
+            AnalyticsRollup.objects.filter(year__in=[int(year) for year in years])
+            .values("year")
+            .annotate(
+                submissions=Sum("submissions"),
+                low_risk_submissions=Sum("low_risk_submissions"),
+                not_low_risk_submissions=Sum("not_low_risk_submissions"),
+                submissions_with_findings=Sum("submissions_with_findings"),
+                findings=Sum("findings"),
+                award_volume=Sum("award_volume"),
+            )
+        )
+        by_year = {row["year"]: row for row in totals}
+        empty = dict.fromkeys(
+            [
+                "submissions",
+                "low_risk_submissions",
+                "not_low_risk_submissions",
+                "submissions_with_findings",
+                "findings",
+                "award_volume",
+            ],
+            0,
+        )
+        self.totals = [(year, by_year.get(int(year), empty)) for year in years]
+
+    def total_submissions(self):
+        return [
+            {"year": year, "total": totals["submissions"]}
+            for year, totals in self.totals
+        ]
+
+    def total_award_volume(self):
+        return [
+            {"year": year, "total": totals["award_volume"]}
+            for year, totals in self.totals
+        ]
+
+    def total_findings(self):
+        return [
+            {"year": year, "total": totals["findings"]} for year, totals in self.totals
+        ]
+
+    def submissions_with_findings(self):
+        return [
+            {
+                "year": year,
+                "total": _percent(
+                    totals["submissions_with_findings"], totals["submissions"]
+                ),
+            }
+            for year, totals in self.totals
+        ]
+
+    def auditee_risk_profile(self):
+        out = []
+        for year, totals in self.totals:
+            total = totals["submissions"]
+            low_risk_count = totals["low_risk_submissions"]
+            not_low_risk_count = total - low_risk_count
+            out.append(
+                {
+                    "year": year,
+                    "low_risk": low_risk_count,
+                    "low_risk_percent": _percent(low_risk_count, total),
+                    "not_low_risk": not_low_risk_count,
+                    "not_low_risk_percent": _percent(not_low_risk_count, total),
+                }
+            )
+        return out
+
+    def risk_profile_vs_findings(self):
+        return [
+            {
+                "year": year,
+                "not_low_risk": _percent(
+                    totals["not_low_risk_submissions"], totals["submissions"]
+                ),
+                "audits_with_findings": _percent(
+                    totals["submissions_with_findings"], totals["submissions"]
+                ),
+            }
+            for year, totals in self.totals
+        ]
+
+
+class RollupStateAnalytics:
+    """
+    DisseminationStateAnalytics for one year, answered from the rollups with
+    one query per rollup table.
+    """
+
+    def __init__(self, state, year):
+        self.state = state
+        self.year = year
+
+        records = AnalyticsRollup.objects.filter(year=int(year))
+        programs = AnalyticsProgramRollup.objects.filter(year=int(year))
+        if state:
+            records = records.filter(auditee_state=state)
+            programs = programs.filter(auditee_state=state)
+        self.submissions = records.aggregate(total=Sum("submissions"))["total"] or 0
+
+        by_program = defaultdict(lambda: {"total_expended": 0, "repeat_findings": 0})
+        by_entity_type = defaultdict(int)
+        for row in programs.values("entity_type", "federal_program_name").annotate(
+            total_expended=Sum("award_volume"),
+            repeat_findings=Sum("repeat_findings"),
+        ):
+            program = by_program[row["federal_program_name"]]
+            program["total_expended"] += row["total_expended"]
+            program["repeat_findings"] += row["repeat_findings"]
+            by_entity_type[row["entity_type"]] += row["total_expended"]
+        self.programs = by_program
+        self.entity_types = by_entity_type
+
+    def single_dissemination_count(self):
+        return self.submissions
+
+    def top_programs(self, limit=None):
+        """Top funded federal programs."""
+        out = [
+            {"federal_program_name": name, "total_expended": totals["total_expended"]}
+            for name, totals in self.programs.items()
+        ]
+        out.sort(key=lambda row: -row["total_expended"])
+        return out[:limit]
+
+    def funding_by_entity_type(self, limit=None):
+        """Top funded federal programs based on entity type."""
+        out = [
+            {"entity_type": entity_type, "total_expended": total}
+            for entity_type, total in self.entity_types.items()
+        ]
+        out.sort(key=lambda row: -row["total_expended"])
+        return out[:limit]
+
+    def programs_with_repeated_findings(self, limit=None):
+        """Top federal programs with repeated findings."""
+        out = [
+            {"federal_program_name": name, "repeat_findings": totals["repeat_findings"]}
+            for name, totals in self.programs.items()
+            if totals["repeat_findings"]
+        ]
+        out.sort(key=lambda row: -row["repeat_findings"])
+        return out[:limit]
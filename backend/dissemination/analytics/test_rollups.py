@@ -0,0 +1,163 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+
+from audit.intake_to_dissemination import copy_dissemination_objects
+from dissemination.models import (
+    AnalyticsRollup,
+    Finding,
+    General,
+    FederalAward,
+)
+from dissemination.analytics.rollups import (
+    RollupStateAnalytics,
+    RollupTrendAnalytics,
+    rebuild_rollups,
+    refresh_rollups,
+)
+from dissemination.analytics.state import DisseminationStateAnalytics
+from dissemination.analytics.trends import DisseminationTrendAnalytics
+
+from model_bakery import baker
+
+TREND_METHODS = [
+    "total_submissions",
+    "total_award_volume",
+    "total_findings",
+    "submissions_with_findings",
+    "auditee_risk_profile",
+    "risk_profile_vs_findings",
+]
+
+
+def _make_record(state, year, entity_type, low_risk, awards, is_public=True):
+    """
+    A General with an award per (program, amount, findings, repeat findings)
+    in awards, and those findings.
+    """
+    general = baker.make(
+        General,
+        auditee_state=state,
+        fac_accepted_date=f"{year}-03-01",
+        entity_type=entity_type,
+        is_low_risk_auditee=low_risk,
+        is_public=is_public,
+    )
+    for i, (program, amount, findings, repeats) in enumerate(awards):
+        award_reference = f"AWARD-{i:04}"
+        baker.make(
+            FederalAward,
+            report_id=general,
+            award_reference=award_reference,
+            federal_program_name=program,
+            federal_agency_prefix="10",
+            amount_expended=amount,
+        )
+        for j in range(findings):
+            baker.make(
+                Finding,
+                report_id=general,
+                award_reference=award_reference,
+                is_repeat_finding="Y" if j < repeats else "N",
+            )
+    return general
+
+
+class RollupAnalyticsTests(TestCase):
+    def setUp(self):
+        _make_record("RI", 2023, "state", "Yes", [("Roads", 500, 2, 1)])
+        _make_record(
+            "RI", 2023, "local", "No", [("Roads", 100, 0, 0), ("Schools", 300, 1, 1)]
+        )
+        _make_record("RI", 2023, "local", "No", [])
+        _make_record("MA", 2023, "local", "Yes", [("Parks", 50, 3, 3)])
+        _make_record("RI", 2024, "tribal", "No", [("Schools", 70, 1, 0)])
+        _make_record("RI", 2024, "state", "Yes", [("Roads", 900, 0, 0)], False)
+
+    def assert_rollups_match_live(self):
+        years = ["2022", "2023", "2024"]
+        trends = RollupTrendAnalytics(years)
+        live_trends = DisseminationTrendAnalytics(years)
+        for method in TREND_METHODS:
+            self.assertEqual(
+                getattr(trends, method)(), getattr(live_trends, method)(), method
+            )
+
+        for state in ["RI", ""]:
+            state_analytics = RollupStateAnalytics(state, "2023")
+            live_state = DisseminationStateAnalytics(state, "2023")
+            self.assertEqual(
+                state_analytics.single_dissemination_count(),
+                live_state.single_dissemination_count(),
+            )
+            for method in [
+                "top_programs",
+                "funding_by_entity_type",
+                "programs_with_repeated_findings",
+            ]:
+                self.assertEqual(
+                    getattr(state_analytics, method)(limit=10),
+                    getattr(live_state, method)(limit=10),
+                    method,
+                )
+
+    def test_rebuild_rollups(self):
+        rebuild_rollups()
+
+        self.assert_rollups_match_live()
+        self.assertEqual(
+            RollupTrendAnalytics(["2023"]).total_submissions(),
+            [{"year": "2023", "total": 4}],
+        )
+
+    def test_migration_fills_rollups(self):
+        """The records disseminated before the rollups are rolled up on migrating"""
+        migration = import_module(
+            "dissemination.migrations.0030_fill_analytics_rollups"
+        )
+
+        migration.fill_analytics_rollups(apps, None)
+
+        self.assert_rollups_match_live()
+
+    def test_refresh_rollups(self):
+        """Refreshing a group replaces its rollups, and leaves the others"""
+        rebuild_rollups()
+        _make_record("RI", 2023, "state", "Yes", [("Roads", 1000, 1, 1)])
+        _make_record("MA", 2023, "local", "Yes", [("Parks", 5, 0, 0)])
+
+        refresh_rollups({(2023, "RI")})
+
+        self.assertEqual(
+            RollupStateAnalytics("RI", "2023").top_programs(limit=1),
+            [{"federal_program_name": "Roads", "total_expended": 1600}],
+        )
+        self.assertEqual(
+            RollupStateAnalytics("MA", "2023").top_programs()[0],
+            {"federal_program_name": "Parks", "total_expended": 50},
+        )
+
+        refresh_rollups({(2023, "MA")})
+
+        self.assert_rollups_match_live()
+
+    def test_dissemination_refreshes_rollups(self):
+        general = baker.prepare(
+            General,
+            auditee_state="VT",
+            fac_accepted_date="2023-03-01",
+            entity_type="local",
+            is_public=True,
+        )
+        award = baker.prepare(
+            FederalAward,
+            report_id=general,
+            federal_program_name="Roads",
+            amount_expended=10,
+        )
+
+        copy_dissemination_objects({"Generals": [general], "FederalAwards": [award]})
+
+        rollup = AnalyticsRollup.objects.get(year=2023, auditee_state="VT")
+        self.assertEqual((rollup.submissions, rollup.award_volume), (1, 10))
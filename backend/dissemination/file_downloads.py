@@ -1,6 +1,9 @@
+from functools import lru_cache
+from hashlib import sha256
 import logging
 
 from django.conf import settings
+from django.core.cache import caches
 from django.http import Http404
 
 from boto3 import client as boto3_client
@@ -12,8 +15,44 @@ from audit.models.constants import STATUS
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _s3_client(endpoint_url):
+    return boto3_client(
+        service_name="s3",
+        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
+        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
+        endpoint_url=endpoint_url,
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        ),
+    )
+
+
+def get_s3_client(external=False):
+    """
+    The process' client for the private bucket. Clients are thread safe, and
+    each keeps a pool of connections that is shared by the requests a worker
+    serves concurrently.
+
+    The internal endpoint is for requests made from within the app. The
+    external endpoint is for presigned URLs, which are requested from outside.
+    """
+    return _s3_client(
+        settings.AWS_S3_PRIVATE_EXTERNAL_ENDPOINT
+        if external
+        else settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT
+    )
+
+
 # TODO: Update Post SOC Launch -> replace get_filename with get_filename_from_audit.
-def get_filename(report_id, file_type):
+def get_file(report_id, file_type):
+    """
+    The key of the report's file of this type, and whether it is known to be
+    in S3. Single audit reports are once they are recorded, but Census reports
+    have no record, and workbooks are removed after dissemination.
+    """
     # .first() returns None if nothing is there.
     sac = SingleAuditChecklist.objects.filter(report_id=report_id).first()
     if file_type == "report":
@@ -22,10 +61,10 @@ def get_filename(report_id, file_type):
                 file_obj = SingleAuditReportFile.objects.filter(sac=sac).latest(
                     "date_created"
                 )
-                return f"singleauditreport/{file_obj.filename}"
+                return f"singleauditreport/{file_obj.filename}", True
             else:
                 if settings.CENSUS_DATA_SOURCE in report_id:
-                    return f"singleauditreport/{report_id}.pdf"
+                    return f"singleauditreport/{report_id}.pdf", False
                 else:
                     raise Http404()
         except SingleAuditReportFile.DoesNotExist:
@@ -35,11 +74,15 @@ def get_filename(report_id, file_type):
             file_obj = ExcelFile.objects.filter(sac=sac, form_section=file_type).latest(
                 "date_created"
             )
-            return f"excel/{file_obj.filename}"
+            return f"excel/{file_obj.filename}", False
         except ExcelFile.DoesNotExist:
             raise Http404()
 
 
+def get_filename(report_id, file_type):
+    return get_file(report_id, file_type)[0]
+
+
 def get_filename_from_audit(report_id, file_type):
     """
     Basically a copy of above. Used for "SOT Beta" pages. Post launch this method should replace get_filename above.
@@ -71,58 +114,73 @@ def get_filename_from_audit(report_id, file_type):
             raise Http404()
 
 
-def file_exists(filename, show_warning=True):
-    # this client uses the internal endpoint url because we're making a request to S3 from within the app
-    s3_client = boto3_client(
-        service_name="s3",
-        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT,
-        config=Config(signature_version="s3v4"),
-    )
+# Workbooks are deleted from S3 by the run_jobs workers, which must be able to
+# clear what the web processes have cached, so the cache is the shared one.
+EXISTS_CACHE = "shared"
 
-    try:
-        s3_client.head_object(
-            Bucket=settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
-            Key=filename,
-        )
 
-        return True
-    except ClientError:
-        if show_warning:
-            logger.warning(f"Unable to locate file {filename} in S3!")
-        return False
+def _exists_cache_key(filename):
+    return f"s3-exists:{sha256(filename.encode()).hexdigest()}"
 
 
-def get_download_url(filename):
-    try:
-        # this client uses the external endpoint url because we're generating a request URL that is eventually triggered from outside the app
-        s3_client = boto3_client(
-            service_name="s3",
-            region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
-            aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-            endpoint_url=settings.AWS_S3_PRIVATE_EXTERNAL_ENDPOINT,
-            config=Config(signature_version="s3v4"),
-        )
+def cache_file_exists(filename, exists):
+    """
+    Record whether the file is in S3, for S3_EXISTS_CACHE_TTL_SECS if it is
+    and S3_MISSING_CACHE_TTL_SECS if it is not.
+    """
+    cache = caches[EXISTS_CACHE]
+    ttl = (
+        settings.S3_EXISTS_CACHE_TTL_SECS
+        if exists
+        else settings.S3_MISSING_CACHE_TTL_SECS
+    )
+    if ttl:
+        cache.set(_exists_cache_key(filename), exists, ttl)
+    else:
+        cache.delete(_exists_cache_key(filename))
 
-        if file_exists(filename):
-            # Remove directory information
-            nicer_filename = filename.split("/")[-1]
-            response = s3_client.generate_presigned_url(
-                ClientMethod="get_object",
-                Params={
-                    "Bucket": settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
-                    "Key": filename,
-                    "ResponseContentDisposition": f"attachment;filename={nicer_filename}",
-                },
-                ExpiresIn=30,
+
+def file_exists(filename, show_warning=True, use_cache=True):
+    exists = (
+        caches[EXISTS_CACHE].get(_exists_cache_key(filename)) if use_cache else None
+    )
+    if exists is None:
+        try:
+            get_s3_client().head_object(
+                Bucket=settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
+                Key=filename,
             )
+            exists = True
+        except ClientError:
+            exists = False
+        if use_cache:
+            cache_file_exists(filename, exists)
 
-            return response
-        else:
-            raise Http404("File not found")
+    if not exists and show_warning:
+        logger.warning(f"Unable to locate file {filename} in S3!")
+    return exists
+
+
+def get_download_url(filename, known_to_exist=False):
+    """
+    A short-lived presigned URL for the file. Unless it is known to exist,
+    check that it does first, so that a missing file is a 404 rather than an
+    error from S3.
+    """
+    if not (known_to_exist or file_exists(filename)):
+        raise Http404("File not found")
+    try:
+        # Remove directory information
+        nicer_filename = filename.split("/")[-1]
+        return get_s3_client(external=True).generate_presigned_url(
+            ClientMethod="get_object",
+            Params={
+                "Bucket": settings.AWS_PRIVATE_STORAGE_BUCKET_NAME,
+                "Key": filename,
+                "ResponseContentDisposition": f"attachment;filename={nicer_filename}",
+            },
+            ExpiresIn=30,
+        )
     except ClientError:
         raise Http404("File not found")
 
@@ -135,23 +193,15 @@ def copy_file(source_key, dest_key):
     if not file_exists(source_key):
         raise Http404(f"Unable to locate file {source_key} in S3!")
 
-    s3_client = boto3_client(
-        service_name="s3",
-        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT,
-        config=Config(signature_version="s3v4"),
-    )
-
     source_bucket = settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
     try:
-        s3_client.copy_object(
+        get_s3_client().copy_object(
             Bucket=source_bucket,
             Key=dest_key,
             CopySource={"Bucket": source_bucket, "Key": source_key},
         )
-        return True
     except ClientError as err:
         logger.error(f"Failed to copy S3 object {source_key} -> {dest_key}: {err}")
         raise Http404("Failed to copy file") from err
+    cache_file_exists(dest_key, True)
+    return True
@@ -115,6 +115,7 @@ class AdvancedSearchForm(forms.Form):
     )
 
     # Display params
+    cursor = forms.CharField(required=False)
     limit = forms.CharField(required=False)
     page = forms.CharField(required=False)
     order_by = forms.CharField(required=False)
@@ -285,6 +286,7 @@ class SearchForm(forms.Form):
     uei_or_ein = forms.CharField(required=False)
 
     # Display params
+    cursor = forms.CharField(required=False)
     limit = forms.CharField(required=False)
     page = forms.CharField(required=False)
     order_by = forms.CharField(required=False)
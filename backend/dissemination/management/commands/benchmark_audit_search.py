@@ -0,0 +1,138 @@
+import json
+import math
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from dissemination.forms.search_forms import AdvancedSearchForm
+from dissemination.searchlib.audit_search import search as search_audit
+from dissemination.searchlib.search_utils import build_search_parameters
+
+# Representative AdvancedSearchForm payloads, as they would be POSTed from
+# the search page.
+DEFAULT_PAYLOADS = {
+    "landing_page": {
+        "audit_year": [str(date.today().year), str(date.today().year - 1)],
+    },
+    "all_years_no_filters": {
+        "audit_year": ["all_years"],
+    },
+    "single_name": {
+        "audit_year": ["all_years"],
+        "entity_name": "college",
+    },
+    "multi_word_name": {
+        "audit_year": ["all_years"],
+        "entity_name": "berea college",
+    },
+    "agency_prefix": {
+        "audit_year": [str(date.today().year - 1)],
+        "aln": "93",
+    },
+    "full_alns": {
+        "audit_year": ["all_years"],
+        "aln": "84.027, 10.555",
+    },
+    "aln_name_and_state": {
+        "audit_year": [str(date.today().year - 1)],
+        "aln": "84",
+        "entity_name": "school district",
+        "auditee_state": "TX",
+    },
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = """
+    Replays representative advanced search payloads against the Audit search
+    and reports p50/p95 query latency per payload.
+
+    Use --compare to also run each payload with index scans disabled, which
+    approximates the sequential-scan behavior prior to the search indexes.
+
+    Usage:
+    manage.py benchmark_audit_search --iterations 20 --compare
+    manage.py benchmark_audit_search --payloads path/to/payloads.json
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Number of times to run each payload.",
+        )
+        parser.add_argument(
+            "--payloads",
+            type=str,
+            default=None,
+            help="JSON file mapping payload names to AdvancedSearchForm data.",
+        )
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            default=False,
+            help="Also time each payload with index scans disabled.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        if iterations < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        payloads = DEFAULT_PAYLOADS
+        if options["payloads"]:
+            with open(options["payloads"], "r") as f:
+                payloads = json.load(f)
+
+        header = f"{'payload':<24} {'mode':<10} {'rows':>8} {'p50 ms':>9} {'p95 ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name, payload in payloads.items():
+            form = AdvancedSearchForm(payload)
+            if not form.is_valid():
+                raise CommandError(f"Invalid payload {name}: {form.errors.as_json()}")
+            form_data = form.cleaned_data
+            form_data["advanced_search_flag"] = True
+            params = build_search_parameters(form_data)
+
+            modes = [("indexed", False)]
+            if options["compare"]:
+                modes.append(("seqscan", True))
+
+            for mode, disable_indexes in modes:
+                rows, timings = self._time_search(params, iterations, disable_indexes)
+                self.stdout.write(
+                    f"{name:<24} {mode:<10} {rows:>8} "
+                    f"{percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}"
+                )
+
+    def _time_search(self, params, iterations, disable_indexes):
+        """
+        Runs the count and first page fetch that a search page view performs,
+        returning the row count and the per-iteration timings in milliseconds.
+        """
+        timings = []
+        rows = 0
+        for _ in range(iterations):
+            with transaction.atomic():
+                if disable_indexes:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_indexscan = off;")
+                        cursor.execute("SET LOCAL enable_bitmapscan = off;")
+                t0 = time.perf_counter()
+                results = search_audit(params)
+                rows = results.count()
+                list(results[:30])
+                timings.append((time.perf_counter() - t0) * 1000)
+        return rows, timings
@@ -0,0 +1,121 @@
+import gc
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dissemination.report_generation.findings_summary_report import (
+    group_by_report_id,
+    join_findings,
+)
+
+
+def synthetic_rows(report_count, findings_per_report):
+    """
+    Build general, finding, and award rows shaped like the `.values()` rows
+    used by the findings summary report. Every finding has a matching award.
+    """
+    generals, findings, awards = [], [], []
+    for r in range(report_count):
+        report_id = f"2023-06-GSAFAC-{r:010d}"
+        generals.append(
+            {
+                "report_id": report_id,
+                "auditee_name": f"Auditee {r}",
+                "auditee_uei": f"UEI{r:09d}",
+                "cognizant_agency": "93" if r % 2 else None,
+                "oversight_agency": None if r % 2 else "84",
+            }
+        )
+        for f in range(findings_per_report):
+            award_reference = f"AWARD-{f:04d}"
+            findings.append(
+                {
+                    "report_id": report_id,
+                    "award_reference": award_reference,
+                    "reference_number": f"2023-{f:03d}",
+                    "is_modified_opinion": "N",
+                    "is_other_matters": "N",
+                    "is_material_weakness": "Y",
+                    "is_significant_deficiency": "N",
+                    "is_other_findings": "N",
+                    "is_questioned_costs": "N",
+                    "is_repeat_finding": "N",
+                    "prior_finding_ref_numbers": "N/A",
+                }
+            )
+            awards.append(
+                {
+                    "report_id": report_id,
+                    "award_reference": award_reference,
+                    "federal_agency_prefix": ["10", "84", "93"][f % 3],
+                    "federal_award_extension": "123",
+                    "federal_program_name": "Program",
+                    "amount_expended": 1000,
+                    "is_direct": "Y",
+                    "is_major": "Y",
+                    "is_passthrough_award": "N",
+                    "passthrough_amount": None,
+                }
+            )
+    return generals, findings, awards
+
+
+class Command(BaseCommand):
+    help = """
+    Times the findings summary report join over synthetic rows, at fractions
+    and multiples of FINDINGS_SUMMARY_REPORT_DOWNLOAD_LIMIT reports. The join
+    should scale linearly, so the time per report should stay flat as the
+    number of reports grows.
+
+    Usage:
+    manage.py benchmark_findings_summary_report
+    manage.py benchmark_findings_summary_report --findings-per-report 10
+    """
+
+    def add_arguments(self, parser):
+        limit = settings.FINDINGS_SUMMARY_REPORT_DOWNLOAD_LIMIT
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[limit // 4, limit // 2, limit, limit * 2],
+            help="Numbers of reports to join.",
+        )
+        parser.add_argument(
+            "--findings-per-report",
+            type=int,
+            default=5,
+            help="Findings (and awards) per synthetic report.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = options["sizes"]
+        findings_per_report = options["findings_per_report"]
+        if any(size < 1 for size in sizes) or findings_per_report < 1:
+            raise CommandError("--sizes and --findings-per-report must be at least 1.")
+
+        header = (
+            f"{'reports':>8} {'findings':>9} {'rows':>9} {'ms':>9} {'us/report':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for size in sizes:
+            generals, findings, awards = synthetic_rows(size, findings_per_report)
+
+            # As timeit does, keep the garbage collector out of the timing.
+            gc.collect()
+            gc.disable()
+            t0 = time.perf_counter()
+            findings_by_report_id = group_by_report_id(findings)
+            awards_keyed = {(a["report_id"], a["award_reference"]): a for a in awards}
+            results = join_findings(generals, findings_by_report_id, awards_keyed)
+            elapsed = time.perf_counter() - t0
+            gc.enable()
+
+            rows = sum(len(v) for v in results.values())
+            self.stdout.write(
+                f"{size:>8} {len(findings):>9} {rows:>9} "
+                f"{elapsed * 1000:>9.1f} {elapsed * 1e6 / size:>10.1f}"
+            )
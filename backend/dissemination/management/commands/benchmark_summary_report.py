@@ -0,0 +1,88 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from audit.models import Audit
+from audit.models.constants import STATUS
+from dissemination.report_generation.audit_summary_reports import (
+    generate_audit_summary_report,
+    stream_audit_summary_report,
+)
+
+DEFAULT_SIZES = [1000, 5000, 10000]
+
+
+class Command(BaseCommand):
+    help = """
+    Generates the Audit summary report for the first N disseminated audits,
+    in memory and streamed, and reports the peak Python memory allocated and
+    the elapsed time for each.
+
+    Peak memory is measured with tracemalloc, so it covers Python allocations
+    (audit JSON, rows, openpyxl cells) rather than total process RSS.
+
+    Usage:
+    manage.py benchmark_summary_report
+    manage.py benchmark_summary_report --sizes 1000 5000 --modes streaming
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=DEFAULT_SIZES,
+            help="Numbers of reports to include.",
+        )
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=["in_memory", "streaming"],
+            default=["in_memory", "streaming"],
+            help="Report generation modes to measure.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = options["sizes"]
+        if any(size < 1 for size in sizes):
+            raise CommandError("--sizes must all be at least 1.")
+
+        report_ids = list(
+            Audit.objects.filter(submission_status=STATUS.DISSEMINATED)
+            .order_by("report_id")
+            .values_list("report_id", flat=True)[: max(sizes)]
+        )
+        if not report_ids:
+            raise CommandError("No disseminated audits to report on.")
+
+        header = f"{'requested':>9} {'reports':>8} {'mode':<10} {'peak MB':>9} {'seconds':>9} {'file MB':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for size in sizes:
+            for mode in options["modes"]:
+                peak, seconds, file_size = self._measure(mode, report_ids[:size])
+                self.stdout.write(
+                    f"{size:>9} {len(report_ids[:size]):>8} {mode:<10} "
+                    f"{peak / 2**20:>9.1f} {seconds:>9.2f} {file_size / 2**20:>8.2f}"
+                )
+
+    def _measure(self, mode, report_ids):
+        """
+        Returns the peak traced memory in bytes, the elapsed seconds, and the
+        size of the generated workbook in bytes.
+        """
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        if mode == "streaming":
+            _, report_file = stream_audit_summary_report(report_ids, True)
+            file_size = report_file.seek(0, 2)
+            report_file.close()
+        else:
+            _, workbook_bytes = generate_audit_summary_report(report_ids, True)
+            file_size = workbook_bytes.getbuffer().nbytes
+        seconds = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, seconds, file_size
@@ -1,16 +1,33 @@
+import time
+
 from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+from django.utils import timezone
+
 from dissemination.api_versions import exec_sql_at_path
+from dissemination.models import General, MaterializedViewRefresh
+from dissemination.searchlib.search_cache import invalidate_search_cache
+
+COMBINED = "dissemination_combined"
 
 
 class Command(BaseCommand):
     help = """
     Runs sql scripts  to recreate access tables for the postgrest API.
+
+    --refresh rebuilds the views, locking out readers until it finishes.
+    --refresh --concurrently rebuilds them without locking out readers, and
+    only rewrites the rows that changed.
+    --refresh --incremental refreshes concurrently only if reports have been
+    disseminated, resubmitted or removed since the last refresh.
     """
 
     def add_arguments(self, parser):
         parser.add_argument("-c", "--create", action="store_true", default=False)
         parser.add_argument("-d", "--drop", action="store_true", default=False)
         parser.add_argument("-r", "--refresh", action="store_true", default=False)
+        parser.add_argument("--concurrently", action="store_true", default=False)
+        parser.add_argument("--incremental", action="store_true", default=False)
 
     def handle(self, *args, **options):
         path = "dissemination/sql"
@@ -19,4 +36,71 @@ class Command(BaseCommand):
         elif options["drop"]:
             exec_sql_at_path(path, "drop_materialized_views.sql")
         elif options["refresh"]:
+            if options["incremental"]:
+                method = "incremental"
+            elif options["concurrently"]:
+                method = "concurrent"
+            else:
+                method = "full"
+            self.refresh(path, method)
+
+    def refresh(self, path, method):
+        # Read the watermark before refreshing, so that anything disseminated
+        # during the refresh is picked up by the next one.
+        watermark = General.objects.aggregate(
+            general_watermark=Max("id"), general_count=Count("id")
+        )
+        watermark["general_watermark"] = watermark["general_watermark"] or 0
+
+        if method == "incremental":
+            changes = _changes_since_last_refresh(watermark)
+            if changes == (set(), 0):
+                self.stdout.write(
+                    f"{COMBINED} is up to date; nothing disseminated since the last refresh."
+                )
+                return
+            if changes is not None:
+                added, removed = changes
+                self.stdout.write(
+                    f"{len(added)} reports disseminated and {removed} records "
+                    "removed since the last refresh."
+                )
+
+        start = time.monotonic()
+        if method == "full":
             exec_sql_at_path(path, "refresh_materialized_views.sql")
+        else:
+            exec_sql_at_path(path, "refresh_materialized_views_concurrently.sql")
+        duration = time.monotonic() - start
+
+        MaterializedViewRefresh.objects.update_or_create(
+            view_name=COMBINED,
+            defaults={
+                **watermark,
+                "method": method,
+                "refreshed_at": timezone.now(),
+                "duration": duration,
+            },
+        )
+        # Advanced search reads from the refreshed views.
+        invalidate_search_cache()
+        self.stdout.write(f"Refreshed {COMBINED} ({method}) in {duration:.2f}s.")
+
+
+def _changes_since_last_refresh(watermark):
+    """
+    The report_ids disseminated since the last refresh of dissemination_combined,
+    and the number of dissemination_general rows removed since, or None if it
+    has never been refreshed here. A resubmission redisseminates the report it
+    replaces, so it shows up as both.
+    """
+    last = MaterializedViewRefresh.objects.filter(view_name=COMBINED).first()
+    if last is None:
+        return None
+    added = set(
+        General.objects.filter(
+            id__gt=last.general_watermark, id__lte=watermark["general_watermark"]
+        ).values_list("report_id", flat=True)
+    )
+    kept = watermark["general_count"] - len(added)
+    return added, last.general_count - kept
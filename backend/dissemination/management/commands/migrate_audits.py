@@ -14,15 +14,24 @@
 #    - If you want to ONLY target disseminated records, pass the parameter "--disseminated".
 #    - If you want to ONLY target intake records, pass the parameter "--intake".
 #    - If you want to target ALL records, leave out the parameters.
+#    - "--batch-size" sets how many records are migrated per transaction, and
+#      "--workers" how many processes migrate at once.
 
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from itertools import repeat
+from multiprocessing import get_context
+import json
 import logging
 import time
 import typing
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
-from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
 
 from audit.intakelib.mapping_additional_eins import additional_eins_audit_view
 from audit.intakelib.mapping_additional_ueis import additional_ueis_audit_view
@@ -49,14 +58,29 @@ from audit.models import (
 from audit.models.history import History
 from audit.models.constants import STATUS, EventType
 from audit.models.utils import (
+    copy_rows,
     generate_audit_indexes,
     convert_utc_to_american_samoa_zone,
 )
+from support.cog_over_w_audit import preloaded_baselines
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
+    help = """
+    Migrates SingleAuditChecklists to Audits, in chunks of --batch-size SACs.
+    Each chunk is read with a few queries, turned into Audit, History, and
+    waiver rows, and loaded with COPY in one transaction, which also links the
+    SAC's accesses and files to its Audit and marks the SAC as migrated.
+
+    With --workers, the SACs to migrate are split into that many ranges of
+    report_id, each migrated by its own process. Every chunk commits on its
+    own, so a stopped migration picks up where it left off when run again.
+
+    Prints a JSON summary: records migrated, records/sec, and the seconds
+    spent in each phase.
+    """
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -74,221 +98,330 @@ class Command(BaseCommand):
             type=str,
             help="Migrate a specific SingleAuditChecklist by ID.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of SACs migrated in each transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes to migrate with.",
+        )
 
     def handle(self, *args, **kwargs):
+        if kwargs["batch_size"] < 1 or kwargs["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be at least 1.")
 
         logger.info("Starting migration...")
-        BATCH_SIZE = 100
-
-        # iterate through unmigrated SACs.
-        queryset = _get_query(kwargs, None)
-        logger.info("Got queryset... Get count...")
-        total = queryset.count()
-        count = 0
-        total_migrated = 0
-        logger.info(f"Found {total} records to parse through.")
+        t_start = time.monotonic()
+        report_ids = list(
+            _get_query(kwargs, None)
+            .order_by("report_id")
+            .values_list("report_id", flat=True)
+        )
+        logger.info(f"Found {len(report_ids)} records to migrate.")
         migration_user = get_or_create_sot_migration_user()
 
-        self.t_audit = 0
-        self.t_create = 0
-        self.t_access = 0
-        self.t_indexes = 0
-        self.t_save = 0
-        self.t_history = 0
-        self.t_files = 0
-        self.t_waivers = 0
-        self.t_update_flag = 0
-        t_migrate_sac = 0
-        t_batch_start = time.monotonic()
-
-        for sac in queryset.iterator():
-            try:
-                t0 = time.monotonic()
-                if Audit.objects.filter(report_id=sac.report_id).exists():
-                    logger.info(
-                        f"SAC with id {sac.report_id} already exists as an Audit... skipping."
-                    )
-                    continue
-                self._migrate_sac(self, migration_user, sac)
-                t_migrate_sac += time.monotonic() - t0
-
-                count += 1
-                if count % BATCH_SIZE == 0:
-                    total_migrated += count
-                    logger.info(
-                        f"Migration progress... ({total_migrated} / {total}) ({(total_migrated / total) * 100}%)"
-                    )
-                    count = 0
-                    logger.info(
-                        f" - Time to migrate batch of 100          - {t_migrate_sac}"
-                    )
-                    logger.info(f"    - Audit info - {self.t_audit}")
-                    logger.info(f"    - Creation   - {self.t_create}")
-                    logger.info(f"    - Access     - {self.t_access}")
-                    logger.info(f"    - Indexes    - {self.t_indexes}")
-                    logger.info(f"    - Re-saving  - {self.t_save}")
-                    logger.info(f"    - History    - {self.t_history}")
-                    logger.info(f"    - Files      - {self.t_files}")
-                    logger.info(f"    - Waivers    - {self.t_waivers}")
-                    logger.info(
-                        f" - Time to mark batch of 100 as migrated - {self.t_update_flag}"
+        partitions = _partition(report_ids, kwargs["workers"])
+        if len(partitions) > 1:
+            # Each process opens its own connection.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=len(partitions), mp_context=get_context("fork")
+            ) as executor:
+                results = executor.map(
+                    _migrate_partition,
+                    partitions,
+                    repeat(migration_user.id),
+                    repeat(kwargs["batch_size"]),
+                )
+                stats = _sum_stats(results)
+        else:
+            stats = _sum_stats(
+                [
+                    _migrate_partition(
+                        report_ids, migration_user.id, kwargs["batch_size"]
                     )
+                ]
+            )
 
-                    t_migrate_sac = 0
-                    self.t_update_flag = 0
-                    self.t_audit = 0
-                    self.t_create = 0
-                    self.t_access = 0
-                    self.t_indexes = 0
-                    self.t_save = 0
-                    self.t_history = 0
-                    self.t_files = 0
-                    self.t_waivers = 0
+        elapsed = time.monotonic() - t_start
+        summary = {
+            "migrated": stats.pop("migrated", 0),
+            "skipped": stats.pop("skipped", 0),
+            "seconds": round(elapsed, 3),
+            "phases": {phase: round(t, 3) for phase, t in stats.items()},
+        }
+        summary["records_per_second"] = round(summary["migrated"] / elapsed, 1)
+        self.stdout.write(json.dumps(summary))
+        logger.info("Completed audit migrations.")
 
-            except Exception as e:
-                logger.error(f"Failed to migrate sac {sac.report_id} - {e}")
-                raise e
 
-        t_batch_end = time.monotonic()
-        logger.info(f" IN TOTAL - {t_batch_end - t_batch_start}")
-        logger.info("Completed audit migrations.")
+BATCH_SIZE = 100
 
-    @staticmethod
-    def _migrate_sac(self, migration_user: User, sac: SingleAuditChecklist):
-        with transaction.atomic():
-            t1 = time.monotonic()
-            audit_data = dict()
-            for idx, handler in enumerate(SAC_HANDLERS):
-                audit_data.update(handler(sac))
-
-            # convert file information.
-            audit_data.update(_convert_file_information(sac))
-            self.t_audit += time.monotonic() - t1
-
-            # create the audit.
-            t1 = time.monotonic()
-            audit = Audit.objects.create(
-                event_type=EventType.SOURCE_OF_TRUTH_MIGRATION,
-                data_source=sac.data_source,
-                event_user=migration_user,
-                created_by=sac.submitted_by,
-                audit=audit_data,
-                report_id=sac.report_id,
-                submission_status=sac.submission_status,
-                audit_type=sac.audit_type,
-            )
 
-            if sac.date_created:
-                audit.created_at = sac.date_created
-            self.t_create += time.monotonic() - t1
-
-            # update Access models.
-            t1 = time.monotonic()
-            Access.objects.filter(sac=sac).update(audit=audit)
-            DeletedAccess.objects.filter(sac=sac).update(audit=audit)
-            self.t_access += time.monotonic() - t1
-
-            # convert additional fields.
-            t1 = time.monotonic()
-            if sac.submission_status == STATUS.DISSEMINATED:
-                audit.audit.update(generate_audit_indexes(audit))
-
-                # re-adjust cog/over afterwards.
-                audit.cognizant_agency = sac.cognizant_agency
-                audit.oversight_agency = sac.oversight_agency
-                audit.audit["cognizant_agency"] = sac.cognizant_agency
-                audit.audit["oversight_agency"] = sac.oversight_agency
-            self.t_indexes += time.monotonic() - t1
-
-            t1 = time.monotonic()
-            audit.save()
-            self.t_save += time.monotonic() - t1
-
-            # copy SubmissionEvents into History records.
-            t1 = time.monotonic()
-            events = SubmissionEvent.objects.filter(sac=sac).values(
-                "event", "timestamp", "user__id"
-            )
-            histories = [
-                History(
-                    event=event["event"],
-                    report_id=sac.report_id,
-                    event_data={},
-                    version=0,
-                    updated_by_id=event["user__id"],
-                )
-                for event in events
-            ]
-            History.objects.bulk_create(histories, batch_size=25)
-
-            for history, event in zip(histories, events):
-                history.updated_at = event["timestamp"]
-
-            # Step 3: Bulk update
-            History.objects.bulk_update(histories, ["updated_at"])
-            if sac.data_source == settings.CENSUS_DATA_SOURCE and not histories:
-                extra_histories = create_history_objects(
-                    transition_name=sac.transition_name,
-                    transition_date=sac.transition_date,
-                    report_id=sac.report_id,
-                    user=migration_user,
+def _partition(report_ids, count):
+    """Split a sorted list of report_ids into at most count contiguous ranges."""
+    size = max(1, -(-len(report_ids) // count))
+    return [report_ids[i : i + size] for i in range(0, len(report_ids), size)]
+
+
+def _sum_stats(results):
+    total = Counter()
+    for stats in results:
+        total.update(stats)
+    return dict(total)
+
+
+def _migrate_partition(report_ids, migration_user_id, batch_size):
+    """
+    Migrate the SACs with these report_ids, batch_size at a time. Returns the
+    number migrated and the seconds spent in each phase.
+    """
+    migration_user = User.objects.get(id=migration_user_id)
+    stats = Counter()
+    total = len(report_ids)
+    # Audits made since the report_ids were listed, by another migration or a
+    # partly failed earlier one, are not made again; see _migrate_chunk().
+    existing = (
+        set(
+            Audit.objects.filter(
+                report_id__gte=report_ids[0], report_id__lte=report_ids[-1]
+            ).values_list("report_id", flat=True)
+        )
+        if report_ids
+        else set()
+    )
+    # Indexing a disseminated SAC computes cog/over; load the baselines of the
+    # years in this partition once, unless there is only a chunk to migrate.
+    # (The report_id starts with the audit year.)
+    baselines = (
+        preloaded_baselines({int(r[:4]) for r in report_ids if r[:4].isdigit()})
+        if total > batch_size
+        else nullcontext()
+    )
+    with baselines:
+        for i in range(0, total, batch_size):
+            chunk = report_ids[i : i + batch_size]
+            try:
+                stats.update(_migrate_chunk(chunk, migration_user, existing))
+            except Exception as e:
+                logger.error(f"Failed to migrate sacs {chunk[0]} to {chunk[-1]} - {e}")
+                raise e
+            logger.info(
+                json.dumps(
+                    {
+                        "migrated": min(i + batch_size, total),
+                        "of": total,
+                        "checkpoint": chunk[-1],
+                    }
                 )
-                # Extract updated_at values separately
-                updated_at_map = [h.updated_at for h in extra_histories]
-
-                for h in extra_histories:
-                    h.updated_at = None
-
-                History.objects.bulk_create(extra_histories, batch_size=25)
-
-                for h, new_time in zip(extra_histories, updated_at_map):
-                    h.updated_at = new_time
-
-                History.objects.bulk_update(extra_histories, ["updated_at"])
-
-            self.t_history += time.monotonic() - t1
-
-            # assign audit reference to file-based models.
-            t1 = time.monotonic()
-            SingleAuditReportFile.objects.filter(sac=sac).update(audit=audit)
-            ExcelFile.objects.filter(sac=sac).update(audit=audit)
-            self.t_files += time.monotonic() - t1
-
-            # copy SacValidationWaivers.
-            t1 = time.monotonic()
-            sac_waivers = SacValidationWaiver.objects.filter(
-                report_id=sac.report_id
-            ).values(
-                "timestamp",
-                "approver_email",
-                "approver_name",
-                "requester_email",
-                "requester_name",
-                "justification",
-                "waiver_types",
             )
-            audit_waivers = [
-                AuditValidationWaiver(
-                    report_id=audit,
-                    timestamp=waiver["timestamp"],
-                    approver_email=waiver["approver_email"],
-                    approver_name=waiver["approver_name"],
-                    requester_email=waiver["requester_email"],
-                    requester_name=waiver["requester_name"],
-                    justification=waiver["justification"],
-                    waiver_types=waiver["waiver_types"],
-                )
-                for waiver in sac_waivers
-            ]
-            AuditValidationWaiver.objects.bulk_create(audit_waivers)
-            self.t_waivers += time.monotonic() - t1
-
-            t1 = time.monotonic()
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    f"update audit_singleauditchecklist set migrated_to_audit = true where report_id = '{sac.report_id}'"
-                )
-            self.t_update_flag += time.monotonic() - t1
+    return stats
+
+
+def _migrate_chunk(report_ids, migration_user, existing):
+    """
+    Migrate the SACs with these report_ids in one transaction, and return the
+    number migrated and skipped and the seconds spent in each phase. SACs
+    whose report_id is in existing already have an Audit, so they are only
+    linked to it and marked as migrated.
+    """
+    timings = Counter()
+
+    t1 = time.monotonic()
+    sacs, skipped_ids = _split_existing(
+        SingleAuditChecklist.objects.filter(
+            report_id__in=report_ids, migrated_to_audit=False
+        ).order_by("report_id"),
+        existing,
+    )
+    sac_ids = [sac.id for sac in sacs]
+    report_files = {
+        file.sac_id: file
+        for file in SingleAuditReportFile.objects.filter(sac_id__in=sac_ids)
+        .order_by("sac_id", "-date_created")
+        .distinct("sac_id")
+    }
+    events_by_sac = defaultdict(list)
+    for event in (
+        SubmissionEvent.objects.filter(sac_id__in=sac_ids)
+        .order_by("id")
+        .values("sac_id", "event", "timestamp", "user_id")
+    ):
+        events_by_sac[event["sac_id"]].append(event)
+    waivers_by_report_id = defaultdict(list)
+    for waiver in SacValidationWaiver.objects.filter(
+        report_id__in=[sac.report_id for sac in sacs]
+    ).order_by("id"):
+        waivers_by_report_id[waiver.report_id_id].append(waiver)
+    timings["read"] += time.monotonic() - t1
+
+    t1 = time.monotonic()
+    now = timezone.now()
+    audits, histories, audit_waivers = [], [], []
+    for sac in sacs:
+        audit, audit_history = _audit_from_sac(
+            sac, report_files.get(sac.id), migration_user, now
+        )
+        audits.append(audit)
+        histories.append(audit_history)
+        histories += _histories_from_sac(sac, events_by_sac[sac.id], migration_user)
+        audit_waivers += _waivers_from_sac(waivers_by_report_id[sac.report_id])
+    timings["transform"] += time.monotonic() - t1
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        t1 = time.monotonic()
+        copy_rows(cursor, Audit, audits, keep_fields=["created_at", "updated_at"])
+        timings["audits"] += time.monotonic() - t1
+
+        t1 = time.monotonic()
+        copy_rows(cursor, History, histories, keep_fields=["updated_at"])
+        timings["history"] += time.monotonic() - t1
+
+        t1 = time.monotonic()
+        copy_rows(cursor, AuditValidationWaiver, audit_waivers)
+        timings["waivers"] += time.monotonic() - t1
+
+        t1 = time.monotonic()
+        _link_sacs_to_audits(cursor, sac_ids + skipped_ids)
+        timings["links"] += time.monotonic() - t1
+
+    timings["migrated"] = len(sacs)
+    timings["skipped"] = len(skipped_ids)
+    return timings
+
+
+def _split_existing(sacs, existing):
+    """
+    The SACs to migrate, and the ids of those whose report_id is in existing,
+    which would break the unique report_id of Audit if they were copied.
+    """
+    to_migrate, skipped = [], []
+    for sac in sacs:
+        if sac.report_id in existing:
+            logger.warning(f"An Audit already exists for {sac.report_id}, skipping.")
+            skipped.append(sac.id)
+        else:
+            to_migrate.append(sac)
+    return to_migrate, skipped
+
+
+def _audit_from_sac(sac, report_file, migration_user, now):
+    """
+    The Audit for a SAC, and the History of its creation, as they would be
+    after creating the Audit and then saving it once more.
+    """
+    audit_data = dict()
+    for handler in SAC_HANDLERS:
+        audit_data.update(handler(sac))
+
+    # convert file information.
+    audit_data.update(_convert_file_information(report_file))
+
+    audit = Audit(
+        data_source=sac.data_source,
+        created_by_id=sac.submitted_by_id,
+        updated_by=migration_user,
+        created_at=sac.date_created or now,
+        updated_at=now,
+        audit=audit_data,
+        report_id=sac.report_id,
+        submission_status=sac.submission_status,
+        audit_type=sac.audit_type,
+        # Audit.objects.create() saves as version 1, and the old per-SAC
+        # migration saved once more.
+        version=2,
+    )
+    history = History(
+        event=EventType.SOURCE_OF_TRUTH_MIGRATION,
+        report_id=sac.report_id,
+        version=0,
+        audit_state=History.State.SNAPSHOT,
+        event_data=dict(audit_data),
+        updated_at=now,
+        updated_by=migration_user,
+    )
+
+    # convert additional fields.
+    if sac.submission_status == STATUS.DISSEMINATED:
+        # These are generated fields, which an unsaved Audit cannot read.
+        general_information = audit_data["general_information"]
+        audit.auditee_ein = general_information.get("ein")
+        audit.auditee_uei = general_information.get("auditee_uei")
+        audit.audit.update(generate_audit_indexes(audit))
+
+        # re-adjust cog/over afterwards.
+        audit.audit["cognizant_agency"] = sac.cognizant_agency
+        audit.audit["oversight_agency"] = sac.oversight_agency
+
+    return audit, history
+
+
+def _histories_from_sac(sac, events, migration_user):
+    """History records for the SAC's SubmissionEvents, or its transitions."""
+    histories = [
+        History(
+            event=event["event"],
+            report_id=sac.report_id,
+            event_data={},
+            version=0,
+            updated_at=event["timestamp"],
+            updated_by_id=event["user_id"],
+        )
+        for event in events
+    ]
+    if sac.data_source == settings.CENSUS_DATA_SOURCE and not histories:
+        histories = create_history_objects(
+            transition_name=sac.transition_name,
+            transition_date=sac.transition_date,
+            report_id=sac.report_id,
+            user=migration_user,
+        )
+    return histories
+
+
+def _waivers_from_sac(sac_waivers):
+    """Copies of a SAC's SacValidationWaivers, for its Audit."""
+    return [
+        AuditValidationWaiver(
+            report_id_id=waiver.report_id_id,
+            timestamp=waiver.timestamp,
+            approver_email=waiver.approver_email,
+            approver_name=waiver.approver_name,
+            requester_email=waiver.requester_email,
+            requester_name=waiver.requester_name,
+            justification=waiver.justification,
+            waiver_types=waiver.waiver_types,
+        )
+        for waiver in sac_waivers
+    ]
+
+
+def _link_sacs_to_audits(cursor, sac_ids):
+    """
+    Point the accesses and files of the SACs at their new Audits, and mark the
+    SACs as migrated, in one statement.
+    """
+    qn = connection.ops.quote_name
+    sac_table = qn(SingleAuditChecklist._meta.db_table)
+    audit_table = qn(Audit._meta.db_table)
+    updates = [
+        f"u{i} AS (UPDATE {qn(model._meta.db_table)} t SET audit_id = a.id "
+        f"FROM {sac_table} s JOIN {audit_table} a ON a.report_id = s.report_id "
+        f"WHERE t.sac_id = s.id AND s.id = ANY(%(sac_ids)s))"
+        for i, model in enumerate(
+            [Access, DeletedAccess, SingleAuditReportFile, ExcelFile]
+        )
+    ]
+    cursor.execute(
+        f"WITH {', '.join(updates)} "
+        f"UPDATE {sac_table} SET migrated_to_audit = true WHERE id = ANY(%(sac_ids)s)",
+        {"sac_ids": sac_ids},
+    )
 
 
 def _get_query(kwargs, max_records):
@@ -318,17 +451,16 @@ def _get_query(kwargs, max_records):
         return queryset
 
 
-def _convert_file_information(sac: SingleAuditChecklist):
-    try:
-        file = SingleAuditReportFile.objects.filter(sac=sac).latest("date_created")
-        return {
-            "file_information": {
-                "pages": file.component_page_numbers,
-                "filename": file.filename,
-            }
-        }
-    except SingleAuditReportFile.DoesNotExist:
+def _convert_file_information(file: SingleAuditReportFile | None):
+    """The file information of a SAC's latest SingleAuditReportFile."""
+    if file is None:
         return {}
+    return {
+        "file_information": {
+            "pages": file.component_page_numbers,
+            "filename": file.filename,
+        }
+    }
 
 
 def _convert_program_names(sac: SingleAuditChecklist):
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from dissemination.analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = """
+    Rebuilds the analytics rollup tables from the disseminated records.
+    Dissemination keeps them up to date; run this after loading or changing
+    disseminated records by other means.
+    """
+
+    def handle(self, *args, **options):
+        rebuild_rollups()
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.16 on 2026-10-18 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dissemination", "0027_alter_unified_aln_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalyticsProgramRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "year",
+                    models.IntegerField(
+                        verbose_name="Year the records were accepted by the FAC"
+                    ),
+                ),
+                ("auditee_state", models.TextField(verbose_name="Auditee State")),
+                (
+                    "entity_type",
+                    models.TextField(verbose_name="Self reported type of entity"),
+                ),
+                (
+                    "federal_agency_prefix",
+                    models.TextField(verbose_name="2-char code refers to an agency"),
+                ),
+                (
+                    "federal_program_name",
+                    models.TextField(verbose_name="Name of Federal Program"),
+                ),
+                (
+                    "award_volume",
+                    models.BigIntegerField(verbose_name="Total amount expended"),
+                ),
+                (
+                    "repeat_findings",
+                    models.IntegerField(
+                        verbose_name="Number of findings that repeat a finding of the prior audit"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["year", "auditee_state"],
+                        name="disseminati_year_8e5e39_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AnalyticsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "year",
+                    models.IntegerField(
+                        verbose_name="Year the records were accepted by the FAC"
+                    ),
+                ),
+                ("auditee_state", models.TextField(verbose_name="Auditee State")),
+                (
+                    "entity_type",
+                    models.TextField(verbose_name="Self reported type of entity"),
+                ),
+                ("submissions", models.IntegerField(verbose_name="Number of records")),
+                (
+                    "low_risk_submissions",
+                    models.IntegerField(
+                        verbose_name="Number of records with a low-risk auditee"
+                    ),
+                ),
+                (
+                    "not_low_risk_submissions",
+                    models.IntegerField(
+                        verbose_name="Number of records with an auditee that is not low-risk"
+                    ),
+                ),
+                (
+                    "submissions_with_findings",
+                    models.IntegerField(
+                        verbose_name="Number of records with at least one finding"
+                    ),
+                ),
+                ("findings", models.IntegerField(verbose_name="Number of findings")),
+                (
+                    "award_volume",
+                    models.BigIntegerField(
+                        verbose_name="Total amount expended on federal awards"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["year", "auditee_state"],
+                        name="disseminati_year_d0217d_idx",
+                    )
+                ],
+            },
+        ),
+    ]
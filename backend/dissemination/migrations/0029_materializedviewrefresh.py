@@ -0,0 +1,54 @@
+# Generated by Django 5.2.16 on 2026-10-18 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dissemination", "0028_analytics_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaterializedViewRefresh",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "view_name",
+                    models.TextField(
+                        unique=True, verbose_name="Name of the materialized view"
+                    ),
+                ),
+                (
+                    "general_watermark",
+                    models.BigIntegerField(
+                        verbose_name="Highest dissemination_general id included in the refresh"
+                    ),
+                ),
+                (
+                    "general_count",
+                    models.BigIntegerField(
+                        verbose_name="Number of dissemination_general rows included in the refresh"
+                    ),
+                ),
+                ("method", models.TextField(verbose_name="How the view was refreshed")),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(verbose_name="When the refresh finished"),
+                ),
+                (
+                    "duration",
+                    models.FloatField(verbose_name="Seconds the refresh took"),
+                ),
+            ],
+        ),
+    ]
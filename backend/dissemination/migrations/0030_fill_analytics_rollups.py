@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+# Fills the rollups from the records disseminated before they existed, as
+# `manage.py refresh_analytics_rollups` does; dissemination keeps them up to
+# date from here on.
+def fill_analytics_rollups(apps, schema_editor):
+    from dissemination.analytics.rollups import rebuild_rollups
+
+    rebuild_rollups()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dissemination", "0029_materializedviewrefresh"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_analytics_rollups, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
 from .additionalein import AdditionalEin
+from .analytics import AnalyticsProgramRollup, AnalyticsRollup
 from .additionaluei import AdditionalUei
 from .captext import CapText
-from .combined import DisseminationCombined
+from .combined import DisseminationCombined, MaterializedViewRefresh
 from .federalaward import FederalAward
 from .finding import Finding
 from .findingtext import FindingText
@@ -45,3 +46,7 @@ _migration_models = [
 ]
 
 _api_access_models = [OneTimeAccess, TribalApiAccessKeyIds]
+
+_analytics_models = [AnalyticsProgramRollup, AnalyticsRollup]
+
+_refresh_models = [MaterializedViewRefresh]
@@ -0,0 +1,48 @@
+from django.db import models
+
+
+class AnalyticsRollup(models.Model):
+    """
+    Totals of the public disseminated records accepted in one year, for one
+    state and entity type. Maintained by dissemination.analytics.rollups.
+    """
+
+    year = models.IntegerField("Year the records were accepted by the FAC")
+    auditee_state = models.TextField("Auditee State")
+    entity_type = models.TextField("Self reported type of entity")
+    submissions = models.IntegerField("Number of records")
+    low_risk_submissions = models.IntegerField(
+        "Number of records with a low-risk auditee"
+    )
+    not_low_risk_submissions = models.IntegerField(
+        "Number of records with an auditee that is not low-risk"
+    )
+    submissions_with_findings = models.IntegerField(
+        "Number of records with at least one finding"
+    )
+    findings = models.IntegerField("Number of findings")
+    award_volume = models.BigIntegerField("Total amount expended on federal awards")
+
+    class Meta:
+        indexes = [models.Index(fields=["year", "auditee_state"])]
+
+
+class AnalyticsProgramRollup(models.Model):
+    """
+    Totals of the federal awards in the public disseminated records accepted in
+    one year, for one state, entity type, agency and program. Maintained by
+    dissemination.analytics.rollups.
+    """
+
+    year = models.IntegerField("Year the records were accepted by the FAC")
+    auditee_state = models.TextField("Auditee State")
+    entity_type = models.TextField("Self reported type of entity")
+    federal_agency_prefix = models.TextField("2-char code refers to an agency")
+    federal_program_name = models.TextField("Name of Federal Program")
+    award_volume = models.BigIntegerField("Total amount expended")
+    repeat_findings = models.IntegerField(
+        "Number of findings that repeat a finding of the prior audit"
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["year", "auditee_state"])]
@@ -364,3 +364,22 @@ class DisseminationCombined(models.Model):
         "Name of Pass-through Entity",
         help_text=docs.passthrough_name,
     )
+
+
+class MaterializedViewRefresh(models.Model):
+    """
+    The last refresh of a materialized view, and the dissemination_general rows
+    it included. `manage.py materialized_views --refresh --incremental` uses it
+    to tell whether anything has been disseminated or resubmitted since.
+    """
+
+    view_name = models.TextField("Name of the materialized view", unique=True)
+    general_watermark = models.BigIntegerField(
+        "Highest dissemination_general id included in the refresh"
+    )
+    general_count = models.BigIntegerField(
+        "Number of dissemination_general rows included in the refresh"
+    )
+    method = models.TextField("How the view was refreshed")
+    refreshed_at = models.DateTimeField("When the refresh finished")
+    duration = models.FloatField("Seconds the refresh took")
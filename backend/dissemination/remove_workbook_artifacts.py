@@ -8,8 +8,8 @@ from audit.models.constants import STATUS
 from audit.models.models import (
     SingleAuditChecklist,
 )
-from boto3 import client as boto3_client
-from botocore.client import ClientError, Config
+from dissemination.file_downloads import cache_file_exists, get_s3_client
+from botocore.client import ClientError
 from django.core.paginator import Paginator
 from django.core.paginator import PageNotAnInteger, EmptyPage
 
@@ -60,15 +60,7 @@ def audit_remove_workbook_artifacts(audit):
 
 def delete_files_in_bulk(filenames, report_id):
     """Delete files from S3 in bulk."""
-    # This client uses the internal endpoint URL because we're making a request to S3 from within the app
-    s3_client = boto3_client(
-        service_name="s3",
-        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT,
-        config=Config(signature_version="s3v4"),
-    )
+    s3_client = get_s3_client()
 
     try:
         delete_objects = [{"Key": filename} for filename in filenames]
@@ -81,6 +73,7 @@ def delete_files_in_bulk(filenames, report_id):
         deleted_files = response.get("Deleted", [])
         for deleted in deleted_files:
             if deleted.get("Key", None):
+                cache_file_exists(deleted["Key"], False)
                 logger.info(
                     f"Successfully deleted {deleted['Key']} from S3 for report: {report_id}"
                 )
@@ -137,14 +130,7 @@ def clean_artifacts(sac_list):
 
 def batch_removal(filenames, sac_list, sac_to_report_id_map):
     """Delete files from S3 in bulk and return the results."""
-    s3_client = boto3_client(
-        service_name="s3",
-        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
-        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
-        endpoint_url=settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT,
-        config=Config(signature_version="s3v4"),
-    )
+    s3_client = get_s3_client()
 
     try:
         delete_objects = [{"Key": filename} for filename in filenames]
@@ -158,6 +144,7 @@ def batch_removal(filenames, sac_list, sac_to_report_id_map):
         deleted_files = response.get("Deleted", [])
         for deleted in deleted_files:
             filename = deleted["Key"]
+            cache_file_exists(filename, False)
             successful_deletes.append(
                 {
                     "filename": filename,
@@ -1,20 +1,47 @@
 import datetime
 import io
 import logging
+import tempfile
 import time
 
+import openpyxl as pyxl
+
 from audit.models import Audit
 from audit.models.constants import ORGANIZATION_TYPE
 from dissemination.report_generation.excel.coversheets import (
     insert_dissemination_coversheet,
+    write_dissemination_coversheet,
+)
+from dissemination.report_generation.excel.utils import (
+    REPORT_FORMAT,
+    add_column_named_ranges,
+    create_workbook,
+)
+from dissemination.summary_reports import (
+    insert_precert_coversheet,
+    set_column_widths_from_rows,
 )
-from dissemination.report_generation.excel.utils import REPORT_FORMAT, create_workbook
-from dissemination.summary_reports import insert_precert_coversheet
 
 logger = logging.getLogger(__name__)
 
 restricted_model_names = ("captext", "findingtext", "note")
 
+# When streaming, audits are read from the database this many at a time.
+STREAMING_CHUNK_SIZE = 100
+
+# The Audit fields read by the REPORT_FORMAT sheets.
+REPORT_AUDIT_FIELDS = (
+    "report_id",
+    "audit",
+    "audit_year",
+    "cognizant_agency",
+    "oversight_agency",
+    "created_at",
+    "fac_accepted_date",
+    "data_source",
+    "is_public",
+)
+
 
 def generate_audit_summary_report(
     report_ids, include_private=False, pre_submission=False
@@ -38,11 +65,75 @@ def generate_audit_summary_report(
     return filename, workbook_bytes
 
 
-def _prepare_workbook_for_download(workbook):
+def stream_audit_summary_report(report_ids, include_private=False):
+    """
+    Builds the same report as generate_audit_summary_report, without holding
+    every audit and row in memory. Audits are read in chunks and their rows
+    are appended to a write-only workbook, which is saved to a temporary file.
 
+    Returns the filename and the open temporary file, rewound to the start.
+    The caller is responsible for closing it; FileResponse does so.
+    """
     t0 = time.time()
+    has_tribal, tht = _contains_private_tribal(report_ids)
+
+    workbook = pyxl.Workbook(write_only=True)
+    write_dissemination_coversheet(workbook, has_tribal, include_private)
+
+    # Write-only sheets have to be created in their final order, so create
+    # every sheet (and its header row) up front.
+    sheets = {}
+    entry_counts = {}
+    for mapping in sorted(REPORT_FORMAT, key=lambda m: m.sheet_name):
+        sheet = workbook.create_sheet(mapping.sheet_name)
+        set_column_widths_from_rows(sheet, [mapping.column_names])
+        sheet.append(mapping.column_names)
+        sheets[mapping.sheet_name] = sheet
+        entry_counts[mapping.sheet_name] = 0
+
+    audits = (
+        Audit.objects.filter(report_id__in=set(report_ids))
+        .only(*REPORT_AUDIT_FIELDS)
+        .iterator(chunk_size=STREAMING_CHUNK_SIZE)
+    )
+    for audit in audits:
+        for mapping in REPORT_FORMAT:
+            if not include_private and mapping.sheet_name in restricted_model_names:
+                continue
+
+            for entry in mapping.parse_audit_to_entries(audit):
+                sheets[mapping.sheet_name].append(entry)
+                entry_counts[mapping.sheet_name] += 1
+    tsa = time.time() - t0
+
+    for mapping in REPORT_FORMAT:
+        add_column_named_ranges(
+            workbook,
+            sheets[mapping.sheet_name],
+            mapping.column_names,
+            entry_counts[mapping.sheet_name],
+        )
+
+    report_file = tempfile.TemporaryFile()
+    workbook.save(report_file)
+    report_file.seek(0)
+
+    t1 = time.time()
+    logger.info(
+        f"SUMMARY_REPORTS stream_audit_summary_report\n\ttotal: {t1 - t0} has_tribal: {tht} stream_audits: {tsa}"
+    )
+    return _report_filename(), report_file
+
+
+def _report_filename():
     now = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d%H%M%S")
-    filename = f"audit-fac-summary-report-{now}.xlsx"
+    return f"audit-fac-summary-report-{now}.xlsx"
+
+
+def _prepare_workbook_for_download(workbook):
+
+    t0 = time.time()
+    filename = _report_filename()
 
     # Save the workbook directly to a BytesIO object
     workbook_bytes = io.BytesIO()
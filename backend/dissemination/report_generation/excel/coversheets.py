@@ -1,5 +1,9 @@
 from datetime import datetime
-from dissemination.summary_reports import set_column_widths, protect_sheet
+from dissemination.summary_reports import (
+    protect_sheet,
+    set_column_widths,
+    set_column_widths_from_rows,
+)
 from dissemination.report_generation.excel.excel_sheet import ExcelSheet
 from django.conf import settings
 
@@ -18,34 +22,52 @@ def insert_precert_coversheet(workbook):
 
 def insert_dissemination_coversheet(workbook, contains_tribal, include_private):
     sheet = workbook.create_sheet("Coversheet", 0)
-    sheet.append(["Time created", datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")])
-    sheet.append(
+    for row in _dissemination_coversheet_rows(contains_tribal, include_private):
+        sheet.append(row)
+
+    # Uncomment if we want to link to the FAC API for larger data dumps.
+    # sheet.cell(row=3, column=2).value = "FAC API Link"
+    # sheet.cell(row=3, column=2).hyperlink = f"{settings.STATIC_SITE_URL}/developers/"
+    set_column_widths(sheet)
+
+
+def write_dissemination_coversheet(workbook, contains_tribal, include_private):
+    """
+    insert_dissemination_coversheet, for write-only workbooks. Must be called
+    before any other sheet is created, so that the coversheet comes first.
+    """
+    rows = _dissemination_coversheet_rows(contains_tribal, include_private)
+    sheet = workbook.create_sheet("Coversheet")
+    set_column_widths_from_rows(sheet, rows)
+    for row in rows:
+        sheet.append(row)
+
+
+def _dissemination_coversheet_rows(contains_tribal, include_private):
+    rows = [
+        ["Time created", datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")],
         [
             "Note",
             limit_disclaimer,
-        ]
-    )
+        ],
+    ]
 
     if contains_tribal:
         if include_private:
-            sheet.append(
+            rows.append(
                 [
                     "Note",
                     can_read_tribal_disclaimer,
                 ]
             )
         else:
-            sheet.append(
+            rows.append(
                 [
                     "Note",
                     cannot_read_tribal_disclaimer,
                 ]
             )
-
-    # Uncomment if we want to link to the FAC API for larger data dumps.
-    # sheet.cell(row=3, column=2).value = "FAC API Link"
-    # sheet.cell(row=3, column=2).hyperlink = f"{settings.STATIC_SITE_URL}/developers/"
-    set_column_widths(sheet)
+    return rows
 
 
 def _get_entries(audit):
@@ -47,7 +47,6 @@ REPORT_FORMAT = [
     federal_awards_excel,
     findings_excel_sheet,
     findings_text_excel_sheet,
-    federal_awards_excel,
     general_information_excel,
     notes_to_sefa_excel_sheet,
     note_coversheet_excel_sheet,
@@ -77,11 +76,12 @@ def create_workbook(data, protect_sheets=False):
             sheet.append(entry)
 
         # add named ranges for the columns, now that the data is loaded.
-        for index, field_name in enumerate(data[sheet_name]["field_names"]):
-            coordinate = f"${columns[index]}$2:${columns[index]}${2 + len(data[sheet_name]['entries'])}"
-            ref = f"{quote_sheetname(sheet.title)}!{coordinate}"
-            named_range = DefinedName(f"{sheet_name}_{field_name}", attr_text=ref)
-            workbook.defined_names.add(named_range)
+        add_column_named_ranges(
+            workbook,
+            sheet,
+            data[sheet_name]["field_names"],
+            len(data[sheet_name]["entries"]),
+        )
 
         set_column_widths(sheet)
         if protect_sheets:
@@ -91,6 +91,17 @@ def create_workbook(data, protect_sheets=False):
     return (workbook, t1 - t0)
 
 
+def add_column_named_ranges(workbook, sheet, field_names, entry_count):
+    """
+    Add a workbook-level named range covering the data rows of each column.
+    """
+    for index, field_name in enumerate(field_names):
+        coordinate = f"${columns[index]}$2:${columns[index]}${2 + entry_count}"
+        ref = f"{quote_sheetname(sheet.title)}!{coordinate}"
+        named_range = DefinedName(f"{sheet.title}_{field_name}", attr_text=ref)
+        workbook.defined_names.add(named_range)
+
+
 def set_column_widths(worksheet):
     dims = {}
     for row in worksheet.rows:
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime, timezone
 from dissemination.models import General, Finding, FederalAward
 from openpyxl import Workbook
@@ -5,19 +6,10 @@ from openpyxl.styles import PatternFill
 import io
 import time
 import logging
-from django.forms.models import model_to_dict
 
 logger = logging.getLogger(__name__)
 
 
-def lmap(fun, ls):
-    return list(map(fun, ls))
-
-
-def objs_to_dict(lob):
-    return lmap(model_to_dict, lob)
-
-
 class Timing:
     def __init__(self, tag):
         self.tag = tag
@@ -38,120 +30,160 @@ def get_award(awards, report_id, award_reference):
         return None
 
 
+# Only the columns that end up in the report are fetched.
+FINDING_FIELDS = [
+    "report_id",
+    "award_reference",
+    "reference_number",
+    "is_modified_opinion",
+    "is_other_matters",
+    "is_material_weakness",
+    "is_significant_deficiency",
+    "is_other_findings",
+    "is_questioned_costs",
+    "is_repeat_finding",
+    "prior_finding_ref_numbers",
+]
+AWARD_FIELDS = [
+    "report_id",
+    "award_reference",
+    "federal_agency_prefix",
+    "federal_award_extension",
+    "federal_program_name",
+    "amount_expended",
+    "is_direct",
+    "is_major",
+    "is_passthrough_award",
+    "passthrough_amount",
+]
+GENERAL_FIELDS = [
+    "report_id",
+    "auditee_name",
+    "auditee_uei",
+    "cognizant_agency",
+    "oversight_agency",
+]
+
+
+def group_by_report_id(rows):
+    """
+    Group dict rows into lists keyed by report_id, keeping their order.
+    """
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row["report_id"]].append(row)
+    return grouped
+
+
 def get_findings_for_agency_number(report_ids):
     with Timing("FINDINGS GFFAN PREP"):
-        # findings_for_report_ids takes a set of report ids and gives us
-        # the findings objects associated with those reports
+        # Group the findings for the given reports by report id. The grouped
+        # keys are the report ids that have findings, a subset of `report_ids`.
         with Timing("FINDINGS GFFAN FFRI"):
-            findings_for_report_ids = lmap(
-                model_to_dict, Finding.objects.filter(report_id__in=report_ids)
-            )
-        # We can now get a list of report ids that have findings. This will
-        # be a subset of `report_ids`
-        with Timing("FINDINGS GFFAN RIWF"):
-            report_ids_with_findings = set(
-                lmap(lambda d: d["report_id"], findings_for_report_ids)
+            findings_by_report_id = group_by_report_id(
+                Finding.objects.filter(report_id__in=report_ids)
+                .values(*FINDING_FIELDS)
+                .iterator()
             )
+            report_ids_with_findings = list(findings_by_report_id.keys())
 
         # The awards rows with findings will have a report id in the subset.
-        # We are also doing this agency-number-by-agency-number, so we'll further restrict things.
-        with Timing("FINDINGS GFFAN AWF"):
-            awards_with_findings = lmap(
-                model_to_dict,
-                FederalAward.objects.filter(
-                    report_id__in=report_ids_with_findings, findings_count__gte=1
-                ),
-            )
-
         # To speed things up, key those by report-id/award-ref
         # This builds a lookup table to directly find awards associated with a report.
-        with Timing("FINDINGS GFFAN AWFK"):
-            awards_with_findings_keyed = {}
-            for a in awards_with_findings:
-                key = tuple([a["report_id"], a["award_reference"]])
-                awards_with_findings_keyed[key] = a
+        with Timing("FINDINGS GFFAN AWF"):
+            awards_with_findings_keyed = {
+                (a["report_id"], a["award_reference"]): a
+                for a in FederalAward.objects.filter(
+                    report_id__in=report_ids_with_findings, findings_count__gte=1
+                )
+                .values(*AWARD_FIELDS)
+                .iterator()
+            }
 
         # These are all of the general objects that have findings. Again, we're subsetting.
-        gobjs = lmap(
-            model_to_dict,
-            General.objects.filter(report_id__in=report_ids_with_findings),
+        gobjs = (
+            General.objects.filter(report_id__in=report_ids_with_findings)
+            .values(*GENERAL_FIELDS)
+            .iterator()
         )
 
+    # I want to start by going report-by-report.
+    with Timing("FINDINGS GUAN"):
+        return join_findings(gobjs, findings_by_report_id, awards_with_findings_keyed)
+
+
+def join_findings(gobjs, findings_by_report_id, awards_with_findings_keyed):
+    """
+    Join each report's findings to its general and award rows, in a single
+    pass. Returns the report rows grouped by agency prefix.
+    """
     uniq = set()
     results = {}
 
-    # I want to start by going report-by-report.
-    with Timing("FINDINGS GUAN"):
-        for gobj in gobjs:
-            # For a given report, I know there are findings. I want unique findings rows. So, I'll
-            # go through the findings that have this report ID.
-            for fobj in filter(
-                lambda d: d["report_id"] == gobj["report_id"], findings_for_report_ids
-            ):
-                # I now want to output one row per unique (report_id, award_ref, ref_num).
-                key = tuple(
-                    [
-                        gobj["report_id"],
-                        fobj["award_reference"],
-                        fobj["reference_number"],
-                    ]
+    for gobj in gobjs:
+        # For a given report, I know there are findings. I want unique findings rows. So, I'll
+        # go through the findings that have this report ID.
+        for fobj in findings_by_report_id.get(gobj["report_id"], []):
+            # I now want to output one row per unique (report_id, award_ref, ref_num).
+            key = tuple(
+                [
+                    gobj["report_id"],
+                    fobj["award_reference"],
+                    fobj["reference_number"],
+                ]
+            )
+            if key in uniq:
+                continue
+            # This makes sure I only do this once.
+            uniq.add(key)
+            # Now, I need an award that matches this report id and reference.
+            aobj = get_award(
+                awards_with_findings_keyed,
+                gobj["report_id"],
+                fobj["award_reference"],
+            )
+            # The awards are constrained to agency number; the findings are not.
+            # We might not find an award, meaning we need to skip for this tab in the sheet.
+            if aobj is not None:
+                # This builds a dictionary based on agency prefix.
+                # Each agency number becomes a tab in the spreadsheet.
+                results.setdefault(aobj["federal_agency_prefix"], []).append(
+                    _findings_row(gobj, fobj, aobj)
                 )
-                if key not in uniq:
-                    # This makes sure I only do this once.
-                    uniq.add(key)
-                    # Now, I need an award that matches this report id and reference.
-                    aobj = get_award(
-                        awards_with_findings_keyed,
-                        gobj["report_id"],
-                        fobj["award_reference"],
-                    )
-                    # The awards are constrained to agency number; the findings are not.
-                    # We might not find an award, meaning we need to skip for this tab in the sheet.
-                    if aobj is not None:
-                        d = {}
-                        d["report_id"] = gobj["report_id"]
-                        d["auditee_name"] = gobj["auditee_name"]
-                        d["auditee_uei"] = gobj["auditee_uei"]
-                        d["award_reference"] = fobj["award_reference"]
-                        d["reference_number"] = fobj["reference_number"]
-                        d["aln"] = (
-                            aobj["federal_agency_prefix"]
-                            + "."
-                            + aobj["federal_award_extension"]
-                        )
-                        d["cog_over"] = "COG" if gobj["cognizant_agency"] else "OVER"
-                        d["cog_over_agency"] = (
-                            f"{gobj['cognizant_agency']}"
-                            if gobj["cognizant_agency"]
-                            else f"{gobj['oversight_agency']}"
-                        )
-                        d["federal_program_name"] = aobj["federal_program_name"]
-                        d["amount_expended"] = aobj["amount_expended"]
-                        d["is_direct"] = aobj["is_direct"]
-                        d["is_major"] = aobj["is_major"]
-                        d["is_passthrough_award"] = aobj["is_passthrough_award"]
-                        d["passthrough_amount"] = aobj["passthrough_amount"]
-                        d["is_modified_opinion"] = fobj["is_modified_opinion"]
-                        d["is_other_matters"] = fobj["is_other_matters"]
-                        d["is_material_weakness"] = fobj["is_material_weakness"]
-                        d["is_significant_deficiency"] = fobj[
-                            "is_significant_deficiency"
-                        ]
-                        d["is_other_findings"] = fobj["is_other_findings"]
-                        d["is_questioned_costs"] = fobj["is_questioned_costs"]
-                        d["is_repeat_finding"] = fobj["is_repeat_finding"]
-                        d["prior_finding_ref_numbers"] = fobj[
-                            "prior_finding_ref_numbers"
-                        ]
-                        # This builds a dictionary based on agency prefix.
-                        # Each agency number becomes a tab in the spreadsheet.
-                        if aobj["federal_agency_prefix"] in results:
-                            results[aobj["federal_agency_prefix"]].append(d)
-                        else:
-                            results[aobj["federal_agency_prefix"]] = [d]
     return results
 
 
+def _findings_row(gobj, fobj, aobj):
+    d = {}
+    d["report_id"] = gobj["report_id"]
+    d["auditee_name"] = gobj["auditee_name"]
+    d["auditee_uei"] = gobj["auditee_uei"]
+    d["award_reference"] = fobj["award_reference"]
+    d["reference_number"] = fobj["reference_number"]
+    d["aln"] = aobj["federal_agency_prefix"] + "." + aobj["federal_award_extension"]
+    d["cog_over"] = "COG" if gobj["cognizant_agency"] else "OVER"
+    d["cog_over_agency"] = (
+        f"{gobj['cognizant_agency']}"
+        if gobj["cognizant_agency"]
+        else f"{gobj['oversight_agency']}"
+    )
+    d["federal_program_name"] = aobj["federal_program_name"]
+    d["amount_expended"] = aobj["amount_expended"]
+    d["is_direct"] = aobj["is_direct"]
+    d["is_major"] = aobj["is_major"]
+    d["is_passthrough_award"] = aobj["is_passthrough_award"]
+    d["passthrough_amount"] = aobj["passthrough_amount"]
+    d["is_modified_opinion"] = fobj["is_modified_opinion"]
+    d["is_other_matters"] = fobj["is_other_matters"]
+    d["is_material_weakness"] = fobj["is_material_weakness"]
+    d["is_significant_deficiency"] = fobj["is_significant_deficiency"]
+    d["is_other_findings"] = fobj["is_other_findings"]
+    d["is_questioned_costs"] = fobj["is_questioned_costs"]
+    d["is_repeat_finding"] = fobj["is_repeat_finding"]
+    d["prior_finding_ref_numbers"] = fobj["prior_finding_ref_numbers"]
+    return d
+
+
 def adjust_columns(ws):
     for col in ws.columns:
         max_length = 0
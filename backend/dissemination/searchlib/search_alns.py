@@ -23,16 +23,21 @@ def audit_search_alns(params):
     if not (full_alns or agency_numbers):
         return Q()
 
+    # Use array overlap (&&) and containment (@>) so that the GIN indexes on
+    # agency_prefixes and agency_extensions can be used.
     query = Q()
     if agency_numbers:
         # Build a filter for the agency numbers. E.g. given 93 and 45
-        for agency_number in agency_numbers:
-            query |= Q(agency_prefixes__icontains=agency_number.prefix)
+        query |= Q(
+            agency_prefixes__overlap=[
+                agency_number.prefix for agency_number in agency_numbers
+            ]
+        )
 
     if full_alns:
         for full_aln in full_alns:
-            query |= Q(agency_prefixes__icontains=full_aln.prefix) & Q(
-                agency_extensions__icontains=full_aln.program
+            query |= Q(agency_prefixes__contains=[full_aln.prefix]) & Q(
+                agency_extensions__contains=[full_aln.program]
             )
 
     return query
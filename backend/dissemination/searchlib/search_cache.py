@@ -0,0 +1,41 @@
+"""
+Generation counter for cached search results.
+
+Every cached search (result ids and counts) is keyed by the current
+generation. Disseminating an audit bumps the generation, which invalidates all
+previously cached searches at once without having to find and delete them.
+
+Audits are disseminated by the run_jobs workers, so the generation is kept in
+the shared cache, where every web process sees it. The searches themselves
+stay in each process's own cache, as they are only ever read by generation.
+
+This module deliberately avoids model imports, so that the intake to
+dissemination ETL can import it without creating an import cycle.
+"""
+
+import time
+
+from django.core.cache import caches
+
+GENERATION_KEY = "search-results-generation"
+GENERATION_CACHE = "shared"
+
+
+def search_cache_generation():
+    """
+    Returns the current generation. If it has never been set (or was evicted),
+    start a new one, so that entries from an older generation are never reused.
+    """
+    cache = caches[GENERATION_CACHE]
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate_search_cache():
+    """
+    Start a new generation, invalidating every cached search.
+    """
+    caches[GENERATION_CACHE].set(GENERATION_KEY, time.time_ns(), timeout=None)
@@ -18,7 +18,10 @@ def audit_search_names(params):
         for sub in term.split():
             flattened.append(sub)
 
+    # `search_names_text` is the flattened form of `search_names`, and is
+    # covered by a trigram index. Searching the array column directly casts it
+    # to text on every row and forces a sequential scan.
     query = Q()
     for name in flattened:
-        query |= Q(search_names__icontains=name)
+        query |= Q(search_names_text__icontains=name)
     return query if flattened else Q()
@@ -0,0 +1,268 @@
+"""
+Keyset (seek) pagination for search results.
+
+The search results are ordered by a single sort column (see `_sort_results`)
+with `report_id` as the tiebreaker. Moving to the next or previous page seeks
+past the first/last row of the current page instead of using an OFFSET, so a
+deep page costs the same as the first one. Jumping straight to an arbitrary
+page number falls back to OFFSET pagination.
+
+The total count is cached per normalized query and, optionally, replaced by
+the planner's row estimate for very broad searches.
+
+When the ordered report_ids for a search are already cached (see
+`run_cached_search`), pages are sliced from that list instead.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from dissemination.models import General
+from dissemination.searchlib.search_cache import search_cache_generation
+from dissemination.searchlib.search_constants import Direction, OrderBy
+
+logger = logging.getLogger(__name__)
+
+# Sort orders that can be paginated by keyset. cog_over sorts over two
+# nullable columns, so it always uses OFFSET pagination.
+KEYSET_SORT_FIELDS = {
+    OrderBy.fac_accepted_date: "fac_accepted_date",
+    OrderBy.auditee_name: "auditee_name",
+    OrderBy.auditee_uei: "auditee_uei",
+    OrderBy.audit_year: "audit_year",
+}
+TIEBREAKER_FIELD = "report_id"
+
+
+def query_fingerprint(results):
+    """
+    A stable key for a search QuerySet, based on its SQL with the parameters
+    interpolated. Used to tie cursors and cached counts to a specific search.
+    """
+    return hashlib.sha256(str(results.query).encode("utf-8")).hexdigest()
+
+
+def encode_cursor(fingerprint, page, after=None, before=None):
+    payload = {"q": fingerprint, "page": page}
+    if after is not None:
+        payload["after"] = after
+    if before is not None:
+        payload["before"] = before
+    raw = json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Returns the decoded cursor dict, or None if the cursor is missing or
+    malformed. Cursors come from the browser, so they are never trusted to be
+    well-formed.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        logger.info("Ignoring malformed search cursor.")
+        return None
+    if not isinstance(payload, dict):
+        return None
+    return payload
+
+
+def search_results_count(results):
+    """
+    Returns (count, is_estimate) for the search results.
+
+    Exact counts are cached per normalized query for
+    SEARCH_COUNT_CACHE_TTL_SECS. If SEARCH_USE_ESTIMATED_COUNTS is on and the
+    planner expects more than SEARCH_ESTIMATED_COUNT_THRESHOLD rows, the
+    planner's estimate is used instead of running a full COUNT.
+    """
+    cache_key = f"search-count:{search_cache_generation()}:{query_fingerprint(results)}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = None
+    if settings.SEARCH_USE_ESTIMATED_COUNTS:
+        estimate = _planner_row_estimate(results)
+        if (
+            estimate is not None
+            and estimate > settings.SEARCH_ESTIMATED_COUNT_THRESHOLD
+        ):
+            result = (estimate, True)
+
+    if result is None:
+        result = (results.count(), False)
+
+    cache.set(cache_key, result, settings.SEARCH_COUNT_CACHE_TTL_SECS)
+    return result
+
+
+def stable_order(results, params):
+    """
+    Re-orders the search results by the sort field with `report_id` as an
+    explicit tiebreaker, so that every way of paging through them (OFFSET,
+    keyset, or a cached id list) sees the same order. Sorts that can't be
+    paginated by keyset are returned unchanged.
+    """
+    # Same default as `_set_general_defaults`.
+    order_by = params.get("order_by") or OrderBy.fac_accepted_date
+    sort_field = KEYSET_SORT_FIELDS.get(order_by)
+    if not sort_field:
+        return results
+    descending = params.get("order_direction") != Direction.ascending
+    return results.order_by(
+        f"-{sort_field}" if descending else sort_field, TIEBREAKER_FIELD
+    )
+
+
+def paginate_report_ids(report_ids, per_page, number):
+    """
+    Paginates an ordered list of report_ids. Returns the paginator and the
+    page, whose object_list holds the matching General rows in list order.
+    """
+    paginator = Paginator(report_ids, per_page)
+    page = paginator.page(number)
+    rows = General.objects.in_bulk(page.object_list, field_name="report_id")
+    page.object_list = [rows[r] for r in page.object_list if r in rows]
+    page.next_cursor = ""
+    page.previous_cursor = ""
+    return paginator, page
+
+
+def paginate_search_results(results, report_ids, results_count, params, number):
+    """
+    Returns (paginator, page) for a search. The page is sliced from the cached
+    report_ids when there are any, and otherwise fetched from the QuerySet,
+    seeking from the cursor in params when it's for an adjacent page.
+    """
+    if report_ids is not None:
+        return paginate_report_ids(report_ids, params["limit"], number)
+    paginator = KeysetPaginator(results, params["limit"], results_count, params)
+    return paginator, paginator.keyset_page(number, params.get("cursor"))
+
+
+def _planner_row_estimate(results):
+    try:
+        plan = json.loads(results.explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (ValueError, KeyError, IndexError, TypeError):
+        logger.warning("Unable to read planner row estimate for search.")
+        return None
+
+
+class KeysetPaginator(Paginator):
+    """
+    A Paginator that uses keyset pagination when given a cursor for an
+    adjacent page, and OFFSET pagination otherwise. The count is supplied up
+    front (see `search_results_count`) rather than computed by the paginator.
+    """
+
+    def __init__(self, object_list, per_page, count, params):
+        # Same default as `_set_general_defaults`.
+        order_by = params.get("order_by") or OrderBy.fac_accepted_date
+        self.sort_field = KEYSET_SORT_FIELDS.get(order_by)
+        self.descending = params.get("order_direction") != Direction.ascending
+        # Make the tiebreaker explicit, so that OFFSET and keyset pages agree
+        # on the order of rows with the same sort value.
+        object_list = stable_order(object_list, params)
+        super().__init__(object_list, per_page)
+        self.count = count
+        self.fingerprint = query_fingerprint(object_list)
+
+    def keyset_page(self, number, cursor=None):
+        """
+        Returns the page for the given number. If the cursor was issued for
+        this query and page, the page is fetched by seeking from the cursor.
+        """
+        number = self.validate_number(number)
+        payload = decode_cursor(cursor)
+
+        if (
+            self.sort_field
+            and payload
+            and payload.get("q") == self.fingerprint
+            and payload.get("page") == number
+        ):
+            if "after" in payload:
+                rows = self._rows_after(payload["after"])
+            elif "before" in payload:
+                rows = self._rows_before(payload["before"])
+            else:
+                rows = None
+            if rows is not None:
+                return self._keyset_page(rows, number)
+
+        page = self.page(number)
+        return self._keyset_page(list(page.object_list), number)
+
+    def _ordered(self, results, reverse=False):
+        descending = self.descending != reverse
+        field = f"-{self.sort_field}" if descending else self.sort_field
+        tiebreaker = f"-{TIEBREAKER_FIELD}" if reverse else TIEBREAKER_FIELD
+        return results.order_by(field, tiebreaker)
+
+    def _seek_query(self, key, forward):
+        """
+        Builds the filter for rows strictly after (forward) or before the
+        given (sort value, report_id) key, in display order.
+        """
+        value, report_id = key
+        field_is_greater = forward != self.descending
+        comparison = "gt" if field_is_greater else "lt"
+        tiebreaker = "gt" if forward else "lt"
+        return Q(**{f"{self.sort_field}__{comparison}": value}) | Q(
+            **{
+                self.sort_field: value,
+                f"{TIEBREAKER_FIELD}__{tiebreaker}": report_id,
+            }
+        )
+
+    def _rows_after(self, key):
+        if not self._valid_key(key):
+            return None
+        results = self._ordered(self.object_list).filter(
+            self._seek_query(key, forward=True)
+        )
+        return list(results[: self.per_page])
+
+    def _rows_before(self, key):
+        if not self._valid_key(key):
+            return None
+        results = self._ordered(self.object_list, reverse=True).filter(
+            self._seek_query(key, forward=False)
+        )
+        return list(reversed(list(results[: self.per_page])))
+
+    def _valid_key(self, key):
+        return isinstance(key, list) and len(key) == 2
+
+    def _key_for(self, row):
+        return [getattr(row, self.sort_field), getattr(row, TIEBREAKER_FIELD)]
+
+    def _keyset_page(self, rows, number):
+        page = Page(rows, number, self)
+        page.next_cursor = ""
+        page.previous_cursor = ""
+        if self.sort_field and rows:
+            # With an estimated count, a short page is the real last page.
+            if page.has_next() and len(rows) == self.per_page:
+                page.next_cursor = encode_cursor(
+                    self.fingerprint, number + 1, after=self._key_for(rows[-1])
+                )
+            if page.has_previous():
+                page.previous_cursor = encode_cursor(
+                    self.fingerprint, number - 1, before=self._key_for(rows[0])
+                )
+        return page
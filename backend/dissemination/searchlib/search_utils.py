@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import textwrap
 
@@ -5,10 +7,17 @@ import time
 from math import ceil
 
 import newrelic.agent
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 
 from config.settings import AGENCY_NAMES
 from dissemination.search import search as search_sac
 from dissemination.searchlib.audit_search import search as search_audit
+from dissemination.searchlib.search_cache import search_cache_generation
+from dissemination.searchlib.search_constants import Direction, OrderBy
+from dissemination.searchlib.search_pagination import stable_order
+from users.permissions import is_federal_user
 
 logger = logging.getLogger(__name__)
 
@@ -44,13 +53,11 @@ def _add_search_params_to_newrelic(search_parameters):
     )
 
 
-# TODO: Update Post SOC Launch -> Clean up to ignore basic/advanced
-def run_search(request, form_data, is_soc=False):
+def build_search_parameters(form_data):
     """
-    Given cleaned form data, run the search.
-    Returns the results QuerySet.
+    Given cleaned form data, build the parameters dict used by the search
+    functions.
     """
-
     basic_parameters = {
         "audit_years": form_data["audit_year"],
         "auditee_state": form_data["auditee_state"],
@@ -86,6 +93,17 @@ def run_search(request, form_data, is_soc=False):
         }
         search_parameters.update(advanced_parameters)
 
+    return search_parameters
+
+
+# TODO: Update Post SOC Launch -> Clean up to ignore basic/advanced
+def run_search(request, form_data, is_soc=False):
+    """
+    Given cleaned form data, run the search.
+    Returns the results QuerySet.
+    """
+    search_parameters = build_search_parameters(form_data)
+
     _add_search_params_to_newrelic(search_parameters)
 
     return (
@@ -95,6 +113,71 @@ def run_search(request, form_data, is_soc=False):
     )
 
 
+def _canonical_search_parameters(search_parameters):
+    """
+    Normalize search parameters so that equivalent searches compare equal.
+    Empty values are dropped, lists are sorted, and the default sort is
+    filled in. Display params (page, limit, cursor) are never included.
+    """
+    canonical = {
+        "order_by": OrderBy.fac_accepted_date,
+        "order_direction": Direction.descending,
+    }
+    for key, value in search_parameters.items():
+        if value in (None, "", [], ()):
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(v) for v in value)
+        canonical[key] = value
+    return canonical
+
+
+def _search_cache_key(request, search_parameters):
+    # Federal users may see deprecated resubmissions, so they get their own key.
+    key_source = {
+        "params": _canonical_search_parameters(search_parameters),
+        "federal": is_federal_user(request.user),
+    }
+    digest = hashlib.sha256(
+        json.dumps(key_source, sort_keys=True, cls=DjangoJSONEncoder).encode("utf-8")
+    ).hexdigest()
+    return f"search-results:{search_cache_generation()}:{digest}"
+
+
+def run_cached_search(request, form_data):
+    """
+    Given cleaned form data, run the search through the result cache.
+    Returns (results, report_ids): the results QuerySet, and the ordered list
+    of matching report_ids. report_ids is None when the search matches more
+    than SEARCH_RESULT_CACHE_MAX_IDS rows; page through the QuerySet instead.
+
+    The cache is invalidated whenever an audit is disseminated.
+    """
+    results = run_search(request, form_data)
+    search_parameters = build_search_parameters(form_data)
+    cache_key = _search_cache_key(request, search_parameters)
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        newrelic.agent.record_custom_metric("Custom/Search/ResultCacheHit", 1)
+        return results, cached["report_ids"]
+
+    newrelic.agent.record_custom_metric("Custom/Search/ResultCacheMiss", 1)
+    limit = settings.SEARCH_RESULT_CACHE_MAX_IDS
+    ordered = stable_order(results, search_parameters)
+    report_ids = list(ordered.values_list("report_id", flat=True)[: limit + 1])
+    if len(report_ids) > limit:
+        # Remember that this search is too broad, so we don't fetch it again.
+        report_ids = None
+
+    cache.set(
+        cache_key,
+        {"report_ids": report_ids},
+        settings.SEARCH_RESULT_CACHE_TTL_SECS,
+    )
+    return results, report_ids
+
+
 # TODO: Update Post SOC Launch -> This can go
 def populate_cog_over_name(results):
     agency_names = AGENCY_NAMES
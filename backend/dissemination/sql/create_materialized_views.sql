@@ -1,16 +1,17 @@
-CREATE SEQUENCE IF NOT EXISTS dissemination_combined_id_seq
-    START WITH 1
-    INCREMENT BY 1
-    NO MINVALUE
-    NO MAXVALUE;
-
 -----------------------
 -- dissemination_combined
 -- This table is used primarily by search.
+-- Each row is keyed by the ids of the award, finding and passthrough rows it
+-- was built from, and its id is derived from that key, so that a row keeps
+-- its id across refreshes. REFRESH ... CONCURRENTLY needs the unique index on
+-- the key, and only rewrites the rows that changed.
 CREATE MATERIALIZED VIEW IF NOT EXISTS 
 	dissemination_combined_temp AS 
 	SELECT
-		nextval('dissemination_combined_id_seq') AS id,
+		hashtextextended(concat_ws(':', dfa.id, coalesce(df.id, 0), coalesce(dp.id, 0)), 0) AS id,
+		dfa.id AS federal_award_row_id,
+		coalesce(df.id, 0) AS finding_row_id,
+		coalesce(dp.id, 0) AS passthrough_row_id,
 		dg.report_id,
 		dfa.award_reference,
 		df.reference_number,
@@ -126,9 +127,12 @@ CREATE MATERIALIZED VIEW IF NOT EXISTS
 
 
 DROP MATERIALIZED VIEW IF EXISTS dissemination_combined;
-ALTER SEQUENCE dissemination_combined_id_seq RESTART;
+DROP SEQUENCE IF EXISTS dissemination_combined_id_seq;
 ALTER MATERIALIZED VIEW dissemination_combined_temp RENAME TO dissemination_combined;
 
+CREATE UNIQUE INDEX IF NOT EXISTS dc_row_key_idx
+	on dissemination_combined (federal_award_row_id, finding_row_id, passthrough_row_id);
+
 CREATE INDEX IF NOT EXISTS dc_report_id_idx 
 	on dissemination_combined (report_id);
 
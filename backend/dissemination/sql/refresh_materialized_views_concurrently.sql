@@ -0,0 +1,3 @@
+REFRESH MATERIALIZED VIEW CONCURRENTLY dissemination_combined;
+
+REFRESH MATERIALIZED VIEW census_gsa_crosswalk;
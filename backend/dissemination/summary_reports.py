@@ -298,6 +298,21 @@ def set_column_widths(worksheet):
         worksheet.column_dimensions[columns[col - 1]].width = int(value * 1.2)
 
 
+def set_column_widths_from_rows(worksheet, rows):
+    """
+    Like set_column_widths, but sized from the given rows. Write-only
+    worksheets can't be read back, and need their widths set before any rows
+    are appended.
+    """
+    dims = {}
+    for row in rows:
+        for index, value in enumerate(row):
+            if value:
+                dims[index] = max((dims.get(index, 0), len(str(value))))
+    for index, value in dims.items():
+        worksheet.column_dimensions[columns[index]].width = int(value * 1.2)
+
+
 def protect_sheet(sheet):
     sheet.protection.sheet = True
     sheet.protection.password = str(uuid.uuid4())
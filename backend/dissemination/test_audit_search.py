@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from audit.models import Audit
+from audit.models.constants import STATUS
+from dissemination.searchlib.audit_search import search
+
+
+def _make_audit(search_names=None, agency_prefixes=None, agency_extensions=None):
+    return baker.make(
+        Audit,
+        version=0,
+        submission_status=STATUS.DISSEMINATED,
+        audit={
+            "search_indexes": {
+                "search_names": search_names or [],
+                "agency_prefixes": agency_prefixes or [],
+                "agency_extensions": agency_extensions or [],
+            }
+        },
+    )
+
+
+def _params(**kwargs):
+    return {"findings": []} | kwargs
+
+
+class AuditSearchNamesTests(TestCase):
+    def test_search_names_text_is_flattened(self):
+        """
+        The generated search_names_text column contains every search name
+        """
+        audit = _make_audit(search_names=["Berea College", "Jane Doe"])
+        audit.refresh_from_db()
+
+        self.assertIn("Berea College", audit.search_names_text)
+        self.assertIn("Jane Doe", audit.search_names_text)
+
+    def test_name_substring_case_insensitive(self):
+        """
+        Name search matches substrings of any search name, ignoring case
+        """
+        match = _make_audit(search_names=["Berea College", "Jane Doe"])
+        _make_audit(search_names=["Some Other Place"])
+
+        results = search(_params(names=["berea"]))
+        self.assertEqual([r.report_id for r in results], [match.report_id])
+
+        results = search(_params(names=["JANE"]))
+        self.assertEqual([r.report_id for r in results], [match.report_id])
+
+    def test_name_terms_are_split(self):
+        """
+        Multi-word name searches match any of the individual words
+        """
+        berea = _make_audit(search_names=["Berea College"])
+        city = _make_audit(search_names=["City of Springfield"])
+        _make_audit(search_names=["Nothing Relevant"])
+
+        results = search(_params(names=["college springfield"]))
+        self.assertEqual(
+            {r.report_id for r in results}, {berea.report_id, city.report_id}
+        )
+
+
+class AuditSearchAlnsTests(TestCase):
+    def test_agency_prefix(self):
+        """
+        Two-digit ALNs match audits with any award under that agency prefix
+        """
+        match_93 = _make_audit(agency_prefixes=["93", "10"])
+        match_45 = _make_audit(agency_prefixes=["45"])
+        _make_audit(agency_prefixes=["84"])
+        # Prefixes are matched as whole values, not substrings.
+        _make_audit(agency_prefixes=["193"])
+
+        results = search(_params(alns=["93", "45"]))
+        self.assertEqual(
+            {r.report_id for r in results}, {match_93.report_id, match_45.report_id}
+        )
+
+    def test_full_aln(self):
+        """
+        Full ALNs require both the prefix and the extension to match
+        """
+        match = _make_audit(agency_prefixes=["84"], agency_extensions=["027"])
+        _make_audit(agency_prefixes=["84"], agency_extensions=["010"])
+        _make_audit(agency_prefixes=["10"], agency_extensions=["027"])
+        _make_audit(agency_prefixes=["84"], agency_extensions=["0271"])
+
+        results = search(_params(alns=["84.027"]))
+        self.assertEqual([r.report_id for r in results], [match.report_id])
+
+    def test_prefix_and_full_aln(self):
+        """
+        Agency prefixes and full ALNs are OR'd together
+        """
+        prefix_match = _make_audit(agency_prefixes=["93"], agency_extensions=["001"])
+        full_match = _make_audit(agency_prefixes=["84"], agency_extensions=["027"])
+        _make_audit(agency_prefixes=["84"], agency_extensions=["010"])
+
+        results = search(_params(alns=["93", "84.027"]))
+        self.assertEqual(
+            {r.report_id for r in results},
+            {prefix_match.report_id, full_match.report_id},
+        )
+
+
+class BenchmarkAuditSearchCommandTests(TestCase):
+    def test_reports_percentiles(self):
+        """
+        The benchmark command reports a line per payload and mode
+        """
+        _make_audit(search_names=["Berea College"], agency_prefixes=["84"])
+        out = StringIO()
+
+        call_command("benchmark_audit_search", iterations=2, compare=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("p95 ms", output)
+        self.assertIn("multi_word_name", output)
+        self.assertIn("seqscan", output)
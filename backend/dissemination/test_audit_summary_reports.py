@@ -0,0 +1,113 @@
+from io import StringIO
+
+import openpyxl
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from audit.models import Audit
+from audit.models.constants import STATUS
+from dissemination.report_generation.audit_summary_reports import (
+    generate_audit_summary_report,
+    stream_audit_summary_report,
+)
+
+
+def _make_audit(report_id, award_count=2):
+    awards = [
+        {
+            "award_reference": f"AWARD-{i:04d}",
+            "program": {
+                "federal_agency_prefix": "93",
+                "three_digit_extension": "600",
+                "program_name": "Head Start",
+                "amount_expended": 1000 * i,
+            },
+            "cluster": {"cluster_name": "N/A"},
+            "direct_or_indirect_award": {"is_direct": "Y"},
+        }
+        for i in range(1, award_count + 1)
+    ]
+    return baker.make(
+        Audit,
+        version=0,
+        report_id=report_id,
+        submission_status=STATUS.DISSEMINATED,
+        audit={
+            "federal_awards": {"awards": awards},
+            "notes_to_sefa": {
+                "accounting_policies": "Policies",
+                "rate_explained": "Explained",
+                "is_minimis_rate_used": "N",
+                "notes_to_sefa_entries": [],
+            },
+        },
+    )
+
+
+def _sheet_values(workbook):
+    return {
+        name: [list(row) for row in workbook[name].iter_rows(values_only=True)]
+        for name in workbook.sheetnames
+        if name != "Coversheet"
+    }
+
+
+class StreamAuditSummaryReportTests(TestCase):
+    def setUp(self):
+        self.report_ids = [
+            _make_audit("2023-06-GSAFAC-0000000001").report_id,
+            _make_audit("2023-06-GSAFAC-0000000002", award_count=3).report_id,
+        ]
+
+    def test_matches_in_memory_report(self):
+        """
+        The streamed workbook has the same sheets, rows, and named ranges as
+        the in-memory one
+        """
+        _, workbook_bytes = generate_audit_summary_report(self.report_ids, True)
+        filename, report_file = stream_audit_summary_report(self.report_ids, True)
+
+        self.assertTrue(filename.endswith(".xlsx"))
+        in_memory = openpyxl.load_workbook(workbook_bytes)
+        streamed = openpyxl.load_workbook(report_file)
+        report_file.close()
+
+        self.assertEqual(streamed.sheetnames, in_memory.sheetnames)
+        self.assertEqual(streamed.sheetnames[0], "Coversheet")
+        self.assertEqual(
+            sorted(_sheet_values(streamed)["federalaward"]),
+            sorted(_sheet_values(in_memory)["federalaward"]),
+        )
+        self.assertEqual(
+            set(streamed.defined_names.keys()), set(in_memory.defined_names.keys())
+        )
+
+    def test_federal_awards_not_duplicated(self):
+        _, report_file = stream_audit_summary_report(self.report_ids, True)
+        rows = _sheet_values(openpyxl.load_workbook(report_file))["federalaward"]
+        report_file.close()
+
+        # Header plus one row per award.
+        self.assertEqual(len(rows), 1 + 5)
+
+    def test_restricted_sheets_excluded_without_private_access(self):
+        _, report_file = stream_audit_summary_report(self.report_ids, False)
+        sheets = _sheet_values(openpyxl.load_workbook(report_file))
+        report_file.close()
+
+        self.assertEqual(len(sheets["note"]), 1)  # Header only
+        self.assertGreater(len(sheets["note_coversheet"]), 1)
+
+
+class BenchmarkSummaryReportCommandTests(TestCase):
+    def test_reports_each_size_and_mode(self):
+        for i in range(3):
+            _make_audit(f"2023-06-GSAFAC-{i:010d}")
+        out = StringIO()
+
+        call_command("benchmark_summary_report", "--sizes", "1", "3", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 4)
+        self.assertIn("streaming", lines[-1])
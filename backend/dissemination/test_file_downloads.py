@@ -1,8 +1,12 @@
 from datetime import datetime, timezone
+import multiprocessing
+from unittest.mock import patch
 
+from botocore.client import ClientError
 from django.conf import settings
 from django.http import Http404
-from django.test import TestCase
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from audit.fixtures.excel import FORM_SECTIONS
 from audit.models import (
@@ -13,7 +17,14 @@ from audit.models import (
 )
 from audit.models.constants import SAC_SEQUENCE_ID
 from audit.models.utils import get_next_sequence_id
-from dissemination.file_downloads import get_filename
+from dissemination.file_downloads import (
+    cache_file_exists,
+    file_exists,
+    get_download_url,
+    get_file,
+    get_filename,
+    get_s3_client,
+)
 
 from model_bakery import baker
 
@@ -172,3 +183,98 @@ class GetFilenameTests(TestCase):
 
             filename = get_filename(report_id, form_section)
             self.assertEqual(f"excel/{report_id}--{form_section}.xlsx", filename)
+
+    def test_get_file_knows_recorded_reports_exist(self):
+        """
+        Single audit reports with a SingleAuditReportFile are known to be in S3;
+        Census reports and workbooks are not.
+        """
+        sequence = get_next_sequence_id(SAC_SEQUENCE_ID)
+        report_id = self._report_id(sequence, "GSAFAC")
+        sac = baker.make(SingleAuditChecklist, id=sequence, report_id=report_id)
+        baker.make(SingleAuditReportFile, sac=sac)
+        baker.make(ExcelFile, sac=sac, form_section=FORM_SECTIONS[0])
+        census_report_id = self._report_id(
+            get_next_sequence_id(SAC_SEQUENCE_ID), settings.CENSUS_DATA_SOURCE
+        )
+
+        self.assertEqual(
+            get_file(report_id, "report"), (f"singleauditreport/{report_id}.pdf", True)
+        )
+        self.assertFalse(get_file(report_id, FORM_SECTIONS[0])[1])
+        self.assertFalse(get_file(census_report_id, "report")[1])
+
+
+class SharedS3ClientTests(TestCase):
+    def test_clients_are_shared(self):
+        self.assertIs(get_s3_client(), get_s3_client())
+        self.assertIsNot(get_s3_client(), get_s3_client(external=True))
+        self.assertEqual(
+            get_s3_client().meta.config.max_pool_connections,
+            settings.S3_MAX_POOL_CONNECTIONS,
+        )
+
+
+@patch("dissemination.file_downloads._s3_client")
+class S3ClientTests(TestCase):
+    @override_settings(S3_EXISTS_CACHE_TTL_SECS=60, S3_MISSING_CACHE_TTL_SECS=60)
+    def test_file_exists_is_cached(self, mock_s3_client):
+        head_object = mock_s3_client.return_value.head_object
+        head_object.side_effect = [None, ClientError({}, "HeadObject")]
+
+        for _ in range(2):
+            self.assertTrue(file_exists("test/cached-exists.pdf"))
+            self.assertFalse(file_exists("test/cached-missing.pdf"))
+
+        self.assertEqual(head_object.call_count, 2)
+
+    def test_file_exists_is_not_cached_in_tests(self, mock_s3_client):
+        head_object = mock_s3_client.return_value.head_object
+
+        file_exists("test/uncached.pdf")
+        file_exists("test/uncached.pdf")
+
+        self.assertEqual(head_object.call_count, 2)
+
+    def test_download_url_of_known_file(self, mock_s3_client):
+        mock_s3_client.return_value.generate_presigned_url.return_value = "url"
+
+        self.assertEqual(get_download_url("test/known.pdf", known_to_exist=True), "url")
+        mock_s3_client.return_value.head_object.assert_not_called()
+
+    def test_download_url_of_missing_file(self, mock_s3_client):
+        mock_s3_client.return_value.head_object.side_effect = ClientError(
+            {}, "HeadObject"
+        )
+
+        self.assertRaises(Http404, get_download_url, "test/missing.pdf")
+        mock_s3_client.return_value.generate_presigned_url.assert_not_called()
+
+
+def _forget_in_child(filename):
+    cache_file_exists(filename, False)
+    connections.close_all()
+
+
+@override_settings(S3_EXISTS_CACHE_TTL_SECS=60, S3_MISSING_CACHE_TTL_SECS=60)
+@patch("dissemination.file_downloads._s3_client")
+class SharedExistsCacheTests(TransactionTestCase):
+    def test_deletion_in_another_process_is_seen(self, mock_s3_client):
+        """
+        A workbook deleted by another process, such as a run_jobs worker, is
+        not taken to exist from what this process cached
+        """
+        filename = "excel/deleted-elsewhere.xlsx"
+        self.assertTrue(file_exists(filename))
+
+        # The child must not share this process's database connection.
+        connections.close_all()
+        child = multiprocessing.get_context("fork").Process(
+            target=_forget_in_child, args=(filename,)
+        )
+        child.start()
+        child.join(timeout=30)
+
+        self.assertEqual(child.exitcode, 0)
+        self.assertFalse(file_exists(filename))
+        mock_s3_client.return_value.head_object.assert_called_once()
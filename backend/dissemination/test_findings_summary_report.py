@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from dissemination.models import FederalAward, Finding, General
+from dissemination.report_generation.findings_summary_report import (
+    gather_report_data,
+    get_findings_for_agency_number,
+)
+
+
+class GetFindingsForAgencyNumberTests(TestCase):
+    def setUp(self):
+        self.general = baker.make(
+            General,
+            report_id="2023-06-GSAFAC-0000000001",
+            auditee_name="Auditee",
+            cognizant_agency="93",
+        )
+        other = baker.make(General, report_id="2023-06-GSAFAC-0000000002")
+        baker.make(
+            FederalAward,
+            report_id=self.general,
+            award_reference="AWARD-0001",
+            federal_agency_prefix="93",
+            federal_award_extension="600",
+            findings_count=2,
+        )
+        baker.make(
+            FederalAward,
+            report_id=self.general,
+            award_reference="AWARD-0002",
+            federal_agency_prefix="84",
+            federal_award_extension="027",
+            findings_count=1,
+        )
+        for reference_number in ["2023-001", "2023-002"]:
+            baker.make(
+                Finding,
+                report_id=self.general,
+                award_reference="AWARD-0001",
+                reference_number=reference_number,
+            )
+        baker.make(
+            Finding,
+            report_id=self.general,
+            award_reference="AWARD-0002",
+            reference_number="2023-001",
+        )
+        # A duplicate (report_id, award_reference, reference_number) row.
+        baker.make(
+            Finding,
+            report_id=self.general,
+            award_reference="AWARD-0002",
+            reference_number="2023-001",
+        )
+        # A finding whose award has no findings count is skipped.
+        baker.make(
+            FederalAward,
+            report_id=other,
+            award_reference="AWARD-0001",
+            federal_agency_prefix="10",
+            federal_award_extension="555",
+            findings_count=0,
+        )
+        baker.make(
+            Finding,
+            report_id=other,
+            award_reference="AWARD-0001",
+            reference_number="2023-001",
+        )
+
+    def test_rows_grouped_by_agency_prefix(self):
+        results = get_findings_for_agency_number(
+            ["2023-06-GSAFAC-0000000001", "2023-06-GSAFAC-0000000002"]
+        )
+
+        self.assertEqual(sorted(results.keys()), ["84", "93"])
+        self.assertEqual(len(results["93"]), 2)
+        self.assertEqual(len(results["84"]), 1)
+
+        row = results["84"][0]
+        self.assertEqual(row["report_id"], self.general.report_id)
+        self.assertEqual(row["aln"], "84.027")
+        self.assertEqual(row["cog_over"], "COG")
+        self.assertEqual(row["cog_over_agency"], "93")
+
+    def test_workbook_has_a_sheet_per_agency(self):
+        workbook = gather_report_data([self.general.report_id])
+
+        self.assertEqual(workbook.sheetnames, ["84", "93"])
+        # Header plus one row per unique finding.
+        self.assertEqual(workbook["93"].max_row, 3)
+
+
+class BenchmarkFindingsSummaryReportCommandTests(TestCase):
+    def test_reports_each_size(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_findings_summary_report",
+            "--sizes",
+            "10",
+            "20",
+            "--findings-per-report",
+            "3",
+            stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2 + 2)
+        self.assertEqual(lines[-1].split()[:3], ["20", "60", "60"])
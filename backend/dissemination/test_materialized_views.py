@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from model_bakery import baker
+
+from dissemination.models import (
+    DisseminationCombined,
+    FederalAward,
+    Finding,
+    General,
+    MaterializedViewRefresh,
+)
+from dissemination.test_materialized_view_builder import TestMaterializedViewBuilder
+
+
+def _make_report(report_id, findings=0):
+    general = baker.make(General, is_public=True, report_id=report_id)
+    baker.make(FederalAward, report_id=general, award_reference="AWARD-0001")
+    for _ in range(findings):
+        baker.make(Finding, report_id=general, award_reference="AWARD-0001")
+    return general
+
+
+def _refresh(*flags):
+    out = StringIO()
+    call_command("materialized_views", "--refresh", *flags, stdout=out)
+    return out.getvalue()
+
+
+class MaterializedViewRefreshTests(TestMaterializedViewBuilder):
+    def setUp(self):
+        super().setUp()
+        _make_report("2022-04-TSTDAT-0000000001", findings=2)
+
+    def test_concurrent_refresh_keeps_row_ids(self):
+        _refresh("--concurrently")
+        ids = set(DisseminationCombined.objects.values_list("id", flat=True))
+        self.assertEqual(len(ids), 2)
+
+        _make_report("2022-04-TSTDAT-0000000002")
+        out = _refresh("--concurrently")
+
+        self.assertIn("Refreshed dissemination_combined (concurrent)", out)
+        self.assertEqual(DisseminationCombined.objects.count(), 3)
+        self.assertLess(
+            ids, set(DisseminationCombined.objects.values_list("id", flat=True))
+        )
+
+    def test_incremental_refresh(self):
+        _refresh()
+
+        out = _refresh("--incremental")
+        self.assertIn("dissemination_combined is up to date", out)
+
+        _make_report("2022-04-TSTDAT-0000000002")
+        out = _refresh("--incremental")
+        self.assertIn("1 reports disseminated and 0 records removed", out)
+        self.assertEqual(DisseminationCombined.objects.count(), 3)
+
+        # Redisseminating a report replaces its rows.
+        General.objects.filter(report_id="2022-04-TSTDAT-0000000001").delete()
+        _make_report("2022-04-TSTDAT-0000000001")
+        out = _refresh("--incremental")
+        self.assertIn("1 reports disseminated and 1 records removed", out)
+        self.assertEqual(DisseminationCombined.objects.count(), 2)
+
+        refresh = MaterializedViewRefresh.objects.get(
+            view_name="dissemination_combined"
+        )
+        self.assertEqual(refresh.method, "incremental")
+        self.assertEqual(refresh.general_count, 2)
+        self.assertEqual(
+            refresh.general_watermark, General.objects.order_by("-id").first().id
+        )
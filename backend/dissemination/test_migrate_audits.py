@@ -0,0 +1,186 @@
+from datetime import datetime, timezone
+from io import StringIO
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from audit.models import (
+    Access,
+    Audit,
+    AuditValidationWaiver,
+    SacValidationWaiver,
+    SingleAuditChecklist,
+    SingleAuditReportFile,
+    SubmissionEvent,
+)
+from audit.models.constants import STATUS, EventType
+from audit.models.history import History
+from dissemination.management.commands.migrate_audits import (
+    _migrate_partition,
+    get_or_create_sot_migration_user,
+)
+
+
+def _general_information(ein, uei):
+    return {
+        "ein": ein,
+        "auditee_uei": uei,
+        "auditee_name": "Test Auditee",
+        "auditee_fiscal_period_end": "2023-06-30",
+    }
+
+
+class MigrateAuditsTests(TestCase):
+    def setUp(self):
+        self.disseminated = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-GSAFAC-0000000001",
+            submission_status=STATUS.DISSEMINATED,
+            general_information=_general_information("123456789", "AAA123456BBB"),
+            cognizant_agency="84",
+            oversight_agency=None,
+            transition_name=[STATUS.SUBMITTED],
+            transition_date=[datetime(2023, 9, 1, 12, tzinfo=timezone.utc)],
+        )
+        self.census = baker.make(
+            SingleAuditChecklist,
+            report_id="2023-06-CENSUS-0000000002",
+            data_source=settings.CENSUS_DATA_SOURCE,
+            submission_status=STATUS.IN_PROGRESS,
+            general_information=_general_information("987654321", "CCC123456DDD"),
+            transition_name=[STATUS.READY_FOR_CERTIFICATION, STATUS.SUBMITTED],
+            transition_date=[
+                datetime(2023, 8, 1, tzinfo=timezone.utc),
+                datetime(2023, 8, 2, tzinfo=timezone.utc),
+            ],
+        )
+        self.access = baker.make(Access, sac=self.disseminated)
+        SingleAuditReportFile.objects.bulk_create(
+            [
+                SingleAuditReportFile(
+                    sac=self.disseminated,
+                    filename=filename,
+                    component_page_numbers={"financial_statements": pages},
+                )
+                for filename, pages in [("old.pdf", 1), ("new.pdf", 2)]
+            ]
+        )
+        self.event_time = datetime(2023, 9, 2, tzinfo=timezone.utc)
+        event = baker.make(
+            SubmissionEvent,
+            sac=self.disseminated,
+            event=SubmissionEvent.EventType.DISSEMINATED,
+        )
+        SubmissionEvent.objects.filter(id=event.id).update(timestamp=self.event_time)
+        baker.make(
+            SacValidationWaiver,
+            report_id=self.disseminated,
+            justification="tab\there",
+            waiver_types=[SacValidationWaiver.TYPES.AUDITOR_CERTIFYING_OFFICIAL],
+        )
+
+    def test_migrate_audits(self):
+        out = StringIO()
+        call_command("migrate_audits", "--batch-size", "1", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["migrated"], 2)
+        self.assertFalse(
+            SingleAuditChecklist.objects.filter(migrated_to_audit=False).exists()
+        )
+
+        audit = Audit.objects.get(report_id=self.disseminated.report_id)
+        self.assertEqual(audit.version, 2)
+        self.assertEqual(audit.created_at, self.disseminated.date_created)
+        self.assertEqual(audit.auditee_uei, "AAA123456BBB")
+        self.assertEqual(audit.cognizant_agency, "84")
+        self.assertIsNone(audit.oversight_agency)
+        self.assertEqual(audit.audit["audit_year"], "2023")
+        self.assertIn("search_indexes", audit.audit)
+        self.assertEqual(
+            audit.audit["file_information"],
+            {"pages": {"financial_statements": 2}, "filename": "new.pdf"},
+        )
+        self.assertEqual(
+            Access.objects.get(id=self.access.id).audit_id,
+            audit.id,
+        )
+        self.assertEqual(
+            set(
+                SingleAuditReportFile.objects.filter(sac=self.disseminated).values_list(
+                    "audit_id", flat=True
+                )
+            ),
+            {audit.id},
+        )
+
+        waiver = AuditValidationWaiver.objects.get(report_id=audit)
+        self.assertEqual(waiver.justification, "tab\there")
+        self.assertEqual(
+            waiver.waiver_types,
+            [SacValidationWaiver.TYPES.AUDITOR_CERTIFYING_OFFICIAL],
+        )
+
+        histories = History.objects.filter(report_id=audit.report_id).order_by("id")
+        self.assertEqual(
+            [(h.event, h.version) for h in histories],
+            [
+                (EventType.SOURCE_OF_TRUTH_MIGRATION, 0),
+                (SubmissionEvent.EventType.DISSEMINATED, 0),
+            ],
+        )
+        self.assertNotIn("search_indexes", histories[0].event_data)
+        self.assertEqual(histories[1].updated_at, self.event_time)
+
+        census_histories = History.objects.filter(
+            report_id=self.census.report_id
+        ).exclude(event=EventType.SOURCE_OF_TRUTH_MIGRATION)
+        self.assertEqual(
+            {(h.event, h.updated_at) for h in census_histories},
+            {
+                (
+                    SubmissionEvent.EventType.LOCKED_FOR_CERTIFICATION,
+                    datetime(2023, 8, 1, tzinfo=timezone.utc),
+                ),
+                (
+                    SubmissionEvent.EventType.SUBMITTED,
+                    datetime(2023, 8, 2, tzinfo=timezone.utc),
+                ),
+            },
+        )
+
+    def test_migrate_audits_resumes(self):
+        """Migrated SACs are skipped when the migration is run again"""
+        call_command(
+            "migrate_audits", "--report_id", self.census.report_id, stdout=StringIO()
+        )
+
+        out = StringIO()
+        call_command("migrate_audits", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["migrated"], 1)
+        self.assertEqual(Audit.objects.count(), 2)
+
+    def test_migrate_audits_skips_existing_audits(self):
+        """
+        SACs whose Audit was made after they were listed are marked as
+        migrated, instead of breaking the chunk
+        """
+        audit = baker.make(Audit, report_id=self.census.report_id)
+        access = baker.make(Access, sac=self.census)
+
+        stats = _migrate_partition(
+            sorted([self.disseminated.report_id, self.census.report_id]),
+            get_or_create_sot_migration_user().id,
+            10,
+        )
+
+        self.assertEqual(stats["migrated"], 1)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(Audit.objects.count(), 2)
+        self.assertFalse(
+            SingleAuditChecklist.objects.filter(migrated_to_audit=False).exists()
+        )
+        self.assertEqual(Access.objects.get(id=access.id).audit_id, audit.id)
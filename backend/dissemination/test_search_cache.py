@@ -0,0 +1,142 @@
+import multiprocessing
+from unittest.mock import call, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.client import RequestFactory
+from model_bakery import baker
+
+from dissemination.forms.search_forms import SearchForm
+from dissemination.models import General
+from dissemination.searchlib.search_cache import (
+    invalidate_search_cache,
+    search_cache_generation,
+)
+from dissemination.searchlib.search_utils import (
+    _canonical_search_parameters,
+    run_cached_search,
+)
+
+User = get_user_model()
+
+
+class CanonicalSearchParametersTests(TestCase):
+    def test_equivalent_searches_match(self):
+        """
+        Empty values, list order, and the default sort don't change the key
+        """
+        a = {
+            "audit_years": ["2023", "2022"],
+            "names": [],
+            "auditee_state": "",
+            "order_by": "",
+        }
+        b = {
+            "audit_years": ["2022", "2023"],
+            "order_by": "fac_accepted_date",
+            "order_direction": "descending",
+        }
+        self.assertEqual(
+            _canonical_search_parameters(a), _canonical_search_parameters(b)
+        )
+
+    def test_different_searches_differ(self):
+        self.assertNotEqual(
+            _canonical_search_parameters({"audit_years": ["2023"]}),
+            _canonical_search_parameters({"audit_years": ["2022"]}),
+        )
+
+
+@override_settings(SEARCH_RESULT_CACHE_TTL_SECS=60)
+class RunCachedSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+        self.request.user = baker.make(User)
+        for i in range(3):
+            baker.make(
+                General,
+                report_id=f"2023-06-GSAFAC-{i:010d}",
+                audit_year="2023",
+                is_public=True,
+            )
+
+    def _form_data(self, **data):
+        form = SearchForm({"audit_year": ["2023"]} | data)
+        form.is_valid()
+        form_data = form.cleaned_data
+        form_data["advanced_search_flag"] = False
+        return form_data
+
+    def _report_ids(self, **data):
+        _, report_ids = run_cached_search(self.request, self._form_data(**data))
+        return report_ids
+
+    def test_repeated_search_is_cached(self):
+        """
+        A repeated search reuses the cached report_ids, whatever the page
+        """
+        first = self._report_ids()
+        self.assertEqual(len(first), 3)
+
+        baker.make(General, audit_year="2023", is_public=True)
+        self.assertEqual(self._report_ids(page="2", limit="1"), first)
+
+    def test_invalidation(self):
+        """
+        Invalidating the cache (as dissemination does) shows new results
+        """
+        generation = search_cache_generation()
+        self._report_ids()
+
+        baker.make(General, audit_year="2023", is_public=True)
+        invalidate_search_cache()
+
+        self.assertNotEqual(search_cache_generation(), generation)
+        self.assertEqual(len(self._report_ids()), 4)
+
+    @override_settings(SEARCH_RESULT_CACHE_MAX_IDS=2)
+    def test_broad_search_is_not_cached(self):
+        """
+        Searches with too many results return None, so callers page the QuerySet
+        """
+        results, report_ids = run_cached_search(self.request, self._form_data())
+        self.assertIsNone(report_ids)
+        self.assertEqual(results.count(), 3)
+
+    def test_hit_and_miss_metrics(self):
+        with patch("newrelic.agent.record_custom_metric") as mock_metric:
+            self._report_ids()
+            self._report_ids()
+
+        mock_metric.assert_has_calls(
+            [
+                call("Custom/Search/ResultCacheMiss", 1),
+                call("Custom/Search/ResultCacheHit", 1),
+            ]
+        )
+
+
+def _invalidate_in_child():
+    invalidate_search_cache()
+    connections.close_all()
+
+
+class SharedGenerationTests(TransactionTestCase):
+    def test_invalidation_from_another_process(self):
+        """
+        A generation started by another process, such as a run_jobs worker
+        that disseminated an audit, is the one this process uses
+        """
+        generation = search_cache_generation()
+
+        # The child must not share this process's database connection.
+        connections.close_all()
+        child = multiprocessing.get_context("fork").Process(target=_invalidate_in_child)
+        child.start()
+        child.join(timeout=30)
+
+        self.assertEqual(child.exitcode, 0)
+        self.assertNotEqual(search_cache_generation(), generation)
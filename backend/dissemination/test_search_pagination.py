@@ -0,0 +1,158 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+from model_bakery import baker
+
+from dissemination.models import General
+from dissemination.search import search
+from dissemination.searchlib.search_pagination import (
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+    search_results_count,
+)
+
+User = get_user_model()
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        self.request.user = baker.make(User)
+
+        # Pairs of reports share an accepted date, so the report_id tiebreaker
+        # matters.
+        for i in range(10):
+            baker.make(
+                General,
+                report_id=f"2023-06-GSAFAC-{i:010d}",
+                fac_accepted_date=datetime.date(2023, 1, 1 + i // 2),
+                audit_year="2023",
+                is_public=True,
+            )
+
+    def _search(self, **params):
+        return search(self.request, {"advanced_search_flag": False} | params)
+
+    def _all_report_ids(self, params):
+        return [r.report_id for r in self._search(**params)]
+
+    def _walk_forward(self, params, per_page=3):
+        results = self._search(**params)
+        paginator = KeysetPaginator(results, per_page, results.count(), params)
+        page = paginator.keyset_page(1)
+        seen = [r.report_id for r in page]
+        while page.has_next():
+            page = paginator.keyset_page(page.number + 1, page.next_cursor)
+            seen.extend(r.report_id for r in page)
+        return seen, page
+
+    def test_next_pages_match_offset_order(self):
+        """
+        Following next cursors visits every report once, in the search order
+        """
+        for direction in ["descending", "ascending"]:
+            params = {
+                "order_by": "fac_accepted_date",
+                "order_direction": direction,
+            }
+            seen, _ = self._walk_forward(params)
+            self.assertEqual(len(seen), 10)
+            self.assertEqual(len(set(seen)), 10)
+
+            results = self._search(**params)
+            paginator = KeysetPaginator(results, 3, results.count(), params)
+            offset_order = [
+                r.report_id for n in paginator.page_range for r in paginator.page(n)
+            ]
+            self.assertEqual(seen, offset_order)
+
+    def test_previous_cursor_returns_previous_page(self):
+        """
+        Following a previous cursor returns the same rows as the earlier page
+        """
+        params = {"order_by": "auditee_name", "order_direction": "ascending"}
+        results = self._search(**params)
+        paginator = KeysetPaginator(results, 3, results.count(), params)
+
+        page_1 = paginator.keyset_page(1)
+        page_2 = paginator.keyset_page(2, page_1.next_cursor)
+        page_3 = paginator.keyset_page(3, page_2.next_cursor)
+        back_to_2 = paginator.keyset_page(2, page_3.previous_cursor)
+
+        self.assertEqual(
+            [r.report_id for r in back_to_2], [r.report_id for r in page_2]
+        )
+
+    def test_cursor_for_another_search_is_ignored(self):
+        """
+        A cursor issued for a different search falls back to OFFSET pagination
+        """
+        params = {"order_by": "fac_accepted_date"}
+        results = self._search(**params)
+        paginator = KeysetPaginator(results, 3, results.count(), params)
+        expected = [r.report_id for r in paginator.page(2)]
+
+        foreign_cursor = encode_cursor("not-this-search", 2, after=["2023-01-05", ""])
+        page = paginator.keyset_page(2, foreign_cursor)
+
+        self.assertEqual([r.report_id for r in page], expected)
+
+    def test_malformed_cursor_is_ignored(self):
+        """
+        Garbage cursors decode to None rather than raising
+        """
+        self.assertIsNone(decode_cursor("not base64 !!"))
+        self.assertIsNone(decode_cursor(""))
+
+        params = {"order_by": "fac_accepted_date"}
+        results = self._search(**params)
+        paginator = KeysetPaginator(results, 3, results.count(), params)
+        page = paginator.keyset_page(1, "not base64 !!")
+        self.assertEqual(len(page), 3)
+
+    def test_cog_over_uses_offset(self):
+        """
+        Sorting by cog/over doesn't issue cursors
+        """
+        params = {"order_by": "cog_over", "order_direction": "ascending"}
+        results = self._search(**params)
+        paginator = KeysetPaginator(results, 3, results.count(), params)
+        page = paginator.keyset_page(1)
+
+        self.assertEqual(len(page), 3)
+        self.assertEqual(page.next_cursor, "")
+
+
+class SearchResultsCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+        self.request.user = baker.make(User)
+        baker.make(General, audit_year="2023", is_public=True, _quantity=4)
+
+    def _search(self):
+        return search(self.request, {"advanced_search_flag": False})
+
+    @override_settings(SEARCH_COUNT_CACHE_TTL_SECS=60)
+    def test_count_is_cached(self):
+        """
+        A repeated search reuses the cached count
+        """
+        self.assertEqual(search_results_count(self._search()), (4, False))
+
+        baker.make(General, audit_year="2023", is_public=True)
+        self.assertEqual(search_results_count(self._search()), (4, False))
+
+    @override_settings(
+        SEARCH_USE_ESTIMATED_COUNTS=True, SEARCH_ESTIMATED_COUNT_THRESHOLD=-1
+    )
+    def test_estimated_count(self):
+        """
+        Above the threshold, the planner estimate is used and flagged as such
+        """
+        _, is_estimate = search_results_count(self._search())
+        self.assertTrue(is_estimate)
@@ -4,7 +4,7 @@ from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from audit.models import (
     ExcelFile,
@@ -1130,10 +1130,11 @@ class PageHandlingTests(TestCase):
             "page": "1",
         }
 
-    @patch("dissemination.views.search.run_search")
+    @patch("dissemination.views.search.run_cached_search")
     def test_advanced_search_post_page_too_high(self, mock_run_search):
         """Ensure page resets to 1 when the requested page is greater than available pages"""
-        mock_run_search.return_value.count.return_value = (
+        mock_run_search.return_value = (MagicMock(), None)
+        mock_run_search.return_value[0].count.return_value = (
             5  # Mock result count (only 1 page available)
         )
 
@@ -1144,10 +1145,11 @@ class PageHandlingTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["page"], 1)  # Should reset to 1
 
-    @patch("dissemination.views.search.run_search")
+    @patch("dissemination.views.search.run_cached_search")
     def test_advanced_search_post_page_zero(self, mock_run_search):
         """Ensure page resets to 1 when the requested page is zero"""
-        mock_run_search.return_value.count.return_value = 5
+        mock_run_search.return_value = (MagicMock(), None)
+        mock_run_search.return_value[0].count.return_value = 5
 
         invalid_data = self.valid_post_data.copy()
         invalid_data["page"] = "0"
@@ -1156,10 +1158,11 @@ class PageHandlingTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["page"], 1)  # Should reset to 1
 
-    @patch("dissemination.views.search.run_search")
+    @patch("dissemination.views.search.run_cached_search")
     def test_advanced_search_post_page_empty(self, mock_run_search):
         """Ensure page defaults to 1 when no page is provided"""
-        mock_run_search.return_value.count.return_value = 5
+        mock_run_search.return_value = (MagicMock(), None)
+        mock_run_search.return_value[0].count.return_value = 5
 
         invalid_data = self.valid_post_data.copy()
         invalid_data["page"] = ""
@@ -1168,10 +1171,11 @@ class PageHandlingTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["page"], 1)  # Should default to 1
 
-    @patch("dissemination.views.search.run_search")
+    @patch("dissemination.views.search.run_cached_search")
     def test_advanced_search_post_valid_page(self, mock_run_search):
         """Ensure valid page number remains unchanged"""
-        mock_run_search.return_value.count.return_value = 20  # Multiple pages exist
+        mock_run_search.return_value = (MagicMock(), None)
+        mock_run_search.return_value[0].count.return_value = 20  # Multiple pages exist
 
         valid_data = self.valid_post_data.copy()
         valid_data["page"] = "2"  # Valid page
@@ -5,8 +5,7 @@ from django.urls import reverse
 from django.views.generic import View
 
 from config.settings import STATE_ABBREVS
-from dissemination.analytics.state import DisseminationStateAnalytics
-from dissemination.analytics.trends import DisseminationTrendAnalytics
+from dissemination.analytics.rollups import RollupStateAnalytics, RollupTrendAnalytics
 from dissemination.forms.analytics_forms import AnalyticsFilterForm
 from dissemination.templatetags.combine_years import combine_years
 
@@ -44,6 +43,7 @@ class AnalyticsView(View):
             "state_abbrevs": STATE_ABBREVS,
         }
 
+        # The analytics are read from the rollup tables. See analytics/rollups.py.
         # Four Cases:
         # 1. No params are given. Render the blank page.
         # 2. Several years were chose with one state. The trend analytics take precedence, redirect without the state.
@@ -57,7 +57,7 @@ class AnalyticsView(View):
 
         if len(years) == 1:
             logger.info(f"Gathering state analytics for {state} {year}")
-            analytics = DisseminationStateAnalytics(state, year)
+            analytics = RollupStateAnalytics(state, year)
             context["dashboard_data"] = context["dashboard_data"] | {
                 "state_analytics": {
                     "total": analytics.single_dissemination_count(),
@@ -72,7 +72,7 @@ class AnalyticsView(View):
             }
         elif len(years) > 1:
             logger.info(f"Gathering trend analytics for {state} {years}")
-            trend_analytics = DisseminationTrendAnalytics(years)
+            trend_analytics = RollupTrendAnalytics(years)
             context["dashboard_data"] = context["dashboard_data"] | {
                 "trend_analytics": {
                     "total_submissions": trend_analytics.total_submissions(),
@@ -3,7 +3,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import BadRequest, ValidationError
-from django.http import Http404, HttpResponse
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.views.generic import View
@@ -16,6 +16,7 @@ from config.settings import (
 )
 from dissemination.file_downloads import (
     get_download_url,
+    get_file,
     get_filename,
     get_filename_from_audit,
 )
@@ -27,8 +28,9 @@ from dissemination.models import (
 )
 from dissemination.report_generation.audit_summary_reports import (
     generate_audit_summary_report,
+    stream_audit_summary_report,
 )
-from dissemination.searchlib.search_utils import run_search
+from dissemination.searchlib.search_utils import run_cached_search, run_search
 from dissemination.summary_reports import (
     generate_summary_report,
 )
@@ -40,6 +42,21 @@ from dissemination.views.utils import include_private_results
 logger = logging.getLogger(__name__)
 
 
+def _search_report_ids(request, form_data, use_audit, limit):
+    """
+    Run the search and return up to `limit` report_ids, in search order.
+    Searches against the dissemination tables go through the result cache.
+    """
+    if use_audit:
+        results = run_search(request, form_data, use_audit)
+        return [result.report_id for result in results[:limit]]
+
+    results, report_ids = run_cached_search(request, form_data)
+    if report_ids is None:
+        report_ids = [result.report_id for result in results[:limit]]
+    return report_ids[:limit]
+
+
 class PdfDownloadView(ReportAccessRequiredMixin, View):
     def get(self, request, report_id):
         """
@@ -59,13 +76,13 @@ class PdfDownloadView(ReportAccessRequiredMixin, View):
                 Audit, report_id=report_id, submission_status=STATUS.DISSEMINATED
             )
 
-        filename = (
-            get_filename_from_audit(report_id, "report")
+        filename, known_to_exist = (
+            (get_filename_from_audit(report_id, "report"), False)
             if use_audit
-            else get_filename(report_id, "report")
+            else get_file(report_id, "report")
         )
 
-        return redirect(get_download_url(filename))
+        return redirect(get_download_url(filename, known_to_exist=known_to_exist))
 
 
 class XlsxDownloadView(ReportAccessRequiredMixin, View):
@@ -139,12 +156,12 @@ class OneTimeAccessDownloadView(View):
             # use_audit = request.GET.get("beta", "N") == "Y"
             use_audit = False
 
-            filename = (
-                get_filename_from_audit(ota.report_id, "report")
+            filename, known_to_exist = (
+                (get_filename_from_audit(ota.report_id, "report"), False)
                 if use_audit
-                else get_filename(ota.report_id, "report")
+                else get_file(ota.report_id, "report")
             )
-            download_url = get_download_url(filename)
+            download_url = get_download_url(filename, known_to_exist=known_to_exist)
 
             # delete the OTA object
             ota.delete()
@@ -211,16 +228,28 @@ class MultipleSummaryReportDownloadView(View):
                 raise ValidationError("Form error in Search POST.")
 
             include_private = include_private_results(request)
-            results = run_search(request, form_data, use_audit)
-            results = results[:SUMMARY_REPORT_DOWNLOAD_LIMIT]  # Hard limit XLSX size
+            report_ids = _search_report_ids(
+                request, form_data, use_audit, SUMMARY_REPORT_DOWNLOAD_LIMIT
+            )  # Hard limit XLSX size
 
-            if len(results) == 0:
+            if len(report_ids) == 0:
                 raise Http404("Cannot generate summary report. No results found.")
-            report_ids = [result.report_id for result in results]
-            filename, workbook_bytes = (
-                generate_summary_report(report_ids, include_private)
-                if not use_audit
-                else generate_audit_summary_report(report_ids, include_private)
+
+            if use_audit:
+                # Stream the workbook from a temporary file, rather than
+                # building it in memory.
+                filename, report_file = stream_audit_summary_report(
+                    report_ids, include_private
+                )
+                return FileResponse(
+                    report_file,
+                    as_attachment=True,
+                    filename=filename,
+                    content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
+
+            filename, workbook_bytes = generate_summary_report(
+                report_ids, include_private
             )
 
             # Create an HTTP response with the workbook file for download
@@ -260,15 +289,13 @@ class FindingsSummaryReportDownloadView(FederalAccessRequiredMixin, View):
                 form_data["advanced_search_flag"] = True
             else:
                 raise ValidationError("Form error in Search POST.")
-            results = run_search(request, form_data)
             # We're not worried about row limits here
-            results = results[
-                :FINDINGS_SUMMARY_REPORT_DOWNLOAD_LIMIT
-            ]  # Hard limit XLSX size
+            report_ids = _search_report_ids(
+                request, form_data, False, FINDINGS_SUMMARY_REPORT_DOWNLOAD_LIMIT
+            )  # Hard limit XLSX size
 
-            if len(results) == 0:
+            if len(report_ids) == 0:
                 raise Http404("Cannot generate summary report. No results found.")
-            report_ids = [result.report_id for result in results]
             filename, workbook_bytes = generate_findings_summary_report(
                 report_ids=report_ids
             )
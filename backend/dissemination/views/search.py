@@ -15,8 +15,13 @@ from config.settings import (
 )
 from dissemination.forms.search_forms import AdvancedSearchForm, SearchForm
 from dissemination.search import gather_errors
+from dissemination.searchlib.search_pagination import (
+    paginate_search_results,
+    search_results_count,
+)
 from dissemination.searchlib.search_utils import (
     populate_cog_over_name,
+    run_cached_search,
     run_search,
 )
 from dissemination.searchlib.search_resub_tags import (
@@ -112,9 +117,12 @@ class AdvancedSearch(View):
 
         logger.info(f"Advanced searching on fields: {form_data}")
 
-        # Generate results on valid user input.
-        results = run_search(request, form_data)
-        results_count = results.count()
+        # Generate results on valid user input. Repeated searches reuse the cached report_ids.
+        results, report_ids = run_cached_search(request, form_data)
+        if report_ids is not None:
+            results_count, results_count_is_estimate = len(report_ids), False
+        else:
+            results_count, results_count_is_estimate = search_results_count(results)
 
         # Reset page number to one if the value already surpasses the number of feasible pages.
         page = form_data["page"]
@@ -125,8 +133,10 @@ class AdvancedSearch(View):
         logger.info(f"TOTAL: results_count: [{results_count}]")
 
         # The paginator object handles splicing the results to a one-page iterable and calculates which page numbers to show.
-        paginator = Paginator(object_list=results, per_page=form_data["limit"])
-        paginator_results = paginator.get_page(page)
+        # Next/previous links carry a cursor, so that those pages seek rather than OFFSET.
+        paginator, paginator_results = paginate_search_results(
+            results, report_ids, results_count, form_data, page
+        )
         paginator_results.adjusted_elided_pages = paginator.get_elided_page_range(
             page, on_each_side=1
         )
@@ -152,6 +162,7 @@ class AdvancedSearch(View):
             "order_direction": form_data["order_direction"],
             "page": page,
             "results_count": results_count,
+            "results_count_is_estimate": results_count_is_estimate,
             "results": paginator_results,
         }
         time_beginning_render = time.time()
@@ -231,9 +242,12 @@ class Search(View):
 
         logger.info(f"Searching on fields: {form_data}")
 
-        # Generate results on valid user input.
-        results = run_search(request, form_data)
-        results_count = results.count()
+        # Generate results on valid user input. Repeated searches reuse the cached report_ids.
+        results, report_ids = run_cached_search(request, form_data)
+        if report_ids is not None:
+            results_count, results_count_is_estimate = len(report_ids), False
+        else:
+            results_count, results_count_is_estimate = search_results_count(results)
 
         # Reset page to one if the page number surpasses how many pages there actually are
         page = form_data["page"]
@@ -244,8 +258,10 @@ class Search(View):
         logger.info(f"TOTAL: results_count: [{results_count}]")
 
         # The paginator object handles splicing the results to a one-page iterable and calculates which page numbers to show.
-        paginator = Paginator(object_list=results, per_page=form_data["limit"])
-        paginator_results = paginator.get_page(page)
+        # Next/previous links carry a cursor, so that those pages seek rather than OFFSET.
+        paginator, paginator_results = paginate_search_results(
+            results, report_ids, results_count, form_data, page
+        )
         paginator_results.adjusted_elided_pages = paginator.get_elided_page_range(
             page, on_each_side=1
         )
@@ -271,6 +287,7 @@ class Search(View):
             "order_direction": form_data["order_direction"],
             "page": page,
             "results_count": results_count,
+            "results_count_is_estimate": results_count_is_estimate,
             "results": paginator_results,
         }
 
@@ -52,4 +52,5 @@ gonogo "create_staffusers"
 #####
 # LAUNCH THE APP
 # We will have died long ago if things didn't work.
-npm run dev & python manage.py runserver 0.0.0.0:8000
+# The job worker disseminates submissions.
+npm run dev & python manage.py run_jobs & python manage.py runserver 0.0.0.0:8000
@@ -1,4 +1,5 @@
 export const UPLOAD_TIMEOUT = 240000; // 4m
+export const UPLOAD_POLL_INTERVAL = 2000; // 2s
 
 export const UPLOAD_URLS = {
   'federal-awards': 'federal-awards',
@@ -8,6 +8,16 @@ const previous_page_link = document.querySelectorAll(
 const loader = document.getElementById(`loader`);
 const search_arrow = document.getElementById(`search_arrow`);
 
+/**
+ * Set the hidden pagination cursor, if this search page has one.
+ * Next/previous links carry a cursor so the server can seek to the adjacent page.
+ */
+function setCursor(value) {
+  if (FORM.elements['cursor']) {
+    FORM.elements['cursor'].value = value || '';
+  }
+}
+
 /**
  * Attach event handlers for the pagination buttons. On click, set the appropriate form inputs and submit it for a reload.
  */
@@ -16,6 +26,7 @@ function attachEventHandlersPagination() {
     link.addEventListener('click', (e) => {
       e.preventDefault();
       FORM.elements['page'].value = link.textContent;
+      setCursor('');
       FORM.submit();
     });
   });
@@ -24,6 +35,7 @@ function attachEventHandlersPagination() {
     next_page_link[0].addEventListener('click', (e) => {
       e.preventDefault();
       FORM.elements['page'].value = parseInt(FORM.elements['page'].value) + 1;
+      setCursor(next_page_link[0].dataset.cursor);
       FORM.submit();
     });
   }
@@ -31,6 +43,7 @@ function attachEventHandlersPagination() {
     previous_page_link[0].addEventListener('click', (e) => {
       e.preventDefault();
       FORM.elements['page'].value = parseInt(FORM.elements['page'].value) - 1;
+      setCursor(previous_page_link[0].dataset.cursor);
       FORM.submit();
     });
   }
@@ -141,6 +154,7 @@ function attachEventHandlersSorting() {
         FORM.elements['order_direction'].value = 'descending';
       }
       FORM.elements['page'].value = 1;
+      setCursor('');
 
       FORM.submit();
     });
@@ -165,6 +179,9 @@ function attachEventHandlersSubmission() {
 
       loader.hidden = false;
 
+      // A new search invalidates any pagination cursor.
+      setCursor('');
+
       search_submit_buttons.forEach((btn) => {
         btn.disabled = true;
         btn.value = 'Searching...';
@@ -1,4 +1,8 @@
-import { UPLOAD_TIMEOUT, UPLOAD_URLS } from './globals';
+import {
+  UPLOAD_POLL_INTERVAL,
+  UPLOAD_TIMEOUT,
+  UPLOAD_URLS,
+} from './globals';
 
 /*
   Useful page elements
@@ -98,6 +102,71 @@ function display_error_table(data) {
   info_box.innerHTML = validationTable;
 }
 
+// On a validated upload, let the user continue.
+function handleSuccess() {
+  info_box.innerHTML = 'File successfully validated! Your work has been saved.';
+  setFormDisabled(false);
+}
+
+// Display the errors for a rejected upload.
+function handleResultErrors(data) {
+  if (data.type === 'error_row') {
+    // Issue in the rows. The "good" error, which we can use to display the error table.
+    // There can also be 'error_row' data that is just an unhelpful array.
+    if (Array.isArray(data.errors[0])) {
+      let e = new Error(`Row error: ${data.errors[0]}`);
+      e.name = 'Row error';
+      handleErrors(new Error(data.errors[0]));
+    } else {
+      display_error_table(data);
+    }
+  } else if (data.type === 'error_field') {
+    let e = new Error(data.errors);
+    e.name = 'Field error';
+    handleErrors(e);
+  } else if (data.type === 'no_late_changes') {
+    let e = new Error(data.errors);
+    e.name = 'Access denied';
+    handleErrors(e);
+  } else if (data.type === 'unknown_workbook') {
+    let e = new Error(data.errors);
+    e.name = 'Unknown workbook';
+    handleErrors(e);
+  } else {
+    // Catch all.
+    let e = new Error('Unexpected error in JSON response.');
+    e.name = 'Unexpected';
+    handleErrors(e);
+  }
+}
+
+// Poll a queued upload's status until it has been validated, or times out.
+function pollUploadStatus(status_url, started = Date.now()) {
+  return new Promise((resolve) => setTimeout(resolve, UPLOAD_POLL_INTERVAL))
+    .then(() => fetch(status_url))
+    .then((res) => {
+      if (!res.ok) throw res;
+      return res.json();
+    })
+    .then((data) => {
+      if (data.status === 'validating') {
+        if (Date.now() - started > UPLOAD_TIMEOUT) {
+          let e = new Error('Validation took longer than expected.');
+          e.name = 'AbortError';
+          throw e;
+        }
+        return pollUploadStatus(status_url, started);
+      }
+      if (data.status === 'accepted') {
+        handleSuccess();
+      } else if (data.status === 'rejected') {
+        handleResultErrors(data.result);
+      } else {
+        throw new Error('The upload could not be validated.');
+      }
+    });
+}
+
 // On file upload, send it off for verification.
 function attachFileUploadHandler() {
   file_input.addEventListener('change', (e) => {
@@ -133,43 +202,16 @@ function attachFileUploadHandler() {
         signal: signal,
       })
         .then((res) => {
+          // A 202 means the file is being validated: wait for the outcome.
+          if (res.status == 202) {
+            return res.json().then((data) => pollUploadStatus(data.status_url));
+          }
           // If recieving a 200 response, we are done.
           // Otherwise, pull the JSON data from the reponse and react accordingly.
           if (res.status == 200) {
-            info_box.innerHTML =
-              'File successfully validated! Your work has been saved.';
-            setFormDisabled(false);
+            handleSuccess();
           } else {
-            res.json().then((data) => {
-              if (data.type === 'error_row') {
-                // Issue in the rows. The "good" error, which we can use to display the error table.
-                // There can also be 'error_row' data that is just an unhelpful array.
-                if (Array.isArray(data.errors[0])) {
-                  let e = new Error(`Row error: ${data.errors[0]}`);
-                  e.name = 'Row error';
-                  handleErrors(new Error(data.errors[0]));
-                } else {
-                  display_error_table(data);
-                }
-              } else if (data.type === 'error_field') {
-                let e = new Error(data.errors);
-                e.name = 'Field error';
-                handleErrors(e);
-              } else if (data.type === 'no_late_changes') {
-                let e = new Error(data.errors);
-                e.name = 'Access denied';
-                handleErrors(e);
-              } else if (data.type === 'unknown_workbook') {
-                let e = new Error(data.errors);
-                e.name = 'Unknown workbook';
-                handleErrors(e);
-              } else {
-                // Catch all.
-                let e = new Error('Unexpected error in JSON response.');
-                e.name = 'Unexpected';
-                handleErrors(e);
-              }
-            });
+            res.json().then(handleResultErrors);
           }
         })
         .catch((error) => {
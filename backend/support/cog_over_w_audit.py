@@ -1,4 +1,5 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 import logging
 import math
 
@@ -18,6 +19,9 @@ BASELINE_VALID_FOR_YEARS = 5
 
 DBKEY_TO_UEI_TRANSITION_YEAR = "2022"
 
+# The BaselineTable in use in this process, if any. See preloaded_baselines().
+_baselines = None
+
 
 def compute_cog_over(
     federal_awards, submission_status, auditee_ein, auditee_uei, audit_year
@@ -123,6 +127,11 @@ def determine_hist_agency(ein, uei, audit_year):
 
 
 def get_dbkey(ein, uei):
+    if _baselines is not None and _baselines.answers(
+        "get_dbkey", _baselines.has_dbkeys
+    ):
+        return _baselines.get_dbkey(ein, uei)
+
     audit_model = apps.get_model("audit.Audit")
     try:
         report_id = audit_model.objects.values_list("report_id", flat=True).get(
@@ -152,6 +161,11 @@ def lookup_latest_cog(ein, uei, dbkey, base_year, audit_year):
     #       From 2016 through 2022, (dbkey, ein) is the identifier for audits through 2021.
     #       In 2022, entities transitioned from dbkey to uei.  2022 data contains dbkey, ein and uei.
     #       From 2022 on, (ein, uei) is the identifier for audits.
+    if _baselines is not None and _baselines.answers(
+        "lookup_latest_cog", _baselines.has_cog_years(base_year, audit_year)
+    ):
+        return _baselines.lookup_latest_cog(ein, uei, dbkey, base_year, audit_year)
+
     query_years = [str(year) for year in range(int(base_year), int(audit_year) + 1)]
     cognizant_agency = None
 
@@ -185,6 +199,11 @@ def lookup_latest_cog(ein, uei, dbkey, base_year, audit_year):
 
 
 def get_base_audit(ein, uei, base_year):
+    if _baselines is not None and _baselines.answers(
+        "get_base_audit", _baselines.has_base_audit(ein, uei, base_year)
+    ):
+        return _baselines.get_base_audit(ein, uei, base_year)
+
     audit_model = apps.get_model("audit.Audit")
     audits = audit_model.objects.filter(
         Q(auditee_ein=ein), Q(auditee_uei=uei), Q(audit_year=base_year)
@@ -198,6 +217,11 @@ def get_base_audit(ein, uei, base_year):
 
 
 def get_base_cfdas(report_id):
+    if _baselines is not None and _baselines.answers(
+        "get_base_cfdas", report_id in _baselines.base_cfdas
+    ):
+        return _baselines.get_base_cfdas(report_id)
+
     audit_model = apps.get_model("audit.Audit")
     audit = audit_model.objects.get(report_id=report_id)
     cfdas = audit.audit["federal_awards"]["awards"]
@@ -245,3 +269,194 @@ def prune_dict_to_max_values(data: dict):
         if value == max_value:
             pruned_dict[key] = value
     return pruned_dict
+
+
+def summarize_cfdas(cfdas):
+    """
+    The baseline CFDAs of one audit as one direct and one indirect row per
+    agency, which calc_cfda_amounts() totals just as it does the full list.
+    """
+    amounts = defaultdict(lambda: 0)
+    for agency, amount, direct in cfdas:
+        amounts[(agency, direct)] += amount or 0
+    return [(agency, amount, direct) for (agency, direct), amount in amounts.items()]
+
+
+class BaselineTable:
+    """
+    Everything determine_hist_agency() looks up for audits of the given audit
+    years, read with a few set-based queries rather than up to four queries
+    per audit:
+
+    - the 2022 dbkey of each (EIN, UEI);
+    - the cognizant agencies of the audits from the earliest base year to the
+      latest audit year, by (EIN, UEI), and by EIN for Census reports;
+    - the number of audits of each (EIN, UEI) in each base year, and for the
+      unique ones, their total expended and summarized CFDAs.
+
+    The lookups mirror the query functions above, which consult the table
+    first and query for anything outside the years loaded. self.stats counts
+    the hits and misses of each lookup.
+    """
+
+    def __init__(self, audit_years):
+        audit_years = {int(year) for year in audit_years}
+        self.base_years = {int(calc_base_year(year)) for year in audit_years}
+        self.first_year = min(self.base_years, default=0)
+        self.last_year = max(audit_years, default=-1)
+        self.has_dbkeys = FIRST_BASELINE_YEAR in self.base_years
+        self.stats = Counter()
+
+        audit_model = apps.get_model("audit.Audit")
+        self.dbkeys = self._load_dbkeys(audit_model) if self.has_dbkeys else {}
+        self.cogs_by_ein_uei = defaultdict(list)
+        self.census_cogs_by_ein = defaultdict(list)
+        self._load_cogs(audit_model)
+        self.base_audits = {}
+        self.base_cfdas = {}
+        self._load_base_audits(audit_model)
+
+    def _load_dbkeys(self, audit_model):
+        report_ids = defaultdict(list)
+        for ein, uei, report_id in audit_model.objects.filter(
+            audit_year=DBKEY_TO_UEI_TRANSITION_YEAR
+        ).values_list("auditee_ein", "auditee_uei", "report_id"):
+            report_ids[(ein, uei)].append(report_id)
+        dbkeys = defaultdict(list)
+        for report_id, dbkey in MigrationInspectionRecord.objects.filter(
+            audit_year=DBKEY_TO_UEI_TRANSITION_YEAR
+        ).values_list("report_id", "dbkey"):
+            dbkeys[report_id].append(dbkey)
+
+        # As in get_dbkey(), only a unique audit with a unique record has a dbkey.
+        return {
+            key: dbkeys[ids[0]][0]
+            for key, ids in report_ids.items()
+            if len(ids) == 1 and len(dbkeys.get(ids[0], [])) == 1
+        }
+
+    def _load_cogs(self, audit_model):
+        for year, ein, uei, report_id, cog in (
+            audit_model.objects.filter(
+                audit_year__gte=self.first_year, audit_year__lte=self.last_year
+            )
+            .exclude(cognizant_agency__isnull=True)
+            .exclude(cognizant_agency__exact="")
+            .order_by("-audit_year", "id")
+            .values_list(
+                "audit_year",
+                "auditee_ein",
+                "auditee_uei",
+                "report_id",
+                "cognizant_agency",
+            )
+        ):
+            self.cogs_by_ein_uei[(ein, uei)].append((year, cog))
+            if "census" in report_id.lower():
+                self.census_cogs_by_ein[ein].append((year, report_id.lower(), cog))
+
+    def _load_base_audits(self, audit_model):
+        self.base_audit_counts = counts = Counter()
+        malformed = set()
+        for ein, uei, year, report_id, federal_awards in (
+            audit_model.objects.filter(audit_year__in=self.base_years)
+            .order_by("id")
+            .values_list(
+                "auditee_ein",
+                "auditee_uei",
+                "audit_year",
+                "report_id",
+                "audit__federal_awards",
+            )
+            .iterator()
+        ):
+            key = (ein, uei, year)
+            counts[key] += 1
+            if counts[key] > 1:
+                continue
+            try:
+                self.base_audits[key] = (
+                    federal_awards["total_amount_expended"],
+                    report_id,
+                )
+                self.base_cfdas[report_id] = summarize_cfdas(
+                    (
+                        row["program"]["federal_agency_prefix"],
+                        row["program"]["amount_expended"],
+                        row["direct_or_indirect_award"]["is_direct"],
+                    )
+                    for row in federal_awards["awards"]
+                )
+            except (KeyError, TypeError):
+                malformed.add(key)
+        # A unique baseline without its awards is left to the queries, which
+        # fail on it as they always have.
+        self.malformed = {key for key in malformed if counts[key] == 1}
+
+    def answers(self, lookup, covered):
+        """Count a lookup as a hit if the table covers it, else a miss."""
+        self.stats[f"{lookup} {'hits' if covered else 'misses'}"] += 1
+        return covered
+
+    def hit_rate(self):
+        hits = sum(n for name, n in self.stats.items() if name.endswith("hits"))
+        total = sum(self.stats.values())
+        return hits / total if total else None
+
+    def has_cog_years(self, base_year, audit_year):
+        return self.first_year <= int(base_year) and int(audit_year) <= self.last_year
+
+    def has_base_audit(self, ein, uei, base_year):
+        return (
+            int(base_year) in self.base_years
+            and (ein, uei, int(base_year)) not in self.malformed
+        )
+
+    def get_dbkey(self, ein, uei):
+        return self.dbkeys.get((ein, uei))
+
+    def lookup_latest_cog(self, ein, uei, dbkey, base_year, audit_year):
+        if (int(base_year) == FIRST_BASELINE_YEAR) and (dbkey is not None):
+            dbkey = dbkey.lower()
+            candidates = (
+                (year, cog)
+                for year, report_id, cog in self.census_cogs_by_ein[ein]
+                if dbkey in report_id
+            )
+        else:
+            candidates = self.cogs_by_ein_uei[(ein, uei)]
+        for year, cog in candidates:
+            if int(base_year) <= year <= int(audit_year):
+                return cog
+        return None
+
+    def get_base_audit(self, ein, uei, base_year):
+        key = (ein, uei, int(base_year))
+        if self.base_audit_counts[key] == 1:
+            return (1,) + self.base_audits[key]
+        return (self.base_audit_counts[key], 0, None)
+
+    def get_base_cfdas(self, report_id):
+        return self.base_cfdas[report_id] or None
+
+
+@contextmanager
+def preloaded_baselines(audit_years):
+    """
+    Within this block, compute_cog_over() in this process answers its
+    historical lookups for audits of these years from a BaselineTable, which
+    is loaded on entry. For bulk runs over whole years, which look up the same
+    baselines again and again. Yields the table; its hit counts are logged on
+    exit.
+    """
+    global _baselines
+    previous = _baselines
+    _baselines = BaselineTable(audit_years)
+    try:
+        yield _baselines
+    finally:
+        logger.info(
+            f"Cog/over baseline hit rate {_baselines.hit_rate()}: "
+            f"{dict(_baselines.stats)}"
+        )
+        _baselines = previous
@@ -0,0 +1,189 @@
+# Export query results to S3 as gzipped CSV, with Postgres' COPY.
+#
+# Each ExportStream's query is run through `COPY (...) TO STDOUT WITH CSV`,
+# and the bytes are compressed and uploaded to S3 as they arrive, a part at a
+# time, so nothing is written to local disk and at most one part of each
+# stream is held in memory. The objects keep their .csv keys, and are stored
+# with `Content-Encoding: gzip`, so that they are unzipped on download.
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+from typing import NamedTuple
+import zlib
+
+from boto3 import client as boto3_client
+from botocore.client import Config
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# S3 requires every part of a multipart upload but the last to be at least
+# 5 MiB. Each worker holds up to about one part in memory.
+PART_SIZE = 8 * 1024 * 1024
+
+
+class ExportStream(NamedTuple):
+    key: str
+    sql: str
+
+
+class GzipMultipartUpload:
+    """
+    A write-only file that gzips what is written to it into an S3 object,
+    uploading a part whenever part_size compressed bytes have accumulated.
+    Objects smaller than a part are uploaded with a single put.
+    """
+
+    def __init__(self, s3_client, bucket, key, part_size=PART_SIZE):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.bytes_in += len(data)
+        self.buffer += self.compressor.compress(data)
+        if len(self.buffer) >= self.part_size:
+            self._upload_part()
+        return len(data)
+
+    def _upload_part(self):
+        if self.upload_id is None:
+            self.upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType="text/csv",
+                ContentEncoding="gzip",
+            )["UploadId"]
+        part_number = len(self.parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.buffer),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.bytes_out += len(self.buffer)
+        self.buffer = bytearray()
+
+    def close(self):
+        self.buffer += self.compressor.flush()
+        if self.upload_id is None:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self.buffer),
+                ContentType="text/csv",
+                ContentEncoding="gzip",
+            )
+            self.bytes_out += len(self.buffer)
+            self.buffer = bytearray()
+            return
+        self._upload_part()
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def abort(self):
+        if self.upload_id is not None:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+
+
+def get_s3_client(max_pool_connections=10):
+    # This client uses the internal endpoint url because we're making requests
+    # to S3 from within the app.
+    return boto3_client(
+        service_name="s3",
+        region_name=settings.AWS_S3_PRIVATE_REGION_NAME,
+        aws_access_key_id=settings.AWS_PRIVATE_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_PRIVATE_SECRET_ACCESS_KEY,
+        endpoint_url=settings.AWS_S3_PRIVATE_INTERNAL_ENDPOINT,
+        config=Config(
+            signature_version="s3v4", max_pool_connections=max_pool_connections
+        ),
+    )
+
+
+def export_stream(stream, s3_client, bucket, part_size=PART_SIZE):
+    """
+    Export one stream's query results, with a header row, to its key in the
+    bucket. Returns the stream's stats.
+    """
+    start = time.monotonic()
+    upload = GzipMultipartUpload(s3_client, bucket, stream.key, part_size)
+    try:
+        with connection.cursor() as cursor:
+            # copy_expert() is psycopg2's own, so its errors need wrapping as
+            # Django's.
+            with connection.wrap_database_errors:
+                cursor.copy_expert(
+                    f"COPY ({stream.sql}) TO STDOUT WITH (FORMAT CSV, HEADER)", upload
+                )
+            rows = cursor.rowcount
+        upload.close()
+    except Exception:
+        upload.abort()
+        raise
+    seconds = time.monotonic() - start
+    stats = {
+        "key": stream.key,
+        "rows": rows,
+        "bytes": upload.bytes_in,
+        "compressed_bytes": upload.bytes_out,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0,
+        "bytes_per_second": upload.bytes_in / seconds if seconds else 0,
+    }
+    logger.info(
+        f"Exported {rows} rows ({upload.bytes_in} bytes, {upload.bytes_out} "
+        f"gzipped) to {stream.key} in {seconds:.2f}s: "
+        f"{stats['rows_per_second']:.0f} rows/s, "
+        f"{stats['bytes_per_second']:.0f} bytes/s"
+    )
+    return stats
+
+
+def _export_stream_in_thread(stream, s3_client, bucket, part_size):
+    try:
+        return export_stream(stream, s3_client, bucket, part_size)
+    finally:
+        # Each thread has its own database connection.
+        connection.close()
+
+
+def export_streams(
+    streams, workers=4, s3_client=None, bucket=None, part_size=PART_SIZE
+):
+    """
+    Export the streams with up to `workers` of them running at a time, each
+    on its own database connection. Returns the stats of each stream, in
+    order. With a single worker, the streams are exported one after another
+    on the current connection.
+    """
+    s3_client = s3_client or get_s3_client(max_pool_connections=max(workers, 10))
+    bucket = bucket or settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
+    if workers <= 1:
+        return [export_stream(s, s3_client, bucket, part_size) for s in streams]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda s: _export_stream_in_thread(s, s3_client, bucket, part_size),
+                streams,
+            )
+        )
@@ -1,5 +1,5 @@
 import support.export_audit_sql as export_audit_sql
-from sling import ReplicationStream
+from support.copy_export import ExportStream
 
 API_VERSION = "api_v1_1_0"
 
@@ -12,11 +12,9 @@ class StreamGenerator:
         table_name = (self.query.split(".")[1]).split(" ")[0]
         return (
             f"{table_name}.{audit_year}",
-            ReplicationStream(
-                object=f"public-data/gsa/audit-year/{audit_year}-ay-{table_name}.csv",
+            ExportStream(
+                key=f"public-data/gsa/audit-year/{audit_year}-ay-{table_name}.csv",
                 sql=self.query.format(api_version=API_VERSION, audit_year=audit_year),
-                mode="full-refresh",
-                target_options={"format": "csv"},
             ),
         )
 
@@ -24,11 +22,9 @@ class StreamGenerator:
         table_name = (self.query.split(".")[1]).split(" ")[0]
         return (
             f"{table_name}",
-            ReplicationStream(
-                object=f"public-data/gsa/full/{table_name}.csv",
+            ExportStream(
+                key=f"public-data/gsa/full/{table_name}.csv",
                 sql=self.query.format(api_version=API_VERSION),
-                mode="full-refresh",
-                target_options={"format": "csv"},
             ),
         )
 
@@ -39,15 +35,13 @@ class StreamGenerator:
         fac_accepted_date_end = str(audit_year) + "-09-30"
         return (
             f"{table_name}_Federal_year.{audit_year}",
-            ReplicationStream(
-                object=f"public-data/gsa/federal-fiscal-year/{audit_year}-ffy-{table_name}.csv",
+            ExportStream(
+                key=f"public-data/gsa/federal-fiscal-year/{audit_year}-ffy-{table_name}.csv",
                 sql=self.query.format(
                     api_version=API_VERSION,
                     fac_accepted_date_start=fac_accepted_date_start,
                     fac_accepted_date_end=fac_accepted_date_end,
                 ),
-                mode="full-refresh",
-                target_options={"format": "csv"},
             ),
         )
 
@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db.models import Q
 
 from audit.models.constants import STATUS
-from support.cog_over_w_audit import compute_cog_over
+from support.cog_over_w_audit import compute_cog_over, preloaded_baselines
 from django.apps import apps
 
 from config.settings import ENVIRONMENT
@@ -47,44 +47,46 @@ class Command(BaseCommand):
         print(f"Count of {year} submissions: {len(audits)}")
         processed = cog_mismatches = over_mismatches = 0
 
-        for audit in audits:
-            print(
-                f"audit.report_id = {audit.report_id} \n",
-            )
-            cognizant_agency, oversight_agency = compute_cog_over(
-                audit.audit["federal_awards"],
-                audit.submission_status,
-                audit.auditee_ein,
-                audit.auditee_uei,
-                audit.audit_year,
-            )
-
-            processed += 1
-            if audit.cognizant_agency == "":
-                audit.cognizant_agency = None
-            if audit.oversight_agency == "":
-                audit.oversight_agency = None
-            if cognizant_agency != audit.cognizant_agency:
-                cog_mismatches += 1
+        with preloaded_baselines([year]) as baselines:
+            for audit in audits:
                 print(
-                    f"Cog mismatch. Calculated {cognizant_agency} Expected {audit.cognizant_agency}"
+                    f"audit.report_id = {audit.report_id} \n",
                 )
-                self.show_mismatch(audit)
-            if oversight_agency != audit.oversight_agency:
-                self.show_mismatch(audit)
-                over_mismatches += 1
-                print(
-                    f"Oversight mismatch. Calculated {oversight_agency} Expected {audit.oversight_agency}"
+                cognizant_agency, oversight_agency = compute_cog_over(
+                    audit.audit["federal_awards"],
+                    audit.submission_status,
+                    audit.auditee_ein,
+                    audit.auditee_uei,
+                    audit.audit_year,
                 )
-                self.show_mismatch(audit)
-            if processed % 1000 == 0:
-                print(f"""
+
+                processed += 1
+                if audit.cognizant_agency == "":
+                    audit.cognizant_agency = None
+                if audit.oversight_agency == "":
+                    audit.oversight_agency = None
+                if cognizant_agency != audit.cognizant_agency:
+                    cog_mismatches += 1
+                    print(
+                        f"Cog mismatch. Calculated {cognizant_agency} Expected {audit.cognizant_agency}"
+                    )
+                    self.show_mismatch(audit)
+                if oversight_agency != audit.oversight_agency:
+                    self.show_mismatch(audit)
+                    over_mismatches += 1
+                    print(
+                        f"Oversight mismatch. Calculated {oversight_agency} Expected {audit.oversight_agency}"
+                    )
+                    self.show_mismatch(audit)
+                if processed % 1000 == 0:
+                    print(f"""
                     Processed {processed} rows so far.
                     Found {cog_mismatches} cog and {over_mismatches} over mismatches.
                     ...""")
         print(f"""
                 Processed all {processed} rows.
                 Found {cog_mismatches} cog and {over_mismatches} over mismatches.
+                Baseline lookups: {dict(baselines.stats)}
                 """)
 
     def show_mismatch(self, audit):
@@ -1,42 +1,14 @@
-###
-# DEPRECATION WARNING!
-# Sling has been removed as a dependency as of 4/30/2026, so this command is
-# considered to be deprecated.
-###
-
-import os
 import logging
 
-from config import settings
 from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
-from sling import Replication, ReplicationStream
 
+from support.copy_export import ExportStream, export_streams
 from support.decorators import newrelic_timing_metric
 from dissemination.summary_reports import restricted_model_names
 
 logger = logging.getLogger(__name__)
 
-S3_CONNECTION = f"""{{
-            "type": "s3",
-            "bucket": "{settings.AWS_PRIVATE_STORAGE_BUCKET_NAME}",
-            "access_key_id": "{settings.AWS_PRIVATE_ACCESS_KEY_ID}",
-            "secret_access_key": "{settings.AWS_PRIVATE_SECRET_ACCESS_KEY}",
-            "endpoint": "{settings.AWS_S3_ENDPOINT_URL}"
-         }}
-    """
-DB_URL = os.environ.get("DATABASE_URL")
-FAC_DB_URL = (
-    f"{DB_URL}?sslmode=disable" if settings.ENVIRONMENT in ["LOCAL", "TEST"] else DB_URL
-)
-DEFAULT_OPTIONS = {
-    "target_options": {
-        "format": "csv",
-        "compression": "gzip",
-        "file_max_rows": 0,
-    }
-}
-
 
 class StreamGenerator:
     EXCLUDE_NONPUBLIC_QUERY = (
@@ -68,13 +40,11 @@ class StreamGenerator:
     def generate_stream(self, audit_year):
         return (
             f"{self.table_name}.{audit_year}",
-            ReplicationStream(
-                object=f"bulk_export/{{MM}}/{audit_year}_{self.friendly_name}.csv",
+            ExportStream(
+                key=f"bulk_export/{datetime.today():%m}/{audit_year}_{self.friendly_name}.csv",
                 sql=self.query.format(
                     table_name=self.table_name, audit_year=audit_year
                 ),
-                mode="full-refresh",
-                target_options={"format": "csv"},
             ),
         )
 
@@ -112,7 +82,7 @@ STREAM_GENERATORS = [
 
 
 @newrelic_timing_metric("data_export")
-def _run_data_export():
+def _run_data_export(workers):
     logger.info("Begin exporting data")
     # We may want to consider instead of hardcoding 2016 only export the past X years.
     # This will only export data that exists, so doing +2 just incase some data is in early
@@ -122,23 +92,23 @@ def _run_data_export():
         for year in years:
             streams.update([stream_generator.generate_stream(year)])
 
-    replication = Replication(
-        source="FAC_DB",
-        target="BULK_DATA_EXPORT",
-        streams=streams,
-        defaults=DEFAULT_OPTIONS,
-        env=dict(FAC_DB=FAC_DB_URL, BULK_DATA_EXPORT=S3_CONNECTION),
-        debug=settings.DEBUG,
-    )
     logger.info(f"Exporting {len(streams)} streams")
-    replication.run()
+    export_streams(list(streams.values()), workers=workers)
     logger.info("Successfully exported data")
 
 
 class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of streams exported at a time.",
+        )
+
     def handle(self, *args, **kwargs):
         try:
-            _run_data_export()
+            _run_data_export(kwargs["workers"])
         except Exception as ex:
             logger.error("An error occurred while exporting data", exc_info=ex)
             raise CommandError("Error while exporting data")
@@ -0,0 +1,98 @@
+from datetime import datetime
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from support.copy_export import export_streams
+from support.decorators import newrelic_timing_metric
+from support.export_audit_streams import (
+    STREAM_GENERATORS,
+    STREAM_GENERATORS_ALL,
+    STREAM_GENERATORS_FEDERAL_YEAR,
+)
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ["audit-year", "federal-year", "full"]
+
+
+def _streams(scopes, years):
+    streams = []
+    if "audit-year" in scopes:
+        for stream_generator in STREAM_GENERATORS:
+            streams += [stream_generator.generate_stream(year)[1] for year in years]
+    if "federal-year" in scopes:
+        for stream_generator in STREAM_GENERATORS_FEDERAL_YEAR:
+            streams += [
+                stream_generator.generate_fed_year_stream(year)[1] for year in years
+            ]
+    if "full" in scopes:
+        streams += [
+            stream_generator.generate_stream_all()[1]
+            for stream_generator in STREAM_GENERATORS_ALL
+        ]
+    return streams
+
+
+@newrelic_timing_metric("data_export_audit")
+def _run_data_export(scopes, years, workers):
+    streams = _streams(scopes, years)
+    logger.info(f"Exporting {len(streams)} streams with {workers} workers")
+    return export_streams(streams, workers=workers)
+
+
+class Command(BaseCommand):
+    """
+    Export the public audit data, through the API, to gzipped CSVs under
+    public-data/gsa/ in the private bucket: one per table and audit year, one
+    per table and federal fiscal year, and one per table for all years.
+
+    Usage:
+    manage.py export_data_audit
+    manage.py export_data_audit --scope audit-year --years 2023 2024 --workers 8
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scope",
+            choices=SCOPES,
+            nargs="+",
+            default=SCOPES,
+            help="Which of the exports to run.",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            nargs="+",
+            # This will only export data that exists, so doing +2 just in case
+            # some data is in early.
+            default=list(range(2016, datetime.today().year + 2)),
+            help="Audit years and federal fiscal years to export.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of streams exported at a time.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            stats = _run_data_export(
+                options["scope"], options["years"], options["workers"]
+            )
+        except Exception as ex:
+            logger.error("An error occurred while exporting data", exc_info=ex)
+            raise CommandError("Error while exporting data")
+
+        for stream in stats:
+            self.stdout.write(
+                f"{stream['key']}: {stream['rows']} rows, {stream['bytes']} bytes "
+                f"({stream['compressed_bytes']} gzipped) in {stream['seconds']:.2f}s; "
+                f"{stream['rows_per_second']:.0f} rows/s, "
+                f"{stream['bytes_per_second']:.0f} bytes/s"
+            )
+        self.stdout.write(
+            f"Exported {len(stats)} streams, "
+            f"{sum(stream['rows'] for stream in stats)} rows."
+        )
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from dissemination.models import MigrationInspectionRecord
@@ -8,7 +10,8 @@ from audit.models import (
 )
 from model_bakery import baker
 from faker import Faker
-from .cog_over_w_audit import compute_cog_over
+from . import cog_over_w_audit
+from .cog_over_w_audit import compute_cog_over, preloaded_baselines
 
 User = get_user_model()
 
@@ -879,3 +882,23 @@ class CogOverTests(TestCase):
         )
         self.assertEqual(cog_agency, "10")
         self.assertEqual(over_agency, None)
+
+
+def _compute_cog_over_preloaded(
+    federal_awards, submission_status, auditee_ein, auditee_uei, audit_year
+):
+    with preloaded_baselines([audit_year]) as baselines:
+        result = cog_over_w_audit.compute_cog_over(
+            federal_awards, submission_status, auditee_ein, auditee_uei, audit_year
+        )
+    if baselines.stats:
+        assert baselines.hit_rate() == 1, baselines.stats
+    return result
+
+
+@patch("support.test_cog_over_w_audit.compute_cog_over", _compute_cog_over_preloaded)
+class PreloadedBaselineCogOverTests(CogOverTests):
+    """
+    The same cases, with every historical lookup answered from a
+    BaselineTable loaded for the audit's year.
+    """
@@ -0,0 +1,110 @@
+import csv
+import gzip
+import io
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from dissemination.models import General
+from support.copy_export import (
+    ExportStream,
+    export_streams,
+    get_s3_client,
+)
+from support.management.commands.export_data_audit import _streams
+
+# S3's smallest part size, for everything but the last part.
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class CopyExportTests(TestCase):
+    """
+    These export to the private bucket of the local S3 stand-in.
+    """
+
+    def setUp(self):
+        self.s3_client = get_s3_client()
+        self.bucket = settings.AWS_PRIVATE_STORAGE_BUCKET_NAME
+
+    def read_csv(self, key):
+        body = self.s3_client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        return list(csv.reader(io.StringIO(gzip.decompress(body).decode("utf-8"))))
+
+    def test_export_stream(self):
+        baker.make(General, report_id="2023-06-GSAFAC-0000000001", audit_year="2023")
+        baker.make(General, report_id="2022-06-GSAFAC-0000000002", audit_year="2022")
+        stream = ExportStream(
+            key="test/copy-export/general.csv",
+            sql="select report_id, audit_year from dissemination_general "
+            "where audit_year = '2023'",
+        )
+
+        [stats] = export_streams([stream], workers=1)
+
+        self.assertEqual(
+            self.read_csv(stream.key),
+            [["report_id", "audit_year"], ["2023-06-GSAFAC-0000000001", "2023"]],
+        )
+        self.assertEqual(stats["key"], stream.key)
+        self.assertEqual(stats["rows"], 1)
+        self.assertEqual(
+            stats["bytes"],
+            len("report_id,audit_year\n2023-06-GSAFAC-0000000001,2023\n"),
+        )
+
+    def test_export_stream_in_parts(self):
+        """Streams larger than a part are uploaded in several"""
+        stream = ExportStream(
+            key="test/copy-export/large.csv",
+            sql="select md5(i::text) || md5((-i)::text) as digest "
+            "from generate_series(1, 200000) as i",
+        )
+
+        with patch.object(
+            self.s3_client, "upload_part", wraps=self.s3_client.upload_part
+        ) as upload_part:
+            [stats] = export_streams(
+                [stream], workers=1, s3_client=self.s3_client, part_size=MIN_PART_SIZE
+            )
+
+        self.assertEqual(upload_part.call_count, 2)
+        rows = self.read_csv(stream.key)
+        self.assertEqual(len(rows), 200001)
+        self.assertEqual(stats["rows"], 200000)
+
+    def test_export_data_audit_streams(self):
+        streams = _streams(["audit-year", "full"], [2022, 2023])
+
+        self.assertEqual(len(streams), 30)
+        self.assertIn(
+            ExportStream(
+                key="public-data/gsa/audit-year/2023-ay-findings.csv",
+                sql="select * from api_v1_1_0.findings where audit_year = '2023'",
+            ),
+            streams,
+        )
+        self.assertIn("public-data/gsa/full/general.csv", [s.key for s in streams])
+
+    @patch("support.management.commands.export_data_audit.export_streams")
+    def test_export_data_audit(self, mock_export_streams):
+        mock_export_streams.return_value = [
+            {
+                "key": "public-data/gsa/full/general.csv",
+                "rows": 10,
+                "bytes": 1000,
+                "compressed_bytes": 100,
+                "seconds": 2,
+                "rows_per_second": 5,
+                "bytes_per_second": 500,
+            }
+        ]
+        out = io.StringIO()
+
+        call_command("export_data_audit", "--scope", "full", stdout=out)
+
+        streams = mock_export_streams.call_args.args[0]
+        self.assertEqual(len(streams), 10)
+        self.assertIn("5 rows/s, 500 bytes/s", out.getvalue())
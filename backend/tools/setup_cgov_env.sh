@@ -23,6 +23,10 @@ function setup_cgov_env {
     # Set the application name for New Relic telemetry.
     export NEW_RELIC_APP_NAME="$(echo "$VCAP_APPLICATION" | jq -r .application_name)-$(echo "$VCAP_APPLICATION" | jq -r .space_name)"
 
+    # The process this is starting, e.g. web or worker (see manifest-fac.yml).
+    # .profile runs for every process, but only web prepares the database.
+    export CF_PROCESS_TYPE="$(echo "$VCAP_APPLICATION" | jq -r .process_type)"
+
     # Set the environment name for New Relic telemetry.
     export NEW_RELIC_ENVIRONMENT="$(echo "$VCAP_APPLICATION" | jq -r .space_name)"
 